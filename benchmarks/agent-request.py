@@ -0,0 +1,69 @@
+"""
+SNMP agent request processing
++++++++++++++++++++++++++++++
+
+Measure how many SNMP messages SNMP agent can process per second,
+from serialized request to serialized response, in two scenarios:
+
+* "get" - SNMPv2c GET request for `sysDescr.0`, `sysUpTime.0` and
+  `snmpInPkts.0`
+* "bad community" - SNMPv2c GET request carrying unknown community
+  name, which is only counted and dropped
+
+Responses are not actually sent. The benchmark relies on public API
+only, so that it can be run against other pysnmp versions for
+comparison.
+
+Number of messages can be given on command line, default is 5000.
+
+"""#
+import sys
+import timeit
+from pyasn1.codec.ber import encoder
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdrsp, context
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto.api import v2c
+
+messageCount = len(sys.argv) > 1 and int(sys.argv[1]) or 5000
+repeats = 3
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addVacmUser(snmpEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+
+cmdrsp.GetCommandResponder(snmpEngine, context.SnmpContext(snmpEngine))
+
+# responses are not actually sent
+snmpEngine.transportDispatcher.sendMessage = lambda *args: None
+
+
+def request(communityName):
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setCommunity(msg, communityName)
+    pdu = v2c.GetRequestPDU()
+    v2c.apiPDU.setDefaults(pdu)
+    v2c.apiPDU.setVarBinds(pdu, [((1, 3, 6, 1, 2, 1, 1, 1, 0), v2c.Null('')),
+                                 ((1, 3, 6, 1, 2, 1, 1, 3, 0), v2c.Null('')),
+                                 ((1, 3, 6, 1, 2, 1, 11, 1, 0), v2c.Null(''))])
+    v2c.apiMessage.setPDU(msg, pdu)
+    return encoder.encode(msg)
+
+
+def receive(wholeMsg):
+    def run():
+        for _ in range(messageCount):
+            snmpEngine.msgAndPduDsp.receiveMessage(
+                snmpEngine, udp.domainName, ('127.0.0.1', 1024), wholeMsg
+            )
+
+    return run
+
+
+for name, wholeMsg in ('get', request('public')), ('bad community', request('private')):
+    best = min([timeit.timeit(receive(wholeMsg), number=1) for _ in range(repeats)])
+    print('%-13s %d messages %8.0f msg/s' % (name, messageCount, messageCount / best))
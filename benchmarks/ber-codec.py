@@ -0,0 +1,79 @@
+"""
+BER codec throughput
+++++++++++++++++++++
+
+Measure encoding and decoding of a typical SNMPv2c response message
+(10 var-binds of assorted types) by pyasn1 BER codec and by SNMP-specific
+BER codec `SnmpEngine(fastCodec=True)` switches to. Messages are
+decoded against the same schema object, as message processing models
+do.
+
+SNMP-specific codec requires pyasn1 0.4.1 or later, with older pyasn1
+only pyasn1 codec is measured.
+
+Number of messages can be given on command line, default is 5000.
+
+"""#
+import sys
+import timeit
+from pyasn1.codec.ber import encoder, decoder
+from pysnmp.proto import ber
+from pysnmp.proto.api import v2c
+
+messageCount = len(sys.argv) > 1 and int(sys.argv[1]) or 5000
+repeats = 3
+
+values = [v2c.OctetString('Linux host 4.9.0 #1 SMP x86_64'),
+          v2c.ObjectIdentifier('1.3.6.1.4.1.8072.3.2.10'),
+          v2c.TimeTicks(123456789),
+          v2c.Integer(-12345),
+          v2c.Counter32(4294967295),
+          v2c.Counter64(18446744073709551615),
+          v2c.Gauge32(1000000000),
+          v2c.IpAddress('192.168.1.1'),
+          v2c.OctetString(hexValue='001122334455'),
+          v2c.Null('')]
+
+msg = v2c.Message()
+v2c.apiMessage.setDefaults(msg)
+v2c.apiMessage.setCommunity(msg, 'public')
+pdu = v2c.ResponsePDU()
+v2c.apiPDU.setDefaults(pdu)
+v2c.apiPDU.setRequestID(pdu, 123456)
+v2c.apiPDU.setVarBinds(pdu, [('1.3.6.1.2.1.2.2.1.%d.%d' % (idx + 1, 10001), value)
+                             for idx, value in enumerate(values)])
+v2c.apiMessage.setPDU(msg, pdu)
+
+substrate = encoder.encode(msg)
+
+codecs = [('pyasn1', encoder, decoder)]
+
+if ber.isSupported:
+    codecs.append(('snmp', ber.encoder, ber.decoder))
+else:
+    print('pyasn1 0.4.1+ required for SNMP-specific codec')
+
+
+def encode(encoder):
+    def run():
+        for _ in range(messageCount):
+            encoder.encode(msg)
+
+    return run
+
+
+def decode(decoder):
+    asn1Spec = v2c.Message()
+
+    def run():
+        for _ in range(messageCount):
+            decoder.decode(substrate, asn1Spec=asn1Spec)
+
+    return run
+
+
+print('%d messages of %d octets' % (messageCount, len(substrate)))
+for name, encoder, decoder in codecs:
+    for operation, fun in ('encode', encode(encoder)), ('decode', decode(decoder)):
+        elapsed = min([timeit.timeit(fun, number=1) for _ in range(repeats)])
+        print('%-6s %s %8.0f msg/s' % (name, operation, messageCount / elapsed))
@@ -0,0 +1,129 @@
+"""
+Walking tables over asyncio
++++++++++++++++++++++++++++
+
+Measure how long it takes to walk 6 columns of `usmUserTable` served
+by a local SNMP agent responding with 20 ms of added latency:
+
+* "bulkCmd loop" - columns walked together by a chain of GETBULK
+  requests, one request at a time (max-repetitions 25)
+* "bulkWalkCmd" - each column walked by its own chain of GETBULK
+  requests running concurrently, `bulkWalkCmd()` defaults (if available)
+
+Requires asyncio carrier, which does not work on Python 3.7 and later.
+
+Number of table rows can be given on command line, default is 500.
+
+"""#
+import sys
+import time
+import asyncio
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdrsp, context
+from pysnmp.carrier.asyncio.dgram import udp
+from pysnmp.proto.rfc1902 import ObjectName
+from pysnmp.hlapi import asyncio as hlapi
+
+rowCount = len(sys.argv) > 1 and int(sys.argv[1]) or 500
+latency = 0.02
+repeats = 3
+
+loop = asyncio.get_event_loop()
+
+agentEngine = engine.SnmpEngine()
+
+agentTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+config.addTransport(agentEngine, udp.domainName, agentTransport)
+
+while agentTransport.transport is None:
+    loop.run_until_complete(asyncio.sleep(0))
+
+agentAddress = agentTransport.transport.get_extra_info('sockname')
+
+config.addV1System(agentEngine, 'my-area', 'public')
+config.addVacmUser(agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+
+for idx in range(rowCount):
+    config.addV3User(agentEngine, 'user%d' % idx)
+
+snmpContext = context.SnmpContext(agentEngine)
+cmdrsp.GetCommandResponder(agentEngine, snmpContext)
+cmdrsp.NextCommandResponder(agentEngine, snmpContext)
+cmdrsp.BulkCommandResponder(agentEngine, snmpContext)
+
+# responses are delayed as if SNMP agent was far away
+sendMessage = agentEngine.transportDispatcher.sendMessage
+agentEngine.transportDispatcher.sendMessage = lambda *args: loop.call_later(latency, sendMessage, *args)
+
+# usmUserSecurityName, usmUserCloneFrom, usmUserAuthProtocol,
+# usmUserPrivProtocol, usmUserStorageType, usmUserStatus
+columns = [ObjectName('1.3.6.1.6.3.15.1.2.2.1.%d' % column)
+           for column in (3, 4, 5, 8, 12, 13)]
+
+
+def varBinds():
+    return [hlapi.ObjectType(hlapi.ObjectIdentity(column)) for column in columns]
+
+
+def target():
+    return hlapi.UdpTransportTarget(agentAddress, timeout=5, retries=0)
+
+
+@asyncio.coroutine
+def bulkCmdLoop(snmpEngine):
+    lastVarBinds = varBinds()
+    count = 0
+
+    while True:
+        errorIndication, errorStatus, errorIndex, varBindTable = yield from hlapi.bulkCmd(
+            snmpEngine, hlapi.CommunityData('public'), target(), hlapi.ContextData(),
+            0, 25, *lastVarBinds
+        )
+        if errorIndication or errorStatus:
+            raise Exception('%s %s' % (errorIndication, errorStatus))
+
+        for varBindRow in varBindTable:
+            if not any(rootOid.isPrefixOf(varBind[0].getOid())
+                       for rootOid, varBind in zip(columns, varBindRow)):
+                return count
+            count += len(varBindRow)
+            lastVarBinds = varBindRow
+
+
+@asyncio.coroutine
+def bulkWalkCmd(snmpEngine):
+    walker = hlapi.bulkWalkCmd(snmpEngine, hlapi.CommunityData('public'),
+                               target(), hlapi.ContextData(), *varBinds())
+    count = 0
+
+    while True:
+        try:
+            errorIndication, errorStatus, errorIndex, varBinds_ = yield from walker.__anext__()
+
+        except StopAsyncIteration:
+            return count
+
+        if errorIndication or errorStatus:
+            raise Exception('%s %s' % (errorIndication, errorStatus))
+
+        count += len(varBinds_)
+
+
+walks = [('bulkCmd loop', bulkCmdLoop)]
+
+if hasattr(hlapi, 'bulkWalkCmd'):
+    walks.append(('bulkWalkCmd', bulkWalkCmd))
+
+print('%d rows of %d columns, %d ms latency' % (rowCount, len(columns), latency * 1000))
+for name, walk in walks:
+    elapsed = []
+    for _ in range(repeats):
+        snmpEngine = hlapi.SnmpEngine()
+        started = time.time()
+        count = loop.run_until_complete(walk(snmpEngine))
+        elapsed.append(time.time() - started)
+        snmpEngine.transportDispatcher.closeDispatcher()
+
+    print('%-12s %d var-binds %7.3f s' % (name, count, min(elapsed)))
+
+agentEngine.transportDispatcher.closeDispatcher()
@@ -0,0 +1,122 @@
+"""
+GETBULK table walk
+++++++++++++++++++
+
+Measure Command Responder serving GETBULK requests over a large table
+(3 columns, 2000 rows) with 20 repetitions per request, the way
+managers walk tables.
+
+Command Generator and Command Responder talk over loopback UDP
+within a single process, requests are sent one after another, each
+resuming where the previous response ended. Timing starts once the
+first response (which pays for MIB indexing) arrives and includes
+BER encoding and decoding on both ends.
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of requests can be given on command line, default is 300.
+
+"""#
+import sys
+import time
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+
+requestCount = len(sys.argv) > 1 and int(sys.argv[1]) or 300
+rowCount = 2000
+maxRepetitions = 20
+
+tableOid = (1, 3, 6, 1, 4, 1, 20408, 999, 1)
+
+transportDispatcher = AsyncoreDispatcher()
+transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+# Command Responder
+
+agentEngine = engine.SnmpEngine()
+agentEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (2,))
+agentTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+config.addTransport(agentEngine, udp.domainName + (2,), agentTransport)
+config.addV1System(agentEngine, 'my-area', 'public')
+config.addVacmUser(agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+
+mibBuilder = agentEngine.msgAndPduDsp.mibInstrumController.mibBuilder
+
+(MibTable, MibTableRow, MibTableColumn,
+ MibScalarInstance, Integer32) = mibBuilder.importSymbols(
+    'SNMPv2-SMI', 'MibTable', 'MibTableRow', 'MibTableColumn',
+    'MibScalarInstance', 'Integer32'
+)
+
+mibSymbols = dict(
+    benchTable=MibTable(tableOid),
+    benchEntry=MibTableRow(tableOid + (1,)).setIndexNames((0, '__BENCH-MIB', 'benchColumn1'))
+)
+
+for column in 1, 2, 3:
+    mibSymbols['benchColumn%d' % column] = MibTableColumn(tableOid + (1, column), Integer32())
+    for row in range(1, rowCount + 1):
+        mibSymbols['benchInstance%d.%d' % (column, row)] = MibScalarInstance(
+            tableOid + (1, column), (row,), Integer32(row)
+        )
+
+mibBuilder.exportSymbols('__BENCH-MIB', **mibSymbols)
+
+cmdrsp.BulkCommandResponder(agentEngine, context.SnmpContext(agentEngine))
+
+# Command Generator
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (1,))
+config.addTransport(snmpEngine, udp.domainName + (1,), udp.UdpTransport().openClientMode())
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+config.addTargetAddr(snmpEngine, 'my-agent', udp.domainName + (1,),
+                     agentTransport.socket.getsockname(), 'my-creds')
+
+bulkCmdGen = cmdgen.BulkCommandGenerator()
+
+initialVarBinds = [(tableOid + (1, column), None) for column in (1, 2, 3)]
+
+
+def sendRequest(varBinds, cbCtx):
+    bulkCmdGen.sendVarBinds(snmpEngine, 'my-agent', None, '', 0,
+                            maxRepetitions, varBinds, cbFun, cbCtx)
+
+
+# noinspection PyUnusedLocal
+def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+          errorStatus, errorIndex, varBindTable, cbCtx):
+    if errorIndication or errorStatus:
+        raise Exception('%s' % (errorIndication or errorStatus.prettyPrint()))
+
+    cbCtx['count'] += 1
+    if cbCtx['count'] == 1:
+        cbCtx['started'] = time.time()
+    elif cbCtx['count'] == requestCount + 1:
+        cbCtx['stopped'] = time.time()
+        transportDispatcher.jobFinished(1)
+        return
+
+    varBinds = varBindTable[-1]
+    if varBinds[0][0][:len(tableOid) + 2] != tableOid + (1, 1):
+        varBinds = initialVarBinds  # table walked over
+
+    sendRequest(varBinds, cbCtx)
+
+
+ctx = {'count': 0}
+
+sendRequest(initialVarBinds, ctx)
+transportDispatcher.jobStarted(1)
+transportDispatcher.runDispatcher()
+
+elapsed = ctx['stopped'] - ctx['started']
+
+print('%d requests, %d repetitions of %d columns' % (requestCount, maxRepetitions, len(initialVarBinds)))
+print('%8.3f s, %6.3f ms/request' % (elapsed, elapsed * 1000 / requestCount))
+
+transportDispatcher.closeDispatcher()
@@ -0,0 +1,65 @@
+"""
+Batch LCD configuration
++++++++++++++++++++++++
+
+Measure how long it takes to configure many SNMP targets sharing
+the same target parameters into a new SNMP engine:
+
+* "addTargetAddr" - targets added one by one by `addTargetAddr()`
+* "addBatch" - targets added at once by a single `addBatch()` call
+  (if available)
+* "loadBatch" - targets read from JSON lines by a single `loadBatch()`
+  call (if available)
+
+Number of targets can be given on command line, default is 1000.
+
+"""#
+import sys
+import json
+import timeit
+from pysnmp.entity import engine, config
+
+targetCount = len(sys.argv) > 1 and int(sys.argv[1]) or 1000
+repeats = 3
+
+targetAddrs = [('target-%d' % idx, config.snmpUDPDomain,
+                ('127.0.0.1', 1024 + idx), 'my-creds')
+               for idx in range(targetCount)]
+
+lines = [json.dumps({'type': 'targetParams', 'name': 'my-creds',
+                     'securityName': 'my-area', 'securityLevel': 'noAuthNoPriv',
+                     'mpModel': 1})]
+lines.extend([json.dumps({'type': 'targetAddr', 'addrName': addrName,
+                          'transportDomain': 'snmpUDPDomain',
+                          'transportAddress': transportAddress, 'params': params})
+              for addrName, transportDomain, transportAddress, params in targetAddrs])
+
+
+def addTargetAddr():
+    snmpEngine = engine.SnmpEngine()
+    config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+    for targetAddr in targetAddrs:
+        config.addTargetAddr(snmpEngine, *targetAddr)
+
+
+def addBatch():
+    snmpEngine = engine.SnmpEngine()
+    config.addBatch(snmpEngine,
+                    targetParams=[('my-creds', 'my-area', 'noAuthNoPriv', 1)],
+                    targetAddrs=targetAddrs)
+
+
+def loadBatch():
+    snmpEngine = engine.SnmpEngine()
+    config.loadBatch(snmpEngine, lines)
+
+
+runs = [('addTargetAddr', addTargetAddr)]
+
+if hasattr(config, 'addBatch'):
+    runs.append(('addBatch', addBatch))
+    runs.append(('loadBatch', loadBatch))
+
+for name, fun in runs:
+    best = min([timeit.timeit(fun, number=1) for _ in range(repeats)])
+    print('%-13s %d targets %7.2f s' % (name, targetCount, best))
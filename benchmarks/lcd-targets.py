@@ -0,0 +1,58 @@
+"""
+Target and tag look up in LCD
++++++++++++++++++++++++++++++
+
+Measure how long it takes to look up transport and security
+parameters of all targets sharing a tag, as notification originator
+does when sending a notification, in two scenarios:
+
+* "unchanged" - target tables are not changing in between
+* "one changed" - one target is reconfigured by `addTargetAddr()`
+  before each look up
+
+Each round looks up tagged target names by `getTargetNames()` and
+then every target by `getTargetInfo()`.
+
+Number of targets can be given on command line, default is 2000.
+
+"""#
+import sys
+import timeit
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413.config import getTargetNames, getTargetInfo
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+
+targetCount = len(sys.argv) > 1 and int(sys.argv[1]) or 2000
+rounds = 20
+repeats = 3
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+
+config.addTransport(snmpEngine, udp.domainName, udp.UdpTransport().openClientMode())
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+
+for idx in range(targetCount):
+    config.addTargetAddr(snmpEngine, 'target-%d' % idx, udp.domainName,
+                         ('127.0.0.1', 1024 + idx), 'my-creds', tagList='all')
+
+
+def lookup(reconfigure):
+    def run():
+        for port in range(rounds):
+            if reconfigure:
+                config.addTargetAddr(snmpEngine, 'target-0', udp.domainName,
+                                     ('127.0.0.1', 1024 + port), 'my-creds', tagList='all')
+
+            for targetName in getTargetNames(snmpEngine, b'all'):
+                getTargetInfo(snmpEngine, targetName)
+
+    return run
+
+
+print('%d targets, %d rounds' % (targetCount, rounds))
+for name, fun in (('unchanged', lookup(False)), ('one changed', lookup(True))):
+    best = min([timeit.timeit(fun, number=1) for _ in range(repeats)])
+    print('%-11s %8.1f ms per round' % (name, best * 1000 / rounds))
@@ -0,0 +1,55 @@
+"""
+SNMP message version sniffing
++++++++++++++++++++++++++++++
+
+Measure `decodeMessageVersion()` the message and PDU dispatcher runs
+on every incoming datagram to pick message processing model:
+
+* "valid" - SNMPv2c GET request
+* "junk" - random datagrams, which are mostly rejected
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of messages can be given on command line, default is 50000.
+
+"""#
+import sys
+import random
+import timeit
+from pyasn1.codec.ber import encoder
+from pysnmp.proto.api import verdec, v2c
+
+messageCount = len(sys.argv) > 1 and int(sys.argv[1]) or 50000
+repeats = 3
+
+msg = v2c.Message()
+v2c.apiMessage.setDefaults(msg)
+v2c.apiMessage.setCommunity(msg, 'public')
+pdu = v2c.GetRequestPDU()
+v2c.apiPDU.setDefaults(pdu)
+v2c.apiPDU.setVarBinds(pdu, [('1.3.6.1.2.1.1.1.0', v2c.null)])
+v2c.apiMessage.setPDU(msg, pdu)
+
+validMessages = [encoder.encode(msg)] * 100
+
+rnd = random.Random(1)
+junkMessages = [bytes(bytearray([rnd.randrange(256) for _ in range(rnd.randrange(1, 100))]))
+                for _ in range(100)]
+
+
+def decode(messages):
+    def run():
+        for idx in range(messageCount):
+            try:
+                verdec.decodeMessageVersion(messages[idx % 100])
+            except Exception:  # older versions leak TypeError
+                pass
+
+    return run
+
+
+print('%d messages' % messageCount)
+for name, messages in ('valid', validMessages), ('junk', junkMessages):
+    elapsed = min([timeit.timeit(decode(messages), number=1) for _ in range(repeats)])
+    print('%-5s %8.0f msg/s' % (name, messageCount / elapsed))
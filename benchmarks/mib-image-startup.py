@@ -0,0 +1,64 @@
+"""
+SNMP engine startup time with MIB image
++++++++++++++++++++++++++++++++++++++++
+
+Measure how long it takes a fresh Python process (pysnmp modules
+already imported) to construct a bare `SnmpEngine` object, which loads
+and indexes a dozen of MIB modules, in each of the modes:
+
+* "no image" - MIB modules compiled from their sources on each start
+* "cold image" - MIB image file enabled but absent, so it gets
+  written in the course of the first start
+* "warm image" - MIB modules code taken from the image file
+
+Each mode is run in several fresh processes, median time is reported.
+Number of runs can be given on command line, default is 7.
+
+"""#
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+runs = len(sys.argv) > 1 and int(sys.argv[1]) or 7
+
+probe = """
+import time
+from pysnmp.entity import engine
+start = time.time()
+engine.SnmpEngine()
+print(time.time() - start)
+"""
+
+
+def measure(mibImagePath=None, removeImage=False):
+    env = dict(os.environ)
+    env.pop('PYSNMP_MIB_IMAGE', None)
+    if mibImagePath:
+        env['PYSNMP_MIB_IMAGE'] = mibImagePath
+
+    times = []
+
+    for _ in range(runs):
+        if removeImage and os.path.exists(mibImagePath):
+            os.remove(mibImagePath)
+
+        output = subprocess.check_output([sys.executable, '-c', probe], env=env)
+        times.append(float(output.decode().split()[-1]))
+
+    return sorted(times)[len(times) // 2]
+
+
+tmpDir = tempfile.mkdtemp()
+
+try:
+    mibImagePath = os.path.join(tmpDir, 'mib.image')
+
+    for name, options in (('no image', {}),
+                          ('cold image', dict(mibImagePath=mibImagePath, removeImage=True)),
+                          ('warm image', dict(mibImagePath=mibImagePath))):
+        print('%-10s %6.1f ms' % (name, measure(**options) * 1000))
+
+finally:
+    shutil.rmtree(tmpDir)
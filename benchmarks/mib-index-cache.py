@@ -0,0 +1,137 @@
+"""
+MIB table index cache policies
+++++++++++++++++++++++++++++++
+
+Replay MIB table row index lookups typical for SNMP Agent serving
+walks over ifTable and ipRouteTable, and measure how many lookups
+per second `MibTableRow` index<->OID caches sustain with each of
+the cache policies:
+
+* "old" - reference implementation of the sorted-usage eviction
+  cache as of pysnmp 4.4.2
+* "LRU" - `pysnmp.cache.LruCache`
+* "LFU" - `pysnmp.cache.LfuCache`
+
+Workloads:
+
+* ifTable GETNEXT walk, 20 columns walked one after another over
+  2000 (more than cache size) and 200 (less than cache size) rows
+* ipRouteTable GETBULK walk, all 13 columns of each of 5000 rows
+  fetched at once
+* GET requests to 5000 ifTable rows with skewed (Zipf-like)
+  popularity
+
+Cache size can be given on command line, default is 256.
+
+"""#
+import sys
+import random
+import timeit
+from pysnmp import cache
+from pysnmp.smi import builder
+
+cacheSize = len(sys.argv) > 1 and int(sys.argv[1]) or 256
+repeats = 3
+
+
+class OldCache(object):
+    """Reference cache evicting the least used tenth of entries"""
+    def __init__(self, maxSize=256):
+        self.__maxSize = maxSize
+        self.__size = 0
+        self.__chopSize = maxSize // 10
+        self.__chopSize = self.__chopSize and self.__chopSize or 1
+        self.__cache = {}
+        self.__usage = {}
+
+    def __contains__(self, k):
+        return k in self.__cache
+
+    def __getitem__(self, k):
+        self.__usage[k] += 1
+        return self.__cache[k]
+
+    def __len__(self):
+        return self.__size
+
+    def __setitem__(self, k, v):
+        if self.__size >= self.__maxSize:
+            usageKeys = sorted(self.__usage, key=lambda x, d=self.__usage: d[x])
+            for _k in usageKeys[:self.__chopSize]:
+                del self.__cache[_k]
+                del self.__usage[_k]
+            self.__size -= self.__chopSize
+        if k not in self.__cache:
+            self.__size += 1
+            self.__usage[k] = 0
+        self.__cache[k] = v
+
+
+mibBuilder = builder.MibBuilder()
+
+(MibTableRow, MibTableColumn,
+ Integer32, IpAddress) = mibBuilder.importSymbols(
+    'SNMPv2-SMI', 'MibTableRow', 'MibTableColumn', 'Integer32', 'IpAddress'
+)
+
+mibBuilder.exportSymbols(
+    '__BENCHMARK-MIB',
+    ifIndex=MibTableColumn((1, 3, 6, 1, 2, 1, 2, 2, 1, 1), Integer32()),
+    ipRouteDest=MibTableColumn((1, 3, 6, 1, 2, 1, 4, 21, 1, 1), IpAddress())
+)
+
+
+def ifTableWalk(rows, columns=20):
+    return [(row,) for _ in range(columns) for row in range(1, rows + 1)]
+
+
+def ipRouteTableBulk(rows, columns=13):
+    routes = [(10, row >> 16 & 255, row >> 8 & 255, row & 255)
+              for row in range(rows)]
+    return [route for route in routes for _ in range(columns)]
+
+
+def ifTableGets(rows, count):
+    rnd = random.Random(1)
+    return [(int(rows ** rnd.random()),) for _ in range(count)]
+
+
+workloads = (
+    ('ifTable walk 2000x20', 'ifIndex', ifTableWalk(2000)),
+    ('ifTable walk 200x20', 'ifIndex', ifTableWalk(200)),
+    ('ipRouteTable bulk 5000x13', 'ipRouteDest', ipRouteTableBulk(5000)),
+    ('ifTable skewed gets 5000', 'ifIndex', ifTableGets(5000, 50000)),
+)
+
+policies = (('old', OldCache), ('LRU', cache.LruCache), ('LFU', cache.LfuCache))
+
+print('cache size %d, index lookups/sec (hit rate)' % cacheSize)
+
+for name, indexName, instIds in workloads:
+    report = []
+
+    for policyName, policy in policies:
+        # rows pick up cache policy on instantiation
+        cache.Cache = lambda maxSize=None, policy=policy: policy(cacheSize)
+
+        best = 0
+
+        for _ in range(repeats):
+            row = MibTableRow((1, 3, 6, 1, 4, 1, 20408, 999, 1)).setIndexNames(
+                (0, '__BENCHMARK-MIB', indexName)
+            )
+
+            def replay():
+                for instId in instIds:
+                    row.getInstIdFromIndices(*row.getIndicesFromInstId(instId))
+
+            best = max(best, len(instIds) / timeit.timeit(replay, number=1))
+
+        stats = getattr(row._MibTableRow__idToIdxCache, 'getStats', None)
+        if stats:
+            stats = stats()
+            report.append('%s %7d (%3d%%)' % (policyName, best, 100 * stats['hits'] // ((stats['hits'] + stats['misses']) or 1)))
+        else:
+            report.append('%s %7d      ' % (policyName, best))
+
+    print('%-26s %s' % (name, '  '.join(report)))
@@ -0,0 +1,58 @@
+"""
+MIB indices ordering
+++++++++++++++++++++
+
+Measure `OidOrderedDict`, which MIB tree and MIB view indices are
+built on, in the access patterns they see:
+
+* "interleaved" - keys are added one at a time with a successor
+  lookup after each one (e.g. table rows created by SNMP SETs while
+  managers walk the table)
+* "walk" - successor lookups over the whole index (e.g. GETNEXT walk
+  over a table)
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of keys can be given on command line, default is 3000.
+
+"""#
+import sys
+import random
+import timeit
+from pysnmp.smi.indices import OidOrderedDict
+
+keyCount = len(sys.argv) > 1 and int(sys.argv[1]) or 3000
+repeats = 3
+
+rnd = random.Random(1)
+keys = [(1, 3, 6, 1, 4, 1, 20408, rnd.randrange(10), rnd.randrange(100000))
+        for _ in range(keyCount)]
+
+
+def interleaved():
+    d = OidOrderedDict()
+    for key in keys:
+        d[key] = None
+        d.nextKey(key[:-1])
+
+
+def walk():
+    d = OidOrderedDict()
+    for key in keys:
+        d[key] = None
+
+    def run():
+        key = (1, 3, 6, 1, 4, 1, 20408)
+        try:
+            while True:
+                key = d.nextKey(key)
+        except KeyError:
+            pass
+
+    return run
+
+
+print('%d keys' % keyCount)
+print('interleaved %8.3f s' % min([timeit.timeit(interleaved, number=1) for _ in range(repeats)]))
+print('walk        %8.3f s' % min([timeit.timeit(walk(), number=1) for _ in range(repeats)]))
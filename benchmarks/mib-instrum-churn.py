@@ -0,0 +1,113 @@
+"""
+MIB instrumentation tree churn
+++++++++++++++++++++++++++++++
+
+Measure how `MibInstrumController` copes with a large MIB table which
+rows come and go at run time, as it happens with SNMP Agents serving
+dynamic data (e.g. sessions or routes):
+
+* "first build" - a 5-column table of 10000 rows (50000
+  `MibScalarInstance` objects) is exported, then a single GET request
+  makes the MIB tree built from scratch
+* "churn" - in each cycle 10 rows (50 instances) are unexported and
+  10 new rows are exported, then a single GET request is served
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of table rows can be given on command line, default is 10000.
+
+"""#
+import sys
+import timeit
+from pysnmp.smi import builder, instrum
+
+rowCount = len(sys.argv) > 1 and int(sys.argv[1]) or 10000
+columnCount = 5
+churnRows = 10
+cycles = 20
+repeats = 3
+
+modName = '__BENCHMARK-MIB'
+tableOid = (1, 3, 6, 1, 4, 1, 20408, 999, 1)
+
+
+def setup():
+    mibBuilder = builder.MibBuilder()
+    mibBuilder.loadModules('SNMPv2-MIB')
+
+    (MibTable, MibTableRow, MibTableColumn,
+     MibScalarInstance, Integer32) = mibBuilder.importSymbols(
+        'SNMPv2-SMI', 'MibTable', 'MibTableRow', 'MibTableColumn',
+        'MibScalarInstance', 'Integer32'
+    )
+
+    symbols = {
+        'benchTable': MibTable(tableOid),
+        'benchEntry': MibTableRow(tableOid + (1,)).setIndexNames(
+            (0, modName, 'benchColumn1')
+        )
+    }
+
+    for column in range(1, columnCount + 1):
+        symbols['benchColumn%d' % column] = MibTableColumn(
+            tableOid + (1, column), Integer32()
+        )
+
+    mibBuilder.exportSymbols(modName, **symbols)
+
+    def exportRows(rows):
+        instances = {}
+        for row in rows:
+            for column in range(1, columnCount + 1):
+                instances['benchInstance%d.%d' % (column, row)] = MibScalarInstance(
+                    tableOid + (1, column), (row,), Integer32(row)
+                )
+        mibBuilder.exportSymbols(modName, **instances)
+
+    def unexportRows(rows):
+        mibBuilder.unexportSymbols(
+            modName, *['benchInstance%d.%d' % (column, row)
+                       for row in rows for column in range(1, columnCount + 1)]
+        )
+
+    exportRows(range(1, rowCount + 1))
+
+    mibInstrumController = instrum.MibInstrumController(mibBuilder)
+
+    def get(row):
+        varBinds = mibInstrumController.readVars([(tableOid + (1, 1, row), None)])
+        if int(varBinds[0][1]) != row:
+            raise Exception('unexpected response %s' % (varBinds,))
+
+    return exportRows, unexportRows, get
+
+
+def firstBuild():
+    exportRows, unexportRows, get = setup()
+    return timeit.timeit(lambda: get(1), number=1)
+
+
+def churn():
+    exportRows, unexportRows, get = setup()
+    get(1)
+
+    state = {'first': 1, 'next': rowCount + 1}
+
+    def cycle():
+        first = state['first']
+        unexportRows(range(first, first + churnRows))
+        state['first'] = first + churnRows
+
+        last = state['next']
+        exportRows(range(last, last + churnRows))
+        state['next'] = last + churnRows
+
+        get(last)
+
+    return timeit.timeit(cycle, number=cycles) / cycles
+
+
+print('%d rows x %d columns' % (rowCount, columnCount))
+print('first build %8.1f ms' % (min([firstBuild() for _ in range(repeats)]) * 1000))
+print('churn       %8.1f ms/cycle' % (min([churn() for _ in range(repeats)]) * 1000))
@@ -0,0 +1,95 @@
+"""
+MIB resolution of response var-binds
+++++++++++++++++++++++++++++++++++++
+
+Measure how fast `ObjectType.resolveWithMib()` turns OID-value pairs,
+as received in SNMP responses, into MIB objects. Var-binds refer to
+`system` scalars and columns of `usmUserTable` and `snmpTargetAddrTable`
+in two scenarios:
+
+* "repeated rows" - the same table rows are resolved over and over
+  (e.g. polling the same interfaces)
+* "fresh rows" - every var-bind refers to a different table row
+  (e.g. walking a large table)
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of var-binds can be given on command line, default is 20000.
+
+"""#
+import sys
+import timeit
+from pysnmp.smi import builder, view, rfc1902
+from pysnmp.proto import rfc1902 as rfc1902p
+
+varBindCount = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+repeats = 3
+
+mibBuilder = builder.MibBuilder()
+mibBuilder.loadModules('SNMPv2-MIB', 'SNMP-USER-BASED-SM-MIB', 'SNMP-TARGET-MIB')
+
+mibViewController = view.MibViewController(mibBuilder)
+
+usmUserEntry = (1, 3, 6, 1, 6, 3, 15, 1, 2, 2, 1)
+snmpTargetAddrEntry = (1, 3, 6, 1, 6, 3, 12, 1, 2, 1)
+system = (1, 3, 6, 1, 2, 1, 1)
+
+# column -> response value
+usmUserValues = ((3, rfc1902p.OctetString('user')),
+                 (4, rfc1902p.ObjectIdentifier('1.3.6.1.6.3.1.1.5.1')),
+                 (12, rfc1902p.Integer32(3)),
+                 (13, rfc1902p.Integer32(1)))
+snmpTargetAddrValues = ((2, rfc1902p.ObjectIdentifier('1.3.6.1.6.1.1')),
+                        (3, rfc1902p.OctetString(hexValue='7f00000100a1')),
+                        (4, rfc1902p.Integer32(1500)),
+                        (9, rfc1902p.Integer32(1)))
+systemValues = ((1, rfc1902p.OctetString('Linux host 4.9.0')),
+                (2, rfc1902p.ObjectIdentifier('1.3.6.1.4.1.8072.3.2.10')),
+                (3, rfc1902p.TimeTicks(123456789)),
+                (5, rfc1902p.OctetString('host')))
+
+
+def usmUserRow(row):
+    # usmUserEngineID.usmUserName
+    userName = 'user%d' % row
+    return (9, 128, 0, 79, 184, 5, 1, 2, 3, 4) + (len(userName),) + tuple(ord(x) for x in userName)
+
+
+def snmpTargetAddrRow(row):
+    # snmpTargetAddrName
+    targetName = 'target%d' % row
+    return (len(targetName),) + tuple(ord(x) for x in targetName)
+
+
+def varBinds(rows):
+    varBinds = []
+    row = 0
+    while len(varBinds) < varBindCount:
+        row += 1
+        varBinds.extend(
+            [(usmUserEntry + (column,) + usmUserRow(row % rows), value)
+             for column, value in usmUserValues]
+        )
+        varBinds.extend(
+            [(snmpTargetAddrEntry + (column,) + snmpTargetAddrRow(row % rows), value)
+             for column, value in snmpTargetAddrValues]
+        )
+        varBinds.extend(
+            [(system + (column, 0), value)
+             for column, value in systemValues]
+        )
+    return varBinds[:varBindCount]
+
+
+def resolve(varBinds):
+    def run():
+        for oid, value in varBinds:
+            rfc1902.ObjectType(rfc1902.ObjectIdentity(oid), value).resolveWithMib(mibViewController)
+
+    return run
+
+
+for name, rows in (('repeated rows', 10), ('fresh rows', varBindCount)):
+    best = min([timeit.timeit(resolve(varBinds(rows)), number=1) for _ in range(repeats)])
+    print('%-13s %d var-binds %8.0f var-binds/s' % (name, varBindCount, varBindCount / best))
@@ -0,0 +1,96 @@
+"""
+MIB view indexing
++++++++++++++++++
+
+Measure how long `MibViewController` takes to index MIB modules in
+two scenarios:
+
+* "full index" - all MIB modules are loaded first, then indexed at
+  once (e.g. first MIB lookup after SNMP engine start up)
+* "one by one" - MIB modules are loaded one at a time with a MIB
+  lookup after each load (e.g. MIB modules loaded on demand by
+  `ObjectIdentity.resolveWithMib()`)
+
+MIB modules are synthetic vendor MIBs, each defining a module identity,
+a subtree, 25 scalars and a table of 25 columns. The benchmark relies
+on public API only, so that it can be run against other pysnmp
+versions for comparison.
+
+Number of MIB modules can be given on command line, default is 300.
+
+"""#
+import sys
+import timeit
+from pysnmp.smi import builder, view
+
+modCount = len(sys.argv) > 1 and int(sys.argv[1]) or 300
+repeats = 3
+
+
+def loadModule(mibBuilder, idx):
+    (ModuleIdentity, MibIdentifier, MibScalar, MibTable, MibTableRow,
+     MibTableColumn, Integer32) = mibBuilder.importSymbols(
+        'SNMPv2-SMI', 'ModuleIdentity', 'MibIdentifier', 'MibScalar',
+        'MibTable', 'MibTableRow', 'MibTableColumn', 'Integer32'
+    )
+
+    modName = 'VENDOR%d-MIB' % idx
+    root = (1, 3, 6, 1, 4, 1, 10000 + idx)
+
+    symbols = {
+        'vendor%dMib' % idx: ModuleIdentity(root + (0,)).setRevisions(
+            ('2017-%.2d-01 00:00' % (idx % 12 + 1),)
+        ),
+        'vendor%dObjects' % idx: MibIdentifier(root + (1,)),
+        'vendor%dTable' % idx: MibTable(root + (2,)),
+        'vendor%dEntry' % idx: MibTableRow(root + (2, 1)).setIndexNames(
+            (0, modName, 'vendor%dColumn1' % idx)
+        )
+    }
+
+    for scalar in range(1, 26):
+        symbols['vendor%dScalar%d' % (idx, scalar)] = MibScalar(
+            root + (1, scalar), Integer32()
+        )
+
+    for column in range(1, 26):
+        symbols['vendor%dColumn%d' % (idx, column)] = MibTableColumn(
+            root + (2, 1, column), Integer32()
+        )
+
+    mibBuilder.exportSymbols(modName, **symbols)
+
+    return root + (2, 1, 25, 1)
+
+
+def fullIndex():
+    mibBuilder = builder.MibBuilder()
+    mibBuilder.loadModules('SNMPv2-MIB')
+
+    oids = [loadModule(mibBuilder, idx) for idx in range(modCount)]
+
+    mibViewController = view.MibViewController(mibBuilder)
+
+    def run():
+        mibViewController.getNodeName(oids[-1])
+
+    return run
+
+
+def oneByOne():
+    mibBuilder = builder.MibBuilder()
+    mibBuilder.loadModules('SNMPv2-MIB')
+
+    mibViewController = view.MibViewController(mibBuilder)
+    mibViewController.getNodeName((1, 3, 6, 1, 2, 1, 1, 1))
+
+    def run():
+        for idx in range(modCount):
+            mibViewController.getNodeName(loadModule(mibBuilder, idx))
+
+    return run
+
+
+for name, setup in (('full index', fullIndex), ('one by one', oneByOne)):
+    best = min([timeit.timeit(setup(), number=1) for _ in range(repeats)])
+    print('%-10s %d MIB modules %7.3f s' % (name, modCount, best))
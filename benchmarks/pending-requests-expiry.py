@@ -0,0 +1,58 @@
+"""
+Pending requests expiration
++++++++++++++++++++++++++++
+
+Measure the cost of the message and PDU dispatcher timer tick while
+many requests await response and none of them times out yet (e.g.
+Command Generator polling a large network of slow devices).
+
+Requests are sent through Command Generator to a peer that never
+responds, then dispatcher timer ticks are run.
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of pending requests can be given on command line, default is
+20000.
+
+"""#
+import sys
+import time
+import socket
+import timeit
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+
+requestCount = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+tickCount = 100
+repeats = 3
+
+peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+peer.bind(('127.0.0.1', 0))
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+config.addTransport(snmpEngine, udp.domainName, udp.UdpTransport().openClientMode())
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+config.addTargetAddr(snmpEngine, 'my-agent', udp.domainName,
+                     peer.getsockname(), 'my-creds', timeout=360000)
+
+getCmdGen = cmdgen.GetCommandGenerator()
+for _ in range(requestCount):
+    getCmdGen.sendVarBinds(snmpEngine, 'my-agent', None, '',
+                           [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)], None)
+
+
+def ticks():
+    for _ in range(tickCount):
+        snmpEngine.msgAndPduDsp.receiveTimerTick(snmpEngine, time.time())
+
+
+print('%d pending requests' % requestCount)
+print('%d ticks %8.6f s' % (tickCount, min([timeit.timeit(ticks, number=1) for _ in range(repeats)])))
+
+snmpEngine.transportDispatcher.closeDispatcher()
+peer.close()
@@ -0,0 +1,82 @@
+"""
+Prepared request var-binds
+++++++++++++++++++++++++++
+
+Measure Command Generator cost of building and sending a GET request
+of 20 var-binds, as done when polling the same objects over and over:
+
+* "plain" - var-binds passed to `sendVarBinds()` as is
+* "prepared" - var-binds serialized once by `prepareVarBinds()`
+  (if available)
+
+for SNMPv2c and SNMPv3 authPriv (SHA/AES) messages. Requests are sent
+to a peer that never responds, responses are not waited for.
+
+Number of requests can be given on command line, default is 2000.
+
+"""#
+import sys
+import socket
+import timeit
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto import rfc1902
+
+requestCount = len(sys.argv) > 1 and int(sys.argv[1]) or 2000
+repeats = 3
+
+peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+peer.bind(('127.0.0.1', 0))
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+config.addTransport(snmpEngine, udp.domainName, udp.UdpTransport().openClientMode())
+
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'v2c-creds', 'my-area', 'noAuthNoPriv', 1)
+config.addTargetAddr(snmpEngine, 'v2c-agent', udp.domainName,
+                     peer.getsockname(), 'v2c-creds', timeout=360000)
+
+# remote SNMP engine ID is known, so no discovery takes place
+securityEngineId = rfc1902.OctetString(hexValue='8000000001020304')
+config.addV3User(snmpEngine, 'usr-sha-aes', config.usmHMACSHAAuthProtocol,
+                 'authkey1', config.usmAesCfb128Protocol, 'privkey1',
+                 securityEngineId=securityEngineId)
+config.addTargetParams(snmpEngine, 'v3-creds', 'usr-sha-aes', 'authPriv')
+config.addTargetAddr(snmpEngine, 'v3-agent', udp.domainName,
+                     peer.getsockname(), 'v3-creds', timeout=360000)
+
+# requests are not actually sent
+snmpEngine.transportDispatcher.sendMessage = lambda *args: None
+
+getCmdGen = cmdgen.GetCommandGenerator()
+
+varBinds = [((1, 3, 6, 1, 2, 1, 2, 2, 1, column, 10001), None)
+            for column in range(1, 21)]
+
+variants = [('plain', varBinds)]
+
+if hasattr(getCmdGen, 'prepareVarBinds'):
+    variants.append(('prepared', getCmdGen.prepareVarBinds(varBinds)))
+
+
+def send(targetName, contextEngineId, varBinds):
+    def run():
+        for _ in range(requestCount):
+            getCmdGen.sendVarBinds(snmpEngine, targetName, contextEngineId,
+                                   '', varBinds, None)
+
+    return run
+
+
+print('%d requests of %d var-binds' % (requestCount, len(varBinds)))
+for targetName, contextEngineId in ('v2c-agent', None), ('v3-agent', securityEngineId):
+    for name, requestVarBinds in variants:
+        elapsed = min([timeit.timeit(send(targetName, contextEngineId, requestVarBinds), number=1)
+                       for _ in range(repeats)])
+        print('%-9s %-8s %8.0f req/s' % (targetName, name, requestCount / elapsed))
+
+snmpEngine.transportDispatcher.closeDispatcher()
+peer.close()
@@ -0,0 +1,63 @@
+"""
+Request timeout accuracy
+++++++++++++++++++++++++
+
+Measure how long it takes Command Generator to give up on a request
+to a peer that never responds, when request timeout is shorter than
+dispatcher timer resolution (0.5 seconds by default).
+
+Requests are run one after another, each with 0.05 seconds timeout
+and no retries.
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of requests can be given on command line, default is 10.
+
+"""#
+import sys
+import time
+import socket
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+
+requestCount = len(sys.argv) > 1 and int(sys.argv[1]) or 10
+
+peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+peer.bind(('127.0.0.1', 0))
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+config.addTransport(snmpEngine, udp.domainName, udp.UdpTransport().openClientMode())
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+config.addTargetAddr(snmpEngine, 'my-agent', udp.domainName,
+                     peer.getsockname(), 'my-creds', timeout=5, retryCount=0)
+
+getCmdGen = cmdgen.GetCommandGenerator()
+
+latencies = []
+
+
+# noinspection PyUnusedLocal
+def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+          errorStatus, errorIndex, varBinds, cbCtx):
+    latencies.append(time.time() - cbCtx)
+    snmpEngine.transportDispatcher.jobFinished(1)
+
+
+for _ in range(requestCount):
+    getCmdGen.sendVarBinds(snmpEngine, 'my-agent', None, '',
+                           [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)],
+                           cbFun, time.time())
+    snmpEngine.transportDispatcher.jobStarted(1)
+    snmpEngine.transportDispatcher.runDispatcher()
+
+print('%d requests, timeout 0.05 s' % requestCount)
+print('timed out in %5.3f s (min %5.3f s, max %5.3f s)' % (
+    sum(latencies) / len(latencies), min(latencies), max(latencies)))
+
+snmpEngine.transportDispatcher.closeDispatcher()
+peer.close()
@@ -0,0 +1,103 @@
+"""
+Batched UDP I/O
++++++++++++++++
+
+Measure how long it takes to pass UDP datagrams back and forth between
+two asyncore UDP transports run by the same transport dispatcher,
+keeping 32 datagrams in flight:
+
+* "unbatched" - one `sendto()`/`recvfrom()` call per datagram
+* "batched" - up to 32 datagrams per I/O event through
+  `sendmmsg()`/`recvmmsg()` calls (if available)
+* "batched, fallback" - up to 32 datagrams per I/O event through
+  a loop of `sendto()`/`recvfrom()` calls (if available)
+
+Number of datagrams can be given on command line, default is 20000.
+
+"""#
+import sys
+import time
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+
+try:
+    from pysnmp.carrier import sockmmsg
+
+except ImportError:
+    sockmmsg = None
+
+messageCount = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+inFlight = 32
+repeats = 3
+
+pingDomain = udp.domainName + (1,)
+pongDomain = udp.domainName + (2,)
+
+
+def pingPong(batchSize):
+    transportDispatcher = AsyncoreDispatcher()
+    transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+    transports = {}
+
+    for transportDomain in pingDomain, pongDomain:
+        transport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        if batchSize:
+            transport.enableBatchIo(batchSize)
+        transportDispatcher.registerTransport(transportDomain, transport)
+        transports[transportDomain] = transport
+
+    pongAddress = transports[pongDomain].socket.getsockname()
+
+    counters = {'sent': 0, 'received': 0}
+
+    def ping(transportDispatcher, transportDomain, transportAddress, wholeMsg):
+        counters['received'] += 1
+        if counters['sent'] < messageCount:
+            transportDispatcher.sendMessage(wholeMsg, pingDomain, pongAddress)
+            counters['sent'] += 1
+        elif counters['received'] == messageCount:
+            transportDispatcher.jobFinished(1)
+
+    def pong(transportDispatcher, transportDomain, transportAddress, wholeMsg):
+        transportDispatcher.sendMessage(wholeMsg, pongDomain, transportAddress)
+
+    transportDispatcher.registerRecvCbFun(ping, pingDomain)
+    transportDispatcher.registerRecvCbFun(pong, pongDomain)
+
+    started = time.time()
+
+    for _ in range(inFlight):
+        transportDispatcher.sendMessage(b'\x00' * 64, pingDomain, pongAddress)
+        counters['sent'] += 1
+
+    transportDispatcher.jobStarted(1)
+
+    try:
+        transportDispatcher.runDispatcher()
+
+    finally:
+        transportDispatcher.closeDispatcher()
+
+    return time.time() - started
+
+
+def fallback(batchSize):
+    sendmmsg = sockmmsg.sendmmsg
+    sockmmsg.sendmmsg = None
+    try:
+        return pingPong(batchSize)
+
+    finally:
+        sockmmsg.sendmmsg = sendmmsg
+
+
+runs = [('unbatched', pingPong, 0)]
+
+if hasattr(udp.UdpTransport, 'enableBatchIo'):
+    runs.append(('batched', pingPong, inFlight))
+    runs.append(('batched, fallback', fallback, inFlight))
+
+for name, fun, batchSize in runs:
+    best = min([fun(batchSize) for _ in range(repeats)])
+    print('%-17s %d datagrams %7.3f s' % (name, messageCount, best))
@@ -0,0 +1,70 @@
+"""
+Response var-binds MIB resolution modes
++++++++++++++++++++++++++++++++++++++++
+
+Measure how fast hlapi command generators turn response var-binds
+into `ObjectType` objects depending on the `lookupMib` option:
+
+* "eager" - `lookupMib=True`, every var-bind is resolved against MIB
+* "lazy" - `lookupMib='lazy'`, MIB look up is postponed till var-binds
+  are pretty printed or queried for MIB details
+
+either alone or with every var-bind pretty printed afterwards.
+
+Response var-binds refer to `system` scalars and `ifTable` columns.
+Prior to lazy mode support, `'lazy'` is taken for `True`, so the
+benchmark can be run against older pysnmp versions for comparison.
+
+Number of var-binds can be given on command line, default is 10000.
+
+"""#
+import sys
+import timeit
+from pysnmp.entity import engine
+from pysnmp.hlapi.varbinds import CommandGeneratorVarBinds
+from pysnmp.proto import rfc1902
+
+varBindCount = len(sys.argv) > 1 and int(sys.argv[1]) or 10000
+repeats = 3
+
+snmpEngine = engine.SnmpEngine()
+
+vbProcessor = CommandGeneratorVarBinds()
+
+# IF-MIB gets loaded and indexed before timing
+vbProcessor.getMibViewController(snmpEngine).mibBuilder.loadModules('IF-MIB')
+vbProcessor.unmakeVarBinds(snmpEngine, [(rfc1902.ObjectName('1.3.6.1.2.1.2.2.1.1.1'), rfc1902.Integer32(1))])
+
+varBinds = []
+
+for row in range(varBindCount):
+    varBinds.extend(
+        [(rfc1902.ObjectName((1, 3, 6, 1, 2, 1, 2, 2, 1, column, row % 100 + 1)), value)
+         for column, value in ((2, rfc1902.OctetString('eth%d' % row)),
+                               (5, rfc1902.Gauge32(1000000000)),
+                               (10, rfc1902.Counter32(row)))]
+    )
+    varBinds.extend(
+        [(rfc1902.ObjectName((1, 3, 6, 1, 2, 1, 1, column, 0)), value)
+         for column, value in ((3, rfc1902.TimeTicks(row)),)]
+    )
+
+varBinds = varBinds[:varBindCount]
+
+
+def unmake(lookupMib, printed=False):
+    def run():
+        resolvedVarBinds = vbProcessor.unmakeVarBinds(snmpEngine, varBinds, lookupMib)
+        if printed:
+            for varBind in resolvedVarBinds:
+                varBind.prettyPrint()
+
+    return run
+
+
+for name, fun in (('eager', unmake(True)),
+                  ('eager, printed', unmake(True, printed=True)),
+                  ('lazy', unmake('lazy')),
+                  ('lazy, printed', unmake('lazy', printed=True))):
+    best = min([timeit.timeit(fun, number=1) for _ in range(repeats)])
+    print('%-14s %d var-binds %8.0f var-binds/s' % (name, varBindCount, varBindCount / best))
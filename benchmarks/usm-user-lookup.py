@@ -0,0 +1,97 @@
+"""
+SNMPv3 USM user look up
++++++++++++++++++++++++
+
+Measure how many SNMPv3 messages SNMP agent configured with many USM
+users can process per second, from serialized request to serialized
+response, in two scenarios:
+
+* "known user" - noAuthNoPriv GET request for `sysDescr.0` from the
+  last of the configured users
+* "unknown user" - noAuthNoPriv GET request from an unconfigured user,
+  which is answered with `usmStatsUnknownUserNames` report
+
+Responses are not actually sent. The benchmark relies on public API
+only, so that it can be run against other pysnmp versions for
+comparison.
+
+Number of USM users can be given on command line, default is 2000.
+
+"""#
+import sys
+import timeit
+from pyasn1.codec.ber import encoder
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdrsp, context
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto.mpmod.rfc3412 import SNMPv3Message
+from pysnmp.proto.secmod.rfc3414.service import UsmSecurityParameters
+from pysnmp.proto.api import v2c
+
+userCount = len(sys.argv) > 1 and int(sys.argv[1]) or 2000
+messageCount = 2000
+repeats = 3
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+
+for idx in range(userCount):
+    config.addV3User(snmpEngine, 'usr-%d' % idx)
+
+config.addVacmUser(snmpEngine, 3, 'usr-%d' % (userCount - 1), 'noAuthNoPriv', (1, 3, 6))
+
+cmdrsp.GetCommandResponder(snmpEngine, context.SnmpContext(snmpEngine))
+
+# responses are not actually sent
+snmpEngine.transportDispatcher.sendMessage = lambda *args: None
+
+snmpEngineID, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
+    '__SNMP-FRAMEWORK-MIB', 'snmpEngineID'
+)
+
+
+def request(userName):
+    securityParameters = UsmSecurityParameters()
+    securityParameters['msgAuthoritativeEngineId'] = snmpEngineID.syntax
+    securityParameters['msgAuthoritativeEngineBoots'] = 0
+    securityParameters['msgAuthoritativeEngineTime'] = 0
+    securityParameters['msgUserName'] = userName
+    securityParameters['msgAuthenticationParameters'] = b''
+    securityParameters['msgPrivacyParameters'] = b''
+
+    pdu = v2c.GetRequestPDU()
+    v2c.apiPDU.setDefaults(pdu)
+    v2c.apiPDU.setVarBinds(pdu, [((1, 3, 6, 1, 2, 1, 1, 1, 0), v2c.Null(''))])
+
+    msg = SNMPv3Message()
+    msg['msgVersion'] = 3
+    msg['msgGlobalData']['msgID'] = 1
+    msg['msgGlobalData']['msgMaxSize'] = 65507
+    msg['msgGlobalData']['msgFlags'] = b'\x04'  # reportable
+    msg['msgGlobalData']['msgSecurityModel'] = 3
+    msg['msgSecurityParameters'] = encoder.encode(securityParameters)
+
+    scopedPDU = msg['msgData'].setComponentByName('plaintext').getComponentByName('plaintext')
+    scopedPDU['contextEngineId'] = snmpEngineID.syntax
+    scopedPDU['contextName'] = b''
+    scopedPDU['data'].setComponentByType(pdu.tagSet, pdu)
+
+    return encoder.encode(msg)
+
+
+def receive(wholeMsg):
+    def run():
+        for _ in range(messageCount):
+            snmpEngine.msgAndPduDsp.receiveMessage(
+                snmpEngine, udp.domainName, ('127.0.0.1', 1024), wholeMsg
+            )
+
+    return run
+
+
+print('%d USM users' % userCount)
+for name, wholeMsg in (('known user', request('usr-%d' % (userCount - 1))),
+                       ('unknown user', request('usr-unknown'))):
+    best = min([timeit.timeit(receive(wholeMsg), number=1) for _ in range(repeats)])
+    print('%-12s %d messages %8.0f msg/s' % (name, messageCount, messageCount / best))
@@ -0,0 +1,79 @@
+"""
+SNMPv3 USM users configuration
+++++++++++++++++++++++++++++++
+
+Measure how fast USM users get configured with HMAC-SHA authentication
+and AES privacy, every user having passphrases of its own:
+
+* "passwordToKey" - RFC3414 A.2 passphrase hashing and key localization
+  alone, two keys per user
+* "addV3User" - users added one by one into a new SNMP engine
+* "addV3User, again" - the same users added into yet another SNMP
+  engine having the same SNMP engine ID, as it happens when SNMP
+  engine restarts
+* "addV3Users" - users added at once by a single `addV3Users()`
+  call into a new SNMP engine (if available)
+
+The benchmark relies on public API only, so that it can be run
+against other pysnmp versions for comparison.
+
+Number of users can be given on command line, default is 200.
+
+"""#
+import sys
+import timeit
+from hashlib import sha1
+from pysnmp.entity import engine, config
+from pysnmp.proto.secmod.rfc3414 import localkey
+
+userCount = len(sys.argv) > 1 and int(sys.argv[1]) or 200
+repeats = 3
+
+snmpEngineID = engine.SnmpEngine().snmpEngineID
+
+users = [('usr-%d' % idx, config.usmHMACSHAAuthProtocol, 'authkey-%d' % idx,
+          config.usmAesCfb128Protocol, 'privkey-%d' % idx)
+         for idx in range(userCount)]
+
+
+def passwordToKey():
+    for userName, authProtocol, authKey, privProtocol, privKey in users:
+        localkey.passwordToKey(authKey, snmpEngineID, sha1)
+        localkey.passwordToKey(privKey, snmpEngineID, sha1)
+
+
+def addV3User():
+    snmpEngine = engine.SnmpEngine(snmpEngineID=snmpEngineID)
+    for user in users:
+        config.addV3User(snmpEngine, *user)
+
+
+def addV3Users():
+    snmpEngine = engine.SnmpEngine(snmpEngineID=snmpEngineID)
+    config.addV3Users(snmpEngine, users)
+
+
+def measure(name, fun, number=1):
+    best = min([timeit.timeit(fun, number=number) for _ in range(repeats)])
+    print('%-16s %d users %8.1f ms' % (name, userCount, best * 1000 / number))
+
+
+measure('passwordToKey', passwordToKey)
+
+# first engine goes untimed if localized keys are cached
+if hasattr(localkey, '_localizedKeys'):
+    localkey._localizedKeys.clear()
+
+started = timeit.default_timer()
+addV3User()
+print('%-16s %d users %8.1f ms' % ('addV3User', userCount, (timeit.default_timer() - started) * 1000))
+
+measure('addV3User, again', addV3User)
+
+if hasattr(config, 'addV3Users'):
+    if hasattr(localkey, '_localizedKeys'):
+        localkey._localizedKeys.clear()
+
+    started = timeit.default_timer()
+    addV3Users()
+    print('%-16s %d users %8.1f ms' % ('addV3Users', userCount, (timeit.default_timer() - started) * 1000))
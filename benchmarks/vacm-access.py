@@ -0,0 +1,62 @@
+"""
+VACM access checks
+++++++++++++++++++
+
+Measure `Vacm.isAccessAllowed()` as Command Responder invokes it for
+each variable-binding of a request:
+
+* "plain" - read view made of included and excluded subtrees
+* "masked" - read view additionally carrying a wildcarded (masked)
+  family
+
+The benchmark relies on public API only, so that it can be run against
+other pysnmp versions for comparison.
+
+Number of checks can be given on command line, default is 20000.
+
+"""#
+import sys
+import timeit
+from pysnmp.entity import engine, config
+from pysnmp.proto.acmod import rfc3415
+from pysnmp.proto import error
+
+checkCount = len(sys.argv) > 1 and int(sys.argv[1]) or 20000
+repeats = 3
+
+variableNames = [(1, 3, 6, 1, 2, 1, 2, 2, 1, column, row)
+                 for column in range(1, 11) for row in range(1, 11)]
+
+
+def makeEngine(masked):
+    snmpEngine = engine.SnmpEngine()
+    config.addVacmGroup(snmpEngine, 'group', 2, 'public')
+    config.addVacmAccess(snmpEngine, 'group', '', 2, 'noAuthNoPriv', 'exact',
+                         'view', 'view', 'view')
+    config.addVacmView(snmpEngine, 'view', 'included', (1, 3, 6, 1), '')
+    config.addVacmView(snmpEngine, 'view', 'excluded', (1, 3, 6, 1, 6, 3), '')
+    if masked:
+        config.addVacmView(snmpEngine, 'view', 'excluded',
+                           (1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 5), (0xff, 0xa0))
+    return snmpEngine
+
+
+def check(masked):
+    snmpEngine = makeEngine(masked)
+    vacm = snmpEngine.accessControlModel[rfc3415.Vacm.accessModelID]
+
+    def run():
+        for idx in range(checkCount):
+            try:
+                vacm.isAccessAllowed(snmpEngine, 2, 'public', 1, 'read', '',
+                                     variableNames[idx % len(variableNames)])
+            except error.StatusInformation:
+                pass
+
+    return run
+
+
+print('%d checks' % checkCount)
+for name, masked in ('plain', False), ('masked', True):
+    elapsed = min([timeit.timeit(check(masked), number=1) for _ in range(repeats)])
+    print('%-6s %8.3f s, %6.1f us/check' % (name, elapsed, elapsed * 1000000 / checkCount))
@@ -0,0 +1,179 @@
+"""
+Replay captured notifications
++++++++++++++++++++++++++++++
+
+The following script replays SNMP notifications as a load generator:
+
+* read UDP datagrams destined to port 162 from a libpcap capture file
+  (Ethernet, Linux cooked or raw IP link layer, IPv4 or IPv6)
+* or, if no capture file is given, build SNMPv2c TRAP messages with
+  community name 'public'
+* send them as fast as possible, or at a given rate, to a Manager at
+  127.0.0.1:162 from 16 different source ports so that SO_REUSEPORT
+  based receivers get the load spread
+* report send rate on stdout
+
+Capture notifications to replay with, for instance:
+
+| $ tcpdump -i any -w traps.pcap udp port 162
+
+Then replay them with:
+
+| $ python replay-captured-notifications.py --count 1000000 traps.pcap
+
+"""#
+import argparse
+import struct
+import time
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pyasn1.codec.ber import encoder
+from pysnmp.proto import api
+
+
+def readCapture(filename, port=162):
+    messages = []
+
+    with open(filename, 'rb') as f:
+        header = f.read(24)
+
+        magic = header[:4]
+        if magic in (b'\xd4\xc3\xb2\xa1', b'\x4d\x3c\xb2\xa1'):
+            endian = '<'
+        elif magic in (b'\xa1\xb2\xc3\xd4', b'\xa1\xb2\x3c\x4d'):
+            endian = '>'
+        else:
+            raise ValueError('not a libpcap capture file: %s' % filename)
+
+        linkType, = struct.unpack(endian + 'I', header[20:24])
+
+        while True:
+            recordHeader = f.read(16)
+            if len(recordHeader) < 16:
+                break
+
+            capturedLength, = struct.unpack(endian + 'I', recordHeader[8:12])
+
+            frame = f.read(capturedLength)
+
+            # strip link layer
+            if linkType == 1:  # Ethernet
+                etherType, = struct.unpack('!H', frame[12:14])
+                offset = 14
+                while etherType in (0x8100, 0x88a8):  # VLAN tags
+                    etherType, = struct.unpack('!H', frame[offset + 2:offset + 4])
+                    offset += 4
+            elif linkType == 113:  # Linux cooked
+                etherType, = struct.unpack('!H', frame[14:16])
+                offset = 16
+            elif linkType in (12, 101):  # raw IP
+                if struct.unpack('B', frame[0:1])[0] >> 4 == 6:
+                    etherType = 0x86dd
+                else:
+                    etherType = 0x0800
+                offset = 0
+            else:
+                raise ValueError('unsupported link type %s' % linkType)
+
+            # strip network layer
+            if etherType == 0x0800:
+                if frame[offset + 9:offset + 10] != b'\x11':  # UDP
+                    continue
+                offset += (struct.unpack('B', frame[offset:offset + 1])[0] & 0xf) * 4
+            elif etherType == 0x86dd:
+                if frame[offset + 6:offset + 7] != b'\x11':  # UDP, no ext headers
+                    continue
+                offset += 40
+            else:
+                continue
+
+            dstPort, udpLength = struct.unpack('!HH', frame[offset + 2:offset + 6])
+            if dstPort == port:
+                messages.append(frame[offset + 8:offset + udpLength])
+
+    return messages
+
+
+def buildMessages(count=100):
+    pMod = api.protoModules[api.protoVersion2c]
+
+    messages = []
+
+    for idx in range(count):
+        trapPDU = pMod.TrapPDU()
+        pMod.apiTrapPDU.setDefaults(trapPDU)
+        pMod.apiTrapPDU.setVarBinds(
+            trapPDU, pMod.apiTrapPDU.getVarBinds(trapPDU) + [
+                ((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, idx + 1), pMod.Integer(idx + 1))
+            ]
+        )
+
+        trapMsg = pMod.Message()
+        pMod.apiMessage.setDefaults(trapMsg)
+        pMod.apiMessage.setCommunity(trapMsg, 'public')
+        pMod.apiMessage.setPDU(trapMsg, trapPDU)
+
+        messages.append(encoder.encode(trapMsg))
+
+    return messages
+
+
+parser = argparse.ArgumentParser(description='SNMP notifications load generator')
+parser.add_argument('capture', nargs='?', help='libpcap capture file')
+parser.add_argument('--host', default='127.0.0.1')
+parser.add_argument('--port', type=int, default=162)
+parser.add_argument('--count', type=int, default=1000, help='messages to send')
+parser.add_argument('--rate', type=int, default=0, help='messages per second, 0 is unlimited')
+parser.add_argument('--capture-port', type=int, default=162, help='replay datagrams captured to this port')
+parser.add_argument('--sockets', type=int, default=16, help='source sockets to use')
+
+args = parser.parse_args()
+
+if args.capture:
+    messages = readCapture(args.capture, args.capture_port)
+else:
+    messages = buildMessages()
+
+if not messages:
+    raise SystemExit('no messages to replay')
+
+transportDispatcher = AsyncoreDispatcher()
+
+for idx in range(args.sockets):
+    transportDispatcher.registerTransport(
+        udp.domainName + (idx,),
+        udp.UdpSocketTransport().openClientMode().enableBatchIo()
+    )
+
+chunkSize = 256
+sent = 0
+startTime = lastTime = time.time()
+
+while sent < args.count:
+    for idx in range(min(chunkSize, args.count - sent)):
+        transportDispatcher.sendMessage(
+            messages[(sent + idx) % len(messages)],
+            udp.domainName + ((sent + idx) % args.sockets,),
+            (args.host, args.port)
+        )
+
+    # returns as soon as all messages are sent
+    transportDispatcher.runDispatcher()
+
+    sent += min(chunkSize, args.count - sent)
+
+    now = time.time()
+
+    if args.rate:
+        delay = startTime + float(sent) / args.rate - now
+        if delay > 0:
+            time.sleep(delay)
+            now = time.time()
+
+    if now - lastTime >= 1:
+        print('%d messages sent, %d per second' % (sent, sent / (now - startTime)))
+        lastTime = now
+
+transportDispatcher.closeDispatcher()
+
+print('%d messages sent in %.2f seconds' % (sent, time.time() - startTime))
@@ -0,0 +1,131 @@
+"""
+Configure and query many targets
+++++++++++++++++++++++++++++++++
+
+Measure how long it takes to configure a large number of SNMP targets
+and then query each of them once using the following options:
+
+* with SNMPv2c, community 'public'
+* over IPv4/UDP
+* to an in-process Agent at 127.0.0.1:16100
+* configuring 50000 targets (number can be given on command line)
+* sending one SNMP GET request for SNMPv2-MIB::sysDescr.0 per target
+* keeping no more than 1000 requests in flight
+
+Both Manager and Agent SNMP engines run off the same transport
+dispatcher, so no external SNMP Agent is needed.
+
+"""#
+import sys
+import time
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.entity.rfc3413.config import getTargetInfo
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+
+targetsCount = len(sys.argv) > 1 and int(sys.argv[1]) or 50000
+maxInFlight = 1000
+
+agentAddress = ('127.0.0.1', 16100)
+
+managerDomain = udp.domainName + (1,)
+agentDomain = udp.domainName + (2,)
+
+transportDispatcher = AsyncoreDispatcher()
+
+# Route incoming messages to SNMP engine by transport domain
+transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+#
+# Agent setup
+#
+
+agentEngine = engine.SnmpEngine()
+agentEngine.registerTransportDispatcher(transportDispatcher, agentDomain)
+
+config.addTransport(
+    agentEngine, agentDomain,
+    udp.UdpTransport().openServerMode(agentAddress)
+)
+
+config.addV1System(agentEngine, 'my-area', 'public')
+config.addVacmUser(agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6, 1, 2, 1))
+
+cmdrsp.GetCommandResponder(agentEngine, context.SnmpContext(agentEngine))
+
+#
+# Manager setup
+#
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(transportDispatcher, managerDomain)
+
+config.addTransport(
+    snmpEngine, managerDomain,
+    udp.UdpTransport().openClientMode()
+)
+
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+
+timeStarted = time.time()
+
+for idx in range(targetsCount):
+    config.addTargetAddr(
+        snmpEngine, 'my-router-%d' % idx,
+        managerDomain, agentAddress,
+        'my-creds'
+    )
+
+    # Look target up the way the first request to it would do
+    getTargetInfo(snmpEngine, 'my-router-%d' % idx)
+
+timeConfigured = time.time()
+
+print('%d targets configured in %.2f sec' % (targetsCount, timeConfigured - timeStarted))
+
+getCmdGen = cmdgen.GetCommandGenerator()
+
+stats = {'sent': 0, 'received': 0, 'failed': 0}
+
+
+# noinspection PyUnusedLocal,PyUnusedLocal,PyUnusedLocal
+def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+          errorStatus, errorIndex, varBinds, cbCtx):
+    if errorIndication or errorStatus:
+        stats['failed'] += 1
+    else:
+        stats['received'] += 1
+
+    sendRequests()
+
+
+def sendRequests():
+    while (stats['sent'] < targetsCount and
+           stats['sent'] - stats['received'] - stats['failed'] < maxInFlight):
+        getCmdGen.sendVarBinds(
+            snmpEngine,
+            'my-router-%d' % stats['sent'],
+            None, '',  # contextEngineId, contextName
+            [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)],
+            cbFun
+        )
+        stats['sent'] += 1
+
+    if stats['received'] + stats['failed'] == targetsCount:
+        transportDispatcher.jobFinished(1)
+
+
+transportDispatcher.jobStarted(1)
+
+sendRequests()
+
+transportDispatcher.runDispatcher()
+
+transportDispatcher.closeDispatcher()
+
+timeQueried = time.time()
+
+print('%d targets queried in %.2f sec, %d responses, %d failures' % (
+    targetsCount, timeQueried - timeConfigured, stats['received'], stats['failed']))
@@ -0,0 +1,102 @@
+"""
+Periodic polling with rate limits
++++++++++++++++++++++++++++++++++
+
+Send SNMP GET requests to a number of SNMP agents periodically using the
+following options:
+
+* with SNMPv2c, community 'public'
+* over IPv4/UDP
+* to Agents at 104.236.166.95:161 and 195.218.195.228:161
+* every 2 seconds, with requests spread randomly across the interval
+* sending no more than 100 requests per second in total
+* and no more than 2 requests per second to each agent
+* for two OIDs in tuple form
+* for 10 seconds, then report request lateness and round-trip times
+
+"""#
+from pysnmp.entity import engine, config
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.entity.rfc3413.scheduler import PollScheduler
+
+# Create SNMP engine instance
+snmpEngine = engine.SnmpEngine()
+
+#
+# SNMPv2c setup
+#
+
+# SecurityName <-> CommunityName mapping
+config.addV1System(snmpEngine, 'my-area', 'public')
+
+# Specify security settings per SecurityName (SNMPv1 - 0, SNMPv2c - 1)
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+
+#
+# Setup transport endpoint and bind it with security settings yielding
+# a target name per agent
+#
+
+# UDP/IPv4
+config.addTransport(
+    snmpEngine,
+    udp.domainName,
+    udp.UdpSocketTransport().openClientMode()
+)
+
+targets = {
+    'my-router': ('104.236.166.95', 161),
+    'my-switch': ('195.218.195.228', 161)
+}
+
+for targetName, transportAddress in targets.items():
+    config.addTargetAddr(
+        snmpEngine, targetName,
+        udp.domainName, transportAddress,
+        'my-creds'
+    )
+
+
+# Error/response receiver
+# noinspection PyUnusedLocal,PyUnusedLocal,PyUnusedLocal
+def cbFun(snmpEngine, pollId, errorIndication,
+          errorStatus, errorIndex, varBinds, cbCtx):
+    if errorIndication:
+        print('%s: %s' % (cbCtx, errorIndication))
+    elif errorStatus:
+        print('%s: %s at %s' % (cbCtx, errorStatus.prettyPrint(),
+                                errorIndex and varBinds[int(errorIndex) - 1][0] or '?'))
+    else:
+        for oid, val in varBinds:
+            print('%s: %s = %s' % (cbCtx, oid.prettyPrint(), val.prettyPrint()))
+
+
+scheduler = PollScheduler(snmpEngine, rate=100, targetRate=2)
+
+# Poll plan: target, var-binds, interval
+for targetName in targets:
+    scheduler.addPoll(
+        targetName,
+        [((1, 3, 6, 1, 2, 1, 1, 1, 0), None),
+         ((1, 3, 6, 1, 2, 1, 1, 3, 0), None)],
+        2, cbFun, targetName
+    )
+
+scheduler.start()
+
+# Stop polling in 10 seconds
+snmpEngine.transportDispatcher.callLater(10, scheduler.stop)
+
+# Run I/O dispatcher which would send queries and process responses
+# for as long as scheduler is running
+snmpEngine.transportDispatcher.runDispatcher()
+
+stats = scheduler.getStats()
+
+print('Requests sent %s, completed %s, failed %s, skipped %s' % (
+    stats['sent'], stats['completed'], stats['failed'], stats['skipped']))
+
+for name in ('lateness', 'completion'):
+    print('%s histogram (seconds <= bound: requests):' % name)
+    for bound, count in stats[name]:
+        print('  %s: %s' % (bound is None and '+Inf' or bound, count))
@@ -0,0 +1,121 @@
+"""
+Bulk walk MIB over TCP
+++++++++++++++++++++++
+
+Send a series of SNMP GETBULK requests using the following options:
+
+* with SNMPv2c, community 'public'
+* over IPv4/TCP
+* to an in-process Agent at 127.0.0.1:16161
+* with values non-repeaters = 0, max-repetitions = 25
+* walking three subtrees at once
+* stop when leaving each subtree
+
+All three walks share a single TCP connection to the Agent, their
+requests are outstanding on that connection simultaneously.
+
+Both Manager and Agent SNMP engines run off the same transport
+dispatcher, so no external SNMP Agent is needed.
+
+"""#
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.stream import tcp
+from pysnmp.proto.rfc1902 import ObjectName
+
+agentAddress = ('127.0.0.1', 16161)
+
+managerDomain = tcp.domainName + (1,)
+agentDomain = tcp.domainName + (2,)
+
+transportDispatcher = AsyncoreDispatcher()
+
+# Route incoming messages to SNMP engine by transport domain
+transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+#
+# Agent setup
+#
+
+agentEngine = engine.SnmpEngine()
+agentEngine.registerTransportDispatcher(transportDispatcher, agentDomain)
+
+# TCP/IPv4, accepting connections
+config.addTransport(
+    agentEngine, agentDomain,
+    tcp.TcpTransport().openServerMode(agentAddress)
+)
+
+config.addV1System(agentEngine, 'my-area', 'public')
+config.addVacmUser(agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+
+cmdrsp.BulkCommandResponder(agentEngine, context.SnmpContext(agentEngine))
+
+#
+# Manager setup
+#
+
+snmpEngine = engine.SnmpEngine()
+snmpEngine.registerTransportDispatcher(transportDispatcher, managerDomain)
+
+# TCP/IPv4, connections are established on demand
+config.addTransport(
+    snmpEngine, managerDomain,
+    tcp.TcpTransport().openClientMode()
+)
+
+config.addV1System(snmpEngine, 'my-area', 'public')
+config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+
+# No retries over reliable transport
+config.addTargetAddr(
+    snmpEngine, 'my-router',
+    managerDomain, agentAddress,
+    'my-creds', retryCount=0
+)
+
+
+# Error/response receiver
+# noinspection PyUnusedLocal,PyUnusedLocal,PyUnusedLocal
+def cbFun(snmpEngine, sendRequesthandle, errorIndication,
+          errorStatus, errorIndex, varBindTable, cbCtx):
+    if errorIndication:
+        print(errorIndication)
+    elif errorStatus:
+        print('%s at %s' % (errorStatus.prettyPrint(),
+                            errorIndex and varBindTable[-1][int(errorIndex) - 1][0] or '?'))
+    else:
+        for varBindRow in varBindTable:
+            for oid, val in varBindRow:
+                if not cbCtx.isPrefixOf(oid):
+                    break  # walked past the subtree
+                print('%s = %s' % (oid.prettyPrint(), val.prettyPrint()))
+            else:
+                continue
+            break
+        else:
+            return True  # signal dispatcher to continue walking
+
+    transportDispatcher.jobFinished(1)
+
+
+bulkCmdGen = cmdgen.BulkCommandGenerator()
+
+for oid in (ObjectName('1.3.6.1.2.1.1'),
+            ObjectName('1.3.6.1.6.3.10'),
+            ObjectName('1.3.6.1.6.3.15')):
+    bulkCmdGen.sendVarBinds(
+        snmpEngine,
+        'my-router',
+        None, '',  # contextEngineId, contextName
+        0, 25,  # non-repeaters, max-repetitions
+        [(oid, None)],
+        cbFun, oid
+    )
+    transportDispatcher.jobStarted(1)
+
+# Run I/O dispatcher which would send pending queries and process responses
+transportDispatcher.runDispatcher()
+
+transportDispatcher.closeDispatcher()
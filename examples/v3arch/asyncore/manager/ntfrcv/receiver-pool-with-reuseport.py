@@ -0,0 +1,66 @@
+"""
+Notification receivers pool
++++++++++++++++++++++++++++
+
+Receive SNMP TRAP/INFORM messages in a pool of worker processes
+with the following options:
+
+* SNMPv1/SNMPv2c
+* with SNMP community "public"
+* over IPv4/UDP, listening at 127.0.0.1:162 by four worker processes
+  each having its own socket bound with SO_REUSEPORT option
+* count received notifications in the parent process and report
+  receive rate on stdout every second
+
+Either of the following Net-SNMP commands will send notifications to this
+receiver:
+
+| $ snmptrap -v2c -c public 127.0.0.1:162 123 1.3.6.1.6.3.1.1.5.1 1.3.6.1.2.1.1.5.0 s test
+| $ snmpinform -v2c -c public 127.0.0.1:162 123 1.3.6.1.6.3.1.1.5.1
+
+Keep in mind that the kernel spreads datagrams over the sockets by
+sender address and port, so notifications coming from a single sender
+socket end up in a single worker.
+
+"""#
+import time
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+from pysnmp.entity import config
+from pysnmp.entity.rfc3413 import ntfrcv
+
+
+# SNMP engine configuration function, runs in every worker process
+def configFun(snmpEngine):
+    # SecurityName <-> CommunityName mapping
+    config.addV1System(snmpEngine, 'my-area', 'public')
+
+
+if __name__ == '__main__':
+    pool = ntfrcv.NotificationReceiverPool(
+        configFun, iface=('127.0.0.1', 162), workers=4
+    ).start()
+
+    count = 0
+    lastTime = time.time()
+
+    try:
+        while True:
+            try:
+                (transportDomain, transportAddress, contextEngineId,
+                 contextName, varBinds) = pool.getNotification(timeout=1)
+                count += 1
+
+            except queue.Empty:
+                pass
+
+            now = time.time()
+            if now - lastTime >= 1:
+                print('%d notifications per second' % (count / (now - lastTime)))
+                count = 0
+                lastTime = now
+
+    finally:
+        pool.stop()
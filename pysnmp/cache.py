@@ -4,42 +4,240 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
-# Limited-size dictionary-like class to use for caches
+# Limited-size dictionary-like classes to use for caches
 #
+import random
 
+try:
+    from collections import OrderedDict
+except ImportError:
+    OrderedDict = None
+
+__all__ = ['LruCache', 'LfuCache', 'Cache']
+
+
+class _LinkedDict(dict):
+    """Insertion-ordered dict for Pythons lacking `OrderedDict`.
+
+    Implements just the part of `OrderedDict` interface `LruCache`
+    relies upon. Keys are kept in a circular doubly linked list of
+    `[previous, next, key]` links.
+    """
+
+    def __init__(self):
+        dict.__init__(self)
+        self.__root = root = []
+        root[:] = [root, root, None]
+        self.__links = {}
+
+    def __setitem__(self, k, v):
+        if k not in self.__links:
+            root = self.__root
+            last = root[0]
+            last[1] = root[0] = self.__links[k] = [last, root, k]
+        dict.__setitem__(self, k, v)
+
+    def __delitem__(self, k):
+        dict.__delitem__(self, k)
+        previous, following, _ = self.__links.pop(k)
+        previous[1] = following
+        following[0] = previous
+
+    def move_to_end(self, k):
+        link = self.__links[k]
+        previous, following, _ = link
+        previous[1] = following
+        following[0] = previous
+        root = self.__root
+        last = root[0]
+        link[0] = last
+        link[1] = root
+        last[1] = root[0] = link
+
+    def popitem(self, last=True):
+        if not self:
+            raise KeyError('dictionary is empty')
+        if last:
+            k = self.__root[0][2]
+        else:
+            k = self.__root[1][2]
+        v = dict.__getitem__(self, k)
+        del self[k]
+        return k, v
+
+    def clear(self):
+        dict.clear(self)
+        self.__links.clear()
+        root = self.__root
+        root[:] = [root, root, None]
+
+
+if OrderedDict is None:
+    OrderedDict = _LinkedDict
+
+
+class AbstractCache(object):
+    """Limited-size mapping keeping hit/miss/eviction counters.
+
+    A failed membership test or item lookup counts as a miss,
+    a successful item lookup counts as a hit.
+    """
+
+    def __init__(self, maxSize=256):
+        self.maxSize = maxSize and maxSize or 1
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, k, default=None):
+        try:
+            return self[k]
+
+        except KeyError:
+            return default
+
+    def getStats(self):
+        return dict(size=len(self), maxSize=self.maxSize, hits=self.hits,
+                    misses=self.misses, evictions=self.evictions)
+
+
+class LruCache(AbstractCache):
+    """Evicts least recently used entry"""
 
-class Cache(object):
     def __init__(self, maxSize=256):
-        self.__maxSize = maxSize
-        self.__size = 0
-        self.__chopSize = maxSize // 10
-        self.__chopSize = self.__chopSize and self.__chopSize or 1
-        self.__cache = {}
-        self.__usage = {}
+        AbstractCache.__init__(self, maxSize)
+        self.__cache = OrderedDict()
 
     def __contains__(self, k):
-        return k in self.__cache
+        if k in self.__cache:
+            return True
+
+        self.misses += 1
+        return False
 
     def __getitem__(self, k):
-        self.__usage[k] += 1
-        return self.__cache[k]
+        try:
+            v = self.__cache[k]
+
+        except KeyError:
+            self.misses += 1
+            raise
+
+        # move to the most recently used end
+        self.__touch(k)
+        self.hits += 1
+        return v
+
+    def __touch(self, k):
+        try:
+            self.__cache.move_to_end(k)
+
+        except AttributeError:  # Python < 3.2
+            self.__cache[k] = self.__cache.pop(k)
 
     def __len__(self):
-        return self.__size
+        return len(self.__cache)
 
     def __setitem__(self, k, v):
-        if self.__size >= self.__maxSize:
-            usageKeys = sorted(self.__usage, key=lambda x, d=self.__usage: d[x])
-            for _k in usageKeys[:self.__chopSize]:
-                del self.__cache[_k]
-                del self.__usage[_k]
-            self.__size -= self.__chopSize
-        if k not in self.__cache:
-            self.__size += 1
-            self.__usage[k] = 0
+        if k in self.__cache:
+            del self.__cache[k]
+
+        elif len(self.__cache) >= self.maxSize:
+            self.__cache.popitem(last=False)
+            self.evictions += 1
+
         self.__cache[k] = v
 
     def __delitem__(self, k):
         del self.__cache[k]
-        del self.__usage[k]
-        self.__size -= 1
+
+    def clear(self):
+        self.__cache.clear()
+
+
+class LfuCache(AbstractCache):
+    """Evicts the least frequently used entry out of a random sample.
+
+    Approximates LFU in O(1): on overflow a few random entries are
+    sampled and the one with the lowest use count gets evicted. Use
+    counts are halved every `maxSize` evictions so that formerly
+    popular entries eventually age out.
+    """
+    samples = 5
+
+    def __init__(self, maxSize=256):
+        AbstractCache.__init__(self, maxSize)
+        self.__cache = {}  # key -> [value, use count, position in keys]
+        self.__keys = []
+        self.__agingCountdown = self.maxSize
+
+    def __contains__(self, k):
+        if k in self.__cache:
+            return True
+
+        self.misses += 1
+        return False
+
+    def __getitem__(self, k):
+        try:
+            entry = self.__cache[k]
+
+        except KeyError:
+            self.misses += 1
+            raise
+
+        entry[1] += 1
+        self.hits += 1
+        return entry[0]
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def __setitem__(self, k, v):
+        if k in self.__cache:
+            self.__cache[k][0] = v
+            return
+
+        if len(self.__keys) >= self.maxSize:
+            self.__evict()
+
+        self.__cache[k] = [v, 0, len(self.__keys)]
+        self.__keys.append(k)
+
+    def __delitem__(self, k):
+        position = self.__cache.pop(k)[2]
+
+        # move the last key into vacated position
+        lastKey = self.__keys.pop()
+        if position != len(self.__keys):
+            self.__keys[position] = lastKey
+            self.__cache[lastKey][2] = position
+
+    def clear(self):
+        self.__cache.clear()
+        self.__keys = []
+        self.__agingCountdown = self.maxSize
+
+    def __evict(self):
+        keys = self.__keys
+        victim = None
+
+        size = len(keys)
+
+        for _ in range(self.samples):
+            k = keys[int(random.random() * size)]
+            if victim is None or self.__cache[k][1] < self.__cache[victim][1]:
+                victim = k
+
+        del self[victim]
+
+        self.evictions += 1
+
+        self.__agingCountdown -= 1
+        if not self.__agingCountdown:
+            self.__agingCountdown = self.maxSize
+            for entry in self.__cache.values():
+                entry[1] >>= 1
+
+
+# Default cache policy, may be replaced with any of the above (or
+# compatible) classes to change caching policy library-wide
+Cache = LruCache
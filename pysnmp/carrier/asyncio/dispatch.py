@@ -58,6 +58,9 @@ class AsyncioDispatcher(AbstractTransportDispatcher):
             yield asyncio.From(asyncio.sleep(self.getTimerResolution()))
             self.handleTimerTick(self.loop.time())
 
+    def callLater(self, delay, cbFun, *args):
+        return self.loop.call_later(delay, cbFun, *args)
+
     def runDispatcher(self, timeout=0.0):
         if not self.loop.is_running():
             try:
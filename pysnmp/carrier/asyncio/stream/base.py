@@ -0,0 +1,234 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import sys
+import traceback
+from time import time
+from pyasn1.compat.octets import null
+from pysnmp.carrier.asyncio.base import AbstractAsyncioTransport
+from pysnmp.carrier.framing import BerStreamFramer
+from pysnmp.carrier import error
+from pysnmp import debug
+
+try:
+    import asyncio
+except ImportError:
+    import trollius as asyncio
+
+# asyncio.async() is a syntax error since Python 3.7
+ensureFuture = getattr(asyncio, 'ensure_future', None) or getattr(asyncio, 'async')
+
+
+class StreamAsyncioProtocol(asyncio.Protocol):
+    """Single stream connection to or from a peer SNMP entity.
+
+    Whole SNMP messages read from the stream are handed over to the
+    callback of the owning `StreamAsyncioTransport`.
+    """
+    transport = None
+    closed = False
+
+    def __init__(self, owner, transportAddress=None):
+        self.__owner = owner
+        self.__framer = BerStreamFramer(owner.maxMessageSize)
+        self._writeQ = []
+        self.transportAddress = transportAddress
+        self.lastActivity = time()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self.closed:  # closed while connecting
+            transport.close()
+            return
+        if self.transportAddress is None:  # accepted connection
+            self.transportAddress = self.__owner.normalizeAddress(
+                transport.get_extra_info('peername')
+            )
+            self.__owner.addConnection(self)
+        self.transportAddress.setLocalAddress(transport.get_extra_info('sockname'))
+        debug.logger & debug.flagIO and debug.logger('connection_made: connection %r -> %r' % (self.transportAddress.getLocalAddress(), self.transportAddress))
+        if self._writeQ:
+            outgoingMessage = null.join(self._writeQ)
+            self._writeQ = []
+            debug.logger & debug.flagIO and debug.logger('connection_made: transportAddress %r outgoingMessage %s' % (self.transportAddress, debug.hexdump(outgoingMessage)))
+            transport.write(outgoingMessage)
+
+    def data_received(self, data):
+        self.lastActivity = time()
+        try:
+            messages = self.__framer.feed(data)
+        except error.CarrierError:
+            debug.logger & debug.flagIO and debug.logger('data_received: broken stream from %r: %s' % (self.transportAddress, sys.exc_info()[1]))
+            self.close()
+            return
+
+        owner = self.__owner
+        if owner._cbFun is None:
+            raise error.CarrierError('Unable to call cbFun')
+        for incomingMessage in messages:
+            owner.loop.call_soon(owner._cbFun, owner, self.transportAddress, incomingMessage)
+
+    def connection_lost(self, exc):
+        debug.logger & debug.flagIO and debug.logger('connection_lost: connection with %r closed: %s' % (self.transportAddress, exc))
+        self.__owner.dropConnection(self)
+        self.transport = None
+
+    def sendMessage(self, outgoingMessage):
+        self.lastActivity = time()
+        if self.transport is None:
+            self._writeQ.append(outgoingMessage)
+        else:
+            self.transport.write(outgoingMessage)
+
+    def close(self):
+        self.closed = True
+        self._writeQ = []
+        if self.transport is not None:
+            self.transport.close()
+
+
+class StreamAsyncioTransport(AbstractAsyncioTransport):
+    """Base Asyncio stream Transport, to be used with AsyncioDispatcher.
+
+    Keeps one connection per peer address. Connections are accepted in
+    server mode or established in client mode when a message is sent
+    to a new peer, then stay open and are reused for all further
+    messages to the same peer. In server mode messages to peers not
+    connected to the transport are dropped.
+
+    Client mode connections are closed after `idleTimeout` seconds
+    without any messages queued, sent or received (never if None). At
+    most `maxConnections` of them are kept open (unlimited if None),
+    the least recently used one is closed to make room for a new one.
+    """
+    sockFamily = None
+    addressType = lambda x: x
+    maxMessageSize = 1048576
+    idleTimeout = 60
+    maxConnections = 256
+
+    def __init__(self, sock=None, sockMap=None, loop=None):
+        self.__connections = {}
+        self.__iface = None
+        self.__idleTimer = None
+        self._lport = None
+        if loop is None:
+            loop = asyncio.get_event_loop()
+        self.loop = loop
+
+    def getConnections(self):
+        return list(self.__connections.values())
+
+    def addConnection(self, connection):
+        if connection.transportAddress in self.__connections:
+            self.__connections[connection.transportAddress].close()
+        self.__connections[connection.transportAddress] = connection
+
+    def dropConnection(self, connection):
+        if self.__connections.get(connection.transportAddress) is connection:
+            del self.__connections[connection.transportAddress]
+
+    def __armIdleTimer(self):
+        if (self.__idleTimer is not None or self.idleTimeout is None or
+                self._lport is not None or not self.__connections):
+            return
+        idleTime = min([x.lastActivity for x in self.__connections.values()]) + self.idleTimeout
+        self.__idleTimer = self.loop.call_later(
+            max(0, idleTime - time()), self.__closeIdleConnections
+        )
+
+    def __closeIdleConnections(self):
+        self.__idleTimer = None
+        idleTime = time() - self.idleTimeout
+        for connection in list(self.__connections.values()):
+            if connection.lastActivity <= idleTime:
+                debug.logger & debug.flagIO and debug.logger('__closeIdleConnections: closing connection with %r idle for %.1f seconds' % (connection.transportAddress, time() - connection.lastActivity))
+                self.dropConnection(connection)
+                connection.close()
+        self.__armIdleTimer()
+
+    def openConnection(self, transportAddress):
+        transportAddress = self.addressType(transportAddress)
+
+        if self.maxConnections is not None and len(self.__connections) >= self.maxConnections:
+            connection = min(self.__connections.values(), key=lambda x: x.lastActivity)
+            debug.logger & debug.flagIO and debug.logger('openConnection: %d connections open, closing least recently used one with %r' % (len(self.__connections), connection.transportAddress))
+            self.dropConnection(connection)
+            connection.close()
+
+        connection = StreamAsyncioProtocol(self, transportAddress)
+        self.addConnection(connection)
+        self.__armIdleTimer()
+
+        def __connected(future):
+            if future.cancelled() or future.exception() is not None:
+                debug.logger & debug.flagIO and debug.logger('openConnection: connection to %r failed: %s' % (transportAddress, not future.cancelled() and future.exception() or 'cancelled'))
+                self.dropConnection(connection)
+
+        try:
+            c = self.loop.create_connection(
+                lambda: connection, transportAddress[0], transportAddress[1],
+                family=self.sockFamily, local_addr=self.__iface
+            )
+            ensureFuture(c).add_done_callback(__connected)
+        except Exception:
+            self.dropConnection(connection)
+            raise error.CarrierError(';'.join(traceback.format_exception(*sys.exc_info())))
+
+        return connection
+
+    # AbstractAsyncioTransport API
+
+    def openClientMode(self, iface=None):
+        self.__iface = iface
+        return self
+
+    def openServerMode(self, iface):
+        try:
+            c = self.loop.create_server(
+                lambda: StreamAsyncioProtocol(self), iface[0], iface[1],
+                family=self.sockFamily
+            )
+            self._lport = ensureFuture(c)
+        except Exception:
+            raise error.CarrierError(';'.join(traceback.format_exception(*sys.exc_info())))
+        return self
+
+    def closeTransport(self):
+        if self.__idleTimer is not None:
+            self.__idleTimer.cancel()
+            self.__idleTimer = None
+        if self._lport is not None:
+            if self._lport.done():
+                if not self._lport.cancelled() and self._lport.exception() is None:
+                    self._lport.result().close()
+            else:
+                self._lport.cancel()
+        for connection in list(self.__connections.values()):
+            connection.close()
+        self.__connections.clear()
+        AbstractAsyncioTransport.closeTransport(self)
+
+    def sendMessage(self, outgoingMessage, transportAddress):
+        transportAddress = self.normalizeAddress(transportAddress)
+        if transportAddress in self.__connections:
+            connection = self.__connections[transportAddress]
+        elif self._lport is not None:
+            # in server mode peers connect to us, never the other way round
+            debug.logger & debug.flagIO and debug.logger('sendMessage: no connection with %r, outgoingMessage %s dropped' % (transportAddress, debug.hexdump(outgoingMessage)))
+            return
+        else:
+            connection = self.openConnection(transportAddress)
+        debug.logger & debug.flagIO and debug.logger('sendMessage: %s transportAddress %r outgoingMessage %s' % (
+            (connection.transport is None and "queuing" or "sending"),
+            transportAddress, debug.hexdump(outgoingMessage)
+        ))
+        connection.sendMessage(outgoingMessage)
+
+    def normalizeAddress(self, transportAddress):
+        if not isinstance(transportAddress, self.addressType):
+            transportAddress = self.addressType(transportAddress)
+        return transportAddress
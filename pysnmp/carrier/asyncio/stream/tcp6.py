@@ -0,0 +1,34 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import socket
+from pysnmp.carrier.base import AbstractTransportAddress
+from pysnmp.carrier.asyncio.stream.base import StreamAsyncioTransport
+
+
+domainName = snmpTCP6Domain = (1, 3, 6, 1, 2, 1, 100, 1, 6)
+
+
+class Tcp6TransportAddress(tuple, AbstractTransportAddress):
+    pass
+
+
+class Tcp6AsyncioTransport(StreamAsyncioTransport):
+    sockFamily = socket.has_ipv6 and socket.AF_INET6 or None
+    addressType = Tcp6TransportAddress
+
+    def normalizeAddress(self, transportAddress):
+        if '%' in transportAddress[0]:  # strip zone ID
+            return self.addressType((transportAddress[0].split('%')[0],
+                                     transportAddress[1],
+                                     0,  # flowinfo
+                                     0))  # scopeid
+        else:
+            return self.addressType((transportAddress[0],
+                                     transportAddress[1], 0, 0))
+
+
+Tcp6Transport = Tcp6AsyncioTransport
@@ -19,6 +19,7 @@ class AbstractSocketTransport(asyncore.dispatcher, AbstractTransport):
     retryCount = 0
     retryInterval = 0
     bufferSize = 131070
+    _transportDispatcher = None
 
     # noinspection PyUnusedLocal
     def __init__(self, sock=None, sockMap=None):
@@ -77,6 +78,12 @@ class AbstractSocketTransport(asyncore.dispatcher, AbstractTransport):
     def unregisterSocket(self, sockMap=None):
         self.del_channel(sockMap)
 
+    def registerTransportDispatcher(self, transportDispatcher):
+        self._transportDispatcher = transportDispatcher
+
+    def unregisterTransportDispatcher(self):
+        self._transportDispatcher = None
+
     def closeTransport(self):
         AbstractTransport.closeTransport(self)
         self.close()
@@ -7,8 +7,9 @@
 import socket
 import errno
 import sys
+from collections import deque
 from pysnmp.carrier.asyncore.base import AbstractSocketTransport
-from pysnmp.carrier import sockfix, sockmsg, error
+from pysnmp.carrier import sockfix, sockmsg, sockmmsg, error
 from pysnmp import debug
 
 # Ignore these socket errors
@@ -31,7 +32,10 @@ class DgramSocketTransport(AbstractSocketTransport):
     addressType = lambda x: x
 
     def __init__(self, sock=None, sockMap=None):
-        self.__outQueue = []
+        self.__outQueue = deque()
+        self.__pktInfo = False
+        self.__batchSize = 0
+        self.__bufferSize = 65535
         self._sendto = lambda s, b, a: s.sendto(b, a)
 
         def __recvfrom(s, sz):
@@ -39,6 +43,7 @@ class DgramSocketTransport(AbstractSocketTransport):
             return d, self.addressType(a)
 
         self._recvfrom = __recvfrom
+        self._sendmany = self._recvmany = None
         AbstractSocketTransport.__init__(self, sock, sockMap)
 
     def openClientMode(self, iface=None):
@@ -67,6 +72,19 @@ class DgramSocketTransport(AbstractSocketTransport):
         debug.logger & debug.flagIO and debug.logger('enableBroadcast: %s option SO_BROADCAST on socket %s' % (flag and "enabled" or "disabled", self.socket.fileno()))
         return self
 
+    def enableReusePort(self, flag=1):
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise error.CarrierError('SO_REUSEPORT socket option is not supported by this OS and/or Python version')
+
+        try:
+            self.socket.setsockopt(
+                socket.SOL_SOCKET, socket.SO_REUSEPORT, flag
+            )
+        except socket.error:
+            raise error.CarrierError('setsockopt() for SO_REUSEPORT failed: %s' % (sys.exc_info()[1],))
+        debug.logger & debug.flagIO and debug.logger('enableReusePort: %s option SO_REUSEPORT on socket %s' % (flag and "enabled" or "disabled", self.socket.fileno()))
+        return self
+
     def enablePktInfo(self, flag=1):
         if (not hasattr(self.socket, 'sendmsg') or
                 not hasattr(self.socket, 'recvmsg')):
@@ -83,6 +101,10 @@ class DgramSocketTransport(AbstractSocketTransport):
         self._sendto = sockmsg.getSendTo(self.addressType)
         self._recvfrom = sockmsg.getRecvFrom(self.addressType)
 
+        self.__pktInfo = bool(flag)
+        if self.__batchSize:
+            self.enableBatchIo(self.__batchSize, self.__bufferSize)
+
         debug.logger & debug.flagIO and debug.logger('enablePktInfo: %s option %s on socket %s' % (self.socket.family == socket.AF_INET6 and "IPV6_RECVPKTINFO" or "IP_PKTINFO", flag and "enabled" or "disabled", self.socket.fileno()))
         return self
 
@@ -104,6 +126,57 @@ class DgramSocketTransport(AbstractSocketTransport):
         debug.logger & debug.flagIO and debug.logger('enableTransparent: %s option IP_TRANSPARENT on socket %s' % (flag and "enabled" or "disabled", self.socket.fileno()))
         return self
 
+    def enableBatchIo(self, batchSize=32, bufferSize=65535):
+        """Send and receive up to `batchSize` datagrams per I/O event.
+
+        Uses sendmmsg()/recvmmsg() system calls where available, falls
+        back to a sequence of sendto()/recvfrom() calls otherwise. Zero
+        `batchSize` disables batching.
+        """
+        self.__batchSize = batchSize
+        self.__bufferSize = bufferSize
+
+        if not batchSize:
+            self._sendmany = self._recvmany = None
+            debug.logger & debug.flagIO and debug.logger('enableBatchIo: batch I/O disabled on socket %s' % self.socket.fileno())
+            return self
+
+        if (sockmmsg.sendmmsg is not None and not self.__pktInfo and
+                self.socket.family in (socket.AF_INET, socket.AF_INET6)):
+            self._sendmany = sockmmsg.getSendMany(batchSize)
+            self._recvmany = sockmmsg.getRecvMany(self.addressType, batchSize, bufferSize)
+
+            debug.logger & debug.flagIO and debug.logger('enableBatchIo: using sendmmsg()/recvmmsg() for up to %d datagrams on socket %s' % (batchSize, self.socket.fileno()))
+
+        else:
+            def sendmany(s, messages):
+                for idx, (outgoingMessage, transportAddress) in enumerate(messages):
+                    try:
+                        self._sendto(s, outgoingMessage, transportAddress)
+                    except socket.error:
+                        if idx:
+                            return idx  # let the caller hit the error again
+                        raise
+                return len(messages)
+
+            def recvmany(s):
+                messages = []
+                while len(messages) < batchSize:
+                    try:
+                        messages.append(self._recvfrom(s, bufferSize))
+                    except socket.error:
+                        if messages:
+                            break
+                        raise
+                return messages
+
+            self._sendmany = sendmany
+            self._recvmany = recvmany
+
+            debug.logger & debug.flagIO and debug.logger('enableBatchIo: using sendto()/recvfrom() for up to %d datagrams on socket %s' % (batchSize, self.socket.fileno()))
+
+        return self
+
     def sendMessage(self, outgoingMessage, transportAddress):
         self.__outQueue.append(
             (outgoingMessage, self.normalizeAddress(transportAddress))
@@ -132,7 +205,11 @@ class DgramSocketTransport(AbstractSocketTransport):
         return self.__outQueue
 
     def handle_write(self):
-        outgoingMessage, transportAddress = self.__outQueue.pop(0)
+        if self._sendmany:
+            self.__handleBatchWrite()
+            return
+
+        outgoingMessage, transportAddress = self.__outQueue.popleft()
         debug.logger & debug.flagIO and debug.logger('handle_write: transportAddress %r -> %r outgoingMessage (%d octets) %s' % (transportAddress.getLocalAddress(), transportAddress, len(outgoingMessage), debug.hexdump(outgoingMessage)))
         if not transportAddress:
             debug.logger & debug.flagIO and debug.logger('handle_write: missing dst address, loosing outgoing msg')
@@ -147,10 +224,67 @@ class DgramSocketTransport(AbstractSocketTransport):
             else:
                 raise error.CarrierError('sendto() failed for %s: %s' % (transportAddress, sys.exc_info()[1]))
 
+    def __handleBatchWrite(self):
+        while self.__outQueue:
+            messages = []
+            while self.__outQueue and len(messages) < self.__batchSize:
+                outgoingMessage, transportAddress = self.__outQueue.popleft()
+                debug.logger & debug.flagIO and debug.logger('handle_write: transportAddress %r -> %r outgoingMessage (%d octets) %s' % (transportAddress.getLocalAddress(), transportAddress, len(outgoingMessage), debug.hexdump(outgoingMessage)))
+                if not transportAddress:
+                    debug.logger & debug.flagIO and debug.logger('handle_write: missing dst address, loosing outgoing msg')
+                    continue
+                messages.append((outgoingMessage, transportAddress))
+
+            if not messages:
+                return
+
+            try:
+                sent = self._sendmany(self.socket, messages)
+
+            except socket.error:
+                errorCode = sys.exc_info()[1].args[0]
+                if errorCode in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    # socket buffer is full, retry on next write event
+                    self.__outQueue.extendleft(reversed(messages))
+                    return
+                elif errorCode in sockErrors:
+                    debug.logger & debug.flagIO and debug.logger('handle_write: ignoring socket error %s' % (sys.exc_info()[1],))
+                    sent = 1  # drop failed message
+                else:
+                    # drop failed message only
+                    self.__outQueue.extendleft(reversed(messages[1:]))
+                    raise error.CarrierError('sendmmsg() failed for %s: %s' % (messages[0][1], sys.exc_info()[1]))
+
+            if sent < len(messages):
+                self.__outQueue.extendleft(reversed(messages[sent:]))
+
     def readable(self):
         return 1
 
+    def __handleBatchRead(self):
+        try:
+            messages = self._recvmany(self.socket)
+
+        except socket.error:
+            if sys.exc_info()[1].args[0] in sockErrors:
+                debug.logger & debug.flagIO and debug.logger('handle_read: known socket error %s' % (sys.exc_info()[1],))
+                sockErrors[sys.exc_info()[1].args[0]] and self.handle_close()
+                return
+            else:
+                raise error.CarrierError('recvmmsg() failed: %s' % (sys.exc_info()[1],))
+
+        for incomingMessage, transportAddress in messages:
+            transportAddress = self.normalizeAddress(transportAddress)
+            debug.logger & debug.flagIO and debug.logger(
+                'handle_read: transportAddress %r -> %r incomingMessage (%d octets) %s' % (transportAddress, transportAddress.getLocalAddress(), len(incomingMessage), debug.hexdump(incomingMessage)))
+            if incomingMessage:
+                self._cbFun(self, transportAddress, incomingMessage)
+
     def handle_read(self):
+        if self._recvmany:
+            self.__handleBatchRead()
+            return
+
         try:
             incomingMessage, transportAddress = self._recvfrom(self.socket, 65535)
             transportAddress = self.normalizeAddress(transportAddress)
@@ -4,7 +4,7 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
-from time import time
+from time import time, sleep
 from sys import exc_info
 from traceback import format_exception
 from asyncore import socket_map
@@ -16,7 +16,7 @@ from pysnmp.error import PySnmpError
 class AsyncoreDispatcher(AbstractTransportDispatcher):
     def __init__(self):
         self.__sockMap = {}  # use own map for MT safety
-        self.timeout = 0.5
+        self.timeout = None  # longest poll() wait, unlimited if None
         AbstractTransportDispatcher.__init__(self)
 
     def getSocketMap(self):
@@ -28,9 +28,12 @@ class AsyncoreDispatcher(AbstractTransportDispatcher):
     def registerTransport(self, tDomain, t):
         AbstractTransportDispatcher.registerTransport(self, tDomain, t)
         t.registerSocket(self.__sockMap)
+        t.registerTransportDispatcher(self)
 
     def unregisterTransport(self, tDomain):
-        self.getTransport(tDomain).unregisterSocket(self.__sockMap)
+        t = self.getTransport(tDomain)
+        t.unregisterTransportDispatcher()
+        t.unregisterSocket(self.__sockMap)
         AbstractTransportDispatcher.unregisterTransport(self, tDomain)
 
     def transportsAreWorking(self):
@@ -41,11 +44,26 @@ class AsyncoreDispatcher(AbstractTransportDispatcher):
 
     def runDispatcher(self, timeout=0.0):
         while self.jobsArePending() or self.transportsAreWorking():
+            # sleep till I/O or the next delayed call or timer tick
+            pollTimeout = timeout and timeout or self.timeout
+            nextCallTime = self.getNextCallTime()
+            if nextCallTime is not None:
+                # poll() takes whole milliseconds, do not wake up early
+                delay = max(0, nextCallTime - time() + 0.001)
+                if pollTimeout is None or delay < pollTimeout:
+                    pollTimeout = delay
             try:
-                loop(timeout and timeout or self.timeout,
-                     use_poll=True, map=self.__sockMap, count=1)
+                if self.__sockMap:
+                    loop(pollTimeout,
+                         use_poll=True, map=self.__sockMap, count=1)
+                elif pollTimeout is not None:
+                    sleep(pollTimeout)  # poll() would not wait for nothing
             except KeyboardInterrupt:
                 raise
             except:
                 raise PySnmpError('poll error: %s' % ';'.join(format_exception(*exc_info())))
-            self.handleTimerTick(time())
+            nextCallTime = self.getNextCallTime()
+            if nextCallTime is not None:
+                timeNow = time()
+                if nextCallTime <= timeNow:
+                    self.handleTimerTick(timeNow)
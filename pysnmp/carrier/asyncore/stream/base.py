@@ -0,0 +1,345 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import socket
+import errno
+import sys
+import asyncore
+from collections import deque
+from itertools import islice
+from time import time
+from pyasn1.compat.octets import null
+from pysnmp.carrier.asyncore.base import AbstractSocketTransport
+from pysnmp.carrier.framing import BerStreamFramer
+from pysnmp.carrier import error
+from pysnmp import debug
+
+# Non-blocking connect() is in progress
+connectErrors = {errno.EINPROGRESS: True,
+                 errno.EALREADY: True,
+                 errno.EWOULDBLOCK: True,
+                 errno.EISCONN: False,
+                 0: False}
+
+try:
+    memoryview
+except NameError:
+    memoryview = buffer
+
+
+class StreamConnection(asyncore.dispatcher):
+    """Single stream connection to or from a peer SNMP entity.
+
+    Connections are owned by a `StreamSocketTransport` which keeps them
+    in the socket map of its dispatcher next to its own socket. Whole
+    SNMP messages read from the stream are handed over to the transport
+    callback as if they were received by the transport itself.
+
+    Outgoing messages are queued as they are and written out at most
+    `sendSize` octets at a time, so a long queue is never copied as
+    a whole.
+    """
+    sendSize = 65536
+
+    def __init__(self, transport, sock, transportAddress, connecting=False):
+        asyncore.dispatcher.__init__(self)
+        self.__transport = transport
+        self.__framer = BerStreamFramer(transport.maxMessageSize)
+        self.__outQueue = deque()
+        self.__outOffset = 0  # octets of the head message already sent
+        self.transportAddress = transportAddress
+        self.lastActivity = time()
+        sock.setblocking(0)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except Exception:
+            debug.logger & debug.flagIO and debug.logger('%s: TCP_NODELAY option mangling failure: %s' % (self.__class__.__name__, sys.exc_info()[1]))
+        self.set_socket(sock)
+        self.connected = not connecting
+        self.connecting = connecting
+
+    # Registration at the socket map is managed by the transport
+    def add_channel(self, map=None):
+        if map is not None:
+            map[self._fileno] = self
+
+    def del_channel(self, map=None):
+        if map is not None and self._fileno in map:
+            del map[self._fileno]
+
+    def sendMessage(self, outgoingMessage):
+        self.__outQueue.append(outgoingMessage)
+        self.lastActivity = time()
+
+    def getUnsentSize(self):
+        return sum([len(x) for x in self.__outQueue]) - self.__outOffset
+
+    # asyncore API
+    def handle_connect(self):
+        debug.logger & debug.flagIO and debug.logger('handle_connect: connected to %r' % (self.transportAddress,))
+
+    def writable(self):
+        return self.connecting or self.__outQueue
+
+    def handle_write(self):
+        outQueue = self.__outQueue
+        if not outQueue:
+            return
+
+        sendSize = self.sendSize
+        offset = self.__outOffset
+        head = outQueue[0]
+
+        if len(head) - offset >= sendSize or len(outQueue) == 1:
+            outgoingData = memoryview(head)[offset:offset + sendSize]
+        else:
+            # coalesce small messages into a single send()
+            chunks = [head[offset:]]
+            size = len(chunks[0])
+            for outgoingMessage in islice(outQueue, 1, None):
+                if size >= sendSize:
+                    break
+                chunks.append(outgoingMessage[:sendSize - size])
+                size += len(chunks[-1])
+            outgoingData = null.join(chunks)
+
+        sent = self.send(outgoingData)
+
+        debug.logger & debug.flagIO and debug.logger('handle_write: transportAddress %r -> %r %d of %d octets sent' % (self.transportAddress.getLocalAddress(), self.transportAddress, sent, len(outgoingData)))
+
+        self.lastActivity = time()
+
+        # the queue is emptied if send() has closed the connection
+        while sent and outQueue:
+            remaining = len(outQueue[0]) - self.__outOffset
+            if sent < remaining:
+                self.__outOffset += sent
+                break
+            outQueue.popleft()
+            self.__outOffset = 0
+            sent -= remaining
+
+    def readable(self):
+        return 1
+
+    def handle_read(self):
+        data = self.recv(self.sendSize)
+        if not data:
+            return  # connection closed by recv()
+
+        self.lastActivity = time()
+
+        try:
+            messages = self.__framer.feed(data)
+        except error.CarrierError:
+            debug.logger & debug.flagIO and debug.logger('handle_read: broken stream from %r: %s' % (self.transportAddress, sys.exc_info()[1]))
+            self.handle_close()
+            return
+
+        transport = self.__transport
+        for incomingMessage in messages:
+            debug.logger & debug.flagIO and debug.logger('handle_read: transportAddress %r -> %r incomingMessage (%d octets) %s' % (self.transportAddress, self.transportAddress.getLocalAddress(), len(incomingMessage), debug.hexdump(incomingMessage)))
+            transport._cbFun(transport, self.transportAddress, incomingMessage)
+
+    def handle_close(self):
+        if self.socket is None:
+            return
+        debug.logger & debug.flagIO and debug.logger('handle_close: connection with %r closed, %d octets unsent' % (self.transportAddress, self.getUnsentSize()))
+        self.__transport.dropConnection(self)
+        self.__outQueue.clear()
+        self.__outOffset = 0
+        self.__framer.clear()
+        self.close()
+        self.socket = None
+
+    def handle_error(self):
+        if isinstance(sys.exc_info()[1], socket.error):
+            debug.logger & debug.flagIO and debug.logger('handle_error: connection with %r failed: %s' % (self.transportAddress, sys.exc_info()[1]))
+            self.handle_close()
+        else:
+            raise
+
+
+class StreamSocketTransport(AbstractSocketTransport):
+    """Stream socket transport keeping one connection per peer address.
+
+    In server mode the transport accepts connections from peers and
+    drops messages to peers not connected to it, in client mode it
+    connects to peers as messages are sent to them. Either way, a
+    connection stays open and is reused for all further messages to
+    the same peer. Many requests can be outstanding on a
+    connection at once, responses are matched to requests by upper
+    layers.
+
+    Client mode connections are closed after `idleTimeout` seconds
+    without any messages queued, sent or received (never if None). At
+    most `maxConnections` of them are kept open (unlimited if None),
+    the least recently used one is closed to make room for a new one.
+    """
+    sockType = socket.SOCK_STREAM
+    addressType = lambda x: x
+    maxMessageSize = 1048576
+    listenBacklog = 64
+    idleTimeout = 60
+    maxConnections = 256
+
+    def __init__(self, sock=None, sockMap=None):
+        self.__connections = {}
+        self.__sockMap = None
+        self.__iface = None
+        self.__idleTimer = None
+        AbstractSocketTransport.__init__(self, sock, sockMap)
+
+    def openClientMode(self, iface=None):
+        self.__iface = iface
+        return self
+
+    def openServerMode(self, iface):
+        try:
+            self.socket.bind(iface)
+            self.listen(self.listenBacklog)
+        except socket.error:
+            raise error.CarrierError('bind()/listen() for %s failed: %s' % (iface, sys.exc_info()[1],))
+        return self
+
+    def registerSocket(self, sockMap=None):
+        AbstractSocketTransport.registerSocket(self, sockMap)
+        self.__sockMap = sockMap
+        for connection in self.__connections.values():
+            connection.add_channel(sockMap)
+
+    def unregisterSocket(self, sockMap=None):
+        for connection in self.__connections.values():
+            connection.del_channel(sockMap)
+        self.__sockMap = None
+        AbstractSocketTransport.unregisterSocket(self, sockMap)
+
+    def registerTransportDispatcher(self, transportDispatcher):
+        AbstractSocketTransport.registerTransportDispatcher(self, transportDispatcher)
+        self.__armIdleTimer()
+
+    def unregisterTransportDispatcher(self):
+        if self.__idleTimer is not None:
+            self.__idleTimer.cancel()
+            self.__idleTimer = None
+        AbstractSocketTransport.unregisterTransportDispatcher(self)
+
+    def closeTransport(self):
+        if self.__idleTimer is not None:
+            self.__idleTimer.cancel()
+            self.__idleTimer = None
+        for connection in list(self.__connections.values()):
+            connection.handle_close()
+        AbstractSocketTransport.closeTransport(self)
+
+    def getConnections(self):
+        return list(self.__connections.values())
+
+    def addConnection(self, connection):
+        self.__connections[connection.transportAddress] = connection
+        connection.add_channel(self.__sockMap)
+
+    def dropConnection(self, connection):
+        if self.__connections.get(connection.transportAddress) is connection:
+            del self.__connections[connection.transportAddress]
+        connection.del_channel(self.__sockMap)
+
+    def __armIdleTimer(self):
+        if (self.__idleTimer is not None or self.idleTimeout is None or
+                self._transportDispatcher is None or self.accepting or
+                not self.__connections):
+            return
+        idleTime = min([x.lastActivity for x in self.__connections.values()]) + self.idleTimeout
+        self.__idleTimer = self._transportDispatcher.callLater(
+            max(0, idleTime - time()), self.__closeIdleConnections
+        )
+
+    def __closeIdleConnections(self):
+        self.__idleTimer = None
+        idleTime = time() - self.idleTimeout
+        for connection in list(self.__connections.values()):
+            if connection.lastActivity <= idleTime:
+                debug.logger & debug.flagIO and debug.logger('__closeIdleConnections: closing connection with %r idle for %.1f seconds' % (connection.transportAddress, time() - connection.lastActivity))
+                connection.handle_close()
+        self.__armIdleTimer()
+
+    def openConnection(self, transportAddress):
+        transportAddress = self.addressType(transportAddress)
+
+        if self.maxConnections is not None and len(self.__connections) >= self.maxConnections:
+            connection = min(self.__connections.values(), key=lambda x: x.lastActivity)
+            debug.logger & debug.flagIO and debug.logger('openConnection: %d connections open, closing least recently used one with %r' % (len(self.__connections), connection.transportAddress))
+            connection.handle_close()
+
+        try:
+            sock = socket.socket(self.sockFamily, self.sockType)
+        except socket.error:
+            raise error.CarrierError('socket() failed: %s' % sys.exc_info()[1])
+
+        try:
+            if self.__iface is not None:
+                sock.bind(self.__iface)
+            sock.setblocking(0)
+            err = sock.connect_ex(transportAddress)
+        except socket.error:
+            sock.close()
+            raise error.CarrierError('bind()/connect() for %s failed: %s' % (transportAddress, sys.exc_info()[1]))
+
+        if err not in connectErrors:
+            sock.close()
+            raise error.CarrierError('connect() to %s failed: %s' % (transportAddress, errno.errorcode.get(err, err)))
+
+        transportAddress.setLocalAddress(sock.getsockname())
+
+        connection = StreamConnection(self, sock, transportAddress, connectErrors[err])
+        self.addConnection(connection)
+        self.__armIdleTimer()
+
+        debug.logger & debug.flagIO and debug.logger('openConnection: connecting %r -> %r' % (transportAddress.getLocalAddress(), transportAddress))
+
+        return connection
+
+    def sendMessage(self, outgoingMessage, transportAddress):
+        transportAddress = self.normalizeAddress(transportAddress)
+        if transportAddress in self.__connections:
+            connection = self.__connections[transportAddress]
+        elif self.accepting:
+            # in server mode peers connect to us, never the other way round
+            debug.logger & debug.flagIO and debug.logger('sendMessage: no connection with %r, outgoingMessage (%d octets) dropped' % (transportAddress, len(outgoingMessage)))
+            return
+        else:
+            connection = self.openConnection(transportAddress)
+        connection.sendMessage(outgoingMessage)
+        debug.logger & debug.flagIO and debug.logger('sendMessage: outgoingMessage queued (%d octets) %s' % (len(outgoingMessage), debug.hexdump(outgoingMessage)))
+
+    def normalizeAddress(self, transportAddress):
+        if not isinstance(transportAddress, self.addressType):
+            transportAddress = self.addressType(transportAddress)
+        return transportAddress
+
+    # asyncore API
+    def writable(self):
+        return 0
+
+    def readable(self):
+        return self.accepting
+
+    def handle_accept(self):
+        try:
+            sock, transportAddress = self.socket.accept()
+        except socket.error:
+            debug.logger & debug.flagIO and debug.logger('handle_accept: accept() failed: %s' % (sys.exc_info()[1],))
+            return
+
+        transportAddress = self.normalizeAddress(transportAddress)
+        transportAddress.setLocalAddress(sock.getsockname())
+
+        if transportAddress in self.__connections:
+            self.__connections[transportAddress].handle_close()
+
+        self.addConnection(StreamConnection(self, sock, transportAddress))
+
+        debug.logger & debug.flagIO and debug.logger('handle_accept: connection %r -> %r accepted' % (transportAddress, transportAddress.getLocalAddress()))
@@ -0,0 +1,23 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+from socket import AF_INET
+from pysnmp.carrier.base import AbstractTransportAddress
+from pysnmp.carrier.asyncore.stream.base import StreamSocketTransport
+
+domainName = snmpTCPDomain = (1, 3, 6, 1, 2, 1, 100, 1, 5)
+
+
+class TcpTransportAddress(tuple, AbstractTransportAddress):
+    pass
+
+
+class TcpSocketTransport(StreamSocketTransport):
+    sockFamily = AF_INET
+    addressType = TcpTransportAddress
+
+
+TcpTransport = TcpSocketTransport
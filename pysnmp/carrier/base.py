@@ -4,9 +4,27 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+import heapq
+from time import time
 from pysnmp.carrier import error
 
 
+class TimerHandle(object):
+    """Delayed call scheduled by `callLater()`"""
+    def __init__(self, callTime, cbFun, args):
+        self.callTime = callTime
+        self.cbFun = cbFun
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return self.callTime < other.callTime
+
+    def cancel(self):
+        self.cancelled = True
+        self.cbFun = self.args = None
+
+
 class TimerCallable(object):
     def __init__(self, cbFun, callInterval):
         self.__cbFun = cbFun
@@ -44,6 +62,7 @@ class AbstractTransportDispatcher(object):
         self.__jobs = {}
         self.__recvCallables = {}
         self.__timerCallables = []
+        self.__delayedCalls = []
         self.__ticks = 0
         self.__timerResolution = 0.5
         self.__timerDelta = self.__timerResolution * 0.05
@@ -109,6 +128,48 @@ class AbstractTransportDispatcher(object):
         else:
             self.__timerCallables = []
 
+    def callLater(self, delay, cbFun, *args):
+        """Schedule `cbFun(*args)` call in `delay` seconds.
+
+        Returns a handle which `cancel()` method cancels the call.
+        Delayed calls are run by the dispatcher on `handleTimerTick()`,
+        event loop based dispatchers hand them over to their loops.
+        """
+        timerHandle = TimerHandle(time() + delay, cbFun, args)
+        heapq.heappush(self.__delayedCalls, timerHandle)
+        return timerHandle
+
+    def getNextCallTime(self):
+        """Return the time of the earliest delayed call or timer tick.
+
+        Timer ticks are only due while timer callbacks are registered,
+        None is returned if nothing is due at all.
+        """
+        nextCallTime = None
+
+        delayedCalls = self.__delayedCalls
+        while delayedCalls:
+            if not delayedCalls[0].cancelled:
+                nextCallTime = delayedCalls[0].callTime
+                break
+            heapq.heappop(delayedCalls)
+
+        if self.__timerCallables and (nextCallTime is None or
+                                      self.__nextTime < nextCallTime):
+            nextCallTime = self.__nextTime
+
+        return nextCallTime
+
+    def runDelayedCalls(self):
+        delayedCalls = self.__delayedCalls
+        timeNow = time()
+        while delayedCalls and delayedCalls[0].callTime <= timeNow:
+            timerHandle = heapq.heappop(delayedCalls)
+            if not timerHandle.cancelled:
+                cbFun, args = timerHandle.cbFun, timerHandle.args
+                timerHandle.cancel()
+                cbFun(*args)
+
     def registerTransport(self, tDomain, transport):
         if tDomain in self.__transports:
             raise error.CarrierError(
@@ -158,6 +219,9 @@ class AbstractTransportDispatcher(object):
         return self.__ticks
 
     def handleTimerTick(self, timeNow):
+        if self.__delayedCalls:
+            self.runDelayedCalls()
+
         if self.__nextTime == 0:  # initial initialization
             self.__nextTime = timeNow + self.__timerResolution - self.__timerDelta
 
@@ -194,6 +258,7 @@ class AbstractTransportDispatcher(object):
         self.__transports.clear()
         self.unregisterRecvCbFun()
         self.unregisterTimerCbFun()
+        self.__delayedCalls = []
 
 
 class AbstractTransportAddress(object):
@@ -0,0 +1,70 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+from pysnmp.carrier import error
+
+
+class BerStreamFramer(object):
+    """Split octet stream into whole BER-encoded SNMP messages.
+
+    Over stream transports (:RFC:`3430#section-2.1`) SNMP messages are
+    sent back to back with no extra framing, message boundaries are
+    derived from the outer SEQUENCE tag and its definite length.
+    Messages longer than `maxMessageSize` octets are rejected.
+    """
+    def __init__(self, maxMessageSize=1048576):
+        self.__maxMessageSize = maxMessageSize
+        self.__buffer = bytearray()
+
+    def feed(self, octets):
+        """Add received `octets`, return a list of messages completed by them"""
+        buffer = self.__buffer
+        buffer.extend(octets)
+
+        messages = []
+        bufferSize = len(buffer)
+        offset = 0
+
+        while bufferSize - offset >= 2:
+            if buffer[offset] != 0x30:
+                raise error.CarrierError('Not a BER SEQUENCE tag %#x in stream' % buffer[offset])
+
+            length = buffer[offset + 1]
+            headerSize = 2
+
+            if length & 0x80:
+                lengthSize = length & 0x7f
+                if not lengthSize:
+                    raise error.CarrierError('Indefinite length encoding in stream')
+                if lengthSize > 4:
+                    raise error.CarrierError('Length field of %d octets in stream' % lengthSize)
+
+                headerSize += lengthSize
+                if bufferSize - offset < headerSize:
+                    break
+
+                length = 0
+                for idx in range(offset + 2, offset + headerSize):
+                    length = length << 8 | buffer[idx]
+
+            messageSize = headerSize + length
+
+            if messageSize > self.__maxMessageSize:
+                raise error.CarrierError('Message of %d octets exceeds %d octets limit' % (messageSize, self.__maxMessageSize))
+
+            if bufferSize - offset < messageSize:
+                break
+
+            messages.append(bytes(buffer[offset:offset + messageSize]))
+            offset += messageSize
+
+        if offset:
+            del buffer[:offset]
+
+        return messages
+
+    def clear(self):
+        del self.__buffer[:]
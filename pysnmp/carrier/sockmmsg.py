@@ -0,0 +1,246 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# The following routines send and receive many datagrams per system call
+# by means of Linux-specific sendmmsg()/recvmmsg() calls invoked through
+# ctypes. Only IPv4 and IPv6 sockets are supported.
+#
+# Where these calls are not available, `sendmmsg` and `recvmmsg` are
+# None and `getSendMany()`/`getRecvMany()` raise CarrierError.
+#
+import sys
+import socket
+import errno
+import struct
+import ctypes
+from pysnmp.carrier import error
+
+sendmmsg = recvmmsg = None
+
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        sendmmsg = _libc.sendmmsg
+        recvmmsg = _libc.recvmmsg
+
+    except (OSError, AttributeError):
+        sendmmsg = recvmmsg = None
+
+MSG_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0x40)
+
+# large enough for any sockaddr_in/sockaddr_in6
+SOCKADDR_SIZE = 128
+
+
+class iovec(ctypes.Structure):
+    _fields_ = [
+        ('iov_base', ctypes.c_void_p),
+        ('iov_len', ctypes.c_size_t),
+    ]
+
+
+class msghdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_name', ctypes.c_void_p),
+        ('msg_namelen', ctypes.c_uint32),
+        ('msg_iov', ctypes.POINTER(iovec)),
+        ('msg_iovlen', ctypes.c_size_t),
+        ('msg_control', ctypes.c_void_p),
+        ('msg_controllen', ctypes.c_size_t),
+        ('msg_flags', ctypes.c_int),
+    ]
+
+
+class mmsghdr(ctypes.Structure):
+    _fields_ = [
+        ('msg_hdr', msghdr),
+        ('msg_len', ctypes.c_uint),
+    ]
+
+
+if sendmmsg is not None:
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(mmsghdr),
+                         ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+
+    recvmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(mmsghdr),
+                         ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    recvmmsg.restype = ctypes.c_int
+
+
+def _packAddress(family, address):
+    if family not in (socket.AF_INET, socket.AF_INET6):
+        raise error.CarrierError('Unsupported address family %s' % family)
+
+    try:
+        host = socket.inet_pton(family, address[0])
+
+    except (socket.error, ValueError):
+        # host name rather than address, resolve it just like sendto() does
+        address = socket.getaddrinfo(address[0], address[1], family, socket.SOCK_DGRAM)[0][4]
+        host = socket.inet_pton(family, address[0])
+
+    if family == socket.AF_INET:
+        return struct.pack('=H', family) + struct.pack(
+            '!H', address[1]) + host + b'\x00' * 8
+
+    else:
+        flowinfo = len(address) > 2 and address[2] or 0
+        scopeid = len(address) > 3 and address[3] or 0
+        return struct.pack('=H', family) + struct.pack(
+            '!HI', address[1], flowinfo) + host + struct.pack('=I', scopeid)
+
+
+def _unpackAddress(buf):
+    family, = struct.unpack('=H', buf[:2])
+    if family == socket.AF_INET:
+        port, = struct.unpack('!H', buf[2:4])
+        return socket.inet_ntop(family, buf[4:8]), port
+
+    elif family == socket.AF_INET6:
+        port, flowinfo = struct.unpack('!HI', buf[2:8])
+        scopeid, = struct.unpack('=I', buf[24:28])
+        return socket.inet_ntop(family, buf[8:24]), port, flowinfo, scopeid
+
+    raise error.CarrierError('Unsupported address family %s' % family)
+
+
+def _raiseSocketError():
+    errorCode = ctypes.get_errno()
+    raise socket.error(errorCode, errno.errorcode.get(errorCode, 'unknown'))
+
+
+def getSendMany(batchSize):
+    """Return sendmany(sock, messages) callable.
+
+    The callable takes a sequence of up to `batchSize` of
+    `(outgoingMessage, transportAddress)` pairs, returns the number
+    of messages actually sent or raises socket.error.
+    """
+    if sendmmsg is None:
+        raise error.CarrierError('sendmmsg() interface is not supported by this OS')
+
+    headers = (mmsghdr * batchSize)()
+    iovecs = (iovec * batchSize)()
+
+    for idx in range(batchSize):
+        headers[idx].msg_hdr.msg_iov = ctypes.pointer(iovecs[idx])
+        headers[idx].msg_hdr.msg_iovlen = 1
+
+    # pre-built per-slot proxies save on ctypes array indexing
+    slots = [(headers[idx].msg_hdr, iovecs[idx]) for idx in range(batchSize)]
+
+    # transport address -> packed sockaddr buffer
+    addresses = {}
+
+    def sendmany(s, messages):
+        family = s.family
+
+        # all messages go into one buffer which is kept alive till
+        # sendmmsg() completes
+        data = b''.join([x[0] for x in messages])
+        offset = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
+
+        names = []
+
+        for (hdr, iov), (outgoingMessage, transportAddress) in zip(slots, messages):
+            try:
+                name, nameLength = addresses[transportAddress]
+
+            except KeyError:
+                if len(addresses) > 1024:
+                    addresses.clear()
+                try:
+                    name = _packAddress(family, transportAddress)
+
+                except socket.error:
+                    if names:
+                        break  # let the caller hit the error again
+                    raise
+
+                name = addresses[transportAddress] = ctypes.create_string_buffer(name), len(name)
+                name, nameLength = name
+
+            names.append(name)
+
+            hdr.msg_name = ctypes.addressof(name)
+            hdr.msg_namelen = nameLength
+
+            iov.iov_base = offset
+            iov.iov_len = length = len(outgoingMessage)
+
+            offset += length
+
+        sent = sendmmsg(s.fileno(), headers, len(names), 0)
+        if sent < 0:
+            _raiseSocketError()
+
+        return sent
+
+    return sendmany
+
+
+def getRecvMany(addressType, batchSize, bufferSize):
+    """Return recvmany(sock) callable.
+
+    The callable reads up to `batchSize` of pending datagrams, each up
+    to `bufferSize` octets long, without blocking. It returns a list of
+    `(incomingMessage, transportAddress)` pairs or raises socket.error
+    (e.g. EAGAIN if no datagrams are pending).
+    """
+    if recvmmsg is None:
+        raise error.CarrierError('recvmmsg() interface is not supported by this OS')
+
+    headers = (mmsghdr * batchSize)()
+    iovecs = (iovec * batchSize)()
+    buffers = ctypes.create_string_buffer(batchSize * bufferSize)
+    names = ctypes.create_string_buffer(batchSize * SOCKADDR_SIZE)
+
+    for idx in range(batchSize):
+        iovecs[idx].iov_base = ctypes.addressof(buffers) + idx * bufferSize
+        iovecs[idx].iov_len = bufferSize
+        hdr = headers[idx].msg_hdr
+        hdr.msg_iov = ctypes.pointer(iovecs[idx])
+        hdr.msg_iovlen = 1
+        hdr.msg_name = ctypes.addressof(names) + idx * SOCKADDR_SIZE
+        hdr.msg_namelen = SOCKADDR_SIZE
+
+    # pre-built per-slot proxies save on ctypes array indexing
+    slots = [(headers[idx], idx * bufferSize, idx * SOCKADDR_SIZE)
+             for idx in range(batchSize)]
+
+    # packed sockaddr -> address tuple
+    addresses = {}
+
+    def recvmany(s):
+        received = recvmmsg(s.fileno(), headers, batchSize, MSG_DONTWAIT, None)
+        if received < 0:
+            _raiseSocketError()
+
+        messages = []
+
+        for header, dataOffset, nameOffset in slots[:received]:
+            hdr = header.msg_hdr
+
+            name = names[nameOffset:nameOffset + hdr.msg_namelen]
+            hdr.msg_namelen = SOCKADDR_SIZE
+
+            try:
+                transportAddress = addresses[name]
+
+            except KeyError:
+                if len(addresses) > 1024:
+                    addresses.clear()
+                transportAddress = addresses[name] = _unpackAddress(name)
+
+            messages.append(
+                (buffers[dataOffset:dataOffset + header.msg_len],
+                 addressType(transportAddress))
+            )
+
+        return messages
+
+    return recvmany
@@ -18,6 +18,16 @@ from pysnmp.carrier.base import AbstractTransportDispatcher
 from pysnmp.error import PySnmpError
 
 
+class DelayedCall(object):
+    """Cancellable handle of a delayed call scheduled with the reactor"""
+    def __init__(self, delayedCall):
+        self.__delayedCall = delayedCall
+
+    def cancel(self):
+        if self.__delayedCall.active():
+            self.__delayedCall.cancel()
+
+
 class TwistedDispatcher(AbstractTransportDispatcher):
     """TransportDispatcher based on twisted.internet.reactor"""
 
@@ -30,6 +40,9 @@ class TwistedDispatcher(AbstractTransportDispatcher):
             lambda self=self: self.handleTimerTick(time.time())
         )
 
+    def callLater(self, delay, cbFun, *args):
+        return DelayedCall(reactor.callLater(delay, cbFun, *args))
+
     def runDispatcher(self, timeout=0.0):
         if not reactor.running:
             try:
@@ -4,10 +4,16 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+import gc
+import json
+import sys
 from pyasn1.compat.octets import null
+from pyasn1.type import univ
 from pysnmp.carrier.asyncore.dgram import udp, udp6, unix
+from pysnmp.carrier.asyncore.stream import tcp, tcp6
 from pysnmp.proto.secmod.rfc3414.auth import hmacmd5, hmacsha, noauth
 from pysnmp.proto.secmod.rfc3414.priv import des, nopriv
+from pysnmp.proto.secmod.rfc3414 import localkey
 from pysnmp.proto.secmod.rfc3826.priv import aes
 from pysnmp.proto.secmod.rfc7860.auth import hmacsha2
 from pysnmp.proto.secmod.eso.priv import des3, aes192, aes256
@@ -20,6 +26,8 @@ from pysnmp import error
 snmpUDPDomain = udp.snmpUDPDomain
 snmpUDP6Domain = udp6.snmpUDP6Domain
 snmpLocalDomain = unix.snmpLocalDomain
+snmpTCPDomain = tcp.snmpTCPDomain
+snmpTCP6Domain = tcp6.snmpTCP6Domain
 
 # Auth protocol
 usmHMACMD5AuthProtocol = hmacmd5.HmacMd5.serviceID
@@ -60,6 +68,19 @@ privServices = {des.Des.serviceID: des.Des(),
                 nopriv.NoPriv.serviceID: nopriv.NoPriv()}
 
 
+# LCD changes are built as a sequence of (rowStatusName, varBinds) writes,
+# rows are re-created if rowStatusName is given, var-binds are written
+# as they are otherwise
+
+def __applyWrites(snmpEngine, writes):
+    for rowStatusName, varBinds in writes:
+        if rowStatusName:
+            snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
+                ((rowStatusName, 'destroy'),)
+            )
+        snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(varBinds)
+
+
 def __cookV1SystemInfo(snmpEngine, communityIndex):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
@@ -69,9 +90,9 @@ def __cookV1SystemInfo(snmpEngine, communityIndex):
     return snmpCommunityEntry, tblIdx, snmpEngineID
 
 
-def addV1System(snmpEngine, communityIndex, communityName,
-                contextEngineId=None, contextName=None,
-                transportTag=None, securityName=None):
+def __v1SystemWrites(snmpEngine, communityIndex, communityName,
+                     contextEngineId=None, contextName=None,
+                     transportTag=None, securityName=None):
     (snmpCommunityEntry, tblIdx,
      snmpEngineID) = __cookV1SystemInfo(snmpEngine, communityIndex)
 
@@ -83,18 +104,26 @@ def addV1System(snmpEngine, communityIndex, communityName,
     if contextName is None:
         contextName = null
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpCommunityEntry.name + (8,) + tblIdx, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpCommunityEntry.name + (1,) + tblIdx, communityIndex),
-         (snmpCommunityEntry.name + (2,) + tblIdx, communityName),
-         (snmpCommunityEntry.name + (3,) + tblIdx, securityName is not None and securityName or communityIndex),
-         (snmpCommunityEntry.name + (4,) + tblIdx, contextEngineId),
-         (snmpCommunityEntry.name + (5,) + tblIdx, contextName),
-         (snmpCommunityEntry.name + (6,) + tblIdx, transportTag),
-         (snmpCommunityEntry.name + (7,) + tblIdx, 'nonVolatile'),
-         (snmpCommunityEntry.name + (8,) + tblIdx, 'createAndGo'))
+    return [
+        (snmpCommunityEntry.name + (8,) + tblIdx,
+         ((snmpCommunityEntry.name + (1,) + tblIdx, communityIndex),
+          (snmpCommunityEntry.name + (2,) + tblIdx, communityName),
+          (snmpCommunityEntry.name + (3,) + tblIdx, securityName is not None and securityName or communityIndex),
+          (snmpCommunityEntry.name + (4,) + tblIdx, contextEngineId),
+          (snmpCommunityEntry.name + (5,) + tblIdx, contextName),
+          (snmpCommunityEntry.name + (6,) + tblIdx, transportTag),
+          (snmpCommunityEntry.name + (7,) + tblIdx, 'nonVolatile'),
+          (snmpCommunityEntry.name + (8,) + tblIdx, 'createAndGo')))
+    ]
+
+
+def addV1System(snmpEngine, communityIndex, communityName,
+                contextEngineId=None, contextName=None,
+                transportTag=None, securityName=None):
+    __applyWrites(
+        snmpEngine, __v1SystemWrites(snmpEngine, communityIndex, communityName,
+                                     contextEngineId, contextName,
+                                     transportTag, securityName)
     )
 
 
@@ -125,13 +154,14 @@ def __cookV3UserInfo(snmpEngine, securityName, securityEngineId):
     return snmpEngineID, usmUserEntry, tblIdx1, pysnmpUsmSecretEntry, tblIdx2
 
 
-def addV3User(snmpEngine, userName,
-              authProtocol=usmNoAuthProtocol, authKey=None,
-              privProtocol=usmNoPrivProtocol, privKey=None,
-              securityEngineId=None,
-              securityName=None,
-              # deprecated parameters follow
-              contextEngineId=None):
+def __v3UserWrites(snmpEngine, userName,
+                   authProtocol=usmNoAuthProtocol, authKey=None,
+                   privProtocol=usmNoPrivProtocol, privKey=None,
+                   securityEngineId=None,
+                   securityName=None,
+                   # deprecated parameters follow
+                   contextEngineId=None,
+                   hashedPassphrases=None):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
     if securityName is None:
@@ -147,60 +177,161 @@ def addV3User(snmpEngine, userName,
     # Load clone-from (may not be needed)
     zeroDotZero, = mibBuilder.importSymbols('SNMPv2-SMI', 'zeroDotZero')
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((usmUserEntry.name + (13,) + tblIdx1, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((usmUserEntry.name + (2,) + tblIdx1, userName),
-         (usmUserEntry.name + (3,) + tblIdx1, securityName),
-         (usmUserEntry.name + (4,) + tblIdx1, zeroDotZero.name),
-         (usmUserEntry.name + (5,) + tblIdx1, authProtocol),
-         (usmUserEntry.name + (8,) + tblIdx1, privProtocol),
-         (usmUserEntry.name + (13,) + tblIdx1, 'createAndGo'))
-    )
+    writes = [
+        (usmUserEntry.name + (13,) + tblIdx1,
+         ((usmUserEntry.name + (2,) + tblIdx1, userName),
+          (usmUserEntry.name + (3,) + tblIdx1, securityName),
+          (usmUserEntry.name + (4,) + tblIdx1, zeroDotZero.name),
+          (usmUserEntry.name + (5,) + tblIdx1, authProtocol),
+          (usmUserEntry.name + (8,) + tblIdx1, privProtocol),
+          (usmUserEntry.name + (13,) + tblIdx1, 'createAndGo')))
+    ]
 
     # Localize keys
     if authProtocol in authServices:
-        hashedAuthPassphrase = authServices[authProtocol].hashPassphrase(
-            authKey and authKey or null
-        )
-        localAuthKey = authServices[authProtocol].localizeKey(
-            hashedAuthPassphrase, snmpEngineID
+        authService = authServices[authProtocol]
+        hashedAuthPassphrase, localAuthKey = localkey.getLocalizedKeys(
+            (tuple(authProtocol),), authKey and authKey or null, snmpEngineID,
+            __getPassphraseHasher(authService.hashPassphrase, authProtocol,
+                                  authProtocol, hashedPassphrases),
+            authService.localizeKey
         )
     else:
         raise error.PySnmpError('Unknown auth protocol %s' % (authProtocol,))
 
     if privProtocol in privServices:
-        hashedPrivPassphrase = privServices[privProtocol].hashPassphrase(
-            authProtocol, privKey and privKey or null
-        )
-        localPrivKey = privServices[privProtocol].localizeKey(
-            authProtocol, hashedPrivPassphrase, snmpEngineID
+        privService = privServices[privProtocol]
+        hashedPrivPassphrase, localPrivKey = localkey.getLocalizedKeys(
+            (tuple(privProtocol), tuple(authProtocol)),
+            privKey and privKey or null, snmpEngineID,
+            __getPassphraseHasher(lambda x: privService.hashPassphrase(authProtocol, x),
+                                  authProtocol, privProtocol, hashedPassphrases),
+            lambda x, y: privService.localizeKey(authProtocol, x, y)
         )
     else:
         raise error.PySnmpError('Unknown priv protocol %s' % (privProtocol,))
 
     # Commit localized keys
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((pysnmpUsmKeyEntry.name + (1,) + tblIdx1, localAuthKey),
-         (pysnmpUsmKeyEntry.name + (2,) + tblIdx1, localPrivKey),
-         (pysnmpUsmKeyEntry.name + (3,) + tblIdx1, hashedAuthPassphrase),
-         (pysnmpUsmKeyEntry.name + (4,) + tblIdx1, hashedPrivPassphrase))
+    writes.append(
+        (None,
+         ((pysnmpUsmKeyEntry.name + (1,) + tblIdx1, localAuthKey),
+          (pysnmpUsmKeyEntry.name + (2,) + tblIdx1, localPrivKey),
+          (pysnmpUsmKeyEntry.name + (3,) + tblIdx1, hashedAuthPassphrase),
+          (pysnmpUsmKeyEntry.name + (4,) + tblIdx1, hashedPrivPassphrase)))
     )
 
     # Commit passphrases
-
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((pysnmpUsmSecretEntry.name + (4,) + tblIdx2, 'destroy'),)
+    writes.append(
+        (pysnmpUsmSecretEntry.name + (4,) + tblIdx2,
+         ((pysnmpUsmSecretEntry.name + (1,) + tblIdx2, userName),
+          (pysnmpUsmSecretEntry.name + (2,) + tblIdx2, authKey),
+          (pysnmpUsmSecretEntry.name + (3,) + tblIdx2, privKey),
+          (pysnmpUsmSecretEntry.name + (4,) + tblIdx2, 'createAndGo')))
     )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((pysnmpUsmSecretEntry.name + (1,) + tblIdx2, userName),
-         (pysnmpUsmSecretEntry.name + (2,) + tblIdx2, authKey),
-         (pysnmpUsmSecretEntry.name + (3,) + tblIdx2, privKey),
-         (pysnmpUsmSecretEntry.name + (4,) + tblIdx2, 'createAndGo'))
+
+    return writes
+
+
+def addV3User(snmpEngine, userName,
+              authProtocol=usmNoAuthProtocol, authKey=None,
+              privProtocol=usmNoPrivProtocol, privKey=None,
+              securityEngineId=None,
+              securityName=None,
+              # deprecated parameters follow
+              contextEngineId=None):
+    __applyWrites(
+        snmpEngine, __v3UserWrites(snmpEngine, userName,
+                                   authProtocol, authKey,
+                                   privProtocol, privKey,
+                                   securityEngineId, securityName,
+                                   contextEngineId)
     )
 
 
+def addV3Users(snmpEngine, users, processes=None):
+    """Add many SNMPv3 USM users at once.
+
+    Each item of *users* is either a sequence of positional or a dict
+    of keyword arguments to :py:func:`addV3User`. Passphrases are hashed
+    up front by a pool of *processes* worker processes (defaults to the
+    number of CPUs) so the subsequent per-user setup just localizes keys.
+    """
+    users = [isinstance(user, dict) and ((), user) or (user, {}) for user in users]
+
+    hashedPassphrases = __hashV3UserPassphrases(snmpEngine, users, processes)
+
+    for args, kwargs in users:
+        __applyWrites(
+            snmpEngine, __v3UserWrites(snmpEngine, hashedPassphrases=hashedPassphrases,
+                                       *args, **kwargs)
+        )
+
+
+def __getPassphraseHasher(hashPassphrase, authProtocol, protocol, hashedPassphrases):
+    if (not hashedPassphrases or authProtocol not in authServices or
+            protocol in (usmNoAuthProtocol, usmNoPrivProtocol)):
+        return hashPassphrase
+
+    hashFunc = authServices[authProtocol].hashAlgorithm
+
+    def hasher(passphrase):
+        try:
+            return hashedPassphrases[(passphrase, hashFunc)]
+
+        except KeyError:
+            return hashPassphrase(passphrase)
+
+    return hasher
+
+
+def __hashV3UserPassphrases(snmpEngine, users, processes=None):
+    mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
+
+    snmpEngineID, = mibBuilder.importSymbols('__SNMP-FRAMEWORK-MIB', 'snmpEngineID')
+
+    passphrases = []
+
+    for args, kwargs in users:
+        params = dict(zip(('userName', 'authProtocol', 'authKey',
+                           'privProtocol', 'privKey', 'securityEngineId',
+                           'securityName', 'contextEngineId'), args))
+        params.update(kwargs)
+
+        authProtocol = params.get('authProtocol', usmNoAuthProtocol)
+
+        if authProtocol == usmNoAuthProtocol or authProtocol not in authServices:
+            continue
+
+        hashFunc = authServices[authProtocol].hashAlgorithm
+
+        securityEngineId = params.get('securityEngineId')
+        if securityEngineId is None:
+            securityEngineId = params.get('contextEngineId')
+
+        if securityEngineId is None:
+            securityEngineId = snmpEngineID.syntax
+        else:
+            securityEngineId = snmpEngineID.syntax.clone(securityEngineId)
+
+        # keys known from earlier runs are not hashed again
+        passphrase = params.get('authKey') or null
+        if not localkey.hasLocalizedKeys((tuple(authProtocol),), passphrase, securityEngineId):
+            passphrases.append((passphrase, hashFunc))
+
+        privProtocol = params.get('privProtocol', usmNoPrivProtocol)
+
+        if privProtocol != usmNoPrivProtocol:
+            passphrase = params.get('privKey') or null
+            if not localkey.hasLocalizedKeys((tuple(privProtocol), tuple(authProtocol)),
+                                             passphrase, securityEngineId):
+                passphrases.append((passphrase, hashFunc))
+
+    passphrases = [(univ.OctetString(passphrase).asOctets(), hashFunc)
+                   for passphrase, hashFunc in passphrases]
+
+    return dict(zip(passphrases, localkey.hashPassphrases(passphrases, processes)))
+
+
 def delV3User(snmpEngine,
               userName,
               securityEngineId=None,
@@ -210,6 +341,8 @@ def delV3User(snmpEngine,
         securityEngineId = contextEngineId
     (snmpEngineID, usmUserEntry, tblIdx1, pysnmpUsmSecretEntry,
      tblIdx2) = __cookV3UserInfo(snmpEngine, userName, securityEngineId)
+    __forgetV3UserKeys(snmpEngine, snmpEngineID, usmUserEntry, tblIdx1,
+                       pysnmpUsmSecretEntry, tblIdx2)
     snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
         ((usmUserEntry.name + (13,) + tblIdx1, 'destroy'),)
     )
@@ -236,6 +369,36 @@ def delV3User(snmpEngine,
             varBinds = initialVarBinds
 
 
+def __forgetV3UserKeys(snmpEngine, snmpEngineID, usmUserEntry, tblIdx1,
+                       pysnmpUsmSecretEntry, tblIdx2):
+    mibInstrumController = snmpEngine.msgAndPduDsp.mibInstrumController
+
+    authProtocol, privProtocol, authKey, privKey = [
+        value for name, value in mibInstrumController.readVars(
+            ((usmUserEntry.name + (5,) + tblIdx1, None),
+             (usmUserEntry.name + (8,) + tblIdx1, None),
+             (pysnmpUsmSecretEntry.name + (2,) + tblIdx2, None),
+             (pysnmpUsmSecretEntry.name + (3,) + tblIdx2, None))
+        )
+    ]
+
+    if authProtocol.isSameTypeWith(rfc1905.noSuchInstance):
+        return  # no such user
+
+    localkey.forgetLocalizedKeys(
+        (tuple(authProtocol),),
+        authKey.isSameTypeWith(rfc1905.noSuchInstance) and null or authKey,
+        snmpEngineID
+    )
+
+    if not privProtocol.isSameTypeWith(rfc1905.noSuchInstance):
+        localkey.forgetLocalizedKeys(
+            (tuple(privProtocol), tuple(authProtocol)),
+            privKey.isSameTypeWith(rfc1905.noSuchInstance) and null or privKey,
+            snmpEngineID
+        )
+
+
 def __cookTargetParamsInfo(snmpEngine, name):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
@@ -244,8 +407,7 @@ def __cookTargetParamsInfo(snmpEngine, name):
     return snmpTargetParamsEntry, tblIdx
 
 
-# mpModel: 0 == SNMPv1, 1 == SNMPv2c, 3 == SNMPv3
-def addTargetParams(snmpEngine, name, securityName, securityLevel, mpModel=3):
+def __targetParamsWrites(snmpEngine, name, securityName, securityLevel, mpModel=3):
     if mpModel == 0:
         securityModel = 1
     elif mpModel in (1, 2):
@@ -257,16 +419,22 @@ def addTargetParams(snmpEngine, name, securityName, securityLevel, mpModel=3):
 
     snmpTargetParamsEntry, tblIdx = __cookTargetParamsInfo(snmpEngine, name)
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpTargetParamsEntry.name + (7,) + tblIdx, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpTargetParamsEntry.name + (1,) + tblIdx, name),
-         (snmpTargetParamsEntry.name + (2,) + tblIdx, mpModel),
-         (snmpTargetParamsEntry.name + (3,) + tblIdx, securityModel),
-         (snmpTargetParamsEntry.name + (4,) + tblIdx, securityName),
-         (snmpTargetParamsEntry.name + (5,) + tblIdx, securityLevel),
-         (snmpTargetParamsEntry.name + (7,) + tblIdx, 'createAndGo'))
+    return [
+        (snmpTargetParamsEntry.name + (7,) + tblIdx,
+         ((snmpTargetParamsEntry.name + (1,) + tblIdx, name),
+          (snmpTargetParamsEntry.name + (2,) + tblIdx, mpModel),
+          (snmpTargetParamsEntry.name + (3,) + tblIdx, securityModel),
+          (snmpTargetParamsEntry.name + (4,) + tblIdx, securityName),
+          (snmpTargetParamsEntry.name + (5,) + tblIdx, securityLevel),
+          (snmpTargetParamsEntry.name + (7,) + tblIdx, 'createAndGo')))
+    ]
+
+
+# mpModel: 0 == SNMPv1, 1 == SNMPv2c, 3 == SNMPv3
+def addTargetParams(snmpEngine, name, securityName, securityLevel, mpModel=3):
+    __applyWrites(
+        snmpEngine, __targetParamsWrites(snmpEngine, name, securityName,
+                                         securityLevel, mpModel)
     )
 
 
@@ -286,9 +454,9 @@ def __cookTargetAddrInfo(snmpEngine, addrName):
     return snmpTargetAddrEntry, snmpSourceAddrEntry, tblIdx
 
 
-def addTargetAddr(snmpEngine, addrName, transportDomain, transportAddress,
-                  params, timeout=None, retryCount=None, tagList=null,
-                  sourceAddress=None):
+def __targetAddrWrites(snmpEngine, addrName, transportDomain, transportAddress,
+                       params, timeout=None, retryCount=None, tagList=null,
+                       sourceAddress=None):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
     (snmpTargetAddrEntry, snmpSourceAddrEntry,
@@ -300,26 +468,41 @@ def addTargetAddr(snmpEngine, addrName, transportDomain, transportAddress,
         if sourceAddress is None:
             sourceAddress = ('0.0.0.0', 0)
         sourceAddress = SnmpUDPAddress(sourceAddress)
-    elif transportDomain[:len(snmpUDP6Domain)] == snmpUDP6Domain:
+    elif (transportDomain[:len(snmpUDP6Domain)] == snmpUDP6Domain or
+          transportDomain[:len(snmpTCP6Domain)] == snmpTCP6Domain):
         TransportAddressIPv6, = mibBuilder.importSymbols('TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv6')
         transportAddress = TransportAddressIPv6(transportAddress)
         if sourceAddress is None:
             sourceAddress = ('::', 0)
         sourceAddress = TransportAddressIPv6(sourceAddress)
+    elif transportDomain[:len(snmpTCPDomain)] == snmpTCPDomain:
+        TransportAddressIPv4, = mibBuilder.importSymbols('TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv4')
+        transportAddress = TransportAddressIPv4(transportAddress)
+        if sourceAddress is None:
+            sourceAddress = ('0.0.0.0', 0)
+        sourceAddress = TransportAddressIPv4(sourceAddress)
+
+    return [
+        (snmpTargetAddrEntry.name + (9,) + tblIdx,
+         ((snmpTargetAddrEntry.name + (1,) + tblIdx, addrName),
+          (snmpTargetAddrEntry.name + (2,) + tblIdx, transportDomain),
+          (snmpTargetAddrEntry.name + (3,) + tblIdx, transportAddress),
+          (snmpTargetAddrEntry.name + (4,) + tblIdx, timeout),
+          (snmpTargetAddrEntry.name + (5,) + tblIdx, retryCount),
+          (snmpTargetAddrEntry.name + (6,) + tblIdx, tagList),
+          (snmpTargetAddrEntry.name + (7,) + tblIdx, params),
+          (snmpSourceAddrEntry.name + (1,) + tblIdx, sourceAddress),
+          (snmpTargetAddrEntry.name + (9,) + tblIdx, 'createAndGo')))
+    ]
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpTargetAddrEntry.name + (9,) + tblIdx, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpTargetAddrEntry.name + (1,) + tblIdx, addrName),
-         (snmpTargetAddrEntry.name + (2,) + tblIdx, transportDomain),
-         (snmpTargetAddrEntry.name + (3,) + tblIdx, transportAddress),
-         (snmpTargetAddrEntry.name + (4,) + tblIdx, timeout),
-         (snmpTargetAddrEntry.name + (5,) + tblIdx, retryCount),
-         (snmpTargetAddrEntry.name + (6,) + tblIdx, tagList),
-         (snmpTargetAddrEntry.name + (7,) + tblIdx, params),
-         (snmpSourceAddrEntry.name + (1,) + tblIdx, sourceAddress),
-         (snmpTargetAddrEntry.name + (9,) + tblIdx, 'createAndGo'))
+
+def addTargetAddr(snmpEngine, addrName, transportDomain, transportAddress,
+                  params, timeout=None, retryCount=None, tagList=null,
+                  sourceAddress=None):
+    __applyWrites(
+        snmpEngine, __targetAddrWrites(snmpEngine, addrName, transportDomain,
+                                       transportAddress, params, timeout,
+                                       retryCount, tagList, sourceAddress)
     )
 
 
@@ -389,14 +572,19 @@ delSocketTransport = delTransport
 
 # VACM shortcuts
 
-def addContext(snmpEngine, contextName):
+def __contextWrites(snmpEngine, contextName):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
     vacmContextEntry, = mibBuilder.importSymbols('SNMP-VIEW-BASED-ACM-MIB', 'vacmContextEntry')
     tblIdx = vacmContextEntry.getInstIdFromIndices(contextName)
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmContextEntry.name + (1,) + tblIdx, contextName),)
-    )
+    return [
+        (None,
+         ((vacmContextEntry.name + (1,) + tblIdx, contextName),))
+    ]
+
+
+def addContext(snmpEngine, contextName):
+    __applyWrites(snmpEngine, __contextWrites(snmpEngine, contextName))
 
 
 def __cookVacmGroupInfo(snmpEngine, securityModel, securityName):
@@ -409,17 +597,22 @@ def __cookVacmGroupInfo(snmpEngine, securityModel, securityName):
     return vacmSecurityToGroupEntry, tblIdx
 
 
-def addVacmGroup(snmpEngine, groupName, securityModel, securityName):
+def __vacmGroupWrites(snmpEngine, groupName, securityModel, securityName):
     (vacmSecurityToGroupEntry,
      tblIdx) = __cookVacmGroupInfo(snmpEngine, securityModel, securityName)
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmSecurityToGroupEntry.name + (5,) + tblIdx, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmSecurityToGroupEntry.name + (1,) + tblIdx, securityModel),
-         (vacmSecurityToGroupEntry.name + (2,) + tblIdx, securityName),
-         (vacmSecurityToGroupEntry.name + (3,) + tblIdx, groupName),
-         (vacmSecurityToGroupEntry.name + (5,) + tblIdx, 'createAndGo'))
+    return [
+        (vacmSecurityToGroupEntry.name + (5,) + tblIdx,
+         ((vacmSecurityToGroupEntry.name + (1,) + tblIdx, securityModel),
+          (vacmSecurityToGroupEntry.name + (2,) + tblIdx, securityName),
+          (vacmSecurityToGroupEntry.name + (3,) + tblIdx, groupName),
+          (vacmSecurityToGroupEntry.name + (5,) + tblIdx, 'createAndGo')))
+    ]
+
+
+def addVacmGroup(snmpEngine, groupName, securityModel, securityName):
+    __applyWrites(
+        snmpEngine, __vacmGroupWrites(snmpEngine, groupName, securityModel,
+                                      securityName)
     )
 
 
@@ -442,26 +635,35 @@ def __cookVacmAccessInfo(snmpEngine, groupName, contextName, securityModel,
     return vacmAccessEntry, tblIdx
 
 
-def addVacmAccess(snmpEngine, groupName, contextName, securityModel,
-                  securityLevel, prefix, readView, writeView, notifyView):
+def __vacmAccessWrites(snmpEngine, groupName, contextName, securityModel,
+                       securityLevel, prefix, readView, writeView, notifyView):
     vacmAccessEntry, tblIdx = __cookVacmAccessInfo(snmpEngine, groupName,
                                                    contextName, securityModel,
                                                    securityLevel)
 
-    addContext(snmpEngine, contextName)  # this is leaky
-
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmAccessEntry.name + (9,) + tblIdx, 'destroy'),)
+    writes = __contextWrites(snmpEngine, contextName)  # this is leaky
+
+    writes.append(
+        (vacmAccessEntry.name + (9,) + tblIdx,
+         ((vacmAccessEntry.name + (1,) + tblIdx, contextName),
+          (vacmAccessEntry.name + (2,) + tblIdx, securityModel),
+          (vacmAccessEntry.name + (3,) + tblIdx, securityLevel),
+          (vacmAccessEntry.name + (4,) + tblIdx, prefix),
+          (vacmAccessEntry.name + (5,) + tblIdx, readView),
+          (vacmAccessEntry.name + (6,) + tblIdx, writeView),
+          (vacmAccessEntry.name + (7,) + tblIdx, notifyView),
+          (vacmAccessEntry.name + (9,) + tblIdx, 'createAndGo')))
     )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmAccessEntry.name + (1,) + tblIdx, contextName),
-         (vacmAccessEntry.name + (2,) + tblIdx, securityModel),
-         (vacmAccessEntry.name + (3,) + tblIdx, securityLevel),
-         (vacmAccessEntry.name + (4,) + tblIdx, prefix),
-         (vacmAccessEntry.name + (5,) + tblIdx, readView),
-         (vacmAccessEntry.name + (6,) + tblIdx, writeView),
-         (vacmAccessEntry.name + (7,) + tblIdx, notifyView),
-         (vacmAccessEntry.name + (9,) + tblIdx, 'createAndGo'))
+
+    return writes
+
+
+def addVacmAccess(snmpEngine, groupName, contextName, securityModel,
+                  securityLevel, prefix, readView, writeView, notifyView):
+    __applyWrites(
+        snmpEngine, __vacmAccessWrites(snmpEngine, groupName, contextName,
+                                       securityModel, securityLevel, prefix,
+                                       readView, writeView, notifyView)
     )
 
 
@@ -485,18 +687,23 @@ def __cookVacmViewInfo(snmpEngine, viewName, subTree):
     return vacmViewTreeFamilyEntry, tblIdx
 
 
-def addVacmView(snmpEngine, viewName, viewType, subTree, mask):
+def __vacmViewWrites(snmpEngine, viewName, viewType, subTree, mask):
     vacmViewTreeFamilyEntry, tblIdx = __cookVacmViewInfo(snmpEngine, viewName,
                                                          subTree)
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmViewTreeFamilyEntry.name + (6,) + tblIdx, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((vacmViewTreeFamilyEntry.name + (1,) + tblIdx, viewName),
-         (vacmViewTreeFamilyEntry.name + (2,) + tblIdx, subTree),
-         (vacmViewTreeFamilyEntry.name + (3,) + tblIdx, mask),
-         (vacmViewTreeFamilyEntry.name + (4,) + tblIdx, viewType),
-         (vacmViewTreeFamilyEntry.name + (6,) + tblIdx, 'createAndGo'))
+    return [
+        (vacmViewTreeFamilyEntry.name + (6,) + tblIdx,
+         ((vacmViewTreeFamilyEntry.name + (1,) + tblIdx, viewName),
+          (vacmViewTreeFamilyEntry.name + (2,) + tblIdx, subTree),
+          (vacmViewTreeFamilyEntry.name + (3,) + tblIdx, mask),
+          (vacmViewTreeFamilyEntry.name + (4,) + tblIdx, viewType),
+          (vacmViewTreeFamilyEntry.name + (6,) + tblIdx, 'createAndGo')))
+    ]
+
+
+def addVacmView(snmpEngine, viewName, viewType, subTree, mask):
+    __applyWrites(
+        snmpEngine, __vacmViewWrites(snmpEngine, viewName, viewType,
+                                     subTree, mask)
     )
 
 
@@ -520,21 +727,40 @@ def __cookVacmUserInfo(snmpEngine, securityModel, securityName, securityLevel):
             'r' + groupName, 'w' + groupName, 'n' + groupName)
 
 
-def addVacmUser(snmpEngine, securityModel, securityName, securityLevel,
-                readSubTree=(), writeSubTree=(), notifySubTree=(),
-                contextName=null):
+def __vacmUserWrites(snmpEngine, securityModel, securityName, securityLevel,
+                     readSubTree=(), writeSubTree=(), notifySubTree=(),
+                     contextName=null):
     (groupName, securityLevel, readView, writeView,
      notifyView) = __cookVacmUserInfo(snmpEngine, securityModel, securityName,
                                       securityLevel)
-    addVacmGroup(snmpEngine, groupName, securityModel, securityName)
-    addVacmAccess(snmpEngine, groupName, contextName, securityModel,
-                  securityLevel, 1, readView, writeView, notifyView)
+    writes = __vacmGroupWrites(snmpEngine, groupName, securityModel, securityName)
+    writes.extend(
+        __vacmAccessWrites(snmpEngine, groupName, contextName, securityModel,
+                           securityLevel, 1, readView, writeView, notifyView)
+    )
     if readSubTree:
-        addVacmView(snmpEngine, readView, "included", readSubTree, null)
+        writes.extend(
+            __vacmViewWrites(snmpEngine, readView, "included", readSubTree, null)
+        )
     if writeSubTree:
-        addVacmView(snmpEngine, writeView, "included", writeSubTree, null)
+        writes.extend(
+            __vacmViewWrites(snmpEngine, writeView, "included", writeSubTree, null)
+        )
     if notifySubTree:
-        addVacmView(snmpEngine, notifyView, "included", notifySubTree, null)
+        writes.extend(
+            __vacmViewWrites(snmpEngine, notifyView, "included", notifySubTree, null)
+        )
+    return writes
+
+
+def addVacmUser(snmpEngine, securityModel, securityName, securityLevel,
+                readSubTree=(), writeSubTree=(), notifySubTree=(),
+                contextName=null):
+    __applyWrites(
+        snmpEngine, __vacmUserWrites(snmpEngine, securityModel, securityName,
+                                     securityLevel, readSubTree, writeSubTree,
+                                     notifySubTree, contextName)
+    )
 
 
 def delVacmUser(snmpEngine, securityModel, securityName, securityLevel,
@@ -620,42 +846,44 @@ def __cookNotificationTargetInfo(snmpEngine, notificationName, paramsName,
             snmpNotifyFilterEntry, tblIdx3)
 
 
-def addNotificationTarget(snmpEngine, notificationName, paramsName,
-                          transportTag, notifyType=None, filterSubtree=None,
-                          filterMask=None, filterType=None):
+def __notificationTargetWrites(snmpEngine, notificationName, paramsName,
+                               transportTag, notifyType=None, filterSubtree=None,
+                               filterMask=None, filterType=None):
     (snmpNotifyEntry, tblIdx1, snmpNotifyFilterProfileEntry, tblIdx2,
      profileName, snmpNotifyFilterEntry,
      tblIdx3) = __cookNotificationTargetInfo(snmpEngine, notificationName,
                                              paramsName, filterSubtree)
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpNotifyEntry.name + (5,) + tblIdx1, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpNotifyEntry.name + (2,) + tblIdx1, transportTag),
-         (snmpNotifyEntry.name + (3,) + tblIdx1, notifyType),
-         (snmpNotifyEntry.name + (5,) + tblIdx1, 'createAndGo'))
-    )
+    writes = [
+        (snmpNotifyEntry.name + (5,) + tblIdx1,
+         ((snmpNotifyEntry.name + (2,) + tblIdx1, transportTag),
+          (snmpNotifyEntry.name + (3,) + tblIdx1, notifyType),
+          (snmpNotifyEntry.name + (5,) + tblIdx1, 'createAndGo'))),
+        (snmpNotifyFilterProfileEntry.name + (3,) + tblIdx2,
+         ((snmpNotifyFilterProfileEntry.name + (1,) + tblIdx2, profileName),
+          (snmpNotifyFilterProfileEntry.name + (3,) + tblIdx2, 'createAndGo')))
+    ]
+
+    if snmpNotifyFilterEntry:
+        writes.append(
+            (snmpNotifyFilterEntry.name + (5,) + tblIdx3,
+             ((snmpNotifyFilterEntry.name + (1,) + tblIdx3, filterSubtree),
+              (snmpNotifyFilterEntry.name + (2,) + tblIdx3, filterMask),
+              (snmpNotifyFilterEntry.name + (3,) + tblIdx3, filterType),
+              (snmpNotifyFilterEntry.name + (5,) + tblIdx3, 'createAndGo')))
+        )
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpNotifyFilterProfileEntry.name + (3,) + tblIdx2, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpNotifyFilterProfileEntry.name + (1,) + tblIdx2, profileName),
-         (snmpNotifyFilterProfileEntry.name + (3,) + tblIdx2, 'createAndGo'))
-    )
+    return writes
 
-    if not snmpNotifyFilterEntry:
-        return
 
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpNotifyFilterEntry.name + (5,) + tblIdx3, 'destroy'),)
-    )
-    snmpEngine.msgAndPduDsp.mibInstrumController.writeVars(
-        ((snmpNotifyFilterEntry.name + (1,) + tblIdx3, filterSubtree),
-         (snmpNotifyFilterEntry.name + (2,) + tblIdx3, filterMask),
-         (snmpNotifyFilterEntry.name + (3,) + tblIdx3, filterType),
-         (snmpNotifyFilterEntry.name + (5,) + tblIdx3, 'createAndGo'))
+def addNotificationTarget(snmpEngine, notificationName, paramsName,
+                          transportTag, notifyType=None, filterSubtree=None,
+                          filterMask=None, filterType=None):
+    __applyWrites(
+        snmpEngine, __notificationTargetWrites(snmpEngine, notificationName,
+                                               paramsName, transportTag,
+                                               notifyType, filterSubtree,
+                                               filterMask, filterType)
     )
 
 
@@ -713,3 +941,285 @@ def setInitialVacmParameters(snmpEngine):
                 "included", (1, 3, 6, 1, 6, 3, 11, 2, 1), "")
     addVacmView(snmpEngine, "restricted",
                 "included", (1, 3, 6, 1, 6, 3, 15, 1, 1), "")
+
+
+# Bulk LCD configuration
+
+__batchWriters = {
+    'v1System': __v1SystemWrites,
+    'v3User': __v3UserWrites,
+    'targetParams': __targetParamsWrites,
+    'targetAddr': __targetAddrWrites,
+    'context': __contextWrites,
+    'vacmGroup': __vacmGroupWrites,
+    'vacmAccess': __vacmAccessWrites,
+    'vacmView': __vacmViewWrites,
+    'vacmUser': __vacmUserWrites,
+    'notificationTarget': __notificationTargetWrites
+}
+
+# Order in which entries of a batch get applied
+__batchOrder = ('v1System', 'v3User', 'targetParams', 'targetAddr', 'context',
+                'vacmGroup', 'vacmAccess', 'vacmView', 'vacmUser',
+                'notificationTarget')
+
+# Protocols and transport domains loadBatch() takes by name
+__batchConstants = {
+    'authProtocol': {
+        'usmHMACMD5AuthProtocol': usmHMACMD5AuthProtocol,
+        'usmHMACSHAAuthProtocol': usmHMACSHAAuthProtocol,
+        'usmHMAC128SHA224AuthProtocol': usmHMAC128SHA224AuthProtocol,
+        'usmHMAC192SHA256AuthProtocol': usmHMAC192SHA256AuthProtocol,
+        'usmHMAC256SHA384AuthProtocol': usmHMAC256SHA384AuthProtocol,
+        'usmHMAC384SHA512AuthProtocol': usmHMAC384SHA512AuthProtocol,
+        'usmNoAuthProtocol': usmNoAuthProtocol
+    },
+    'privProtocol': {
+        'usmDESPrivProtocol': usmDESPrivProtocol,
+        'usm3DESEDEPrivProtocol': usm3DESEDEPrivProtocol,
+        'usmAesCfb128Protocol': usmAesCfb128Protocol,
+        'usmAesBlumenthalCfb192Protocol': usmAesBlumenthalCfb192Protocol,
+        'usmAesBlumenthalCfb256Protocol': usmAesBlumenthalCfb256Protocol,
+        'usmAesCfb192Protocol': usmAesCfb192Protocol,
+        'usmAesCfb256Protocol': usmAesCfb256Protocol,
+        'usmNoPrivProtocol': usmNoPrivProtocol
+    },
+    'transportDomain': {
+        'snmpUDPDomain': snmpUDPDomain,
+        'snmpUDP6Domain': snmpUDP6Domain,
+        'snmpLocalDomain': snmpLocalDomain,
+        'snmpTCPDomain': snmpTCPDomain,
+        'snmpTCP6Domain': snmpTCP6Domain
+    }
+}
+
+
+def addBatch(snmpEngine, v1Systems=(), v3Users=(), targetParams=(),
+             targetAddrs=(), contexts=(), vacmGroups=(), vacmAccesses=(),
+             vacmViews=(), vacmUsers=(), notificationTargets=(),
+             processes=None):
+    """Add many LCD entries at once.
+
+    Each item of the iterables is either a sequence of positional or
+    a dict of keyword arguments to the respective `add*()` function
+    (e.g. :py:func:`addTargetAddr` for *targetAddrs*). USM passphrases
+    are hashed up front as :py:func:`addV3Users` does.
+
+    Rather than re-creating rows one by one, all rows are destroyed
+    in a single pass over MIB instrumentation and then created in
+    another one, so that MIB-backed caches get rebuilt just once.
+    Plain columns (USM keys, contexts) are written in a third pass.
+
+    Should the creation or the plain columns pass fail, the rows
+    written by the batch are destroyed, the rows they were to replace
+    are re-created from their column values read before the batch and
+    the error is raised. Restored rows get back their readable columns
+    only. A failed destroy pass is undone by MIB instrumentation alone.
+    """
+    batch = zip(__batchOrder, (v1Systems, v3Users, targetParams, targetAddrs,
+                               contexts, vacmGroups, vacmAccesses, vacmViews,
+                               vacmUsers, notificationTargets))
+
+    __addBatch(
+        snmpEngine, [(entryType, [isinstance(item, dict) and ((), item) or (item, {})
+                                  for item in items])
+                     for entryType, items in batch], processes
+    )
+
+
+def __addBatch(snmpEngine, batch, processes=None, lineNos=None):
+    writes = []
+
+    for entryType, items in batch:
+        writesFun = __batchWriters[entryType]
+
+        if entryType == 'v3User':
+            hashedPassphrases = __hashV3UserPassphrases(snmpEngine, items, processes)
+            extraArgs = {'hashedPassphrases': hashedPassphrases}
+        else:
+            extraArgs = {}
+
+        for itemIdx, (args, kwargs) in enumerate(items):
+            kwargs = dict(kwargs)
+            kwargs.update(extraArgs)
+
+            try:
+                writes.extend(writesFun(snmpEngine, *args, **kwargs))
+
+            except (TypeError, error.PySnmpError):
+                if lineNos is None:
+                    raise
+
+                raise error.PySnmpError(
+                    'Bad %s entry at line %d: %s' % (
+                        entryType, lineNos[entryType][itemIdx], sys.exc_info()[1])
+                )
+
+    # Later entries override earlier ones just like repeated add*() calls do
+    rows = {}
+    columns = {}
+
+    for rowStatusName, rowVarBinds in writes:
+        if rowStatusName:
+            rows[rowStatusName] = rowVarBinds
+        else:
+            for name, value in rowVarBinds:
+                columns[name] = value
+
+    if not rows and not columns:
+        return
+
+    mibInstrumController = snmpEngine.msgAndPduDsp.mibInstrumController
+
+    # Whole batch stays in memory till the end of MIB transaction, there is
+    # nothing for garbage collector to find in there
+    gcEnabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        if rows:
+            backup, backupColumns = __backupRows(mibInstrumController, rows, columns)
+
+            mibInstrumController.writeVars(
+                [(rowStatusName, 'destroy') for rowStatusName in rows]
+            )
+
+        try:
+            if rows:
+                mibInstrumController.writeVars(
+                    [varBind for rowVarBinds in rows.values() for varBind in rowVarBinds]
+                )
+
+            # Plain columns of augmenting tables come into existence with their rows
+            if columns:
+                mibInstrumController.writeVars(list(columns.items()))
+
+        except error.PySnmpError:
+            if rows:
+                __restoreRows(mibInstrumController, rows, backup, backupColumns)
+            raise
+
+    finally:
+        if gcEnabled:
+            gc.enable()
+
+
+def __readExisting(mibInstrumController, names):
+    return [(name, value) for name, value in
+            mibInstrumController.readVars([(name, None) for name in names])
+            if not (value.isSameTypeWith(rfc1905.noSuchInstance) or
+                    value.isSameTypeWith(rfc1905.noSuchObject)) and
+            value.hasValue()]
+
+
+def __backupRows(mibInstrumController, rows, columns):
+    # Read back existing rows to be re-created so that they could be
+    # restored should new rows fail
+    backup = []
+
+    for rowStatusName, rowStatus in __readExisting(mibInstrumController, rows):
+        if rowStatus == 0:  # left over by destruction of absent row
+            continue
+
+        rowVarBinds = __readExisting(
+            mibInstrumController, [name for name, value in rows[rowStatusName]
+                                   if name != rowStatusName]
+        )
+
+        # active (1) rows are brought back active, others are left for the user
+        rowVarBinds.append(
+            (rowStatusName, rowStatus == 1 and 'createAndGo' or 'createAndWait')
+        )
+
+        backup.append((rowStatusName, rowVarBinds))
+
+    if backup:
+        # augmenting rows go along with the rows they augment
+        columns = __readExisting(mibInstrumController, columns)
+    else:
+        columns = []
+
+    return backup, columns
+
+
+def __restoreRows(mibInstrumController, rows, backup, columns):
+    mibInstrumController.writeVars(
+        [(rowStatusName, 'destroy') for rowStatusName in rows]
+    )
+
+    if not backup:
+        return
+
+    mibInstrumController.writeVars(
+        [varBind for rowStatusName, rowVarBinds in backup for varBind in rowVarBinds]
+    )
+
+    if columns:
+        mibInstrumController.writeVars(columns)
+
+
+def loadBatch(snmpEngine, lines, processes=None):
+    """Add LCD entries read from JSON lines.
+
+    Each non-empty line of *lines* (e.g. an open file) holds a JSON
+    object whose `type` member names the kind of entry (`v1System`,
+    `v3User`, `targetParams`, `targetAddr`, `context`, `vacmGroup`,
+    `vacmAccess`, `vacmView`, `vacmUser` or `notificationTarget`)
+    while other members are keyword arguments to the respective
+    `add*()` function. Arrays are taken for OIDs and transport
+    addresses. Protocols (`authProtocol`, `privProtocol`) and transport
+    domains (`transportDomain`) are given by their names in this module
+    (e.g. `usmHMACSHAAuthProtocol` or `snmpUDPDomain`). For example:
+
+        {"type": "targetParams", "name": "my-creds", "securityName": "my-area", "securityLevel": "noAuthNoPriv", "mpModel": 1}
+        {"type": "targetAddr", "addrName": "my-router", "transportDomain": "snmpUDPDomain", "transportAddress": ["127.0.0.1", 161], "params": "my-creds"}
+
+    All entries are then added at once as :py:func:`addBatch` does.
+    Malformed entries, including unknown or missing arguments, raise
+    :py:class:`~pysnmp.error.PySnmpError` naming the offending line.
+    """
+    batch = dict([(entryType, []) for entryType in __batchWriters])
+    lineNos = dict([(entryType, []) for entryType in __batchWriters])
+
+    for lineNo, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            kwargs = json.loads(line)
+            entryType = kwargs.pop('type')
+
+        except (ValueError, KeyError, AttributeError, TypeError):
+            raise error.PySnmpError(
+                'Bad LCD entry at line %d: %s' % (lineNo + 1, sys.exc_info()[1])
+            )
+
+        if entryType not in batch:
+            raise error.PySnmpError(
+                'Unknown LCD entry type %s at line %d' % (entryType, lineNo + 1)
+            )
+
+        params = {}
+
+        for key, value in kwargs.items():
+            if isinstance(value, list):
+                value = __jsonToTuple(value)
+            elif key in __batchConstants:
+                try:
+                    value = __batchConstants[key][value]
+                except (KeyError, TypeError):
+                    raise error.PySnmpError(
+                        'Unknown %s %s at line %d' % (key, value, lineNo + 1)
+                    )
+            params[str(key)] = value
+
+        batch[entryType].append(((), params))
+        lineNos[entryType].append(lineNo + 1)
+
+    __addBatch(snmpEngine, [(entryType, batch[entryType]) for entryType in __batchOrder],
+               processes, lineNos)
+
+
+def __jsonToTuple(value):
+    return tuple([isinstance(x, list) and __jsonToTuple(x) or x for x in value])
@@ -8,13 +8,16 @@ import os
 import shutil
 import sys
 import tempfile
+from time import time
 from pyasn1.compat.octets import str2octs
+from pyasn1.codec.ber import encoder, decoder
 from pysnmp.proto.rfc3412 import MsgAndPduDispatcher
 from pysnmp.proto.mpmod.rfc2576 import SnmpV1MessageProcessingModel, SnmpV2cMessageProcessingModel
 from pysnmp.proto.mpmod.rfc3412 import SnmpV3MessageProcessingModel
 from pysnmp.proto.secmod.rfc2576 import SnmpV1SecurityModel, SnmpV2cSecurityModel
 from pysnmp.proto.secmod.rfc3414 import SnmpUSMSecurityModel
 from pysnmp.proto.acmod import rfc3415, void
+from pysnmp.proto import ber
 from pysnmp.entity import observer
 from pysnmp import debug
 from pysnmp import error
@@ -44,6 +47,10 @@ class SnmpEngine(object):
         Unique and unambiguous identifier of an SNMP engine.
         If not given, `snmpEngineID` is autogenerated and stored on
         the filesystem. See :RFC:`3411#section-3.1.1`  for details.
+    fastCodec : :py:class:`bool`
+        If `True`, SNMP messages are serialized by SNMP-specific
+        BER codec rather than by generic pyasn1 codec. See
+        :py:meth:`enableFastCodec` for details.
 
     Examples
     --------
@@ -54,15 +61,25 @@ class SnmpEngine(object):
     """
 
     def __init__(self, snmpEngineID=None, maxMessageSize=65507,
-                 msgAndPduDsp=None):
+                 msgAndPduDsp=None, fastCodec=False):
         self.cache = {}
 
+        self.berEncoder = encoder
+        self.berDecoder = decoder
+
+        if fastCodec:
+            self.enableFastCodec()
+
         self.observer = observer.MetaObserver()
 
         if msgAndPduDsp is None:
             self.msgAndPduDsp = MsgAndPduDispatcher()
         else:
             self.msgAndPduDsp = msgAndPduDsp
+
+        # SNMP statistics counters, shared with the dispatcher
+        self.statistics = self.msgAndPduDsp.statistics
+
         self.messageProcessingSubsystems = {
             SnmpV1MessageProcessingModel.messageProcessingModelID:
                 SnmpV1MessageProcessingModel(),
@@ -83,6 +100,9 @@ class SnmpEngine(object):
 
         self.transportDispatcher = None
 
+        # Delayed call running MP and SM housekeeping
+        self.__housekeepingTimer = None
+
         if self.msgAndPduDsp.mibInstrumController is None:
             raise error.PySnmpError(
                 'MIB instrumentation does not yet exist'
@@ -148,17 +168,41 @@ class SnmpEngine(object):
 
     def __receiveMessageCbFun(self, transportDispatcher, transportDomain,
                               transportAddress, wholeMsg):
+        # incoming messages may leave state behind to expire
+        if self.__housekeepingTimer is None:
+            self.__scheduleHousekeeping()
+
         self.msgAndPduDsp.receiveMessage(
             self, transportDomain, transportAddress, wholeMsg
         )
 
-    def __receiveTimerTickCbFun(self, timeNow):
+    def __scheduleHousekeeping(self):
+        self.__housekeepingTimer = self.transportDispatcher.callLater(
+            self.transportDispatcher.getTimerResolution(),
+            self.__receiveTimerTickCbFun
+        )
+
+    def __receiveTimerTickCbFun(self):
+        self.__housekeepingTimer = None
+
+        if self.transportDispatcher is None:
+            return
+
+        timeNow = time()
+
         self.msgAndPduDsp.receiveTimerTick(self, timeNow)
         for mpHandler in self.messageProcessingSubsystems.values():
             mpHandler.receiveTimerTick(self, timeNow)
         for smHandler in self.securityModels.values():
             smHandler.receiveTimerTick(self, timeNow)
 
+        # keep ticking while anything is left to expire, sleep otherwise
+        for handler in (list(self.messageProcessingSubsystems.values()) +
+                        list(self.securityModels.values())):
+            if handler.expirationsArePending():
+                self.__scheduleHousekeeping()
+                break
+
     def registerTransportDispatcher(self, transportDispatcher, recvId=None):
         if self.transportDispatcher is not None and \
                 self.transportDispatcher is not transportDispatcher:
@@ -169,9 +213,6 @@ class SnmpEngine(object):
             self.__receiveMessageCbFun, recvId
         )
         if self.transportDispatcher is None:
-            transportDispatcher.registerTimerCbFun(
-                self.__receiveTimerTickCbFun
-            )
             self.transportDispatcher = transportDispatcher
 
     def unregisterTransportDispatcher(self, recvId=None):
@@ -180,9 +221,43 @@ class SnmpEngine(object):
                 'Transport dispatcher not registered'
             )
         self.transportDispatcher.unregisterRecvCbFun(recvId)
-        self.transportDispatcher.unregisterTimerCbFun()
+        if self.__housekeepingTimer is not None:
+            self.__housekeepingTimer.cancel()
+            self.__housekeepingTimer = None
         self.transportDispatcher = None
 
+    def enableFastCodec(self, flag=True):
+        """Switch SNMP message serialization codec.
+
+        SNMP-specific BER codec yields the same pyasn1 objects as
+        generic pyasn1 codec does, though several times faster. Whatever
+        it can not handle (including malformed messages) is passed
+        over to pyasn1 codec.
+
+        SNMP-specific codec requires pyasn1 0.4.1 or later, with older
+        pyasn1 generic pyasn1 codec remains in use.
+
+        Parameters
+        ----------
+        flag : :py:class:`bool`
+            If `True`, SNMP-specific codec is used, otherwise generic
+            pyasn1 codec is used.
+        """
+        if flag and not ber.isSupported:
+            debug.logger & debug.flagApp and debug.logger(
+                'enableFastCodec: SNMP-specific BER codec requires pyasn1 0.4.1+, running %s' % ber.pyasn1Version)
+            flag = False
+
+        if flag:
+            self.berEncoder = ber.encoder
+            self.berDecoder = ber.decoder
+        else:
+            self.berEncoder = encoder
+            self.berDecoder = decoder
+
+        debug.logger & debug.flagApp and debug.logger(
+            'enableFastCodec: SNMP-specific BER codec %s' % (flag and 'enabled' or 'disabled'))
+
     def getMibBuilder(self):
         return self.msgAndPduDsp.mibInstrumController.mibBuilder
 
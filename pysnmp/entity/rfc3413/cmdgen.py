@@ -12,6 +12,7 @@ from pysnmp.proto.proxy import rfc2576
 from pysnmp import error, nextid, debug
 from pysnmp.proto.error import StatusInformation
 from pyasn1.type import univ
+from pyasn1.error import PyAsn1Error
 
 getNextHandle = nextid.Integer(0x7fffffff)
 
@@ -40,6 +41,81 @@ def getNextVarBinds(varBinds, origVarBinds=None):
     return errorIndication, rspVarBinds
 
 
+class PreparedPdu(object):
+    """Request PDU serialized in advance for repeated sending.
+
+    Var-bind list of the PDU is BER-encoded once per PDU version and
+    then copied into every SNMP message carrying this request as-is.
+    The rest of the message (e.g. request-id, msgID, snmpEngineBoots,
+    snmpEngineTime, authentication digest) is built for every request
+    as usual.
+
+    Parameters
+    ----------
+    PDU : :py:class:`~pysnmp.proto.rfc1905.PDU`
+        SNMPv2c request PDU which must not be changed afterwards.
+    """
+    def __init__(self, PDU):
+        self.PDU = PDU
+        # pduVersion -> request PDU carrying serialized var-binds
+        self.__wirePdus = {}
+
+    def getWirePdu(self, snmpEngine, pduVersion):
+        try:
+            return self.__wirePdus[pduVersion]
+
+        except KeyError:
+            pass
+
+        if pduVersion == 0:
+            wirePdu = rfc2576.v2ToV1(self.PDU)
+        else:
+            wirePdu = self.PDU.clone()
+            for idx in range(len(self.PDU.componentType)):
+                wirePdu.setComponentByPosition(
+                    idx, self.PDU.getComponentByPosition(idx)
+                )
+
+        try:
+            varBinds = snmpEngine.berEncoder.encode(
+                wirePdu.getComponentByPosition(3)
+            )
+
+        except PyAsn1Error:
+            debug.logger & debug.flagApp and debug.logger(
+                'getWirePdu: var-binds serialization failure: %s' % sys.exc_info()[1])
+            raise StatusInformation(errorIndication=errind.serializationError)
+
+        # serialized var-binds go into the message as-is
+        wirePdu.setComponentByPosition(
+            3, univ.Any(varBinds), verifyConstraints=False,
+            matchTags=False, matchConstraints=False
+        )
+
+        debug.logger & debug.flagApp and debug.logger(
+            'getWirePdu: var-binds serialized for PDU version %s' % pduVersion)
+
+        self.__wirePdus[pduVersion] = wirePdu
+
+        return wirePdu
+
+
+def _getRequestPdu(snmpEngine, PDU, messageProcessingModel):
+    # User-side API assumes SMIv2
+    if messageProcessingModel == 0:
+        pduVersion = 0
+    else:
+        pduVersion = 1
+
+    if isinstance(PDU, PreparedPdu):
+        return PDU.getWirePdu(snmpEngine, pduVersion), pduVersion
+
+    if pduVersion == 0:
+        PDU = rfc2576.v2ToV1(PDU)
+
+    return PDU, pduVersion
+
+
 class CommandGenerator(object):
     _null = univ.Null('')
 
@@ -86,13 +162,9 @@ class CommandGenerator(object):
                 cbFun(snmpEngine, origSendRequestHandle, errorIndication, None, cbCtx)
                 return
 
-            # User-side API assumes SMIv2
-            if origMessageProcessingModel == 0:
-                reqPDU = rfc2576.v2ToV1(origPdu)
-                pduVersion = 0
-            else:
-                reqPDU = origPdu
-                pduVersion = 1
+            reqPDU, pduVersion = _getRequestPdu(
+                snmpEngine, origPdu, origMessageProcessingModel
+            )
 
             try:
                 sendPduHandle = snmpEngine.msgAndPduDsp.sendPdu(
@@ -100,8 +172,9 @@ class CommandGenerator(object):
                     origMessageProcessingModel, origSecurityModel,
                     origSecurityName, origSecurityLevel, origContextEngineId,
                     origContextName, pduVersion, reqPDU,
-                    True, origTimeout, self.processResponsePdu,
-                    (origSendRequestHandle, cbFun, cbCtx))
+                    True, cbFun=self.processResponsePdu,
+                    cbCtx=(origSendRequestHandle, cbFun, cbCtx),
+                    timeoutInSeconds=origTimeout)
 
                 snmpEngine.transportDispatcher.jobStarted(id(self))
 
@@ -137,6 +210,9 @@ class CommandGenerator(object):
                   'badResponse', None, cbCtx)
             return
 
+        if isinstance(origPdu, PreparedPdu):
+            origPdu = origPdu.PDU
+
         # User-side API assumes SMIv2
         if messageProcessingModel == 0:
             PDU = rfc2576.v1ToV2(PDU, origPdu)
@@ -158,8 +234,9 @@ class CommandGenerator(object):
          securityName,
          securityLevel) = config.getTargetInfo(snmpEngine, targetName)
 
-        # Convert timeout in seconds into timeout in timer ticks
-        timeoutInTicks = float(timeout) / 100 / snmpEngine.transportDispatcher.getTimerResolution()
+        # Timeout in hundredths of a second into seconds, requests time
+        # out by dispatcher delayed calls regardless of timer resolution
+        timeoutInSeconds = float(timeout) / 100
 
         SnmpEngineID, SnmpAdminString = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
             'SNMP-FRAMEWORK-MIB', 'SnmpEngineID', 'SnmpAdminString')
@@ -171,12 +248,9 @@ class CommandGenerator(object):
 
         origPDU = PDU
 
-        # User-side API assumes SMIv2
-        if messageProcessingModel == 0:
-            PDU = rfc2576.v2ToV1(PDU)
-            pduVersion = 0
-        else:
-            pduVersion = 1
+        PDU, pduVersion = _getRequestPdu(
+            snmpEngine, PDU, messageProcessingModel
+        )
 
         sendRequestHandle = getNextHandle()
 
@@ -185,8 +259,9 @@ class CommandGenerator(object):
             snmpEngine, transportDomain, transportAddress,
             messageProcessingModel, securityModel, securityName,
             securityLevel, contextEngineId, contextName,
-            pduVersion, PDU, True, timeoutInTicks, self.processResponsePdu,
-            (sendRequestHandle, cbFun, cbCtx)
+            pduVersion, PDU, True, cbFun=self.processResponsePdu,
+            cbCtx=(sendRequestHandle, cbFun, cbCtx),
+            timeoutInSeconds=timeoutInSeconds
         )
 
         snmpEngine.transportDispatcher.jobStarted(id(self))
@@ -194,13 +269,13 @@ class CommandGenerator(object):
         self.__pendingReqs[sendPduHandle] = (
             transportDomain, transportAddress, messageProcessingModel,
             securityModel, securityName, securityLevel, contextEngineId,
-            contextName, pduVersion, origPDU, timeoutInTicks,
+            contextName, pduVersion, origPDU, timeoutInSeconds,
             retryCount, 0, 0
         )
 
         debug.logger & debug.flagApp and debug.logger(
-            'sendPdu: sendPduHandle %s, timeout %d*10 ms/%d ticks, retry 0 of %d' % (
-                sendPduHandle, timeout, timeoutInTicks, retryCount))
+            'sendPdu: sendPduHandle %s, timeout %d*10 ms, retry 0 of %d' % (
+                sendPduHandle, timeout, retryCount))
 
         return sendRequestHandle
 
@@ -219,13 +294,34 @@ class GetCommandGenerator(CommandGenerator):
               PDU and v2c.apiPDU.getErrorIndex(PDU, muteErrors=True) or 0,
               PDU and v2c.apiPDU.getVarBinds(PDU) or (), cbCtx)
 
-    def sendVarBinds(self, snmpEngine, targetName, contextEngineId,
-                     contextName, varBinds, cbFun, cbCtx=None):
+    @staticmethod
+    def prepareVarBinds(varBinds):
+        """Serialize var-binds in advance for repeated requests.
+
+        Returned object can be passed to :py:meth:`sendVarBinds` in
+        place of `varBinds` any number of times.
+        """
         reqPDU = v2c.GetRequestPDU()
         v2c.apiPDU.setDefaults(reqPDU)
 
         v2c.apiPDU.setVarBinds(reqPDU, varBinds)
 
+        return PreparedPdu(reqPDU)
+
+    def sendVarBinds(self, snmpEngine, targetName, contextEngineId,
+                     contextName, varBinds, cbFun, cbCtx=None):
+        if isinstance(varBinds, PreparedPdu):
+            if not varBinds.PDU.isSameTypeWith(v2c.GetRequestPDU()):
+                raise error.PySnmpError('Prepared PDU type mismatch')
+
+            reqPDU = varBinds
+
+        else:
+            reqPDU = v2c.GetRequestPDU()
+            v2c.apiPDU.setDefaults(reqPDU)
+
+            v2c.apiPDU.setVarBinds(reqPDU, varBinds)
+
         return self.sendPdu(snmpEngine, targetName, contextEngineId,
                             contextName, reqPDU, self.processResponseVarBinds,
                             (cbFun, cbCtx))
@@ -241,13 +337,34 @@ class SetCommandGenerator(CommandGenerator):
               PDU and v2c.apiPDU.getErrorIndex(PDU, muteErrors=True) or 0,
               PDU and v2c.apiPDU.getVarBinds(PDU) or (), cbCtx)
 
-    def sendVarBinds(self, snmpEngine, targetName, contextEngineId,
-                     contextName, varBinds, cbFun, cbCtx=None):
+    @staticmethod
+    def prepareVarBinds(varBinds):
+        """Serialize var-binds in advance for repeated requests.
+
+        Returned object can be passed to :py:meth:`sendVarBinds` in
+        place of `varBinds` any number of times.
+        """
         reqPDU = v2c.SetRequestPDU()
         v2c.apiPDU.setDefaults(reqPDU)
 
         v2c.apiPDU.setVarBinds(reqPDU, varBinds)
 
+        return PreparedPdu(reqPDU)
+
+    def sendVarBinds(self, snmpEngine, targetName, contextEngineId,
+                     contextName, varBinds, cbFun, cbCtx=None):
+        if isinstance(varBinds, PreparedPdu):
+            if not varBinds.PDU.isSameTypeWith(v2c.SetRequestPDU()):
+                raise error.PySnmpError('Prepared PDU type mismatch')
+
+            reqPDU = varBinds
+
+        else:
+            reqPDU = v2c.SetRequestPDU()
+            v2c.apiPDU.setDefaults(reqPDU)
+
+            v2c.apiPDU.setVarBinds(reqPDU, varBinds)
+
         return self.sendPdu(snmpEngine, targetName, contextEngineId,
                             contextName, reqPDU,
                             self.processResponseVarBinds, (cbFun, cbCtx))
@@ -5,6 +5,8 @@
 # License: http://snmplabs.com/pysnmp/license.html
 #
 import sys
+from pyasn1.type import univ
+from pyasn1.codec.ber import encoder
 from pysnmp.proto import rfc1902, rfc1905, rfc3411, errind, error
 from pysnmp.proto.api import v2c  # backend is always SMIv2 compliant
 from pysnmp.proto.proxy import rfc2576
@@ -12,6 +14,46 @@ import pysnmp.smi.error
 from pysnmp import debug
 
 
+def _getTlvSize(length):
+    if length < 0x80:
+        return length + 2
+    elif length < 0x100:
+        return length + 3
+    elif length < 0x10000:
+        return length + 4
+    return length + 5
+
+
+def _getOidSize(oid):
+    length = 0
+    for subId in oid[2:]:
+        length += subId < 0x80 and 1 or (subId.bit_length() + 6) // 7
+    # first two sub-IDs are packed together
+    subId = oid[0] * 40 + oid[1]
+    length += subId < 0x80 and 1 or (subId.bit_length() + 6) // 7
+    return _getTlvSize(length)
+
+
+def _getVarBindSize(varBind):
+    """Estimate BER-encoded var-bind size without encoding it"""
+    name, value = varBind
+    if isinstance(value, univ.OctetString):
+        valueSize = _getTlvSize(len(value))
+    elif isinstance(value, univ.Integer):
+        value = int(value)
+        if value < 0:
+            value = ~value
+        valueSize = _getTlvSize(value.bit_length() // 8 + 1)
+    elif isinstance(value, univ.Null):
+        valueSize = 2
+    elif isinstance(value, univ.ObjectIdentifier):
+        valueSize = _getOidSize(value)
+    else:
+        valueSize = len(encoder.encode(value))
+
+    return _getTlvSize(_getOidSize(name) + valueSize)
+
+
 # 3.2
 class CommandResponderBase(object):
     acmID = 3  # default MIB access control method to use
@@ -85,15 +127,38 @@ class CommandResponderBase(object):
         except error.StatusInformation:
             debug.logger & debug.flagApp and debug.logger(
                 'sendPdu: stateReference %s, statusInformation %s' % (stateReference, sys.exc_info()[1]))
-            snmpSilentDrops, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols('__SNMPv2-MIB',
-                                                                                                     'snmpSilentDrops')
-            snmpSilentDrops.syntax += 1
+            snmpEngine.statistics.snmpSilentDrops += 1
 
     _getRequestType = rfc1905.GetRequestPDU.tagSet
     _getNextRequestType = rfc1905.GetNextRequestPDU.tagSet
     _setRequestType = rfc1905.SetRequestPDU.tagSet
     _counter64Type = rfc1902.Counter64.tagSet
 
+    def _getMaxSizeResponseScopedPDU(self, stateReference):
+        return self.__pendingReqs[stateReference][9]
+
+    # Encoded response PDU size less var-binds: PDU tag and length,
+    # request-id, error-status, error-index, var-binds tag and length
+    pduHeaderSize = 20
+
+    # SNMPv3 scopedPDU size less context fields and PDU: SEQUENCE tag
+    # and length, encryptedPDU tag and length, cipher block padding
+    scopedPduHeaderSize = 24
+
+    def _getResponseHeaderSize(self, stateReference):
+        """Estimate response scopedPDU size less var-binds (an upper bound)"""
+        (messageProcessingModel, securityModel, securityName,
+         securityLevel, contextEngineId, contextName,
+         pduVersion, PDU, origPdu, maxSizeResponseScopedPDU,
+         statusInformation) = self.__pendingReqs[stateReference]
+
+        if messageProcessingModel == 3:
+            return (self.pduHeaderSize + self.scopedPduHeaderSize +
+                    _getTlvSize(len(contextEngineId)) +
+                    _getTlvSize(len(contextName)))
+
+        return self.pduHeaderSize
+
     def releaseStateInformation(self, stateReference):
         if stateReference in self.__pendingReqs:
             del self.__pendingReqs[stateReference]
@@ -214,13 +279,13 @@ class CommandResponderBase(object):
             elif errorIndication == errind.otherError:
                 raise pysnmp.smi.error.GenError(name=name, idx=idx)
             elif errorIndication == errind.noSuchContext:
+                snmpEngine.statistics.snmpUnknownContexts += 1
                 snmpUnknownContexts, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
                     '__SNMP-TARGET-MIB', 'snmpUnknownContexts')
-                snmpUnknownContexts.syntax += 1
                 # Request REPORT generation
                 raise pysnmp.smi.error.GenError(name=name, idx=idx,
                                                 oid=snmpUnknownContexts.name,
-                                                val=snmpUnknownContexts.syntax)
+                                                val=snmpUnknownContexts.syntax.clone())
             elif errorIndication == errind.notInView:
                 return 1
             else:
@@ -292,22 +357,40 @@ class BulkCommandResponder(CommandResponderBase):
         R = max(len(reqVarBinds) - N, 0)
 
         if R:
-            M = min(M, self.maxVarBinds / R)
+            M = min(M, self.maxVarBinds // R)
 
         debug.logger & debug.flagApp and debug.logger('handleMgmtOperation: N %d, M %d, R %d' % (N, M, R))
 
-        mgmtFun = self.snmpContext.getMibInstrum(contextName).readNextVars
+        mibInstrum = self.snmpContext.getMibInstrum(contextName)
 
         if N:
-            rspVarBinds = mgmtFun(reqVarBinds[:N], (acFun, acCtx))
+            rspVarBinds = mibInstrum.readNextVars(reqVarBinds[:N], (acFun, acCtx))
         else:
             rspVarBinds = []
 
-        varBinds = reqVarBinds[-R:]
-        while M and R:
-            rspVarBinds.extend(mgmtFun(varBinds, (acFun, acCtx)))
-            varBinds = rspVarBinds[-R:]
-            M -= 1
+        # rfc3416: 4.2.3 -- repetitions not fitting into response are dropped
+        maxSize = self._getMaxSizeResponseScopedPDU(stateReference)
+        if maxSize is not None:
+            maxSize = int(maxSize) - self._getResponseHeaderSize(stateReference)
+            for varBind in rspVarBinds:
+                maxSize -= _getVarBindSize(varBind)
+
+        if M and R:
+            for varBinds in mibInstrum.iterNextVars(reqVarBinds[-R:], (acFun, acCtx)):
+                if maxSize is not None:
+                    for varBind in varBinds:
+                        maxSize -= _getVarBindSize(varBind)
+
+                    if maxSize < 0 and rspVarBinds:
+                        debug.logger & debug.flagApp and debug.logger(
+                            'handleMgmtOperation: response size limit reached, %d repetitions left' % M)
+                        break
+
+                rspVarBinds.extend(varBinds)
+
+                M -= 1
+                if not M:
+                    break
 
         if len(rspVarBinds):
             self.sendVarBinds(snmpEngine, stateReference, 0, 0, rspVarBinds)
@@ -4,27 +4,100 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+from bisect import bisect
 from pysnmp.smi.error import SmiError, NoSuchInstanceError
 from pysnmp.entity import config
 
 
+def _importTableRows(cache, mibBuilder, *symbols):
+    # Return MIB table row objects re-imported on MIB changes only.
+    # Cached rows are dropped altogether once table objects get replaced
+    if cache['buildId'] != mibBuilder.lastBuildId:
+        mibTableRows = tuple(
+            [mibBuilder.importSymbols(modName, symName)[0] for modName, symName in symbols]
+        )
+
+        for mibTableRow, cachedMibTableRow in zip(mibTableRows, cache['mibTableRows']):
+            if mibTableRow is not cachedMibTableRow:
+                cache['id'] = -1
+
+        cache['mibTableRows'] = mibTableRows
+        cache['buildId'] = mibBuilder.lastBuildId
+
+    return cache['mibTableRows']
+
+
+def _getRowChanges(cache, *mibTableRows):
+    # Return instance IDs of table rows written since last call or
+    # None if cache should be dropped altogether
+    versionIds = tuple([x.branchVersionId for x in mibTableRows])
+
+    if cache['id'] == versionIds:
+        return []
+
+    changes = []
+
+    if cache['id'] != -1:
+        for mibTableRow, versionId in zip(mibTableRows, cache['id']):
+            rowChanges = mibTableRow.getChanges(versionId)
+            if rowChanges is None:
+                changes = None
+                break
+
+            changes.extend(rowChanges)
+
+    else:
+        changes = None
+
+    cache['id'] = versionIds
+
+    return changes
+
+
+def _dropCachedRows(cache, cacheMap, changes):
+    if changes is None:
+        cacheMap.clear()
+        cache['instIdToKeys'] = {}
+
+    else:
+        instIdToKeys = cache['instIdToKeys']
+
+        for instId in changes:
+            for key in instIdToKeys.pop(instId, ()):
+                cacheMap.pop(key, None)
+
+
+def _addCachedRow(cache, cacheMap, key, instId, value):
+    cacheMap[key] = value
+
+    instIdToKeys = cache['instIdToKeys']
+
+    if instId in instIdToKeys:
+        instIdToKeys[instId].append(key)
+    else:
+        instIdToKeys[instId] = [key]
+
+
 def getTargetAddr(snmpEngine, snmpTargetAddrName):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
-    snmpTargetAddrEntry, = mibBuilder.importSymbols(
-        'SNMP-TARGET-MIB', 'snmpTargetAddrEntry'
-    )
-
     cache = snmpEngine.getUserContext('getTargetAddr')
     if cache is None:
-        cache = {'id': -1}
+        cache = {'id': -1, 'buildId': -1, 'mibTableRows': (), 'nameToTargetMap': {}}
         snmpEngine.setUserContext(getTargetAddr=cache)
 
-    if cache['id'] != snmpTargetAddrEntry.branchVersionId:
-        cache['nameToTargetMap'] = {}
+    snmpTargetAddrEntry, snmpSourceAddrEntry = _importTableRows(
+        cache, mibBuilder, ('SNMP-TARGET-MIB', 'snmpTargetAddrEntry'),
+        ('PYSNMP-SOURCE-MIB', 'snmpSourceAddrEntry')
+    )
 
     nameToTargetMap = cache['nameToTargetMap']
 
+    if cache['id'] != (snmpTargetAddrEntry.branchVersionId,
+                       snmpSourceAddrEntry.branchVersionId):
+        changes = _getRowChanges(cache, snmpTargetAddrEntry, snmpSourceAddrEntry)
+        _dropCachedRows(cache, nameToTargetMap, changes)
+
     if snmpTargetAddrName not in nameToTargetMap:
         (snmpTargetAddrTDomain,
          snmpTargetAddrTAddress,
@@ -69,26 +142,31 @@ def getTargetAddr(snmpEngine, snmpTargetAddrName):
             snmpTargetAddrTAddress = transport.addressType(
                 SnmpUDPAddress(snmpTargetAddrTAddress)
             ).setLocalAddress(SnmpUDPAddress(snmpSourceAddrTAddress))
-        elif snmpTargetAddrTDomain[:len(config.snmpUDP6Domain)] == config.snmpUDP6Domain:
+        elif (snmpTargetAddrTDomain[:len(config.snmpUDP6Domain)] == config.snmpUDP6Domain or
+              snmpTargetAddrTDomain[:len(config.snmpTCP6Domain)] == config.snmpTCP6Domain):
             TransportAddressIPv6, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
                 'TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv6')
             snmpTargetAddrTAddress = transport.addressType(
                 TransportAddressIPv6(snmpTargetAddrTAddress)
             ).setLocalAddress(TransportAddressIPv6(snmpSourceAddrTAddress))
+        elif snmpTargetAddrTDomain[:len(config.snmpTCPDomain)] == config.snmpTCPDomain:
+            TransportAddressIPv4, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
+                'TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv4')
+            snmpTargetAddrTAddress = transport.addressType(
+                TransportAddressIPv4(snmpTargetAddrTAddress)
+            ).setLocalAddress(TransportAddressIPv4(snmpSourceAddrTAddress))
         elif snmpTargetAddrTDomain[:len(config.snmpLocalDomain)] == config.snmpLocalDomain:
             snmpTargetAddrTAddress = transport.addressType(
                 snmpTargetAddrTAddress
             )
 
-        nameToTargetMap[snmpTargetAddrName] = (
+        _addCachedRow(cache, nameToTargetMap, snmpTargetAddrName, tblIdx, (
             snmpTargetAddrTDomain,
             snmpTargetAddrTAddress,
             snmpTargetAddrTimeout,
             snmpTargetAddrRetryCount,
             snmpTargetAddrParams
-        )
-
-        cache['id'] = snmpTargetAddrEntry.branchVersionId
+        ))
 
     return nameToTargetMap[snmpTargetAddrName]
 
@@ -96,20 +174,21 @@ def getTargetAddr(snmpEngine, snmpTargetAddrName):
 def getTargetParams(snmpEngine, paramsName):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
-    snmpTargetParamsEntry, = mibBuilder.importSymbols(
-        'SNMP-TARGET-MIB', 'snmpTargetParamsEntry'
-    )
-
     cache = snmpEngine.getUserContext('getTargetParams')
     if cache is None:
-        cache = {'id': -1}
+        cache = {'id': -1, 'buildId': -1, 'mibTableRows': (), 'nameToParamsMap': {}}
         snmpEngine.setUserContext(getTargetParams=cache)
 
-    if cache['id'] != snmpTargetParamsEntry.branchVersionId:
-        cache['nameToParamsMap'] = {}
+    snmpTargetParamsEntry, = _importTableRows(
+        cache, mibBuilder, ('SNMP-TARGET-MIB', 'snmpTargetParamsEntry')
+    )
 
     nameToParamsMap = cache['nameToParamsMap']
 
+    if cache['id'] != (snmpTargetParamsEntry.branchVersionId,):
+        changes = _getRowChanges(cache, snmpTargetParamsEntry)
+        _dropCachedRows(cache, nameToParamsMap, changes)
+
     if paramsName not in nameToParamsMap:
         (snmpTargetParamsMPModel, snmpTargetParamsSecurityModel,
          snmpTargetParamsSecurityName,
@@ -137,12 +216,11 @@ def getTargetParams(snmpEngine, paramsName):
         except NoSuchInstanceError:
             raise SmiError('Parameters %s not configured at LCD' % paramsName)
 
-        nameToParamsMap[paramsName] = (snmpTargetParamsMPModel,
-                                       snmpTargetParamsSecurityModel,
-                                       snmpTargetParamsSecurityName,
-                                       snmpTargetParamsSecurityLevel)
-
-        cache['id'] = snmpTargetParamsEntry.branchVersionId
+        _addCachedRow(cache, nameToParamsMap, paramsName, tblIdx,
+                      (snmpTargetParamsMPModel,
+                       snmpTargetParamsSecurityModel,
+                       snmpTargetParamsSecurityName,
+                       snmpTargetParamsSecurityLevel))
 
     return nameToParamsMap[paramsName]
 
@@ -170,19 +248,21 @@ def getTargetInfo(snmpEngine, snmpTargetAddrName):
 def getNotificationInfo(snmpEngine, notificationTarget):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
-    snmpNotifyEntry, = mibBuilder.importSymbols('SNMP-NOTIFICATION-MIB',
-                                                'snmpNotifyEntry')
-
     cache = snmpEngine.getUserContext('getNotificationInfo')
     if cache is None:
-        cache = {'id': -1}
+        cache = {'id': -1, 'buildId': -1, 'mibTableRows': (), 'targetToNotifyMap': {}}
         snmpEngine.setUserContext(getNotificationInfo=cache)
 
-    if cache['id'] != snmpNotifyEntry.branchVersionId:
-        cache['targetToNotifyMap'] = {}
+    snmpNotifyEntry, = _importTableRows(
+        cache, mibBuilder, ('SNMP-NOTIFICATION-MIB', 'snmpNotifyEntry')
+    )
 
     targetToNotifyMap = cache['targetToNotifyMap']
 
+    if cache['id'] != (snmpNotifyEntry.branchVersionId,):
+        changes = _getRowChanges(cache, snmpNotifyEntry)
+        _dropCachedRows(cache, targetToNotifyMap, changes)
+
     if notificationTarget not in targetToNotifyMap:
         (snmpNotifyTag,
          snmpNotifyType) = mibBuilder.importSymbols('SNMP-NOTIFICATION-MIB',
@@ -202,12 +282,10 @@ def getNotificationInfo(snmpEngine, notificationTarget):
         except NoSuchInstanceError:
             raise SmiError('Target %s not configured at LCD' % notificationTarget)
 
-        targetToNotifyMap[notificationTarget] = (
+        _addCachedRow(cache, targetToNotifyMap, notificationTarget, tblIdx, (
             snmpNotifyTag,
             snmpNotifyType
-        )
-
-        cache['id'] = snmpNotifyEntry.branchVersionId
+        ))
 
     return targetToNotifyMap[notificationTarget]
 
@@ -215,44 +293,86 @@ def getNotificationInfo(snmpEngine, notificationTarget):
 def getTargetNames(snmpEngine, tag):
     mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
-    snmpTargetAddrEntry, = mibBuilder.importSymbols('SNMP-TARGET-MIB',
-                                                    'snmpTargetAddrEntry')
-
     cache = snmpEngine.getUserContext('getTargetNames')
     if cache is None:
-        cache = {'id': -1}
+        cache = {'id': -1, 'buildId': -1, 'mibTableRows': ()}
         snmpEngine.setUserContext(getTargetNames=cache)
 
-    if cache['id'] == snmpTargetAddrEntry.branchVersionId:
-        tagToTargetsMap = cache['tagToTargetsMap']
-    else:
-        cache['tagToTargetsMap'] = {}
+    snmpTargetAddrEntry, = _importTableRows(
+        cache, mibBuilder, ('SNMP-TARGET-MIB', 'snmpTargetAddrEntry')
+    )
 
-        tagToTargetsMap = cache['tagToTargetsMap']
+    changes = _getRowChanges(cache, snmpTargetAddrEntry)
 
+    if changes is None or changes:
         (SnmpTagValue, snmpTargetAddrName,
          snmpTargetAddrTagList) = mibBuilder.importSymbols(
             'SNMP-TARGET-MIB', 'SnmpTagValue', 'snmpTargetAddrName',
             'snmpTargetAddrTagList'
         )
-        mibNode = snmpTargetAddrTagList
-        while True:
+
+        if changes is None:
+            # tag -> target names, in table order
+            cache['tagToTargetsMap'] = {}
+            # tag -> instance IDs of target rows, sorted
+            cache['tagToInstIdsMap'] = {}
+            # instance ID of target row -> tags
+            cache['instIdToTagsMap'] = {}
+
+            changes = []
+
+            mibNode = snmpTargetAddrTagList
+            while True:
+                try:
+                    mibNode = snmpTargetAddrTagList.getNextNode(mibNode.name)
+                except NoSuchInstanceError:
+                    break
+
+                changes.append(mibNode.name[len(snmpTargetAddrTagList.name):])
+
+        tagToTargetsMap = cache['tagToTargetsMap']
+        tagToInstIdsMap = cache['tagToInstIdsMap']
+        instIdToTagsMap = cache['instIdToTagsMap']
+
+        for idx in set(changes):
+            for _tag in instIdToTagsMap.pop(idx, ()):
+                instIds = tagToInstIdsMap[_tag]
+                pos = bisect(instIds, idx) - 1
+                del instIds[pos]
+                del tagToTargetsMap[_tag][pos]
+                if not instIds:
+                    del tagToInstIdsMap[_tag]
+                    del tagToTargetsMap[_tag]
+
             try:
-                mibNode = snmpTargetAddrTagList.getNextNode(mibNode.name)
-            except NoSuchInstanceError:
-                break
+                _snmpTargetAddrTagList = snmpTargetAddrTagList.getNode(
+                    snmpTargetAddrTagList.name + idx
+                ).syntax
+                _snmpTargetAddrName = snmpTargetAddrName.getNode(
+                    snmpTargetAddrName.name + idx
+                ).syntax
 
-            idx = mibNode.name[len(snmpTargetAddrTagList.name):]
+            except NoSuchInstanceError:
+                continue  # target is gone
 
-            _snmpTargetAddrName = snmpTargetAddrName.getNode(snmpTargetAddrName.name + idx).syntax
+            tags = []
 
-            for _tag in mibNode.syntax.asOctets().split():
+            for _tag in _snmpTargetAddrTagList.asOctets().split():
                 _tag = SnmpTagValue(_tag)
+                if _tag in tags:
+                    continue
                 if _tag not in tagToTargetsMap:
                     tagToTargetsMap[_tag] = []
-                tagToTargetsMap[_tag].append(_snmpTargetAddrName)
+                    tagToInstIdsMap[_tag] = []
+                instIds = tagToInstIdsMap[_tag]
+                pos = bisect(instIds, idx)
+                instIds.insert(pos, idx)
+                tagToTargetsMap[_tag].insert(pos, _snmpTargetAddrName)
+                tags.append(_tag)
+
+            instIdToTagsMap[idx] = tags
 
-        cache['id'] = snmpTargetAddrEntry.branchVersionId
+    tagToTargetsMap = cache['tagToTargetsMap']
 
     if tag not in tagToTargetsMap:
         raise SmiError('Transport tag %s not configured at LCD' % tag)
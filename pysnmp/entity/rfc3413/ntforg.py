@@ -66,9 +66,6 @@ class NotificationOriginator(object):
                 cbFun(snmpEngine, sendRequestHandle, errorIndication, None, cbCtx)
                 return
 
-            # Convert timeout in seconds into timeout in timer ticks
-            timeoutInTicks = float(origTimeout) / 100 / snmpEngine.transportDispatcher.getTimerResolution()
-
             # User-side API assumes SMIv2
             if messageProcessingModel == 0:
                 reqPDU = rfc2576.v2ToV1(origPdu)
@@ -84,8 +81,9 @@ class NotificationOriginator(object):
                     origMessageProcessingModel, origSecurityModel,
                     origSecurityName, origSecurityLevel,
                     origContextEngineId, origContextName, pduVersion,
-                    reqPDU, True, timeoutInTicks, self.processResponsePdu,
-                    (sendRequestHandle, cbFun, cbCtx)
+                    reqPDU, True, cbFun=self.processResponsePdu,
+                    cbCtx=(sendRequestHandle, cbFun, cbCtx),
+                    timeoutInSeconds=float(origTimeout) / 100
                 )
             except error.StatusInformation:
                 statusInformation = sys.exc_info()[1]
@@ -137,9 +135,6 @@ class NotificationOriginator(object):
 
         # 3.3.5
         if reqPDU.tagSet in rfc3411.confirmedClassPDUs:
-            # Convert timeout in seconds into timeout in timer ticks
-            timeoutInTicks = float(timeout) / 100 / snmpEngine.transportDispatcher.getTimerResolution()
-
             sendRequestHandle = getNextHandle()
 
             # 3.3.6a
@@ -147,8 +142,11 @@ class NotificationOriginator(object):
                 snmpEngine, transportDomain, transportAddress,
                 messageProcessingModel, securityModel, securityName,
                 securityLevel, contextEngineId, contextName,
-                pduVersion, reqPDU, True, timeoutInTicks,
-                self.processResponsePdu, (sendRequestHandle, cbFun, cbCtx)
+                pduVersion, reqPDU, True, cbFun=self.processResponsePdu,
+                cbCtx=(sendRequestHandle, cbFun, cbCtx),
+                # requests time out by dispatcher delayed calls
+                # regardless of timer resolution
+                timeoutInSeconds=float(timeout) / 100
             )
 
             debug.logger & debug.flagApp and debug.logger(
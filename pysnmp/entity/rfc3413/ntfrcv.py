@@ -5,10 +5,17 @@
 # License: http://snmplabs.com/pysnmp/license.html
 #
 import sys
+import socket
+try:
+    import multiprocessing
+except ImportError:
+    multiprocessing = None
 from pyasn1.compat.octets import null
 from pysnmp.proto import rfc3411, error
 from pysnmp.proto.api import v1, v2c  # backend is always SMIv2 compliant
 from pysnmp.proto.proxy import rfc2576
+from pysnmp.carrier.error import CarrierError
+from pysnmp.error import PySnmpError
 from pysnmp import debug
 
 
@@ -88,9 +95,7 @@ class NotificationReceiver(object):
             except error.StatusInformation:
                 debug.logger & debug.flagApp and debug.logger(
                     'processPdu: stateReference %s, statusInformation %s' % (stateReference, sys.exc_info()[1]))
-                snmpSilentDrops, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols('__SNMPv2-MIB',
-                                                                                                         'snmpSilentDrops')
-                snmpSilentDrops.syntax += 1
+                snmpEngine.statistics.snmpSilentDrops += 1
 
         elif PDU.tagSet in rfc3411.unconfirmedClassPDUs:
             pass
@@ -113,3 +118,178 @@ class NotificationReceiver(object):
                 self.__cbFunVer = 1
                 self.__cbFun(snmpEngine, stateReference, contextEngineId,
                              contextName, varBinds, self.__cbCtx)
+
+
+# MIB-defined types can't be pickled, base SMI types are used instead
+_baseTypes = dict(
+    [(x.tagSet, x) for x in (v2c.Integer, v2c.OctetString, v2c.ObjectIdentifier,
+                             v2c.IpAddress, v2c.Counter32, v2c.Gauge32,
+                             v2c.TimeTicks, v2c.Opaque, v2c.Counter64)]
+)
+
+
+def _toBaseType(value):
+    if value.tagSet in _baseTypes:
+        return _baseTypes[value.tagSet](value)
+    return value
+
+
+def _cookNotification(snmpEngine, stateReference, contextEngineId,
+                      contextName, varBinds):
+    transportDomain, transportAddress = snmpEngine.msgAndPduDsp.getTransportInfo(stateReference)
+    return (transportDomain, tuple(transportAddress),
+            _toBaseType(contextEngineId), _toBaseType(contextName),
+            [(_toBaseType(name), _toBaseType(value)) for name, value in varBinds])
+
+
+def _serveNotifications(configFun, cookFun, iface, batchSize, queue, status):
+    from pysnmp.entity import engine, config
+    from pysnmp.carrier.asyncore.dgram import udp, udp6
+
+    try:
+        snmpEngine = engine.SnmpEngine()
+
+        if ':' in iface[0]:
+            transportDomain = udp6.domainName
+            transport = udp6.Udp6Transport()
+        else:
+            transportDomain = udp.domainName
+            transport = udp.UdpTransport()
+
+        transport.enableReusePort().openServerMode(iface)
+
+        if batchSize:
+            transport.enableBatchIo(batchSize)
+
+        config.addTransport(snmpEngine, transportDomain, transport)
+
+        configFun(snmpEngine)
+
+        def cbFun(snmpEngine, stateReference, contextEngineId, contextName,
+                  varBinds, cbCtx):
+            queue.put(cookFun(snmpEngine, stateReference, contextEngineId,
+                              contextName, varBinds))
+
+        NotificationReceiver(snmpEngine, cbFun)
+
+    except Exception:
+        # let parent process know why this worker is gone
+        status.send('%s: %s' % (sys.exc_info()[0].__name__, sys.exc_info()[1]))
+        status.close()
+        return
+
+    status.send(None)
+    status.close()
+
+    snmpEngine.transportDispatcher.jobStarted(1)
+
+    try:
+        snmpEngine.transportDispatcher.runDispatcher()
+
+    finally:
+        snmpEngine.transportDispatcher.closeDispatcher()
+
+
+class NotificationReceiverPool(object):
+    """Receive notifications in a pool of worker processes.
+
+    Each worker process runs its own SNMP engine serving its own UDP
+    socket bound to the same `iface` with SO_REUSEPORT option set so
+    that the kernel spreads incoming datagrams over the workers.
+
+    The `configFun(snmpEngine)` callable is invoked in each worker to
+    populate its LCD (e.g. communities and USM users).
+
+    Received notifications are delivered to the parent process through
+    a shared queue as `(transportDomain, transportAddress,
+    contextEngineId, contextName, varBinds)` tuples holding base SMI
+    types. Optional `cookFun(snmpEngine, stateReference, contextEngineId,
+    contextName, varBinds)` callable invoked in the worker may return
+    any other picklable object to deliver instead.
+    """
+
+    # seconds to wait for a worker process to get ready
+    startTimeout = 15
+
+    def __init__(self, configFun, iface=('0.0.0.0', 162), workers=None,
+                 batchSize=32, queue=None, cookFun=_cookNotification):
+        if multiprocessing is None:
+            raise PySnmpError('multiprocessing module is not available')
+
+        if not hasattr(socket, 'SO_REUSEPORT'):
+            raise CarrierError('SO_REUSEPORT socket option is not supported by this OS and/or Python version')
+
+        self.__configFun = configFun
+        self.__cookFun = cookFun
+        self.__iface = iface
+        self.__workers = workers or multiprocessing.cpu_count()
+        self.__batchSize = batchSize
+        self.__processes = []
+        self.queue = queue or multiprocessing.Queue()
+
+    def start(self):
+        """Start worker processes and wait for them to get ready.
+
+        Raises `PySnmpError` and stops all workers should any of them
+        fail to set up its SNMP engine (e.g. bind UDP socket).
+        """
+        if self.__processes:
+            raise PySnmpError('Notification receiver pool already started')
+
+        statuses = []
+
+        for _ in range(self.__workers):
+            status, workerStatus = multiprocessing.Pipe(False)
+
+            process = multiprocessing.Process(
+                target=_serveNotifications,
+                args=(self.__configFun, self.__cookFun, self.__iface,
+                      self.__batchSize, self.queue, workerStatus)
+            )
+            process.daemon = True
+            process.start()
+
+            workerStatus.close()
+
+            self.__processes.append(process)
+            statuses.append(status)
+
+        failure = None
+
+        for status in statuses:
+            try:
+                if status.poll(self.startTimeout):
+                    failure = failure or status.recv()
+                else:
+                    failure = failure or 'worker process start timed out'
+
+            except EOFError:
+                failure = failure or 'worker process exited prematurely'
+
+            status.close()
+
+        if failure:
+            self.stop()
+            raise PySnmpError('Notification receiver pool failed to start at %s: %s' % (self.__iface, failure))
+
+        debug.logger & debug.flagApp and debug.logger(
+            'start: %d notification receiver processes serving %s' % (self.__workers, self.__iface,))
+
+        return self
+
+    def stop(self):
+        for process in self.__processes:
+            process.terminate()
+
+        for process in self.__processes:
+            process.join()
+
+        self.__processes = []
+
+    def getNotification(self, block=True, timeout=None):
+        """Return next received notification.
+
+        Raises `Queue.Empty` exception if no notification is available
+        in time.
+        """
+        return self.queue.get(block, timeout)
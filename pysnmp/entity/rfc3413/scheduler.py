@@ -0,0 +1,436 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# Periodic polling of many SNMP agents through a single SNMP engine
+#
+import sys
+import heapq
+import random
+from bisect import bisect_left
+from time import time
+from pyasn1.compat.octets import null
+from pysnmp.entity.rfc3413 import cmdgen
+from pysnmp.proto.error import StatusInformation
+from pysnmp import error, nextid, debug
+
+__all__ = ['PollScheduler', 'TokenBucket', 'Histogram']
+
+getNextPollId = nextid.Integer(0x7fffffff)
+
+
+class TokenBucket(object):
+    """Token bucket rate limiter.
+
+    Tokens are added at `rate` per second up to `burst` tokens.
+    Each request takes one token.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second.
+    burst : int
+        Bucket capacity. Default is one second worth of tokens.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise error.PySnmpError('Token bucket rate must be positive')
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self.__tokens = self.burst
+        self.__lastTime = None
+
+    def __refill(self, timeNow):
+        if self.__lastTime is not None and timeNow > self.__lastTime:
+            self.__tokens = min(
+                self.burst,
+                self.__tokens + (timeNow - self.__lastTime) * self.rate
+            )
+        self.__lastTime = timeNow
+
+    def getDelay(self, timeNow):
+        """Return seconds till a token is available, 0 if it is now"""
+        self.__refill(timeNow)
+        if self.__tokens >= 1:
+            return 0
+        return (1 - self.__tokens) / self.rate
+
+    def consume(self, timeNow):
+        """Take a token, return `False` if none is available"""
+        self.__refill(timeNow)
+        if self.__tokens >= 1:
+            self.__tokens -= 1
+            return True
+        return False
+
+
+class Histogram(object):
+    """Distribution of observed values (in seconds) over fixed buckets.
+
+    Parameters
+    ----------
+    bounds : tuple
+        Ascending upper bounds of the buckets. Values above the
+        last bound fall into the implicit `+Inf` bucket.
+    """
+    defaultBounds = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                     0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, bounds=None):
+        self.bounds = tuple(bounds or self.defaultBounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def getBuckets(self):
+        """Return a list of `(upperBound, cumulativeCount)` pairs
+
+        The last pair has `None` for upper bound and counts all values.
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds + (None,), self.counts):
+            total += count
+            buckets.append((bound, total))
+        return buckets
+
+    def getPercentile(self, percentile):
+        """Return upper bound of the bucket the `percentile` falls into
+
+        `None` stands for the `+Inf` bucket or no values observed.
+        """
+        if not self.count:
+            return None
+        rank = self.count * percentile / 100.0
+        for bound, total in self.getBuckets():
+            if total >= rank:
+                return bound
+
+
+class _Poll(object):
+    def __init__(self, targetName, varBinds, interval, cbFun, cbCtx):
+        self.targetName = targetName
+        self.varBinds = varBinds
+        self.interval = interval
+        self.cbFun = cbFun
+        self.cbCtx = cbCtx
+        self.nominalTime = self.dueTime = self.queueTime = 0
+        self.sendTime = None  # response pending if set
+
+
+class PollScheduler(object):
+    """Periodically query many SNMP agents with SNMP GET requests.
+
+    Each poll is a target (as configured by
+    :py:func:`~pysnmp.entity.config.addTargetAddr`), a set of var-binds
+    and a polling interval. Polls are spread over their intervals at
+    random phases and every request is sent with a random delay (jitter)
+    within a fraction of the interval, so that SNMP requests do not come
+    out in bursts.
+
+    Requests are additionally paced by token buckets, one shared by
+    all targets and one per target. Requests waiting for tokens are
+    postponed. A poll which previous request is still pending when the
+    next one is due skips that round.
+
+    How late requests are sent against their schedule and how long
+    they take to complete is collected into histograms.
+
+    The scheduler is driven by the SNMP engine's transport dispatcher
+    delayed calls, so it works with any dispatcher (asyncore, asyncio,
+    Twisted). With asyncore dispatcher, the scheduler keeps
+    :py:meth:`runDispatcher` running till the scheduler gets stopped.
+
+    Parameters
+    ----------
+    snmpEngine : :py:class:`~pysnmp.entity.engine.SnmpEngine`
+        SNMP engine to send requests through.
+    rate : float
+        Maximum requests per second to all targets, `None` stands for
+        no limit.
+    burst : int
+        Maximum requests sent at once to all targets. Default is
+        one second worth of `rate`.
+    targetRate : float
+        Maximum requests per second to each target, `None` stands for
+        no limit.
+    targetBurst : int
+        Maximum requests sent at once to each target. Default is
+        one second worth of `targetRate`.
+    jitter : float
+        Fraction of polling interval to randomly delay each request by.
+    contextEngineId : :py:class:`~pysnmp.proto.rfc1902.OctetString`
+        SNMP context engine ID to query, `None` stands for SNMP agent's
+        engine ID.
+    contextName : :py:class:`~pysnmp.proto.rfc1902.OctetString`
+        SNMP context name to query.
+
+    Examples
+    --------
+    >>> scheduler = PollScheduler(snmpEngine, rate=1000, targetRate=10)
+    >>> scheduler.addPoll('my-router', [((1, 3, 6, 1, 2, 1, 1, 3, 0), None)], 60, cbFun)
+    >>> scheduler.start()
+    >>> snmpEngine.transportDispatcher.runDispatcher()
+    """
+
+    def __init__(self, snmpEngine, rate=None, burst=None,
+                 targetRate=None, targetBurst=None, jitter=0.1,
+                 contextEngineId=None, contextName=null):
+        self.snmpEngine = snmpEngine
+        self.jitter = jitter
+        self.contextEngineId = contextEngineId
+        self.contextName = contextName
+        self.__commandGenerator = cmdgen.GetCommandGenerator()
+        self.__polls = {}
+        self.__queue = []  # (queueTime, pollId)
+        self.__timer = self.__timerTime = None
+        self.__running = False
+        self.__rateLimit = rate and TokenBucket(rate, burst)
+        self.__targetRate = targetRate
+        self.__targetBurst = targetBurst
+        self.__targetRateLimits = {}
+        # how late requests are sent against schedule
+        self.lateness = Histogram()
+        # request round-trip time including retries
+        self.completion = Histogram()
+        self.__stats = dict(sent=0, completed=0, failed=0,
+                            skipped=0, postponed=0)
+
+    def addPoll(self, targetName, varBinds, interval, cbFun, cbCtx=None):
+        """Start polling SNMP agent periodically.
+
+        Parameters
+        ----------
+        targetName : str
+            Target name as configured by
+            :py:func:`~pysnmp.entity.config.addTargetAddr`.
+        varBinds : list
+            Sequence of `(oid, value)` pairs to query. They are serialized
+            just once and reused for all requests.
+        interval : float
+            Seconds between requests.
+        cbFun : callable
+            Called on every response or failure as
+            `cbFun(snmpEngine, pollId, errorIndication, errorStatus,
+            errorIndex, varBinds, cbCtx)`. If request can not be sent
+            (e.g. target is misconfigured), `errorIndication` is the
+            :py:class:`~pysnmp.error.PySnmpError` raised.
+        cbCtx :
+            Passed to `cbFun` as is.
+
+        Returns
+        -------
+        : :py:class:`int`
+            Poll ID to remove the poll by.
+        """
+        if interval <= 0:
+            raise error.PySnmpError('Polling interval must be positive')
+
+        pollId = getNextPollId()
+
+        poll = _Poll(targetName,
+                     self.__commandGenerator.prepareVarBinds(varBinds),
+                     interval, cbFun, cbCtx)
+
+        # spread polls over their interval
+        poll.nominalTime = time() + random.random() * interval
+
+        self.__polls[pollId] = poll
+
+        self.__schedule(pollId, poll)
+
+        debug.logger & debug.flagApp and debug.logger(
+            'addPoll: pollId %s, target %s, interval %s' % (pollId, targetName, interval))
+
+        return pollId
+
+    def removePoll(self, pollId):
+        """Stop polling, response to a pending request is ignored"""
+        if pollId in self.__polls:
+            del self.__polls[pollId]
+        if not self.__polls:
+            self.__queue = []
+
+    def start(self):
+        """Start sending requests"""
+        if self.__running:
+            return
+        self.__running = True
+        self.snmpEngine.transportDispatcher.jobStarted(id(self))
+        self.__armTimer()
+
+    def stop(self):
+        """Stop sending requests, polls are kept"""
+        if not self.__running:
+            return
+        self.__running = False
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = self.__timerTime = None
+        self.snmpEngine.transportDispatcher.jobFinished(id(self))
+
+    def getStats(self):
+        """Return scheduler counters along with histograms
+
+        Counters are `sent`, `completed` (response received),
+        `failed` (no response or other SNMP engine error), `skipped`
+        (previous request was still pending or fell behind schedule)
+        and `postponed` (waiting for per-target rate limit), `pending` is the number of requests awaiting
+        response. The `lateness` and `completion` histograms come in
+        :py:meth:`Histogram.getBuckets` form.
+        """
+        stats = dict(self.__stats)
+        stats['polls'] = len(self.__polls)
+        stats['pending'] = len([x for x in self.__polls.values() if x.sendTime is not None])
+        stats['lateness'] = self.lateness.getBuckets()
+        stats['completion'] = self.completion.getBuckets()
+        return stats
+
+    def __schedule(self, pollId, poll, timeNow=None):
+        if timeNow is not None:
+            # rounds fallen behind are skipped rather than sent in a burst
+            while poll.nominalTime + poll.interval <= timeNow:
+                poll.nominalTime += poll.interval
+                self.__stats['skipped'] += 1
+
+            poll.nominalTime += poll.interval
+
+        poll.dueTime = poll.queueTime = (
+            poll.nominalTime + random.random() * self.jitter * poll.interval
+        )
+
+        heapq.heappush(self.__queue, (poll.queueTime, pollId))
+
+        self.__armTimer()
+
+    def __postpone(self, pollId, poll, queueTime):
+        poll.queueTime = queueTime
+        heapq.heappush(self.__queue, (queueTime, pollId))
+        self.__stats['postponed'] += 1
+
+    def __armTimer(self, timerTime=None):
+        if not self.__running or not self.__queue:
+            return
+
+        if timerTime is None:
+            timerTime = self.__queue[0][0]
+
+        if self.__timerTime is not None and self.__timerTime <= timerTime:
+            return
+
+        if self.__timer is not None:
+            self.__timer.cancel()
+
+        self.__timerTime = timerTime
+        self.__timer = self.snmpEngine.transportDispatcher.callLater(
+            max(0, timerTime - time()), self.__runPolls
+        )
+
+    def __getTargetRateLimit(self, targetName):
+        if targetName not in self.__targetRateLimits:
+            self.__targetRateLimits[targetName] = TokenBucket(
+                self.__targetRate, self.__targetBurst
+            )
+        return self.__targetRateLimits[targetName]
+
+    def __runPolls(self):
+        self.__timer = self.__timerTime = None
+
+        if not self.__running:
+            return
+
+        queue = self.__queue
+        polls = self.__polls
+        rateLimit = self.__rateLimit
+
+        timeNow = time()
+
+        while queue and queue[0][0] <= timeNow:
+            if rateLimit:
+                delay = rateLimit.getDelay(timeNow)
+                if delay:
+                    self.__armTimer(timeNow + delay)
+                    return
+
+            queueTime, pollId = heapq.heappop(queue)
+
+            poll = polls.get(pollId)
+            if poll is None or poll.queueTime != queueTime:
+                continue  # removed or stale entry
+
+            if poll.sendTime is not None:
+                self.__stats['skipped'] += 1
+                self.__schedule(pollId, poll, timeNow)
+                continue
+
+            if self.__targetRate:
+                targetRateLimit = self.__getTargetRateLimit(poll.targetName)
+                delay = targetRateLimit.getDelay(timeNow)
+                if delay:
+                    self.__postpone(pollId, poll, timeNow + delay)
+                    continue
+                targetRateLimit.consume(timeNow)
+
+            if rateLimit:
+                rateLimit.consume(timeNow)
+
+            self.lateness.observe(max(0, timeNow - poll.dueTime))
+
+            self.__sendPoll(pollId, poll, timeNow)
+
+            if pollId in polls:
+                self.__schedule(pollId, poll, timeNow)
+
+        self.__armTimer()
+
+    def __sendPoll(self, pollId, poll, timeNow):
+        poll.sendTime = timeNow
+
+        self.__stats['sent'] += 1
+
+        try:
+            self.__commandGenerator.sendVarBinds(
+                self.snmpEngine, poll.targetName, self.contextEngineId,
+                self.contextName, poll.varBinds, self.__cbFun, pollId
+            )
+
+        except StatusInformation:
+            statusInformation = sys.exc_info()[1]
+            debug.logger & debug.flagApp and debug.logger(
+                '__sendPoll: pollId %s: sendVarBinds() failed with %r' % (pollId, statusInformation))
+            self.__cbFun(self.snmpEngine, None,
+                         statusInformation['errorIndication'],
+                         0, 0, (), pollId)
+
+        except error.PySnmpError:
+            errorIndication = sys.exc_info()[1]
+            debug.logger & debug.flagApp and debug.logger(
+                '__sendPoll: pollId %s: sendVarBinds() failed with %s' % (pollId, errorIndication))
+            self.__cbFun(self.snmpEngine, None, errorIndication,
+                         0, 0, (), pollId)
+
+    def __cbFun(self, snmpEngine, sendRequestHandle, errorIndication,
+                errorStatus, errorIndex, varBinds, pollId):
+        poll = self.__polls.get(pollId)
+        if poll is None:
+            return  # poll removed
+
+        self.completion.observe(time() - poll.sendTime)
+
+        poll.sendTime = None
+
+        if errorIndication:
+            self.__stats['failed'] += 1
+        else:
+            self.__stats['completed'] += 1
+
+        poll.cbFun(snmpEngine, pollId, errorIndication, errorStatus,
+                   errorIndex, varBinds, poll.cbCtx)
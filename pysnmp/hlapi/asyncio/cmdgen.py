@@ -38,13 +38,23 @@ from pysnmp.hlapi.lcd import *
 from pysnmp.hlapi.varbinds import *
 from pysnmp.hlapi.asyncio.transport import *
 from pysnmp.entity.rfc3413 import cmdgen
+from pysnmp.proto import errind, rfc1905
+from pyasn1.type.univ import Null
+from collections import deque
 
 try:
     import asyncio
 except ImportError:
     import trollius as asyncio
 
-__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'isEndOfMib']
+try:
+    StopAsyncIteration
+except NameError:  # Python < 3.5
+    class StopAsyncIteration(Exception):
+        pass
+
+__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'bulkWalkCmd',
+           'isEndOfMib', 'prepareGetCmd', 'prepareSetCmd']
 
 vbProcessor = CommandGeneratorVarBinds()
 lcd = CommandGeneratorLcdConfigurator()
@@ -87,6 +97,8 @@ def getCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Yields
     ------
@@ -192,6 +204,8 @@ def setCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Yields
     ------
@@ -297,6 +311,8 @@ def nextCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Yields
     ------
@@ -418,6 +434,8 @@ def bulkCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Yields
     ------
@@ -511,3 +529,325 @@ def bulkCmd(snmpEngine, authData, transportTarget, contextData,
         (options.get('lookupMib', True), future)
     )
     return future
+
+
+def bulkWalkCmd(snmpEngine, authData, transportTarget, contextData,
+                *varBinds, **options):
+    """Creates an asynchronous iterator walking one or more MIB subtrees.
+
+    Each of `varBinds` starts its own chain of SNMP GETBULK requests
+    (:RFC:`1905#section-4.2.3`) which runs concurrently with the others
+    till it leaves its subtree or hits the end of MIB. Requests
+    to the same SNMP agent running at once are limited by the
+    `maxConcurrency` option, shared by all walks of this `snmpEngine`.
+
+    The `maxRepetitions` value of each chain is adjusted on the fly:
+    it grows while SNMP agent fills responses up, gets capped by the
+    number of rows the agent is able to return at once and is halved
+    on `tooBig` error.
+
+    Parameters
+    ----------
+    snmpEngine : :py:class:`~pysnmp.hlapi.SnmpEngine`
+        Class instance representing SNMP engine.
+
+    authData : :py:class:`~pysnmp.hlapi.CommunityData` or :py:class:`~pysnmp.hlapi.UsmUserData`
+        Class instance representing SNMP credentials.
+
+    transportTarget : :py:class:`~pysnmp.hlapi.asyncio.UdpTransportTarget` or :py:class:`~pysnmp.hlapi.asyncio.Udp6TransportTarget`
+        Class instance representing transport type along with SNMP peer address.
+
+    contextData : :py:class:`~pysnmp.hlapi.ContextData`
+        Class instance representing SNMP ContextEngineId and ContextName values.
+
+    \*varBinds : :py:class:`~pysnmp.smi.rfc1902.ObjectType`
+        One or more class instances representing disjoint MIB subtrees
+        (e.g. table columns) to walk.
+
+    Other Parameters
+    ----------------
+    \*\*options :
+        Request options:
+
+            * `lookupMib` - load MIB and resolve response MIB variables at
+              the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
+            * `maxRepetitions` - initial `maxRepetitions` value.
+              Default is `25`.
+            * `maxRepetitionsLimit` - never request more than that many
+              rows at once. Default is `250`.
+            * `maxConcurrency` - maximum number of requests in progress
+              to this SNMP agent. Default is `4`.
+
+    Returns
+    -------
+    :
+        Asynchronous iterator to use with `async for` statement. Its
+        `close()` method stops the walk.
+
+    Yields
+    ------
+    errorIndication : str
+        True value indicates SNMP engine error.
+    errorStatus : str
+        True value indicates SNMP PDU error.
+    errorIndex : int
+        Non-zero value refers to `varBinds[errorIndex-1]`
+    varBinds : tuple
+        A sequence of :py:class:`~pysnmp.smi.rfc1902.ObjectType` class
+        instances representing MIB variables of one of the subtrees
+        returned in one SNMP response. On error it holds the MIB variable
+        the failed request was made for, the walk of that subtree stops
+        while the others go on.
+
+    Raises
+    ------
+    PySnmpError
+        Or its derivative indicating that an error occurred while
+        performing SNMP operation.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from pysnmp.hlapi.asyncio import *
+    >>>
+    >>> async def run():
+    ...     async for errorIndication, errorStatus, errorIndex, varBinds in bulkWalkCmd(
+    ...             SnmpEngine(),
+    ...             CommunityData('public'),
+    ...             UdpTransportTarget(('demo.snmplabs.com', 161)),
+    ...             ContextData(),
+    ...             ObjectType(ObjectIdentity('IF-MIB', 'ifDescr')),
+    ...             ObjectType(ObjectIdentity('IF-MIB', 'ifType'))):
+    ...         print(errorIndication, errorStatus, errorIndex, varBinds)
+    >>>
+    >>> asyncio.get_event_loop().run_until_complete(run())
+    (None, 0, 0, [ObjectType(ObjectIdentity(ObjectName('1.3.6.1.2.1.2.2.1.2.1')), DisplayString('eth0'))])
+    (None, 0, 0, [ObjectType(ObjectIdentity(ObjectName('1.3.6.1.2.1.2.2.1.3.1')), Integer(6))])
+    >>>
+
+    """
+    return _BulkWalker(snmpEngine, authData, transportTarget, contextData,
+                       varBinds, options)
+
+
+class _BulkWalker(object):
+    def __init__(self, snmpEngine, authData, transportTarget, contextData,
+                 varBinds, options):
+        self.__snmpEngine = snmpEngine
+        self.__authData = authData
+        self.__transportTarget = transportTarget
+        self.__contextData = contextData
+        self.__varBinds = varBinds
+        self.__lookupMib = options.get('lookupMib', True)
+        self.__maxRepetitions = options.get('maxRepetitions', 25)
+        self.__maxRepetitionsLimit = options.get('maxRepetitionsLimit', 250)
+        self.__maxConcurrency = options.get('maxConcurrency', 4)
+        self.__addrName = self.__agent = None
+        self.__walks = 0
+        self.__results = deque()
+        self.__waiters = deque()
+        self.__started = self.__closed = False
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = asyncio.Future()
+
+        if not self.__started:
+            self.__started = True
+            try:
+                self.__start()
+
+            except Exception as exc:
+                self.__closed = True
+                future.set_exception(exc)
+                return future
+
+        if self.__results:
+            self.__resolve(future, self.__results.popleft())
+
+        elif self.__closed or not self.__walks:
+            future.set_exception(StopAsyncIteration())
+
+        else:
+            self.__waiters.append(future)
+
+        return future
+
+    def close(self):
+        self.__closed = True
+        self.__results.clear()
+        self.__stopWaiters()
+
+    def __start(self):
+        snmpEngine = self.__snmpEngine
+
+        self.__addrName, paramsName = lcd.configure(
+            snmpEngine, self.__authData, self.__transportTarget
+        )
+
+        # in-flight requests counter and waiting requests per SNMP agent
+        agents = snmpEngine.getUserContext('bulkWalkCmd')
+        if agents is None:
+            agents = {}
+            snmpEngine.setUserContext(bulkWalkCmd=agents)
+
+        agent = self.__transportTarget.getTransportInfo()
+        if agent not in agents:
+            agents[agent] = [0, deque()]
+
+        self.__agent = agents[agent]
+
+        for varBind in vbProcessor.makeVarBinds(snmpEngine, self.__varBinds):
+            rootOid = varBind[0].getOid()
+            # root OID, last OID, max-repetitions, max-repetitions capped
+            walk = [rootOid, rootOid, self.__maxRepetitions, False]
+            self.__walks += 1
+            self.__schedule(walk)
+
+    def __schedule(self, walk):
+        if self.__agent[0] < self.__maxConcurrency:
+            self.__agent[0] += 1
+            self.__send(walk)
+        else:
+            self.__agent[1].append((self, walk))
+
+    def __release(self):
+        agent = self.__agent
+        agent[0] -= 1
+        while agent[1]:
+            walker, walk = agent[1].popleft()
+            if not walker.__closed:
+                agent[0] += 1
+                walker.__send(walk)
+                break
+
+    def __send(self, walk):
+        try:
+            cmdgen.BulkCommandGenerator().sendVarBinds(
+                self.__snmpEngine, self.__addrName,
+                self.__contextData.contextEngineId,
+                self.__contextData.contextName,
+                0, walk[2], [(walk[1], Null(''))], self.__cbFun, walk
+            )
+
+        except Exception as exc:
+            self.__release()
+            self.__done(walk, exc)
+
+    def __cbFun(self, snmpEngine, sendRequestHandle,
+                errorIndication, errorStatus, errorIndex,
+                varBindTable, walk):
+        self.__release()
+
+        if self.__closed:
+            return
+
+        if not errorIndication and not varBindTable and not errorStatus:
+            errorIndication = errind.emptyResponse
+
+        if errorIndication or errorStatus:
+            if errorStatus == 1 and walk[2] > 1:  # tooBig
+                walk[2] //= 2
+                walk[3] = True
+                self.__schedule(walk)
+                return
+
+            self.__fail(walk, errorIndication, errorStatus, errorIndex)
+            return
+
+        rootOid, lastOid = walk[:2]
+
+        varBinds = []
+
+        for varBindRow in varBindTable:
+            oid, val = varBindRow[0]
+            if (isinstance(val, rfc1905.EndOfMibView) or
+                    not rootOid.isPrefixOf(oid)):
+                lastOid = None
+                break
+
+            if oid <= lastOid:
+                errorIndication = errind.oidNotIncreasing
+                break
+
+            varBinds.append(varBindRow[0])
+            lastOid = oid
+
+        if varBinds:
+            try:
+                varBinds = vbProcessor.unmakeVarBinds(
+                    snmpEngine, varBinds, self.__lookupMib
+                )
+
+            except Exception as exc:
+                self.__done(walk, exc)
+                return
+
+            self.__put((None, 0, 0, varBinds))
+
+        if errorIndication:
+            walk[1] = lastOid
+            self.__fail(walk, errorIndication, 0, 0)
+
+        elif lastOid is None:
+            self.__done(walk)
+
+        else:
+            walk[1] = lastOid
+
+            if len(varBindTable) < walk[2]:
+                # agent returns no more rows than that
+                walk[2] = len(varBindTable)
+                walk[3] = True
+
+            elif not walk[3]:
+                walk[2] = min(walk[2] * 2, self.__maxRepetitionsLimit)
+
+            self.__schedule(walk)
+
+    def __fail(self, walk, errorIndication, errorStatus, errorIndex):
+        try:
+            varBinds = vbProcessor.unmakeVarBinds(
+                self.__snmpEngine, [(walk[1], Null(''))], self.__lookupMib
+            )
+
+        except Exception as exc:
+            self.__done(walk, exc)
+
+        else:
+            self.__done(walk, (errorIndication, errorStatus,
+                               errorIndex, varBinds))
+
+    def __put(self, result):
+        while self.__waiters:
+            future = self.__waiters.popleft()
+            if not future.cancelled():
+                self.__resolve(future, result)
+                return
+
+        self.__results.append(result)
+
+    def __done(self, walk, result=None):
+        if result is not None:
+            self.__put(result)
+
+        self.__walks -= 1
+        if not self.__walks:
+            self.__stopWaiters()
+
+    def __stopWaiters(self):
+        while self.__waiters:
+            future = self.__waiters.popleft()
+            if not future.cancelled():
+                future.set_exception(StopAsyncIteration())
+
+    @staticmethod
+    def __resolve(future, result):
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
@@ -7,10 +7,12 @@
 import socket
 import sys
 from pysnmp.carrier.asyncio.dgram import udp, udp6
+from pysnmp.carrier.asyncio.stream import tcp, tcp6
 from pysnmp.hlapi.transport import AbstractTransportTarget
 from pysnmp.error import PySnmpError
 
-__all__ = ['Udp6TransportTarget', 'UdpTransportTarget']
+__all__ = ['Udp6TransportTarget', 'UdpTransportTarget',
+           'Tcp6TransportTarget', 'TcpTransportTarget']
 
 
 class UdpTransportTarget(AbstractTransportTarget):
@@ -121,3 +123,84 @@ class Udp6TransportTarget(AbstractTransportTarget):
         except socket.gaierror:
             raise PySnmpError('Bad IPv6/UDP transport address %s: %s' % (
                 '@'.join([str(x) for x in transportAddr]), sys.exc_info()[1]))
+
+
+class TcpTransportTarget(AbstractTransportTarget):
+    """Creates TCP/IPv4 configuration entry and initialize socket API if needed.
+
+    This object can be used by
+    :py:class:`~pysnmp.hlapi.asyncio.AsyncCommandGenerator` or
+    :py:class:`~pysnmp.hlapi.asyncio.AsyncNotificationOriginator`
+    and kept around so that all requests to the same agent share a
+    single TCP connection.
+
+    See :RFC:`3430` for more information on the TCP transport mapping.
+
+    Parameters
+    ----------
+    transportAddr : tuple
+        Indicates remote address in Python :py:mod:`socket` module format
+        which is a tuple of FQDN, port where FQDN is a string representing
+        either hostname or IPv4 address in quad-dotted form, port is an
+        integer.
+    timeout : int
+        Response timeout in seconds.
+    retries : int
+        Maximum number of request retries, 0 retries means just a single
+        request.
+    tagList : str
+        Arbitrary string that contains a list of tag values which are used
+        to select target addresses for a particular operation
+        (:RFC:`3413#section-4.1.4`).
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi.asyncio import TcpTransportTarget
+    >>> TcpTransportTarget(('127.0.0.1', 161))
+    TcpTransportTarget(('127.0.0.1', 161), timeout=1, retries=5, tagList='')
+    >>>
+
+    """
+    transportDomain = tcp.domainName
+    protoTransport = tcp.TcpAsyncioTransport
+
+    def _resolveAddr(self, transportAddr):
+        try:
+            return socket.getaddrinfo(transportAddr[0],
+                                      transportAddr[1],
+                                      socket.AF_INET,
+                                      socket.SOCK_STREAM,
+                                      socket.IPPROTO_TCP)[0][4][:2]
+        except socket.gaierror:
+            raise PySnmpError('Bad IPv4/TCP transport address %s: %s' % (
+                '@'.join([str(x) for x in transportAddr]), sys.exc_info()[1]))
+
+
+class Tcp6TransportTarget(AbstractTransportTarget):
+    """Creates TCP/IPv6 configuration entry and initialize socket API if needed.
+
+    Same as :py:class:`~pysnmp.hlapi.asyncio.TcpTransportTarget` but
+    `transportAddr` is a tuple of FQDN, port where FQDN is a string
+    representing either hostname or IPv6 address.
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi.asyncio import Tcp6TransportTarget
+    >>> Tcp6TransportTarget(('::1', 161))
+    Tcp6TransportTarget(('::1', 161), timeout=1, retries=5, tagList='')
+    >>>
+
+    """
+    transportDomain = tcp6.domainName
+    protoTransport = tcp6.Tcp6AsyncioTransport
+
+    def _resolveAddr(self, transportAddr):
+        try:
+            return socket.getaddrinfo(transportAddr[0],
+                                      transportAddr[1],
+                                      socket.AF_INET6,
+                                      socket.SOCK_STREAM,
+                                      socket.IPPROTO_TCP)[0][4][:2]
+        except socket.gaierror:
+            raise PySnmpError('Bad IPv6/TCP transport address %s: %s' % (
+                '@'.join([str(x) for x in transportAddr]), sys.exc_info()[1]))
@@ -12,7 +12,8 @@ from pysnmp.hlapi.lcd import *
 from pysnmp.hlapi.varbinds import *
 from pysnmp.hlapi.asyncore.transport import *
 
-__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'isEndOfMib']
+__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'isEndOfMib',
+           'prepareGetCmd', 'prepareSetCmd']
 
 vbProcessor = CommandGeneratorVarBinds()
 lcd = CommandGeneratorLcdConfigurator()
@@ -55,6 +56,8 @@ def getCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `cbFun` (callable) - user-supplied callable that is invoked
                to pass SNMP response data or error to user at a later point
                of time. Default is `None`.
@@ -167,6 +170,8 @@ def setCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `cbFun` (callable) - user-supplied callable that is invoked
                to pass SNMP response data or error to user at a later point
                of time. Default is `None`.
@@ -277,6 +282,8 @@ def nextCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `cbFun` (callable) - user-supplied callable that is invoked
                to pass SNMP response data or error to user at a later point
                of time. Default is `None`.
@@ -398,6 +405,8 @@ def bulkCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `cbFun` (callable) - user-supplied callable that is invoked
                to pass SNMP response data or error to user at a later point
                of time. Default is `None`.
@@ -11,7 +11,8 @@ from pysnmp.proto.rfc1905 import endOfMibView
 from pysnmp.proto import errind
 from pyasn1.type.univ import Null
 
-__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd']
+__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd',
+           'prepareGetCmd', 'prepareSetCmd']
 
 if version_info[:2] < (2, 6):
     __all__.append('next')
@@ -53,6 +54,8 @@ def getCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Yields
     ------
@@ -159,6 +162,8 @@ def setCmd(snmpEngine, authData, transportTarget, contextData,
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
               Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Yields
     ------
@@ -266,6 +271,8 @@ def nextCmd(snmpEngine, authData, transportTarget, contextData,
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
               Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `lexicographicMode` - walk SNMP agent's MIB till the end (if `True`),
               otherwise (if `False`) stop iteration when all response MIB
               variables leave the scope of initial MIB variables in
@@ -450,6 +457,8 @@ def bulkCmd(snmpEngine, authData, transportTarget, contextData,
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
               Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `lexicographicMode` - walk SNMP agent's MIB till the end (if `True`),
               otherwise (if `False`) stop iteration when all response MIB
               variables leave the scope of initial MIB variables in
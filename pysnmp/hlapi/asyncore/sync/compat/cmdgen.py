@@ -12,7 +12,8 @@ from pysnmp.proto.rfc1905 import endOfMibView
 from pysnmp.proto import errind
 from pyasn1.type.univ import Null
 
-__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'next']
+__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'next',
+           'prepareGetCmd', 'prepareSetCmd']
 
 
 # noinspection PyShadowingBuiltins
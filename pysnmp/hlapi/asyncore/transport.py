@@ -7,10 +7,12 @@
 import socket
 import sys
 from pysnmp.carrier.asyncore.dgram import udp, udp6, unix
+from pysnmp.carrier.asyncore.stream import tcp, tcp6
 from pysnmp.hlapi.transport import AbstractTransportTarget
 from pysnmp import error
 
-__all__ = ['UnixTransportTarget', 'Udp6TransportTarget', 'UdpTransportTarget']
+__all__ = ['UnixTransportTarget', 'Udp6TransportTarget', 'UdpTransportTarget',
+           'Tcp6TransportTarget', 'TcpTransportTarget']
 
 
 class UdpTransportTarget(AbstractTransportTarget):
@@ -121,6 +123,89 @@ class Udp6TransportTarget(AbstractTransportTarget):
                 '@'.join([str(x) for x in transportAddr]), sys.exc_info()[1]))
 
 
+class TcpTransportTarget(AbstractTransportTarget):
+    """Creates TCP/IPv4 configuration entry and initialize socket API if needed.
+
+    This object can be used for adding new entries to Local Configuration
+    Datastore (LCD) managed by :py:class:`~pysnmp.hlapi.SnmpEngine`
+    class instance.
+
+    All requests to the same agent share a single TCP connection which
+    is established on first request and kept open afterwards.
+
+    See :RFC:`3430` for more information on the TCP transport mapping.
+
+    Parameters
+    ----------
+    transportAddr: :py:class:`tuple`
+        Indicates remote address in Python :py:mod:`socket` module format
+        which is a tuple of FQDN, port where FQDN is a string representing
+        either hostname or IPv4 address in quad-dotted form, port is an
+        integer.
+    timeout: :py:class:`int`
+        Response timeout in seconds.
+    retries: :py:class:`int`
+        Maximum number of request retries, 0 retries means just a single
+        request.
+    tagList: :py:class:`str`
+        Arbitrary string that contains a list of space-separated tag
+        strings used to select target addresses and/or SNMP configuration
+        (see :RFC:`3413#section-4.1.1`, :RFC:`2576#section-5.3` and
+        :py:class:`~pysnmp.hlapi.CommunityData` object).
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi.asyncore import TcpTransportTarget
+    >>> TcpTransportTarget(('127.0.0.1', 161))
+    TcpTransportTarget(('127.0.0.1', 161), timeout=1, retries=5, tagList='')
+    >>>
+
+    """
+    transportDomain = tcp.domainName
+    protoTransport = tcp.TcpSocketTransport
+
+    def _resolveAddr(self, transportAddr):
+        try:
+            return socket.getaddrinfo(transportAddr[0],
+                                      transportAddr[1],
+                                      socket.AF_INET,
+                                      socket.SOCK_STREAM,
+                                      socket.IPPROTO_TCP)[0][4][:2]
+        except socket.gaierror:
+            raise error.PySnmpError('Bad IPv4/TCP transport address %s: %s' % (
+                '@'.join([str(x) for x in transportAddr]), sys.exc_info()[1]))
+
+
+class Tcp6TransportTarget(AbstractTransportTarget):
+    """Creates TCP/IPv6 configuration entry and initialize socket API if needed.
+
+    Same as :py:class:`~pysnmp.hlapi.asyncore.TcpTransportTarget` but
+    `transportAddr` is a tuple of FQDN, port where FQDN is a string
+    representing either hostname or IPv6 address.
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi.asyncore import Tcp6TransportTarget
+    >>> Tcp6TransportTarget(('::1', 161))
+    Tcp6TransportTarget(('::1', 161), timeout=1, retries=5, tagList='')
+    >>>
+
+    """
+    transportDomain = tcp6.domainName
+    protoTransport = tcp6.Tcp6SocketTransport
+
+    def _resolveAddr(self, transportAddr):
+        try:
+            return socket.getaddrinfo(transportAddr[0],
+                                      transportAddr[1],
+                                      socket.AF_INET6,
+                                      socket.SOCK_STREAM,
+                                      socket.IPPROTO_TCP)[0][4][:2]
+        except socket.gaierror:
+            raise error.PySnmpError('Bad IPv6/TCP transport address %s: %s' % (
+                '@'.join([str(x) for x in transportAddr]), sys.exc_info()[1]))
+
+
 class UnixTransportTarget(AbstractTransportTarget):
     transportDomain = unix.domainName
     protoTransport = unix.UnixSocketTransport
@@ -15,7 +15,8 @@ from pysnmp.proto import errind
 from twisted.internet.defer import Deferred
 from twisted.python.failure import Failure
 
-__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'isEndOfMib']
+__all__ = ['getCmd', 'nextCmd', 'setCmd', 'bulkCmd', 'isEndOfMib',
+           'prepareGetCmd', 'prepareSetCmd']
 
 vbProcessor = CommandGeneratorVarBinds()
 lcd = CommandGeneratorLcdConfigurator()
@@ -55,6 +56,8 @@ def getCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Returns
     -------
@@ -171,6 +174,8 @@ def setCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
 
     Returns
     -------
@@ -287,6 +292,8 @@ def nextCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `ignoreNonIncreasingOid` - continue iteration even if response
               MIB variables (OIDs) are not greater then request MIB variables.
               Be aware that setting it to `True` may cause infinite loop between
@@ -427,6 +434,8 @@ def bulkCmd(snmpEngine, authData, transportTarget, contextData,
 
             * `lookupMib` - load MIB and resolve response MIB variables at
               the cost of slightly reduced performance. Default is `True`.
+              If `'lazy'`, response MIB variables are resolved only once
+              pretty printed or queried for MIB details.
             * `ignoreNonIncreasingOid` - continue iteration even if response
               MIB variables (OIDs) are not greater then request MIB variables.
               Be aware that setting it to `True` may cause infinite loop between
@@ -6,8 +6,10 @@
 #
 from pysnmp.smi import view
 from pysnmp.smi.rfc1902 import *
+from pysnmp.entity.rfc3413 import cmdgen
 
-__all__ = ['CommandGeneratorVarBinds', 'NotificationOriginatorVarBinds']
+__all__ = ['CommandGeneratorVarBinds', 'NotificationOriginatorVarBinds',
+           'prepareGetCmd', 'prepareSetCmd']
 
 
 class AbstractVarBinds(object):
@@ -24,6 +26,10 @@ class AbstractVarBinds(object):
 
 class CommandGeneratorVarBinds(AbstractVarBinds):
     def makeVarBinds(self, snmpEngine, varBinds):
+        # var-binds serialized in advance are passed through
+        if len(varBinds) == 1 and isinstance(varBinds[0], cmdgen.PreparedPdu):
+            return varBinds[0]
+
         mibViewController = self.getMibViewController(snmpEngine)
         __varBinds = []
         for varBind in varBinds:
@@ -43,7 +49,8 @@ class CommandGeneratorVarBinds(AbstractVarBinds):
     def unmakeVarBinds(self, snmpEngine, varBinds, lookupMib=True):
         if lookupMib:
             mibViewController = self.getMibViewController(snmpEngine)
-            varBinds = [ObjectType(ObjectIdentity(x[0]), x[1]).resolveWithMib(mibViewController) for x in varBinds]
+            lazy = lookupMib == 'lazy'
+            varBinds = [ObjectType(ObjectIdentity(x[0]), x[1]).resolveWithMib(mibViewController, lazy) for x in varBinds]
 
         return varBinds
 
@@ -69,3 +76,55 @@ class NotificationOriginatorVarBinds(AbstractVarBinds):
             mibViewController = self.getMibViewController(snmpEngine)
             varBinds = [ObjectType(ObjectIdentity(x[0]), x[1]).resolveWithMib(mibViewController) for x in varBinds]
         return varBinds
+
+
+def prepareGetCmd(snmpEngine, *varBinds):
+    """Prepares SNMP GET query var-binds for repeated use.
+
+    MIB variables are resolved and serialized just once. The returned
+    object is passed to `getCmd()` in place of `varBinds` as many
+    times as needed. Only request-id and, for SNMPv3, message header and
+    security parameters are built anew for each SNMP message.
+
+    Parameters
+    ----------
+    snmpEngine : :py:class:`~pysnmp.hlapi.SnmpEngine`
+        Class instance representing SNMP engine.
+
+    \*varBinds : :py:class:`~pysnmp.smi.rfc1902.ObjectType`
+        One or more class instances representing MIB variables to place
+        into SNMP request.
+
+    Returns
+    -------
+    : :py:class:`~pysnmp.entity.rfc3413.cmdgen.PreparedPdu`
+        Serialized SNMP GET request var-binds.
+
+    Examples
+    --------
+    >>> from pysnmp.hlapi import *
+    >>> snmpEngine = SnmpEngine()
+    >>> varBinds = prepareGetCmd(snmpEngine, ObjectType(ObjectIdentity('SNMPv2-MIB', 'sysDescr', 0)))
+    >>> g = getCmd(snmpEngine,
+    ...            CommunityData('public'),
+    ...            UdpTransportTarget(('demo.snmplabs.com', 161)),
+    ...            ContextData(),
+    ...            varBinds)
+    >>> next(g)
+    (None, 0, 0, [ObjectType(ObjectIdentity(ObjectName('1.3.6.1.2.1.1.1.0')), DisplayString('SunOS zeus.snmplabs.com 4.1.3_U1 1 sun4m'))])
+    >>>
+    """
+    return cmdgen.GetCommandGenerator.prepareVarBinds(
+        CommandGeneratorVarBinds().makeVarBinds(snmpEngine, varBinds)
+    )
+
+
+def prepareSetCmd(snmpEngine, *varBinds):
+    """Prepares SNMP SET query var-binds for repeated use.
+
+    Same as :py:func:`prepareGetCmd` but the returned object goes to
+    `setCmd()`.
+    """
+    return cmdgen.SetCommandGenerator.prepareVarBinds(
+        CommandGeneratorVarBinds().makeVarBinds(snmpEngine, varBinds)
+    )
@@ -4,11 +4,89 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
-from pysnmp.smi.error import NoSuchInstanceError
+from pysnmp.smi.error import NoSuchInstanceError, NoSuchObjectError
 from pysnmp.proto import errind, error
-from pysnmp import debug
+from pysnmp import cache, debug
 
-__powOfTwoSeq = [128, 64, 32, 16, 8, 4, 2, 1]
+
+class ViewTree(object):
+    """Compiled vacmViewTreeFamilyTable entries of a single view.
+
+    View tree families are kept in a prefix tree keyed by sub-identifiers,
+    wildcarded (masked out) sub-identifiers are kept aside in a separate
+    branch of each node. The most specific matching family, if any,
+    determines whether the object is in view (RFC3415 5.3.1.3)
+    """
+
+    def __init__(self):
+        # [children, wildcard child, (subtree, included) or None]
+        self.__root = [{}, None, None]
+        self.__wildcarded = False
+
+    def addFamily(self, subtree, mask, included):
+        subtree = tuple(subtree)
+
+        # Mask shorter than subtree is extended with ones
+        mask = [(mask[idx // 8] << (idx % 8)) & 0x80 if idx // 8 < len(mask) else 1
+                for idx in range(len(subtree))]
+
+        node = self.__root
+        for subId, bit in zip(subtree, mask):
+            if bit:
+                children = node[0]
+                if subId not in children:
+                    children[subId] = [{}, None, None]
+                node = children[subId]
+            else:
+                if node[1] is None:
+                    node[1] = [{}, None, None]
+                node = node[1]
+                self.__wildcarded = True
+
+        # Families made identical by masks resolve to lexicographically
+        # greater subtree
+        if node[2] is None or node[2][0] < subtree:
+            node[2] = subtree, included
+
+    def isInView(self, variableName):
+        if self.__wildcarded:
+            return self.__isInWildcardedView(variableName)
+
+        family = None
+        node = self.__root
+        for subId in variableName:
+            if node[2] is not None:
+                family = node[2]
+            node = node[0].get(subId)
+            if node is None:
+                break
+        else:
+            if node[2] is not None:
+                family = node[2]
+
+        return family is not None and family[1]
+
+    def __isInWildcardedView(self, variableName):
+        family = None
+        nodes = [self.__root]
+        subIds = iter(variableName)
+        while nodes:
+            nextNodes = []
+            subId = next(subIds, None)
+            for children, wildcard, entry in nodes:
+                # deeper families take precedence over shallower ones
+                if entry is not None and (family is None or len(family[0]) < len(entry[0]) or family < entry):
+                    family = entry
+                if subId is None:
+                    continue
+                if subId in children:
+                    nextNodes.append(children[subId])
+                if wildcard is not None:
+                    nextNodes.append(wildcard)
+
+            nodes = nextNodes
+
+        return family is not None and family[1]
 
 
 # 3.2
@@ -16,6 +94,17 @@ class Vacm(object):
     """View-based Access Control Model"""
     accessModelID = 3
 
+    def __init__(self):
+        self.__tablesVersionId = None
+        # (securityModel, securityName, securityLevel, contextName,
+        # viewType) -> ViewTree or error indication
+        self.__accessCache = cache.Cache(maxSize=1024)
+        # viewName -> ViewTree
+        self.__viewTrees = {}
+
+    def getCacheStats(self):
+        return self.__accessCache.getStats()
+
     def isAccessAllowed(self,
                         snmpEngine,
                         securityModel,
@@ -30,19 +119,69 @@ class Vacm(object):
             'isAccessAllowed: securityModel %s, securityName %s, securityLevel %s, viewType %s, contextName %s for variableName %s' % (
                 securityModel, securityName, securityLevel, viewType, contextName, variableName))
 
+        if viewType not in ('read', 'write', 'notify'):
+            raise error.ProtocolError('Unknown view type %s' % viewType)
+
+        (vacmContextEntry,
+         vacmSecurityToGroupEntry,
+         vacmAccessEntry,
+         vacmViewTreeFamilyEntry) = mibInstrumController.mibBuilder.importSymbols(
+            'SNMP-VIEW-BASED-ACM-MIB', 'vacmContextEntry',
+            'vacmSecurityToGroupEntry', 'vacmAccessEntry',
+            'vacmViewTreeFamilyEntry'
+        )
+
+        tablesVersionId = (vacmContextEntry.branchVersionId,
+                           vacmSecurityToGroupEntry.branchVersionId,
+                           vacmAccessEntry.branchVersionId,
+                           vacmViewTreeFamilyEntry.branchVersionId)
+
+        if self.__tablesVersionId != tablesVersionId:
+            debug.logger & debug.flagACL and debug.logger(
+                'isAccessAllowed: VACM tables changed, dropping compiled views')
+
+            self.__accessCache.clear()
+            self.__viewTrees.clear()
+            self.__tablesVersionId = tablesVersionId
+
+        cacheKey = (securityModel, securityName, securityLevel,
+                    contextName, viewType)
+
+        try:
+            viewTree = self.__accessCache[cacheKey]
+
+        except KeyError:
+            viewTree = self.__compileAccess(
+                vacmContextEntry, vacmSecurityToGroupEntry, vacmAccessEntry,
+                vacmViewTreeFamilyEntry, securityModel, securityName,
+                securityLevel, viewType, contextName
+            )
+
+            self.__accessCache[cacheKey] = viewTree
+
+        if not isinstance(viewTree, ViewTree):
+            raise error.StatusInformation(errorIndication=viewTree)
+
+        # 3.2.5a
+        if viewTree.isInView(variableName):
+            # 3.2.5c
+            return error.StatusInformation(errorIndication=errind.accessAllowed)
+
+        # 3.2.5b
+        raise error.StatusInformation(errorIndication=errind.notInView)
+
+    def __compileAccess(self, vacmContextEntry, vacmSecurityToGroupEntry,
+                        vacmAccessEntry, vacmViewTreeFamilyEntry,
+                        securityModel, securityName, securityLevel,
+                        viewType, contextName):
         # 3.2.1
-        vacmContextEntry, = mibInstrumController.mibBuilder.importSymbols('SNMP-VIEW-BASED-ACM-MIB', 'vacmContextEntry')
         tblIdx = vacmContextEntry.getInstIdFromIndices(contextName)
         try:
-            vacmContextName = vacmContextEntry.getNode(
-                vacmContextEntry.name + (1,) + tblIdx
-            ).syntax
+            vacmContextEntry.getNode(vacmContextEntry.name + (1,) + tblIdx)
         except NoSuchInstanceError:
-            raise error.StatusInformation(errorIndication=errind.noSuchContext)
+            return errind.noSuchContext
 
         # 3.2.2
-        vacmSecurityToGroupEntry, = mibInstrumController.mibBuilder.importSymbols('SNMP-VIEW-BASED-ACM-MIB',
-                                                                                  'vacmSecurityToGroupEntry')
         tblIdx = vacmSecurityToGroupEntry.getInstIdFromIndices(
             securityModel, securityName
         )
@@ -51,12 +190,9 @@ class Vacm(object):
                 vacmSecurityToGroupEntry.name + (3,) + tblIdx
             ).syntax
         except NoSuchInstanceError:
-            raise error.StatusInformation(errorIndication=errind.noGroupName)
+            return errind.noGroupName
 
         # 3.2.3
-        vacmAccessEntry, = mibInstrumController.mibBuilder.importSymbols(
-            'SNMP-VIEW-BASED-ACM-MIB', 'vacmAccessEntry'
-        )
         # XXX partial context name match
         tblIdx = vacmAccessEntry.getInstIdFromIndices(
             vacmGroupName, contextName, securityModel, securityLevel
@@ -67,58 +203,64 @@ class Vacm(object):
             entryIdx = vacmAccessEntry.name + (5,) + tblIdx
         elif viewType == 'write':
             entryIdx = vacmAccessEntry.name + (6,) + tblIdx
-        elif viewType == 'notify':
-            entryIdx = vacmAccessEntry.name + (7,) + tblIdx
         else:
-            raise error.ProtocolError('Unknown view type %s' % viewType)
+            entryIdx = vacmAccessEntry.name + (7,) + tblIdx
 
         try:
             viewName = vacmAccessEntry.getNode(entryIdx).syntax
         except NoSuchInstanceError:
-            raise error.StatusInformation(errorIndication=errind.noAccessEntry)
+            return errind.noAccessEntry
         if not len(viewName):
-            raise error.StatusInformation(errorIndication=errind.noSuchView)
+            return errind.noSuchView
 
-        # XXX split onto object & instance ?
+        viewName = viewName.asOctets()
+
+        if viewName not in self.__viewTrees:
+            self.__viewTrees[viewName] = self.__compileView(
+                vacmViewTreeFamilyEntry, viewName
+            )
+
+        return self.__viewTrees[viewName]
+
+    @staticmethod
+    def __compileView(vacmViewTreeFamilyEntry, viewName):
+        debug.logger & debug.flagACL and debug.logger(
+            '__compileView: compiling view %s' % viewName)
+
+        viewTree = ViewTree()
 
-        # 3.2.5a
-        vacmViewTreeFamilyEntry, = mibInstrumController.mibBuilder.importSymbols('SNMP-VIEW-BASED-ACM-MIB',
-                                                                                 'vacmViewTreeFamilyEntry')
         tblIdx = vacmViewTreeFamilyEntry.getInstIdFromIndices(viewName)
 
         # Walk over entries
         initialTreeName = treeName = vacmViewTreeFamilyEntry.name + (2,) + tblIdx
-        maskName = vacmViewTreeFamilyEntry.name + (3,) + tblIdx
-        while 1:
-            vacmViewTreeFamilySubtree = vacmViewTreeFamilyEntry.getNextNode(
-                treeName
-            )
-            vacmViewTreeFamilyMask = vacmViewTreeFamilyEntry.getNextNode(
-                maskName
-            )
+        while True:
+            try:
+                vacmViewTreeFamilySubtree = vacmViewTreeFamilyEntry.getNextNode(
+                    treeName
+                )
+            except (NoSuchInstanceError, NoSuchObjectError):
+                break
+
             treeName = vacmViewTreeFamilySubtree.name
-            maskName = vacmViewTreeFamilyMask.name
             if initialTreeName != treeName[:len(initialTreeName)]:
-                # 3.2.5b
-                raise error.StatusInformation(errorIndication=errind.notInView)
-            l = len(vacmViewTreeFamilySubtree.syntax)
-            if l > len(variableName):
-                continue
-            if vacmViewTreeFamilyMask.syntax:
-                mask = []
-                for c in vacmViewTreeFamilyMask.syntax.asNumbers():
-                    mask = mask + [b & c for b in __powOfTwoSeq]
-                m = len(mask) - 1
-                idx = l - 1
-                while idx:
-                    if idx > m or mask[idx] and \
-                            vacmViewTreeFamilySubtree.syntax[idx] != variableName[idx]:
-                        break
-                    idx -= 1
-                if idx:
-                    continue  # no match
-            else:  # no mask
-                if vacmViewTreeFamilySubtree.syntax != variableName[:l]:
-                    continue  # no match
-            # 3.2.5c
-            return error.StatusInformation(errorIndication=errind.accessAllowed)
+                break
+
+            instId = treeName[len(vacmViewTreeFamilyEntry.name) + 1:]
+
+            try:
+                vacmViewTreeFamilyMask = vacmViewTreeFamilyEntry.getNode(
+                    vacmViewTreeFamilyEntry.name + (3,) + instId
+                )
+                vacmViewTreeFamilyType = vacmViewTreeFamilyEntry.getNode(
+                    vacmViewTreeFamilyEntry.name + (4,) + instId
+                )
+            except NoSuchInstanceError:
+                continue  # incomplete row
+
+            viewTree.addFamily(
+                vacmViewTreeFamilySubtree.syntax,
+                vacmViewTreeFamilyMask.syntax.asNumbers(),
+                vacmViewTreeFamilyType.syntax == 1  # included
+            )
+
+        return viewTree
@@ -6,11 +6,93 @@
 #
 from pyasn1.type import univ
 from pyasn1.codec.ber import decoder, eoo
+from pyasn1.compat.octets import oct2int
 from pyasn1.error import PyAsn1Error
 from pysnmp.proto.error import ProtocolError
 
 
-def decodeMessageVersion(wholeMsg):
+class _UnusualEncoding(Exception):
+    """Legal yet unusual BER, left to pyasn1 decoder"""
+
+
+def _readHeader(wholeMsg, pos, end, tagOctet):
+    if pos + 2 > end:
+        raise ProtocolError('Short BER header at SNMP message')
+
+    if oct2int(wholeMsg[pos]) != tagOctet:
+        if oct2int(wholeMsg[pos]) & 0x1f == 0x1f:
+            raise _UnusualEncoding()  # long form tag
+        raise ProtocolError('Unexpected tag at SNMP message')
+
+    length = oct2int(wholeMsg[pos + 1])
+    pos += 2
+
+    if length & 0x80:
+        size = length & 0x7f
+        if not size:
+            raise _UnusualEncoding()  # indefinite length
+        if size > 4 or pos + size > end:
+            raise ProtocolError('Bad BER length at SNMP message')
+        length = 0
+        for idx in range(pos, pos + size):
+            length = length << 8 | oct2int(wholeMsg[idx])
+        pos += size
+
+    if pos + length > end:
+        raise ProtocolError('Truncated SNMP message')
+
+    return pos, length
+
+
+def decodeMessageVersion(wholeMsg, maxMessageSize=None):
+    """Sniff SNMP version out of serialized SNMP message.
+
+    Outer SEQUENCE and version INTEGER headers are parsed right from
+    the substrate, so that truncated, oversized or otherwise malformed
+    messages are rejected before any ASN.1 object gets created.
+
+    Parameters
+    ----------
+    wholeMsg : :py:class:`bytes`
+        Serialized SNMP message.
+    maxMessageSize : :py:class:`int`
+        If given, messages longer than that are rejected.
+
+    Returns
+    -------
+    : :py:class:`~pyasn1.type.univ.Integer`
+        SNMP message version.
+
+    Raises
+    ------
+    : :py:class:`~pysnmp.proto.error.ProtocolError`
+        On malformed SNMP message.
+    """
+    end = len(wholeMsg)
+
+    if maxMessageSize is not None and end > maxMessageSize:
+        raise ProtocolError('SNMP message size %d exceeds %d' % (end, maxMessageSize))
+
+    try:
+        pos, length = _readHeader(wholeMsg, 0, end, 0x30)  # SEQUENCE
+        pos, length = _readHeader(wholeMsg, pos, pos + length, 0x02)  # INTEGER
+
+    except _UnusualEncoding:
+        return _decodeMessageVersion(wholeMsg)
+
+    version = 0
+    if length:
+        version = oct2int(wholeMsg[pos])
+        if version & 0x80:
+            version -= 0x100
+        for idx in range(pos + 1, pos + length):
+            version = version << 8 | oct2int(wholeMsg[idx])
+
+    return univ.Integer(version)
+
+
+# indefinite length and long form tags are left to pyasn1
+def _decodeMessageVersion(wholeMsg):
     try:
         seq, wholeMsg = decoder.decode(
             wholeMsg, asn1Spec=univ.Sequence(),
@@ -23,5 +105,6 @@ def decodeMessageVersion(wholeMsg):
         if eoo.endOfOctets.isSameTypeWith(ver):
             raise ProtocolError('EOO at SNMP version component')
         return ver
-    except PyAsn1Error:
+    # pyasn1 raises TypeError on tag mismatch with substrateFun
+    except (PyAsn1Error, TypeError):
         raise ProtocolError('Invalid BER at SNMP version component')
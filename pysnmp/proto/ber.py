@@ -0,0 +1,490 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+# BER codec specialized on SNMP messages.
+#
+# SNMP messages are built of a handful of ASN.1 types: SEQUENCE,
+# SEQUENCE OF, untagged CHOICE, INTEGER, OCTET STRING, NULL and OBJECT
+# IDENTIFIER (and their implicitly tagged derivatives), all encoded with
+# single-octet tags and definite lengths. The codec below handles just
+# that, producing and consuming the same pyasn1 objects as the generic
+# pyasn1 codec does. Untagged ANY values are encoded too as they carry
+# pre-serialized substrate.
+#
+# Anything beyond that (e.g. indefinite length, constructed OCTET STRING
+# encoding, ASN.1 types not used by SNMP or malformed substrate) is
+# passed over to pyasn1 codec, which also takes care of error reporting.
+# The same happens on any pyasn1 error so that it is raised by pyasn1
+# codec exactly as if it was used in the first place.
+#
+# The codec relies on pyasn1 0.4.1+ APIs (`NamedTypes.hasOpenTypes`,
+# `getComponentByPosition(instantiate=False)`), on older pyasn1 the
+# `isSupported` flag is off and SNMP engine sticks to pyasn1 codec.
+#
+from pyasn1 import __version__ as pyasn1Version
+from pyasn1.type import univ, tag
+from pyasn1.type.base import noValue
+from pyasn1.codec.ber import encoder as berEncoder, decoder as berDecoder
+from pyasn1.compat.integer import from_bytes, to_bytes
+from pyasn1.compat.octets import ints2octs, null
+from pyasn1.error import PyAsn1Error
+from pysnmp import cache
+
+__all__ = ['encoder', 'decoder', 'isSupported']
+
+
+def _parseVersion(version):
+    numbers = []
+    for part in version.split('.'):
+        digits = ''
+        for char in part:
+            if not char.isdigit():
+                break
+            digits += char
+        if not digits:
+            break
+        numbers.append(int(digits))
+    return tuple(numbers)
+
+
+isSupported = _parseVersion(pyasn1Version) >= (0, 4, 1)
+
+
+class FallbackError(Exception):
+    """Not handled by this codec, pass it over to pyasn1 codec"""
+
+
+def _getTagOctet(tagSet, isConstructed):
+    if len(tagSet.superTags) != 1:
+        raise FallbackError('multiple tags')  # explicit tagging
+
+    tagClass, tagFormat, tagId = tagSet.superTags[0]
+    if tagId >= 31:
+        raise FallbackError('long tag')
+
+    if isConstructed:
+        tagFormat = tag.tagFormatConstructed
+
+    return tagClass | tagFormat | tagId
+
+
+def _readHeader(octets, pos, end):
+    if pos + 2 > end:
+        raise FallbackError('short substrate')
+
+    tagOctet = octets[pos]
+    length = octets[pos + 1]
+    pos += 2
+
+    if length & 0x80:
+        size = length & 0x7f
+        if not size or size > 4:
+            raise FallbackError('unsupported length form')
+        if pos + size > end:
+            raise FallbackError('short substrate')
+        length = 0
+        for octet in octets[pos:pos + size]:
+            length = length << 8 | octet
+        pos += size
+
+    if pos + length > end:
+        raise FallbackError('short substrate')
+
+    return tagOctet, pos, pos + length
+
+
+class Decoder(object):
+    """Turn BER substrate into pyasn1 objects following ASN.1 schema.
+
+    Schema is compiled into a tree of decoding functions on first use,
+    decoding functions are called as `fun(substrate, octets, start, end)`
+    where `octets` is a `bytearray` of `substrate` and `start`, `end`
+    delimit value being decoded.
+
+    Compiled schema objects are kept in a bounded cache. Components of
+    SNMP schemas are shared by all schema instances of the same class,
+    so that schema instantiated per message compiles into a single
+    decoding function on top of the cached ones.
+    """
+    def __init__(self):
+        # id(asn1Spec) -> (asn1Spec, {tag octet: decoding function} or None)
+        self.__specs = cache.Cache(maxSize=1024)
+
+    def __call__(self, substrate, asn1Spec=None, **options):
+        if asn1Spec is None or options:
+            return berDecoder.decode(substrate, asn1Spec=asn1Spec, **options)
+
+        try:
+            tagMap = self.__compile(asn1Spec)
+
+        except FallbackError:
+            return berDecoder.decode(substrate, asn1Spec=asn1Spec)
+
+        try:
+            octets = bytearray(substrate)
+            tagOctet, start, end = _readHeader(octets, 0, len(octets))
+            if tagOctet not in tagMap:
+                raise FallbackError('unexpected tag')
+            return tagMap[tagOctet](substrate, octets, start, end), substrate[end:]
+
+        except (FallbackError, PyAsn1Error):
+            return berDecoder.decode(substrate, asn1Spec=asn1Spec)
+
+    decode = __call__
+
+    def __compile(self, asn1Spec):
+        try:
+            spec, tagMap = self.__specs[id(asn1Spec)]
+
+        except KeyError:
+            pass
+
+        else:
+            # cached schema object holds on to its id
+            if spec is asn1Spec:
+                if tagMap is None:
+                    raise FallbackError('unsupported schema')
+                return tagMap
+
+        try:
+            tagMap = self.__compileSpec(asn1Spec)
+
+        except FallbackError:
+            self.__specs[id(asn1Spec)] = asn1Spec, None
+            raise
+
+        self.__specs[id(asn1Spec)] = asn1Spec, tagMap
+
+        return tagMap
+
+    def __compileSpec(self, asn1Spec):
+        if isinstance(asn1Spec, univ.Choice):
+            return self.__compileChoice(asn1Spec)
+
+        elif isinstance(asn1Spec, univ.Sequence):
+            fun = self.__compileSequence(asn1Spec)
+
+        elif isinstance(asn1Spec, univ.SequenceOf):
+            fun = self.__compileSequenceOf(asn1Spec)
+
+        elif isinstance(asn1Spec, univ.Integer):
+            fun = self.__compileInteger(asn1Spec)
+
+        elif isinstance(asn1Spec, univ.OctetString):
+            fun = self.__compileOctetString(asn1Spec)
+
+        elif isinstance(asn1Spec, univ.Null):
+            fun = self.__compileNull(asn1Spec)
+
+        elif isinstance(asn1Spec, univ.ObjectIdentifier):
+            fun = self.__compileObjectIdentifier(asn1Spec)
+
+        else:
+            raise FallbackError('unsupported type %s' % asn1Spec.__class__.__name__)
+
+        isConstructed = isinstance(asn1Spec, (univ.Sequence, univ.SequenceOf))
+
+        return {_getTagOctet(asn1Spec.tagSet, isConstructed): fun}
+
+    def __compileChoice(self, asn1Spec):
+        if asn1Spec.tagSet:
+            raise FallbackError('tagged CHOICE')
+
+        tagMap = {}
+
+        for idx, namedType in enumerate(asn1Spec.componentType.namedTypes):
+            for tagOctet, fun in self.__compile(namedType.asn1Object).items():
+                if tagOctet in tagMap:
+                    raise FallbackError('ambiguous CHOICE')
+
+                tagMap[tagOctet] = self.__getChoiceDecoder(asn1Spec, idx, fun)
+
+        return tagMap
+
+    @staticmethod
+    def __getChoiceDecoder(asn1Spec, idx, fun):
+        clone = asn1Spec.clone
+
+        # component position is resolved by tag at compile time
+        def decodeChoice(substrate, octets, start, end):
+            asn1Object = clone()
+            asn1Object.setComponentByPosition(
+                idx, fun(substrate, octets, start, end),
+                verifyConstraints=False,
+                matchTags=False, matchConstraints=False
+            )
+            return asn1Object
+
+        return decodeChoice
+
+    def __compileSequence(self, asn1Spec):
+        namedTypes = asn1Spec.componentType
+        if not namedTypes or namedTypes.hasOptionalOrDefault or namedTypes.hasOpenTypes:
+            raise FallbackError('SEQUENCE with optional components')
+
+        componentTagMaps = [self.__compile(namedType.asn1Object)
+                            for namedType in namedTypes.namedTypes]
+
+        clone = asn1Spec.clone
+
+        def decodeSequence(substrate, octets, start, end):
+            asn1Object = clone()
+            setComponentByPosition = asn1Object.setComponentByPosition
+
+            for idx, tagMap in enumerate(componentTagMaps):
+                tagOctet, start, nextStart = _readHeader(octets, start, end)
+                if tagOctet not in tagMap:
+                    raise FallbackError('unexpected tag')
+
+                setComponentByPosition(
+                    idx, tagMap[tagOctet](substrate, octets, start, nextStart),
+                    verifyConstraints=False,
+                    matchTags=False, matchConstraints=False
+                )
+
+                start = nextStart
+
+            if start != end:
+                raise FallbackError('excessive components')
+
+            return asn1Object
+
+        return decodeSequence
+
+    def __compileSequenceOf(self, asn1Spec):
+        tagMap = self.__compile(asn1Spec.componentType)
+
+        clone = asn1Spec.clone
+
+        def decodeSequenceOf(substrate, octets, start, end):
+            asn1Object = clone()
+            setComponentByPosition = asn1Object.setComponentByPosition
+
+            idx = 0
+            while start < end:
+                tagOctet, start, nextStart = _readHeader(octets, start, end)
+                if tagOctet not in tagMap:
+                    raise FallbackError('unexpected tag')
+
+                setComponentByPosition(
+                    idx, tagMap[tagOctet](substrate, octets, start, nextStart),
+                    verifyConstraints=False,
+                    matchTags=False, matchConstraints=False
+                )
+
+                start = nextStart
+                idx += 1
+
+            return asn1Object
+
+        return decodeSequenceOf
+
+    @staticmethod
+    def __compileInteger(asn1Spec):
+        clone = asn1Spec.clone
+
+        def decodeInteger(substrate, octets, start, end):
+            if start == end:
+                return clone(0)
+            return clone(from_bytes(substrate[start:end], signed=True))
+
+        return decodeInteger
+
+    @staticmethod
+    def __compileOctetString(asn1Spec):
+        clone = asn1Spec.clone
+
+        def decodeOctetString(substrate, octets, start, end):
+            return clone(substrate[start:end])
+
+        return decodeOctetString
+
+    @staticmethod
+    def __compileNull(asn1Spec):
+        clone = asn1Spec.clone
+
+        def decodeNull(substrate, octets, start, end):
+            if start != end:
+                raise FallbackError('non-empty NULL')
+            return clone(null)
+
+        return decodeNull
+
+    @staticmethod
+    def __compileObjectIdentifier(asn1Spec):
+        clone = asn1Spec.clone
+
+        def decodeObjectIdentifier(substrate, octets, start, end):
+            if start == end or octets[end - 1] & 0x80:
+                raise FallbackError('malformed OID')
+
+            oid = []
+            subId = 0
+            for octet in octets[start:end]:
+                if octet & 0x80:
+                    if not subId and octet == 0x80:
+                        raise FallbackError('malformed OID')
+                    subId = subId << 7 | octet & 0x7f
+                else:
+                    oid.append(subId << 7 | octet)
+                    subId = 0
+
+            subId = oid[0]
+            if subId < 40:
+                oid.insert(0, 0)
+            elif subId < 80:
+                oid[0:1] = 1, subId - 40
+            else:
+                oid[0:1] = 2, subId - 80
+
+            return clone(tuple(oid))
+
+        return decodeObjectIdentifier
+
+
+def _encodeLength(length):
+    if length < 0x80:
+        return ints2octs((length,))
+
+    substrate = []
+    while length:
+        substrate.insert(0, length & 0xff)
+        length >>= 8
+
+    return ints2octs([0x80 | len(substrate)] + substrate)
+
+
+class Encoder(object):
+    """Turn pyasn1 objects into BER substrate"""
+    def __init__(self):
+        # tagSet -> encoded tag
+        self.__tags = {}
+
+    def __call__(self, value, asn1Spec=None, **options):
+        if asn1Spec is not None or options:
+            return berEncoder.encode(value, asn1Spec=asn1Spec, **options)
+
+        try:
+            return self.__encode(value)
+
+        except (FallbackError, PyAsn1Error):
+            return berEncoder.encode(value)
+
+    encode = __call__
+
+    def __encode(self, value):
+        tagSet = value.tagSet
+
+        if isinstance(value, univ.Choice):
+            if tagSet:
+                raise FallbackError('tagged CHOICE')
+            return self.__encode(value.getComponent())
+
+        if isinstance(value, univ.Sequence):
+            componentType = value.componentType
+            if not componentType or componentType.hasOptionalOrDefault:
+                raise FallbackError('SEQUENCE with optional components')
+
+            value.verifySizeSpec()
+
+            substrate = []
+            for idx in range(len(componentType)):
+                component = value.getComponentByPosition(idx, instantiate=False)
+                if component is noValue:
+                    raise FallbackError('no value')
+                substrate.append(self.__encode(component))
+
+            substrate = null.join(substrate)
+            isConstructed = True
+
+        elif isinstance(value, univ.SequenceOf):
+            value.verifySizeSpec()
+
+            substrate = []
+            for idx in range(len(value)):
+                component = value.getComponentByPosition(idx, instantiate=False)
+                if component is noValue:
+                    raise FallbackError('no value')
+                substrate.append(self.__encode(component))
+
+            substrate = null.join(substrate)
+            isConstructed = True
+
+        elif not value.isValue:
+            raise FallbackError('no value')
+
+        elif isinstance(value, univ.Any):
+            if tagSet:
+                raise FallbackError('tagged ANY')
+            return value.asOctets()  # serialized in advance
+
+        elif isinstance(value, univ.Integer):
+            value = int(value)
+            if value:
+                substrate = to_bytes(value, signed=True)
+            else:
+                substrate = ints2octs((0,))
+            isConstructed = False
+
+        elif isinstance(value, univ.OctetString):
+            substrate = value.asOctets()
+            isConstructed = False
+
+        elif isinstance(value, univ.Null):
+            substrate = null
+            isConstructed = False
+
+        elif isinstance(value, univ.ObjectIdentifier):
+            substrate = self.__encodeObjectIdentifier(value.asTuple())
+            isConstructed = False
+
+        else:
+            raise FallbackError('unsupported type %s' % value.__class__.__name__)
+
+        try:
+            encodedTag = self.__tags[tagSet, isConstructed]
+
+        except KeyError:
+            encodedTag = self.__tags[tagSet, isConstructed] = ints2octs(
+                (_getTagOctet(tagSet, isConstructed),)
+            )
+
+        return encodedTag + _encodeLength(len(substrate)) + substrate
+
+    @staticmethod
+    def __encodeObjectIdentifier(oid):
+        if len(oid) < 2:
+            raise FallbackError('short OID')
+
+        first, second = oid[:2]
+        if first < 2 and 0 <= second <= 39:
+            subIds = [first * 40 + second]
+        elif first == 2 and second >= 0:
+            subIds = [second + 80]
+        else:
+            raise FallbackError('impossible first/second arcs')
+
+        subIds.extend(oid[2:])
+
+        octets = []
+        for subId in subIds:
+            if 0 <= subId < 0x80:
+                octets.append(subId)
+            elif subId >= 0x80:
+                chunk = [subId & 0x7f]
+                subId >>= 7
+                while subId:
+                    chunk.insert(0, 0x80 | subId & 0x7f)
+                    subId >>= 7
+                octets.extend(chunk)
+            else:
+                raise FallbackError('negative sub-OID')
+
+        return ints2octs(octets)
+
+
+encoder = Encoder()
+decoder = Decoder()
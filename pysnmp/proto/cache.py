@@ -4,15 +4,33 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+import heapq
 from pysnmp.proto import error
 
 
 class Cache(object):
+    """Pending requests repository.
+
+    Entries carrying `timeout` parameter (absolute expiration time) are
+    also kept in a heap ordered by expiration time so that expiration
+    takes time proportional to the number of expired entries rather
+    than to the number of outstanding ones.
+
+    Heap entries of popped or rescheduled requests are not removed right
+    away but skipped once they surface, the heap is rebuilt whenever
+    such stale entries start to prevail.
+    """
     def __init__(self):
         self.__cacheRepository = {}
+        self.__expirationHeap = []
+
+    def __len__(self):
+        return len(self.__cacheRepository)
 
     def add(self, index, **kwargs):
         self.__cacheRepository[index] = kwargs
+        if 'timeout' in kwargs:
+            self.__schedule(index, kwargs['timeout'])
         return index
 
     def pop(self, index):
@@ -29,10 +47,60 @@ class Cache(object):
                 'Cache miss on update for %s' % kwargs
             )
         self.__cacheRepository[index].update(kwargs)
+        if 'timeout' in kwargs:
+            self.__schedule(index, kwargs['timeout'])
+
+    def getNextExpiration(self):
+        """Return earliest expiration time of pending entries or None"""
+        heap = self.__expirationHeap
+        while heap:
+            timeoutAt, index = heap[0]
+            cachedParams = self.__cacheRepository.get(index)
+            if cachedParams is not None and cachedParams.get('timeout') == timeoutAt:
+                return timeoutAt
+            heapq.heappop(heap)
+
+    def expire(self, cbFun, cbCtx, timeNow=None):
+        """Offer cached entries to `cbFun`, drop those it returns True for.
+
+        If `timeNow` is given, only entries timing out at or before
+        `timeNow` are offered.
+        """
+        if timeNow is None:
+            for index, cachedParams in list(self.__cacheRepository.items()):
+                if cbFun:
+                    if cbFun(index, cachedParams, cbCtx):
+                        if index in self.__cacheRepository:
+                            del self.__cacheRepository[index]
+            return
+
+        heap = self.__expirationHeap
+        cacheRepository = self.__cacheRepository
+
+        unexpired = []
+
+        while heap and heap[0][0] <= timeNow:
+            timeoutAt, index = heapq.heappop(heap)
+            cachedParams = cacheRepository.get(index)
+            if cachedParams is None or cachedParams.get('timeout') != timeoutAt:
+                continue  # stale entry
+            if cbFun and cbFun(index, cachedParams, cbCtx):
+                if cacheRepository.get(index) is cachedParams:
+                    del cacheRepository[index]
+            elif cacheRepository.get(index) is cachedParams:
+                unexpired.append((timeoutAt, index))
+
+        for entry in unexpired:
+            heapq.heappush(heap, entry)
+
+    def __schedule(self, index, timeoutAt):
+        heap = self.__expirationHeap
+        heapq.heappush(heap, (timeoutAt, index))
 
-    def expire(self, cbFun, cbCtx):
-        for index, cachedParams in list(self.__cacheRepository.items()):
-            if cbFun:
-                if cbFun(index, cachedParams, cbCtx):
-                    if index in self.__cacheRepository:
-                        del self.__cacheRepository[index]
+        # stale heap entries prevail
+        if len(heap) > 64 and len(heap) > 2 * len(self.__cacheRepository):
+            cacheRepository = self.__cacheRepository
+            heap[:] = [(timeoutAt, index) for timeoutAt, index in heap
+                       if index in cacheRepository and
+                       cacheRepository[index].get('timeout') == timeoutAt]
+            heapq.heapify(heap)
@@ -41,3 +41,7 @@ class AbstractMessageProcessingModel(object):
 
     def receiveTimerTick(self, snmpEngine, timeNow):
         self._cache.expireCaches()
+
+    def expirationsArePending(self):
+        """Tell whether `receiveTimerTick()` has anything to expire"""
+        return self._cache.expirationsArePending()
@@ -45,7 +45,7 @@ class Cache(object):
             raise error.ProtocolError('Cache miss for stateReference=%s at %s' % (stateReference, self))
         del self.__stateReferenceIndex[stateReference]
         cacheEntry, expireAt = cacheInfo
-        del self.__expirationQueue[expireAt]['stateReference'][stateReference]
+        self.__unschedule(expireAt, 'stateReference', stateReference)
         return cacheEntry
 
     # Client mode cache handling
@@ -81,13 +81,24 @@ class Cache(object):
         del self.__sendPduHandleIdx[msgInfo['sendPduHandle']]
         del self.__msgIdIndex[msgId]
         cacheEntry, expireAt = cacheInfo
-        del self.__expirationQueue[expireAt]['msgId'][msgId]
+        self.__unschedule(expireAt, 'msgId', msgId)
         return cacheEntry
 
     def popBySendPduHandle(self, sendPduHandle):
         if sendPduHandle in self.__sendPduHandleIdx:
             self.popByMsgId(self.__sendPduHandleIdx[sendPduHandle])
 
+    def __unschedule(self, expireAt, kind, key):
+        cacheInfo = self.__expirationQueue[expireAt]
+        del cacheInfo[kind][key]
+        if not cacheInfo[kind]:
+            del cacheInfo[kind]
+            if not cacheInfo:
+                del self.__expirationQueue[expireAt]
+
+    def expirationsArePending(self):
+        return bool(self.__expirationQueue)
+
     def expireCaches(self):
         # Uses internal clock to expire pending messages
         if self.__expirationTimer in self.__expirationQueue:
@@ -5,7 +5,7 @@
 # License: http://snmplabs.com/pysnmp/license.html
 #
 import sys
-from pyasn1.codec.ber import decoder, eoo
+from pyasn1.codec.ber import eoo
 from pyasn1.type import univ
 from pyasn1.compat.octets import null
 from pyasn1.error import PyAsn1Error
@@ -247,7 +247,7 @@ class SnmpV1MessageProcessingModel(AbstractMessageProcessingModel):
         mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
 
         # rfc3412: 7.2.2
-        msg, restOfWholeMsg = decoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
+        msg, restOfWholeMsg = snmpEngine.berDecoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
 
         debug.logger & debug.flagMP and debug.logger('prepareDataElements: %s' % (msg.prettyPrint(),))
 
@@ -8,7 +8,7 @@ import sys
 from pysnmp.proto.mpmod.base import AbstractMessageProcessingModel
 from pysnmp.proto import rfc1905, rfc3411, api, errind, error
 from pyasn1.type import univ, namedtype, constraint
-from pyasn1.codec.ber import decoder, eoo
+from pyasn1.codec.ber import eoo
 from pyasn1.error import PyAsn1Error
 from pysnmp import debug
 
@@ -469,7 +469,7 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
     def prepareDataElements(self, snmpEngine, transportDomain,
                             transportAddress, wholeMsg):
         # 7.2.2
-        msg, restOfwholeMsg = decoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
+        msg, restOfwholeMsg = snmpEngine.berDecoder.decode(wholeMsg, asn1Spec=self._snmpMsgSpec)
 
         debug.logger & debug.flagMP and debug.logger('prepareDataElements: %s' % (msg.prettyPrint(),))
 
@@ -491,9 +491,7 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
 
         # 7.2.4
         if securityModel not in snmpEngine.securityModels:
-            snmpUnknownSecurityModels, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
-                '__SNMP-MPD-MIB', 'snmpUnknownSecurityModels')
-            snmpUnknownSecurityModels.syntax += 1
+            snmpEngine.statistics.snmpUnknownSecurityModels += 1
             raise error.StatusInformation(errorIndication=errind.unsupportedSecurityModel)
 
         # 7.2.5
@@ -504,8 +502,7 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
         elif (msgFlags & 0x03) == 0x03:
             securityLevel = 3
         else:
-            snmpInvalidMsgs, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols('__SNMP-MPD-MIB', 'snmpInvalidMsgs')
-            snmpInvalidMsgs.syntax += 1
+            snmpEngine.statistics.snmpInvalidMsgs += 1
             raise error.StatusInformation(errorIndication=errind.invalidMsg)
 
         if msgFlags & 0x04:
@@ -841,3 +838,7 @@ class SnmpV3MessageProcessingModel(AbstractMessageProcessingModel):
     def receiveTimerTick(self, snmpEngine, timeNow):
         self.__expireEnginesInfo()
         AbstractMessageProcessingModel.receiveTimerTick(self, snmpEngine, timeNow)
+
+    def expirationsArePending(self):
+        return (bool(self.__engineIdCacheExpQueue) or
+                AbstractMessageProcessingModel.expirationsArePending(self))
@@ -5,10 +5,11 @@
 # License: http://snmplabs.com/pysnmp/license.html
 #
 import sys
+from time import time
 from pyasn1.compat.octets import null
 from pyasn1.error import PyAsn1Error
 from pysnmp.smi import builder, instrum
-from pysnmp.proto import errind, error, cache
+from pysnmp.proto import errind, error, cache, stats
 from pysnmp.proto.api import verdec  # XXX
 from pysnmp.error import PySnmpError
 from pysnmp import nextid, debug
@@ -32,9 +33,17 @@ class MsgAndPduDispatcher(object):
             'SNMP-TARGET-MIB', 'SNMP-USER-BASED-SM-MIB'
         )
 
+        # Statistics counters backing MIB instances
+        self.statistics = stats.Statistics()
+        self.statistics.bindMib(self.mibInstrumController.mibBuilder)
+
         # Requests cache
         self.__cache = cache.Cache()
 
+        # Delayed call expiring the earliest pending request
+        self.__expirationTimer = None
+        self.__expirationTime = None
+
         # Registered context engine IDs
         self.__appsRegistration = {}
 
@@ -107,8 +116,12 @@ class MsgAndPduDispatcher(object):
                 messageProcessingModel, securityModel, securityName,
                 securityLevel, contextEngineId, contextName,
                 pduVersion, PDU, expectResponse, timeout=0,
-                cbFun=None, cbCtx=None):
-        """PDU dispatcher -- prepare and serialize a request or notification"""
+                cbFun=None, cbCtx=None, timeoutInSeconds=None):
+        """PDU dispatcher -- prepare and serialize a request or notification
+
+        Response is awaited for `timeout` timer ticks or, if given,
+        `timeoutInSeconds` seconds.
+        """
         # 4.1.1.2
         k = int(messageProcessingModel)
         if k in snmpEngine.messageProcessingSubsystems:
@@ -124,20 +137,27 @@ class MsgAndPduDispatcher(object):
         # 4.1.1.3
         sendPduHandle = self.__sendPduHandle()
         if expectResponse:
+            if timeoutInSeconds is None:
+                # Timeout in (possibly fractional) timer ticks into seconds
+                timeoutInSeconds = timeout * snmpEngine.transportDispatcher.getTimerResolution()
+
+            timeoutAt = time() + timeoutInSeconds
+
             self.__cache.add(
                 sendPduHandle,
                 messageProcessingModel=messageProcessingModel,
                 sendPduHandle=sendPduHandle,
-                timeout=timeout + snmpEngine.transportDispatcher.getTimerTicks(),
+                timeout=timeoutAt,
                 cbFun=cbFun,
                 cbCtx=cbCtx
             )
 
-            debug.logger & debug.flagDsp and debug.logger('sendPdu: current time %d ticks, one tick is %s seconds' % (
-                snmpEngine.transportDispatcher.getTimerTicks(), snmpEngine.transportDispatcher.getTimerResolution()))
+            self.__scheduleExpiration(snmpEngine, timeoutAt)
+
+            debug.logger & debug.flagDsp and debug.logger('sendPdu: request times out at %s' % timeoutAt)
 
         debug.logger & debug.flagDsp and debug.logger(
-            'sendPdu: new sendPduHandle %s, timeout %s ticks, cbFun %s' % (sendPduHandle, timeout, cbFun))
+            'sendPdu: new sendPduHandle %s, timeout %s seconds, cbFun %s' % (sendPduHandle, timeoutInSeconds, cbFun))
 
         origTransportDomain = transportDomain
         origTransportAddress = transportAddress
@@ -190,6 +210,8 @@ class MsgAndPduDispatcher(object):
                 self.__cache.pop(sendPduHandle)
             raise
 
+        self.statistics.snmpOutPkts += 1
+
         snmpEngine.observer.clearExecutionContext(snmpEngine, 'rfc3412.sendPdu')
 
         # Update cache with orignal req params (used for retrying)
@@ -247,8 +269,7 @@ class MsgAndPduDispatcher(object):
                                                                                        'snmpEngineMaxMessageSize')
         if (snmpEngineMaxMessageSize.syntax and
                 len(outgoingMessage) > snmpEngineMaxMessageSize.syntax):
-            snmpSilentDrops, = self.mibInstrumController.mibBuilder.importSymbols('__SNMPv2-MIB', 'snmpSilentDrops')
-            snmpSilentDrops.syntax += 1
+            self.statistics.snmpSilentDrops += 1
             raise error.StatusInformation(errorIndication=errind.tooBig)
 
         snmpEngine.observer.storeExecutionContext(
@@ -271,6 +292,8 @@ class MsgAndPduDispatcher(object):
                                                    transportDomain,
                                                    transportAddress)
 
+        self.statistics.snmpOutPkts += 1
+
         snmpEngine.observer.clearExecutionContext(
             snmpEngine, 'rfc3412.returnResponsePdu'
         )
@@ -280,20 +303,25 @@ class MsgAndPduDispatcher(object):
                        transportAddress, wholeMsg):
         """Message dispatcher -- de-serialize message into PDU"""
         # 4.2.1.1
-        snmpInPkts, = self.mibInstrumController.mibBuilder.importSymbols(
-            '__SNMPv2-MIB', 'snmpInPkts'
+        self.statistics.snmpInPkts += 1
+
+        snmpEngineMaxMessageSize, = self.mibInstrumController.mibBuilder.importSymbols(
+            '__SNMP-FRAMEWORK-MIB', 'snmpEngineMaxMessageSize'
         )
-        snmpInPkts.syntax += 1
+
+        # zero message size means no limit just like on sending
+        if snmpEngineMaxMessageSize.syntax:
+            maxMessageSize = int(snmpEngineMaxMessageSize.syntax)
+        else:
+            maxMessageSize = None
 
         # 4.2.1.2
         try:
             restOfWholeMsg = null  # XXX fix decoder non-recursive return
-            msgVersion = verdec.decodeMessageVersion(wholeMsg)
+            msgVersion = verdec.decodeMessageVersion(wholeMsg, maxMessageSize)
 
         except error.ProtocolError:
-            snmpInASNParseErrs, = self.mibInstrumController.mibBuilder.importSymbols('__SNMPv2-MIB',
-                                                                                     'snmpInASNParseErrs')
-            snmpInASNParseErrs.syntax += 1
+            self.statistics.snmpInASNParseErrs += 1
             return null  # n.b the whole buffer gets dropped
 
         debug.logger & debug.flagDsp and debug.logger('receiveMessage: msgVersion %s, msg decoded' % msgVersion)
@@ -304,8 +332,7 @@ class MsgAndPduDispatcher(object):
             mpHandler = snmpEngine.messageProcessingSubsystems[int(messageProcessingModel)]
 
         except KeyError:
-            snmpInBadVersions, = self.mibInstrumController.mibBuilder.importSymbols('__SNMPv2-MIB', 'snmpInBadVersions')
-            snmpInBadVersions.syntax += 1
+            self.statistics.snmpInBadVersions += 1
             return restOfWholeMsg
 
         # 4.2.1.3 -- no-op
@@ -347,8 +374,7 @@ class MsgAndPduDispatcher(object):
 
         except PyAsn1Error:
             debug.logger & debug.flagMP and debug.logger('receiveMessage: %s' % (sys.exc_info()[1],))
-            snmpInASNParseErrs, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols('__SNMPv2-MIB', 'snmpInASNParseErrs')
-            snmpInASNParseErrs.syntax += 1
+            self.statistics.snmpInASNParseErrs += 1
 
             return restOfWholeMsg
 
@@ -365,15 +391,16 @@ class MsgAndPduDispatcher(object):
             # 4.2.2.1.2
             if processPdu is None:
                 # 4.2.2.1.2.a
+                self.statistics.snmpUnknownPDUHandlers += 1
+
                 snmpUnknownPDUHandlers, = self.mibInstrumController.mibBuilder.importSymbols('__SNMP-MPD-MIB',
                                                                                              'snmpUnknownPDUHandlers')
-                snmpUnknownPDUHandlers.syntax += 1
 
                 # 4.2.2.1.2.b
                 statusInformation = {
                     'errorIndication': errind.unknownPDUHandler,
                     'oid': snmpUnknownPDUHandlers.name,
-                    'val': snmpUnknownPDUHandlers.syntax
+                    'val': snmpUnknownPDUHandlers.syntax.clone()
                 }
 
                 debug.logger & debug.flagDsp and debug.logger('receiveMessage: unhandled PDU type')
@@ -395,6 +422,8 @@ class MsgAndPduDispatcher(object):
                         destTransportAddress
                     )
 
+                    self.statistics.snmpOutPkts += 1
+
                 except PySnmpError:
                     debug.logger & debug.flagDsp and debug.logger(
                         'receiveMessage: report failed, statusInformation %s' % sys.exc_info()[1])
@@ -450,9 +479,7 @@ class MsgAndPduDispatcher(object):
 
             # 4.2.2.2.2
             if cachedParams is None:
-                snmpUnknownPDUHandlers, = self.mibInstrumController.mibBuilder.importSymbols('__SNMP-MPD-MIB',
-                                                                                             'snmpUnknownPDUHandlers')
-                snmpUnknownPDUHandlers.syntax += 1
+                self.statistics.snmpUnknownPDUHandlers += 1
                 return restOfWholeMsg
 
             debug.logger & debug.flagDsp and debug.logger(
@@ -507,10 +534,9 @@ class MsgAndPduDispatcher(object):
     # noinspection PyUnusedLocal
     def __expireRequest(self, cacheKey, cachedParams, snmpEngine,
                         statusInformation=None):
-        timeNow = snmpEngine.transportDispatcher.getTimerTicks()
         timeoutAt = cachedParams['timeout']
 
-        if statusInformation is None and timeNow < timeoutAt:
+        if statusInformation is None and time() < timeoutAt:
             return
 
         processResponsePdu = cachedParams['cbFun']
@@ -533,6 +559,44 @@ class MsgAndPduDispatcher(object):
                            cachedParams['cbCtx'])
         return True
 
+    def __scheduleExpiration(self, snmpEngine, timeoutAt):
+        if self.__expirationTime is not None and self.__expirationTime <= timeoutAt:
+            return
+
+        if self.__expirationTimer is not None:
+            self.__expirationTimer.cancel()
+
+        self.__expirationTime = timeoutAt
+        self.__expirationTimer = snmpEngine.transportDispatcher.callLater(
+            max(0, timeoutAt - time()), self.__expireRequests, snmpEngine
+        )
+
+    def __expireRequests(self, snmpEngine):
+        self.__expirationTimer = self.__expirationTime = None
+
+        if snmpEngine.transportDispatcher is None:
+            return
+
+        self.__cache.expire(self.__expireRequest, snmpEngine, time())
+
+        timeoutAt = self.__cache.getNextExpiration()
+        if timeoutAt is not None:
+            self.__scheduleExpiration(snmpEngine, timeoutAt)
+
     # noinspection PyUnusedLocal
     def receiveTimerTick(self, snmpEngine, timeNow):
-        self.__cache.expire(self.__expireRequest, snmpEngine)
+        # Requests are expired by delayed calls, re-arm one if it got lost
+        if self.__expirationTimer is None:
+            timeoutAt = self.__cache.getNextExpiration()
+            if timeoutAt is not None:
+                self.__scheduleExpiration(snmpEngine, timeoutAt)
+
+    def getPendingRequestsStats(self, snmpEngine):
+        """Return number of requests awaiting response and time (in
+        seconds) till the earliest of them times out (or None)"""
+        timeToExpire = self.__cache.getNextExpiration()
+        if timeToExpire is not None:
+            timeToExpire = max(0, timeToExpire - time())
+
+        return dict(pendingRequests=len(self.__cache),
+                    timeToExpire=timeToExpire)
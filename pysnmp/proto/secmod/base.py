@@ -36,3 +36,7 @@ class AbstractSecurityModel(object):
 
     def receiveTimerTick(self, snmpEngine, timeNow):
         pass
+
+    def expirationsArePending(self):
+        """Tell whether `receiveTimerTick()` has anything to expire"""
+        return False
@@ -5,10 +5,10 @@
 # License: http://snmplabs.com/pysnmp/license.html
 #
 import sys
-from pyasn1.codec.ber import encoder
 from pyasn1.error import PyAsn1Error
 from pysnmp.proto.secmod import base
 from pysnmp.carrier.asyncore.dgram import udp, udp6, unix
+from pysnmp.carrier.asyncore.stream import tcp, tcp6
 from pysnmp.smi.error import NoSuchInstanceError
 from pysnmp.proto import errind, error
 from pysnmp import debug
@@ -138,10 +138,15 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
                     SnmpUDPAddress, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols('SNMPv2-TM',
                                                                                                             'SnmpUDPAddress')
                     targetAddrTAddress = tuple(SnmpUDPAddress(targetAddrTAddress))
-                elif targetAddrTDomain[:len(udp6.snmpUDP6Domain)] == udp6.snmpUDP6Domain:
+                elif (targetAddrTDomain[:len(udp6.snmpUDP6Domain)] == udp6.snmpUDP6Domain or
+                      targetAddrTDomain[:len(tcp6.snmpTCP6Domain)] == tcp6.snmpTCP6Domain):
                     TransportAddressIPv6, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
                         'TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv6')
                     targetAddrTAddress = tuple(TransportAddressIPv6(targetAddrTAddress))
+                elif targetAddrTDomain[:len(tcp.snmpTCPDomain)] == tcp.snmpTCPDomain:
+                    TransportAddressIPv4, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
+                        'TRANSPORT-ADDRESS-MIB', 'TransportAddressIPv4')
+                    targetAddrTAddress = tuple(TransportAddressIPv4(targetAddrTAddress))
                 elif targetAddrTDomain[:len(unix.snmpLocalDomain)] == unix.snmpLocalDomain:
                     targetAddrTAddress = str(targetAddrTAddress)
                 targetAddr = targetAddrTDomain, targetAddrTAddress
@@ -308,7 +313,7 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
         debug.logger & debug.flagMP and debug.logger('generateRequestMsg: %s' % (msg.prettyPrint(),))
 
         try:
-            return securityParameters, encoder.encode(msg)
+            return securityParameters, snmpEngine.berEncoder.encode(msg)
 
         except PyAsn1Error:
             debug.logger & debug.flagMP and debug.logger(
@@ -338,7 +343,7 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
         debug.logger & debug.flagMP and debug.logger('generateResponseMsg: %s' % (msg.prettyPrint(),))
 
         try:
-            return communityName, encoder.encode(msg)
+            return communityName, snmpEngine.berEncoder.encode(msg)
 
         except PyAsn1Error:
             debug.logger & debug.flagMP and debug.logger(
@@ -368,9 +373,7 @@ class SnmpV1SecurityModel(base.AbstractSecurityModel):
             )
 
         except error.StatusInformation:
-            snmpInBadCommunityNames, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
-                '__SNMPv2-MIB', 'snmpInBadCommunityNames')
-            snmpInBadCommunityNames.syntax += 1
+            snmpEngine.statistics.snmpInBadCommunityNames += 1
             raise error.StatusInformation(
                 errorIndication=errind.unknownCommunityName,
                 communityName=communityName
@@ -4,9 +4,64 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+from pyasn1.compat.octets import oct2int
 from pysnmp.proto import errind, error
 
 
+# BER TLVs to step through on the way to msgAuthenticationParameters
+# value: SNMPv3Message, msgVersion, msgGlobalData, msgSecurityParameters,
+# UsmSecurityParameters, msgAuthoritativeEngineID,
+# msgAuthoritativeEngineBoots, msgAuthoritativeEngineTime, msgUserName
+# and msgAuthenticationParameters. True means "skip TLV value".
+_digestPath = (False, True, True, False, False, True, True, True, True, False)
+
+# Max distance from msgAuthoritativeEngineID value (up to 32 octets)
+# to msgAuthenticationParameters value: engine ID, engine boots and
+# time TLVs, msgUserName TLV (up to 32 octets) and digest TLV header
+_digestWindow = 32 + 7 + 7 + 34 + 2
+
+
+def locateDigest(wholeMsg, digest):
+    """Return offset of msgAuthenticationParameters value in SNMPv3 message.
+
+    If digest octets occur in the message more than once (e.g. a run
+    of zeros in msgAuthoritativeEngineID), the digest is found by
+    walking BER headers of SNMPv3Message and UsmSecurityParameters.
+    Falls back to substring search if message layout is unexpected
+    (e.g. constructed OCTET STRING encoding). Returns -1 if digest
+    is not found.
+    """
+    # A false match may only occur in msgAuthoritativeEngineID or
+    # msgUserName which closely precede the digest, so if the digest
+    # does not repeat right after the first match, that match is it
+    location = wholeMsg.find(digest)
+    if (location == -1 or
+            wholeMsg.find(digest, location + 1, location + _digestWindow + len(digest)) == -1):
+        return location
+
+    try:
+        offset = length = 0
+        for skipValue in _digestPath:
+            length = oct2int(wholeMsg[offset + 1])
+            offset += 2
+            if length & 0x80:
+                size = length & 0x7F
+                length = 0
+                for octet in wholeMsg[offset:offset + size]:
+                    length = length << 8 | oct2int(octet)
+                offset += size
+            if skipValue:
+                offset += length
+
+    except IndexError:
+        return location
+
+    if length == len(digest) and wholeMsg[offset:offset + length] == digest:
+        return offset
+
+    return location
+
+
 class AbstractAuthenticationService(object):
     serviceID = None
 
@@ -20,6 +75,10 @@ class AbstractAuthenticationService(object):
     def digestLength(self):
         raise error.ProtocolError(errind.noAuthentication)
 
+    @property
+    def hashAlgorithm(self):
+        raise error.ProtocolError(errind.noAuthentication)
+
     # 7.2.4.1
     def authenticateOutgoingMsg(self, authKey, wholeMsg):
         raise error.ProtocolError(errind.noAuthentication)
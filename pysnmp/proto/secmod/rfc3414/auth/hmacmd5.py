@@ -14,6 +14,7 @@ from pyasn1.type import univ
 from pysnmp.proto.secmod.rfc3414.auth import base
 from pysnmp.proto.secmod.rfc3414 import localkey
 from pysnmp.proto import errind, error
+from pysnmp import cache
 
 _twelveZeros = univ.OctetString((0,) * 12).asOctets()
 _fortyEightZeros = (0,) * 48
@@ -26,6 +27,9 @@ class HmacMd5(base.AbstractAuthenticationService):
     __ipad = [0x36] * 64
     __opad = [0x5C] * 64
 
+    def __init__(self):
+        self.__keyedHashers = cache.Cache(maxSize=1024)
+
     def hashPassphrase(self, authKey):
         return localkey.hashPassphraseMD5(authKey)
 
@@ -36,22 +40,21 @@ class HmacMd5(base.AbstractAuthenticationService):
     def digestLength(self):
         return 12
 
-    # 6.3.1
-    def authenticateOutgoingMsg(self, authKey, wholeMsg):
-        # Here we expect calling secmod to indicate where the digest
-        # should be in the substrate. Also, it pre-sets digest placeholder
-        # so we hash wholeMsg out of the box.
-        # Yes, that's ugly but that's rfc...
-        l = wholeMsg.find(_twelveZeros)
-        if l == -1:
-            raise error.ProtocolError('Cant locate digest placeholder')
-        wholeHead = wholeMsg[:l]
-        wholeTail = wholeMsg[l + 12:]
+    @property
+    def hashAlgorithm(self):
+        return md5
 
-        # 6.3.1.1
+    def __getKeyedHashers(self, authKey):
+        authKey = authKey.asOctets()
+
+        try:
+            return self.__keyedHashers[authKey]
+
+        except KeyError:
+            pass
 
         # 6.3.1.2a
-        extendedAuthKey = authKey.asNumbers() + _fortyEightZeros
+        extendedAuthKey = univ.OctetString(authKey).asNumbers() + _fortyEightZeros
 
         # 6.3.1.2b --> no-op
 
@@ -67,14 +70,38 @@ class HmacMd5(base.AbstractAuthenticationService):
             map(lambda x, y: x ^ y, extendedAuthKey, self.__opad)
         )
 
-        # 6.3.1.3
         # noinspection PyDeprecation,PyCallingNonCallable
-        d1 = md5(k1.asOctets() + wholeMsg).digest()
+        keyedHashers = md5(k1.asOctets()), md5(k2.asOctets())
+
+        self.__keyedHashers[authKey] = keyedHashers
+
+        return keyedHashers
+
+    # 6.3.1
+    def authenticateOutgoingMsg(self, authKey, wholeMsg):
+        # Here we expect calling secmod to indicate where the digest
+        # should be in the substrate. Also, it pre-sets digest placeholder
+        # so we hash wholeMsg out of the box.
+        # Yes, that's ugly but that's rfc...
+        l = base.locateDigest(wholeMsg, _twelveZeros)
+        if l == -1:
+            raise error.ProtocolError('Cant locate digest placeholder')
+        wholeHead = wholeMsg[:l]
+        wholeTail = wholeMsg[l + 12:]
+
+        # 6.3.1.1
+
+        # 6.3.1.2
+        innerHasher, outerHasher = self.__getKeyedHashers(authKey)
+
+        # 6.3.1.3
+        d1 = innerHasher.copy()
+        d1.update(wholeMsg)
 
         # 6.3.1.4
-        # noinspection PyDeprecation,PyCallingNonCallable
-        d2 = md5(k2.asOctets() + d1).digest()
-        mac = d2[:12]
+        d2 = outerHasher.copy()
+        d2.update(d1.digest())
+        mac = d2.digest()[:12]
 
         # 6.3.1.5 & 6
         return wholeHead + mac + wholeTail
@@ -88,40 +115,26 @@ class HmacMd5(base.AbstractAuthenticationService):
             )
 
         # 6.3.2.3
-        l = wholeMsg.find(authParameters.asOctets())
+        l = base.locateDigest(wholeMsg, authParameters.asOctets())
         if l == -1:
             raise error.ProtocolError('Cant locate digest in wholeMsg')
         wholeHead = wholeMsg[:l]
         wholeTail = wholeMsg[l + 12:]
         authenticatedWholeMsg = wholeHead + _twelveZeros + wholeTail
 
-        # 6.3.2.4a
-        extendedAuthKey = authKey.asNumbers() + _fortyEightZeros
-
-        # 6.3.2.4b --> no-op
-
-        # 6.3.2.4c
-        k1 = univ.OctetString(
-            map(lambda x, y: x ^ y, extendedAuthKey, self.__ipad)
-        )
-
-        # 6.3.2.4d --> no-op
-
-        # 6.3.2.4e
-        k2 = univ.OctetString(
-            map(lambda x, y: x ^ y, extendedAuthKey, self.__opad)
-        )
+        # 6.3.2.4
+        innerHasher, outerHasher = self.__getKeyedHashers(authKey)
 
         # 6.3.2.5a
-        # noinspection PyDeprecation,PyCallingNonCallable
-        d1 = md5(k1.asOctets() + authenticatedWholeMsg).digest()
+        d1 = innerHasher.copy()
+        d1.update(authenticatedWholeMsg)
 
         # 6.3.2.5b
-        # noinspection PyDeprecation,PyCallingNonCallable
-        d2 = md5(k2.asOctets() + d1).digest()
+        d2 = outerHasher.copy()
+        d2.update(d1.digest())
 
         # 6.3.2.5c
-        mac = d2[:12]
+        mac = d2.digest()[:12]
 
         # 6.3.2.6
         if mac != authParameters:
@@ -14,6 +14,7 @@ from pyasn1.type import univ
 from pysnmp.proto.secmod.rfc3414.auth import base
 from pysnmp.proto.secmod.rfc3414 import localkey
 from pysnmp.proto import errind, error
+from pysnmp import cache
 
 _twelveZeros = univ.OctetString((0,) * 12).asOctets()
 _fortyFourZeros = (0,) * 44
@@ -26,6 +27,9 @@ class HmacSha(base.AbstractAuthenticationService):
     __ipad = [0x36] * 64
     __opad = [0x5C] * 64
 
+    def __init__(self):
+        self.__keyedHashers = cache.Cache(maxSize=1024)
+
     def hashPassphrase(self, authKey):
         return localkey.hashPassphraseSHA(authKey)
 
@@ -36,21 +40,21 @@ class HmacSha(base.AbstractAuthenticationService):
     def digestLength(self):
         return 12
 
-    # 7.3.1
-    def authenticateOutgoingMsg(self, authKey, wholeMsg):
-        # 7.3.1.1
-        # Here we expect calling secmod to indicate where the digest
-        # should be in the substrate. Also, it pre-sets digest placeholder
-        # so we hash wholeMsg out of the box.
-        # Yes, that's ugly but that's rfc...
-        l = wholeMsg.find(_twelveZeros)
-        if l == -1:
-            raise error.ProtocolError('Cant locate digest placeholder')
-        wholeHead = wholeMsg[:l]
-        wholeTail = wholeMsg[l + 12:]
+    @property
+    def hashAlgorithm(self):
+        return sha1
+
+    def __getKeyedHashers(self, authKey):
+        authKey = authKey.asOctets()
+
+        try:
+            return self.__keyedHashers[authKey]
+
+        except KeyError:
+            pass
 
         # 7.3.1.2a
-        extendedAuthKey = authKey.asNumbers() + _fortyFourZeros
+        extendedAuthKey = univ.OctetString(authKey).asNumbers() + _fortyFourZeros
 
         # 7.3.1.2b -- no-op
 
@@ -66,12 +70,36 @@ class HmacSha(base.AbstractAuthenticationService):
             map(lambda x, y: x ^ y, extendedAuthKey, self.__opad)
         )
 
+        keyedHashers = sha1(k1.asOctets()), sha1(k2.asOctets())
+
+        self.__keyedHashers[authKey] = keyedHashers
+
+        return keyedHashers
+
+    # 7.3.1
+    def authenticateOutgoingMsg(self, authKey, wholeMsg):
+        # 7.3.1.1
+        # Here we expect calling secmod to indicate where the digest
+        # should be in the substrate. Also, it pre-sets digest placeholder
+        # so we hash wholeMsg out of the box.
+        # Yes, that's ugly but that's rfc...
+        l = base.locateDigest(wholeMsg, _twelveZeros)
+        if l == -1:
+            raise error.ProtocolError('Cant locate digest placeholder')
+        wholeHead = wholeMsg[:l]
+        wholeTail = wholeMsg[l + 12:]
+
+        # 7.3.1.2
+        innerHasher, outerHasher = self.__getKeyedHashers(authKey)
+
         # 7.3.1.3
-        d1 = sha1(k1.asOctets() + wholeMsg).digest()
+        d1 = innerHasher.copy()
+        d1.update(wholeMsg)
 
         # 7.3.1.4
-        d2 = sha1(k2.asOctets() + d1).digest()
-        mac = d2[:12]
+        d2 = outerHasher.copy()
+        d2.update(d1.digest())
+        mac = d2.digest()[:12]
 
         # 7.3.1.5 & 6
         return wholeHead + mac + wholeTail
@@ -85,38 +113,26 @@ class HmacSha(base.AbstractAuthenticationService):
             )
 
         # 7.3.2.3
-        l = wholeMsg.find(authParameters.asOctets())
+        l = base.locateDigest(wholeMsg, authParameters.asOctets())
         if l == -1:
             raise error.ProtocolError('Cant locate digest in wholeMsg')
         wholeHead = wholeMsg[:l]
         wholeTail = wholeMsg[l + 12:]
         authenticatedWholeMsg = wholeHead + _twelveZeros + wholeTail
 
-        # 7.3.2.4a
-        extendedAuthKey = authKey.asNumbers() + _fortyFourZeros
-
-        # 7.3.2.4b --> no-op
-
-        # 7.3.2.4c
-        k1 = univ.OctetString(
-            map(lambda x, y: x ^ y, extendedAuthKey, self.__ipad)
-        )
-
-        # 7.3.2.4d --> no-op
-
-        # 7.3.2.4e
-        k2 = univ.OctetString(
-            map(lambda x, y: x ^ y, extendedAuthKey, self.__opad)
-        )
+        # 7.3.2.4
+        innerHasher, outerHasher = self.__getKeyedHashers(authKey)
 
         # 7.3.2.5a
-        d1 = sha1(k1.asOctets() + authenticatedWholeMsg).digest()
+        d1 = innerHasher.copy()
+        d1.update(authenticatedWholeMsg)
 
         # 7.3.2.5b
-        d2 = sha1(k2.asOctets() + d1).digest()
+        d2 = outerHasher.copy()
+        d2.update(d1.digest())
 
         # 7.3.2.5c
-        mac = d2[:12]
+        mac = d2.digest()[:12]
 
         # 7.3.2.6
         if mac != authParameters:
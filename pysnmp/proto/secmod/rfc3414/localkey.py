@@ -4,39 +4,285 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
+import os
+import hmac
+import struct
 try:
-    from hashlib import md5, sha1
+    from hashlib import md5, sha1, sha256
 except ImportError:
     import md5
     import sha
 
     md5 = md5.new
     sha1 = sha.new
+    sha256 = None
+try:
+    import multiprocessing
+except ImportError:
+    multiprocessing = None
 from pyasn1.type import univ
+from pysnmp.cache import LruCache
+from pysnmp import debug
+from pysnmp import error
 
+# Keys derived from passphrases of recently configured USM users:
+# (hashed passphrase, localized key) pairs indexed by key derivation
+# (e.g. USM protocol), passphrase digest and SNMP engine ID
+_localizedKeys = LruCache(maxSize=1024)
 
-def hashPassphrase(passphrase, hashFunc):
-    passphrase = univ.OctetString(passphrase).asOctets()
+# Optional persistent store of the above, see openCacheFile()
+_cacheFile = None
+
+_cacheFileMagic = b'PYSNMP-USM-KEYS\x01'
+_cacheFileSaltSize = 16
+_cacheFileRecordHeader = struct.Struct('!32sBB')
+
+
+class _CacheFile(object):
+    """Append-only file of localized keys.
+
+    The file starts with a magic string followed by a random salt.
+    Each record is HMAC-SHA256 of key derivation, passphrase and
+    SNMP engine ID keyed by the salt, followed by hashed passphrase
+    and localized key. Records with empty keys are tombstones.
+    """
+    def __init__(self, filename):
+        flags = os.O_RDWR | os.O_CREAT | os.O_APPEND
+        flags |= getattr(os, 'O_BINARY', 0) | getattr(os, 'O_NOFOLLOW', 0)
+
+        self.__fd = os.open(filename, flags, 384)  # 0600
+
+        try:
+            if hasattr(os, 'fchmod') and os.fstat(self.__fd).st_mode & 63:  # 0077
+                raise error.PySnmpError(
+                    'Localized keys cache file %s is accessible by others' % filename)
+
+            self.__keys = {}
+            self.__load(filename)
+
+        except Exception:
+            os.close(self.__fd)
+            raise
+
+    def __load(self, filename):
+        os.lseek(self.__fd, 0, 0)
+
+        chunks = []
+        while True:
+            chunk = os.read(self.__fd, 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+
+        data = b''.join(chunks)
+
+        if not data:
+            self.__salt = os.urandom(_cacheFileSaltSize)
+            os.write(self.__fd, _cacheFileMagic + self.__salt)
+            return
+
+        offset = len(_cacheFileMagic) + _cacheFileSaltSize
+
+        if len(data) < offset or not data.startswith(_cacheFileMagic):
+            raise error.PySnmpError(
+                'Localized keys cache file %s is corrupted' % filename)
+
+        self.__salt = data[len(_cacheFileMagic):offset]
+
+        while offset + _cacheFileRecordHeader.size <= len(data):
+            digest, hashedSize, localizedSize = _cacheFileRecordHeader.unpack_from(data, offset)
+            offset += _cacheFileRecordHeader.size
+            if offset + hashedSize + localizedSize > len(data):
+                break  # partially written record
+            if hashedSize:
+                self.__keys[digest] = (data[offset:offset + hashedSize],
+                                       data[offset + hashedSize:offset + hashedSize + localizedSize])
+            else:
+                self.__keys.pop(digest, None)
+            offset += hashedSize + localizedSize
+
+    def getDigest(self, keyId, passphrase, snmpEngineId):
+        keyId = ';'.join(['.'.join([str(x) for x in oid]) for oid in keyId])
+        keyId = univ.OctetString(keyId).asOctets()
+        return hmac.new(
+            self.__salt,
+            b''.join([struct.pack('!H', len(x)) + x
+                      for x in (keyId, passphrase, snmpEngineId)]),
+            sha256
+        ).digest()
+
+    def __contains__(self, digest):
+        return digest in self.__keys
+
+    def __getitem__(self, digest):
+        return self.__keys[digest]
+
+    def __setitem__(self, digest, keys):
+        hashedPassphrase, localizedKey = keys
+        os.write(self.__fd, _cacheFileRecordHeader.pack(
+            digest, len(hashedPassphrase), len(localizedKey)) + hashedPassphrase + localizedKey)
+        self.__keys[digest] = keys
+
+    def __delitem__(self, digest):
+        if digest in self.__keys:
+            os.write(self.__fd, _cacheFileRecordHeader.pack(digest, 0, 0))
+            del self.__keys[digest]
+
+    def __len__(self):
+        return len(self.__keys)
+
+    def close(self):
+        os.close(self.__fd)
+
+
+def openCacheFile(filename):
+    """Keep localized keys in a file to survive process restarts.
+
+    The file is created readable and writable by its owner only, an
+    existing file accessible by others is refused. Keys are indexed
+    by a salted HMAC, so the file reveals neither passphrases nor
+    their digests. Every key localized afterwards gets stored in the
+    file, `forgetLocalizedKeys()` drops it from there as well.
+    """
+    global _cacheFile
+
+    if sha256 is None:
+        raise error.PySnmpError('Localized keys cache file requires SHA256')
+
+    closeCacheFile()
+
+    _cacheFile = _CacheFile(filename)
+
+    debug.logger & debug.flagSM and debug.logger(
+        'openCacheFile: using localized keys cache file %s, %d keys' % (filename, len(_cacheFile)))
+
+
+def closeCacheFile():
+    global _cacheFile
+
+    if _cacheFile is not None:
+        _cacheFile.close()
+        _cacheFile = None
+
+
+def _getCacheKey(keyId, passphrase, snmpEngineId):
+    return keyId, sha1(passphrase).digest(), snmpEngineId.asOctets()
+
+
+def _hashPassphrase(args):
+    passphrase, hashFunc = args
     # noinspection PyDeprecation,PyCallingNonCallable
     hasher = hashFunc()
-    ringBuffer = passphrase * (64 // len(passphrase) + 1)
-    # noinspection PyTypeChecker
-    ringBufferLen = len(ringBuffer)
-    count = 0
-    mark = 0
-    while count < 16384:
-        e = mark + 64
-        if e < ringBufferLen:
-            hasher.update(ringBuffer[mark:e])
-            mark = e
-        else:
-            hasher.update(
-                ringBuffer[mark:ringBufferLen] + ringBuffer[0:e - ringBufferLen]
-            )
-            mark = e - ringBufferLen
-        count += 1
+    # 1MB worth of repeated passphrase hashed in one go
+    hasher.update(
+        (passphrase * (1048576 // len(passphrase) + 1))[:1048576]
+    )
     return hasher.digest()
 
+
+def hashPassphrase(passphrase, hashFunc):
+    return _hashPassphrase((univ.OctetString(passphrase).asOctets(), hashFunc))
+
+
+def hashPassphrases(passphrases, processes=None):
+    """Hash many passphrases in parallel.
+
+    Takes a sequence of `(passphrase, hashFunc)` tuples, returns
+    a list of hashed passphrases in the same order. Falls back to
+    serial hashing if worker processes can not be used.
+    """
+    passphrases = [(univ.OctetString(passphrase).asOctets(), hashFunc)
+                   for passphrase, hashFunc in passphrases]
+
+    pending = list(set(passphrases))
+
+    if multiprocessing is not None and processes != 1 and len(pending) > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            hashedPassphrases = dict(zip(pending, pool.map(_hashPassphrase, pending)))
+
+        finally:
+            pool.close()
+            pool.join()
+
+    else:
+        hashedPassphrases = dict([(x, _hashPassphrase(x)) for x in pending])
+
+    return [hashedPassphrases[x] for x in passphrases]
+
+
+def getLocalizedKeys(keyId, passphrase, snmpEngineId,
+                     hashPassphrase, localizeKey):
+    """Return hashed passphrase and localized key, reusing recent ones.
+
+    Keys are derived by `hashPassphrase(passphrase)` and
+    `localizeKey(hashedPassphrase, snmpEngineId)` callables unless
+    already known for the same `keyId`, passphrase and engine ID.
+    Derived keys are kept in a bounded in-memory cache and, if
+    `openCacheFile()` has been called, in a file.
+    """
+    passphrase = univ.OctetString(passphrase).asOctets()
+
+    cacheKey = _getCacheKey(keyId, passphrase, snmpEngineId)
+
+    try:
+        return _localizedKeys[cacheKey]
+
+    except KeyError:
+        pass
+
+    if _cacheFile is not None:
+        digest = _cacheFile.getDigest(keyId, passphrase, cacheKey[2])
+
+        try:
+            keys = _cacheFile[digest]
+
+        except KeyError:
+            pass
+
+        else:
+            _localizedKeys[cacheKey] = keys
+            return keys
+
+    hashedPassphrase = hashPassphrase(passphrase)
+
+    keys = hashedPassphrase, localizeKey(hashedPassphrase, snmpEngineId)
+
+    if hashedPassphrase is not None:  # protocols with no keys are not cached
+        _localizedKeys[cacheKey] = keys
+
+        if _cacheFile is not None:
+            _cacheFile[digest] = tuple([univ.OctetString(x).asOctets() for x in keys])
+
+    return keys
+
+
+def hasLocalizedKeys(keyId, passphrase, snmpEngineId):
+    """Tell whether keys derived from passphrase are cached"""
+    passphrase = univ.OctetString(passphrase).asOctets()
+
+    cacheKey = _getCacheKey(keyId, passphrase, snmpEngineId)
+
+    if cacheKey in _localizedKeys:
+        return True
+
+    return (_cacheFile is not None and
+            _cacheFile.getDigest(keyId, passphrase, cacheKey[2]) in _cacheFile)
+
+
+def forgetLocalizedKeys(keyId, passphrase, snmpEngineId):
+    """Drop keys derived from passphrase from cache and cache file"""
+    passphrase = univ.OctetString(passphrase).asOctets()
+
+    cacheKey = _getCacheKey(keyId, passphrase, snmpEngineId)
+
+    if cacheKey in _localizedKeys:
+        del _localizedKeys[cacheKey]
+
+    if _cacheFile is not None:
+        del _cacheFile[_cacheFile.getDigest(keyId, passphrase, cacheKey[2])]
+
+
 def passwordToKey(passphrase, snmpEngineId, hashFunc):
     return localizeKey(hashPassphrase(passphrase, hashFunc), snmpEngineId, hashFunc)
 
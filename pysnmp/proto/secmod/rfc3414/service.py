@@ -12,15 +12,23 @@ from pysnmp.proto.secmod.rfc3414.priv import des, nopriv
 from pysnmp.proto.secmod.rfc3826.priv import aes
 from pysnmp.proto.secmod.rfc7860.auth import hmacsha2
 from pysnmp.proto.secmod.eso.priv import des3, aes192, aes256
-from pysnmp.smi.error import NoSuchInstanceError
+from pysnmp.smi.error import NoSuchInstanceError, NoSuchObjectError
 from pysnmp.proto import rfc1155, errind, error
 from pysnmp import debug
 from pyasn1.type import univ, namedtype, constraint
-from pyasn1.codec.ber import encoder, decoder, eoo
+from pyasn1.codec.ber import eoo
 from pyasn1.error import PyAsn1Error
 from pyasn1.compat.octets import null
 
 
+def _asOctets(value):
+    if isinstance(value, univ.OctetString):
+        return value.asOctets()
+    if isinstance(value, bytes):
+        return value
+    return univ.OctetString(value).asOctets()
+
+
 # USM security params
 
 class UsmSecurityParameters(rfc1155.TypeCoercionHackMixIn, univ.Sequence):
@@ -62,81 +70,168 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
         self.__timeline = {}
         self.__timelineExpQueue = {}
         self.__expirationTimer = 0
-        self.__paramsBranchId = -1
+        self.__userIndexBuildId = -1
+        self.__userIndexVersionIds = None
+        self.__usmUserEntry = self.__pysnmpUsmKeyEntry = None
+        # (usmUserEngineID, usmUserName) -> user info
+        self.__userIndex = {}
+        # (usmUserEngineID, usmUserSecurityName) -> {instId: usmUserName}
+        self.__securityToUserMap = {}
+        # instId -> (usmUserEngineID, usmUserName, usmUserSecurityName)
+        self.__userIndexInstIds = {}
+
+    def __syncUserIndex(self, mibBuilder):
+        if self.__userIndexBuildId != mibBuilder.lastBuildId:
+            usmUserEntry, = mibBuilder.importSymbols(
+                'SNMP-USER-BASED-SM-MIB', 'usmUserEntry')
+            pysnmpUsmKeyEntry, = mibBuilder.importSymbols(
+                'PYSNMP-USM-MIB', 'pysnmpUsmKeyEntry')
+
+            if (usmUserEntry is not self.__usmUserEntry or
+                    pysnmpUsmKeyEntry is not self.__pysnmpUsmKeyEntry):
+                self.__usmUserEntry = usmUserEntry
+                self.__pysnmpUsmKeyEntry = pysnmpUsmKeyEntry
+                self.__userIndexVersionIds = None
+
+            self.__userIndexBuildId = mibBuilder.lastBuildId
+
+        usmUserEntry = self.__usmUserEntry
+        pysnmpUsmKeyEntry = self.__pysnmpUsmKeyEntry
+
+        versionIds = usmUserEntry.branchVersionId, pysnmpUsmKeyEntry.branchVersionId
+
+        if self.__userIndexVersionIds == versionIds:
+            return
+
+        if self.__userIndexVersionIds is None:
+            changes = None
 
-    def __sec2usr(self, snmpEngine, securityName, securityEngineID=None):
-        mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
-        usmUserEngineID, = mibBuilder.importSymbols('SNMP-USER-BASED-SM-MIB',
-                                                    'usmUserEngineID')
-        if self.__paramsBranchId != usmUserEngineID.branchVersionId:
-            usmUserName, usmUserSecurityName = mibBuilder.importSymbols(
-                'SNMP-USER-BASED-SM-MIB', 'usmUserName', 'usmUserSecurityName')
+        else:
+            changes = usmUserEntry.getChanges(self.__userIndexVersionIds[0])
+            if changes is not None:
+                keyChanges = pysnmpUsmKeyEntry.getChanges(self.__userIndexVersionIds[1])
+                if keyChanges is None:
+                    changes = None
+                else:
+                    changes.extend(keyChanges)
 
-            self.__securityToUserMap = {}
+        if changes is None:
+            self.__userIndex.clear()
+            self.__securityToUserMap.clear()
+            self.__userIndexInstIds.clear()
+
+            instIds = []
+
+            try:
+                usmUserEngineID = usmUserEntry.getNode(usmUserEntry.name + (1,))
+
+            except NoSuchObjectError:
+                usmUserEngineID = None  # MIB tree is not indexed yet
 
             nextMibNode = usmUserEngineID
 
-            while True:
+            while usmUserEngineID is not None:
                 try:
                     nextMibNode = usmUserEngineID.getNextNode(nextMibNode.name)
 
                 except NoSuchInstanceError:
-                    self.__paramsBranchId = usmUserEngineID.branchVersionId
-                    debug.logger & debug.flagSM and debug.logger(
-                        '_sec2usr: built snmpEngineId + securityName to userName map, version %s: %r' % (
-                            self.__paramsBranchId, self.__securityToUserMap))
                     break
 
-                instId = nextMibNode.name[len(usmUserSecurityName.name):]
+                instIds.append(nextMibNode.name[len(usmUserEngineID.name):])
 
-                __engineID = usmUserEngineID.getNode(usmUserEngineID.name + instId).syntax
-                __userName = usmUserName.getNode(usmUserName.name + instId).syntax
-                __securityName = usmUserSecurityName.getNode(usmUserSecurityName.name + instId).syntax
+        else:
+            instIds = set(changes)
+
+        for instId in instIds:
+            self.__indexUser(usmUserEntry, pysnmpUsmKeyEntry, instId)
+
+        self.__userIndexVersionIds = versionIds
+
+        debug.logger & debug.flagSM and debug.logger(
+            '__syncUserIndex: %s %d users rows, version %s, %d users indexed' % (
+                changes is None and 'indexed' or 're-indexed', len(instIds),
+                versionIds, len(self.__userIndex)))
 
-                k = __engineID, __securityName
+    def __indexUser(self, usmUserEntry, pysnmpUsmKeyEntry, instId):
+        if instId in self.__userIndexInstIds:
+            engineID, userName, securityName = self.__userIndexInstIds.pop(instId)
+
+            del self.__userIndex[(engineID, userName)]
+
+            userNames = self.__securityToUserMap[(engineID, securityName)]
+            del userNames[instId]
+            if not userNames:
+                del self.__securityToUserMap[(engineID, securityName)]
+
+        try:
+            usmUserEngineID = usmUserEntry.getNode(usmUserEntry.name + (1,) + instId).syntax
+            usmUserName = usmUserEntry.getNode(usmUserEntry.name + (2,) + instId).syntax
+            usmUserSecurityName = usmUserEntry.getNode(usmUserEntry.name + (3,) + instId).syntax
+            usmUserAuthProtocol = usmUserEntry.getNode(usmUserEntry.name + (5,) + instId).syntax
+            usmUserPrivProtocol = usmUserEntry.getNode(usmUserEntry.name + (8,) + instId).syntax
+            pysnmpUsmKeyAuthLocalized = pysnmpUsmKeyEntry.getNode(pysnmpUsmKeyEntry.name + (1,) + instId).syntax
+            pysnmpUsmKeyPrivLocalized = pysnmpUsmKeyEntry.getNode(pysnmpUsmKeyEntry.name + (2,) + instId).syntax
+
+        except NoSuchInstanceError:
+            return  # row is gone
+
+        if not (usmUserEngineID.hasValue() and usmUserName.hasValue() and
+                usmUserSecurityName.hasValue()):
+            return  # row is not complete yet
+
+        engineID = usmUserEngineID.asOctets()
+        userName = usmUserName.asOctets()
+        securityName = usmUserSecurityName.asOctets()
+
+        self.__userIndex[(engineID, userName)] = (
+            usmUserName, usmUserSecurityName, usmUserAuthProtocol,
+            pysnmpUsmKeyAuthLocalized, usmUserPrivProtocol,
+            pysnmpUsmKeyPrivLocalized
+        )
 
-                # first (lesser) securityName wins
-                if k not in self.__securityToUserMap:
-                    self.__securityToUserMap[k] = __userName
+        if (engineID, securityName) not in self.__securityToUserMap:
+            self.__securityToUserMap[(engineID, securityName)] = {}
+
+        self.__securityToUserMap[(engineID, securityName)][instId] = usmUserName
+
+        self.__userIndexInstIds[instId] = engineID, userName, securityName
+
+    def __sec2usr(self, snmpEngine, securityName, securityEngineID=None):
+        mibBuilder = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
+
+        self.__syncUserIndex(mibBuilder)
 
         if securityEngineID is None:
             snmpEngineID, = mibBuilder.importSymbols('__SNMP-FRAMEWORK-MIB', 'snmpEngineID')
             securityEngineID = snmpEngineID.syntax
 
         try:
-            userName = self.__securityToUserMap[(securityEngineID, securityName)]
+            userNames = self.__securityToUserMap[
+                (_asOctets(securityEngineID), _asOctets(securityName))
+            ]
+
         except KeyError:
             debug.logger & debug.flagSM and debug.logger(
                 '_sec2usr: no entry exists for snmpEngineId %r, securityName %r' % (securityEngineID, securityName))
             raise NoSuchInstanceError()  # emulate MIB lookup
 
+        # first (lesser) securityName wins
+        userName = userNames[min(userNames)]
+
         debug.logger & debug.flagSM and debug.logger(
             '_sec2usr: using userName %r for snmpEngineId %r, securityName %r' % (
                 userName, securityEngineID, securityName))
 
         return userName
 
-    @staticmethod
-    def __getUserInfo(mibInstrumController, securityEngineID, userName):
-        usmUserEntry, = mibInstrumController.mibBuilder.importSymbols(
-            'SNMP-USER-BASED-SM-MIB', 'usmUserEntry'
-        )
-        tblIdx = usmUserEntry.getInstIdFromIndices(securityEngineID, userName)
-        # Get userName & securityName
-        usmUserName = usmUserEntry.getNode(usmUserEntry.name + (2,) + tblIdx).syntax
-        usmUserSecurityName = usmUserEntry.getNode(usmUserEntry.name + (3,) + tblIdx).syntax
-        # Get protocols
-        usmUserAuthProtocol = usmUserEntry.getNode(usmUserEntry.name + (5,) + tblIdx).syntax
-        usmUserPrivProtocol = usmUserEntry.getNode(usmUserEntry.name + (8,) + tblIdx).syntax
-        # Get keys
-        pysnmpUsmKeyEntry, = mibInstrumController.mibBuilder.importSymbols(
-            'PYSNMP-USM-MIB', 'pysnmpUsmKeyEntry'
-        )
-        pysnmpUsmKeyAuthLocalized = pysnmpUsmKeyEntry.getNode(pysnmpUsmKeyEntry.name + (1,) + tblIdx).syntax
-        pysnmpUsmKeyPrivLocalized = pysnmpUsmKeyEntry.getNode(pysnmpUsmKeyEntry.name + (2,) + tblIdx).syntax
-        return (usmUserName, usmUserSecurityName, usmUserAuthProtocol,
-                pysnmpUsmKeyAuthLocalized, usmUserPrivProtocol,
-                pysnmpUsmKeyPrivLocalized)
+    def __getUserInfo(self, mibInstrumController, securityEngineID, userName):
+        self.__syncUserIndex(mibInstrumController.mibBuilder)
+
+        try:
+            return self.__userIndex[(_asOctets(securityEngineID), _asOctets(userName))]
+
+        except KeyError:
+            raise NoSuchInstanceError()  # emulate MIB lookup
 
     def __cloneUserInfo(self, mibInstrumController, securityEngineID,
                         userName):
@@ -291,8 +386,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
                     '__generateRequestOrResponseMsg: %s' % (sys.exc_info()[1],))
-                snmpInGenErrs, = mibBuilder.importSymbols('__SNMPv2-MIB', 'snmpInGenErrs')
-                snmpInGenErrs.syntax += 1
+                snmpEngine.statistics.snmpInGenErrs += 1
                 raise error.StatusInformation(
                     errorIndication=errind.invalidMsg
                 )
@@ -376,7 +470,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 '__generateRequestOrResponseMsg: scopedPDU %s' % scopedPDU.prettyPrint())
 
             try:
-                dataToEncrypt = encoder.encode(scopedPDU)
+                dataToEncrypt = snmpEngine.berEncoder.encode(scopedPDU)
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
@@ -445,7 +539,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 '__generateRequestOrResponseMsg: %s' % (securityParameters.prettyPrint(),))
 
             try:
-                msg.setComponentByPosition(2, encoder.encode(securityParameters), verifyConstraints=False)
+                msg.setComponentByPosition(2, snmpEngine.berEncoder.encode(securityParameters), verifyConstraints=False)
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
@@ -458,7 +552,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 '__generateRequestOrResponseMsg: auth outgoing msg: %s' % msg.prettyPrint())
 
             try:
-                wholeMsg = encoder.encode(msg)
+                wholeMsg = snmpEngine.berEncoder.encode(msg)
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
@@ -482,7 +576,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 '__generateRequestOrResponseMsg: %s' % (securityParameters.prettyPrint(),))
 
             try:
-                msg.setComponentByPosition(2, encoder.encode(securityParameters), verifyConstraints=False, matchTags=False, matchConstraints=False)
+                msg.setComponentByPosition(2, snmpEngine.berEncoder.encode(securityParameters), verifyConstraints=False, matchTags=False, matchConstraints=False)
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
@@ -494,7 +588,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
             try:
                 debug.logger & debug.flagSM and debug.logger(
                     '__generateRequestOrResponseMsg: plain outgoing msg: %s' % msg.prettyPrint())
-                authenticatedWholeMsg = encoder.encode(msg)
+                authenticatedWholeMsg = snmpEngine.berEncoder.encode(msg)
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
@@ -549,7 +643,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
             'processIncomingMsg: securityParameters %s' % debug.hexdump(securityParameters))
 
         # 3.2.1
-        securityParameters, rest = decoder.decode(
+        securityParameters, rest = snmpEngine.berDecoder.decode(
             securityParameters, asn1Spec=self.__securityParametersSpec
         )
 
@@ -588,9 +682,9 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 # 3.2.3b
                 debug.logger & debug.flagSM and debug.logger(
                     'processIncomingMsg: peer requested snmpEngineID discovery')
+                snmpEngine.statistics.usmStatsUnknownEngineIDs += 1
                 usmStatsUnknownEngineIDs, = mibBuilder.importSymbols(
                     '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownEngineIDs')
-                usmStatsUnknownEngineIDs.syntax += 1
                 debug.logger & debug.flagSM and debug.logger(
                     'processIncomingMsg: null or malformed msgAuthoritativeEngineId')
                 pysnmpUsmDiscoverable, = mibBuilder.importSymbols(
@@ -615,7 +709,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     raise error.StatusInformation(
                         errorIndication=errind.unknownEngineID,
                         oid=usmStatsUnknownEngineIDs.name,
-                        val=usmStatsUnknownEngineIDs.syntax,
+                        val=usmStatsUnknownEngineIDs.syntax.clone(),
                         securityStateReference=securityStateReference,
                         securityLevel=securityLevel,
                         contextEngineId=contextEngineId,
@@ -655,14 +749,14 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     'processIncomingMsg: unknown securityEngineID %r msgUserName %r' % (
                         msgAuthoritativeEngineId, msgUserName))
 
+                snmpEngine.statistics.usmStatsUnknownUserNames += 1
                 usmStatsUnknownUserNames, = mibBuilder.importSymbols(
                     '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownUserNames')
-                usmStatsUnknownUserNames.syntax += 1
 
                 raise error.StatusInformation(
                     errorIndication=errind.unknownSecurityName,
                     oid=usmStatsUnknownUserNames.name,
-                    val=usmStatsUnknownUserNames.syntax,
+                    val=usmStatsUnknownUserNames.syntax.clone(),
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -673,8 +767,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger('processIncomingMsg: %s' % (sys.exc_info()[1],))
-                snmpInGenErrs, = mibBuilder.importSymbols('__SNMPv2-MIB', 'snmpInGenErrs')
-                snmpInGenErrs.syntax += 1
+                snmpEngine.statistics.snmpInGenErrs += 1
                 raise error.StatusInformation(errorIndication=errind.invalidMsg)
         else:
             # empty username used for engineID discovery
@@ -740,16 +833,16 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 if usmUserPrivProtocol != nopriv.NoPriv.serviceID:
                     badSecIndication = 'noAuthNoPriv wanted while priv expected'
             if badSecIndication:
+                snmpEngine.statistics.usmStatsUnsupportedSecLevels += 1
                 usmStatsUnsupportedSecLevels, = mibBuilder.importSymbols(
                     '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnsupportedSecLevels')
-                usmStatsUnsupportedSecLevels.syntax += 1
                 debug.logger & debug.flagSM and debug.logger(
                     'processIncomingMsg: reporting inappropriate security level for user %s: %s' % (
                         msgUserName, badSecIndication))
                 raise error.StatusInformation(
                     errorIndication=errind.unsupportedSecurityLevel,
                     oid=usmStatsUnsupportedSecLevels.name,
-                    val=usmStatsUnsupportedSecLevels.syntax,
+                    val=usmStatsUnsupportedSecLevels.syntax.clone(),
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -775,13 +868,13 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 )
 
             except error.StatusInformation:
+                snmpEngine.statistics.usmStatsWrongDigests += 1
                 usmStatsWrongDigests, = mibBuilder.importSymbols(
                     '__SNMP-USER-BASED-SM-MIB', 'usmStatsWrongDigests')
-                usmStatsWrongDigests.syntax += 1
                 raise error.StatusInformation(
                     errorIndication=errind.authenticationFailure,
                     oid=usmStatsWrongDigests.name,
-                    val=usmStatsWrongDigests.syntax,
+                    val=usmStatsWrongDigests.syntax.clone(),
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -843,13 +936,13 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 if (snmpEngineBoots == 2147483647 or
                         snmpEngineBoots != msgAuthoritativeEngineBoots or
                         abs(idleTime + int(snmpEngineTime) - int(msgAuthoritativeEngineTime)) > 150):
+                    snmpEngine.statistics.usmStatsNotInTimeWindows += 1
                     usmStatsNotInTimeWindows, = mibBuilder.importSymbols(
                         '__SNMP-USER-BASED-SM-MIB', 'usmStatsNotInTimeWindows')
-                    usmStatsNotInTimeWindows.syntax += 1
                     raise error.StatusInformation(
                         errorIndication=errind.notInTimeWindow,
                         oid=usmStatsNotInTimeWindows.name,
-                        val=usmStatsNotInTimeWindows.syntax,
+                        val=usmStatsNotInTimeWindows.syntax.clone(),
                         securityStateReference=securityStateReference,
                         securityLevel=2,
                         contextEngineId=contextEngineId,
@@ -919,13 +1012,13 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                     'processIncomingMsg: PDU deciphered into %s' % debug.hexdump(decryptedData))
 
             except error.StatusInformation:
+                snmpEngine.statistics.usmStatsDecryptionErrors += 1
                 usmStatsDecryptionErrors, = mibBuilder.importSymbols(
                     '__SNMP-USER-BASED-SM-MIB', 'usmStatsDecryptionErrors')
-                usmStatsDecryptionErrors.syntax += 1
                 raise error.StatusInformation(
                     errorIndication=errind.decryptionError,
                     oid=usmStatsDecryptionErrors.name,
-                    val=usmStatsDecryptionErrors.syntax,
+                    val=usmStatsDecryptionErrors.syntax.clone(),
                     securityStateReference=securityStateReference,
                     securityLevel=securityLevel,
                     contextEngineId=contextEngineId,
@@ -935,7 +1028,7 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
                 )
             scopedPduSpec = scopedPduData.setComponentByPosition(0).getComponentByPosition(0)
             try:
-                scopedPDU, rest = decoder.decode(decryptedData, asn1Spec=scopedPduSpec)
+                scopedPDU, rest = snmpEngine.berDecoder.decode(decryptedData, asn1Spec=scopedPduSpec)
 
             except PyAsn1Error:
                 debug.logger & debug.flagSM and debug.logger(
@@ -971,13 +1064,13 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
 
         # Delayed to include details
         if not msgUserName and not msgAuthoritativeEngineId:
+            snmpEngine.statistics.usmStatsUnknownUserNames += 1
             usmStatsUnknownUserNames, = mibBuilder.importSymbols(
                 '__SNMP-USER-BASED-SM-MIB', 'usmStatsUnknownUserNames')
-            usmStatsUnknownUserNames.syntax += 1
             raise error.StatusInformation(
                 errorIndication=errind.unknownSecurityName,
                 oid=usmStatsUnknownUserNames.name,
-                val=usmStatsUnknownUserNames.syntax,
+                val=usmStatsUnknownUserNames.syntax.clone(),
                 securityStateReference=securityStateReference,
                 securityEngineID=msgAuthoritativeEngineId,
                 securityLevel=securityLevel,
@@ -1003,3 +1096,6 @@ class SnmpUSMSecurityModel(AbstractSecurityModel):
 
     def receiveTimerTick(self, snmpEngine, timeNow):
         self.__expireTimelineInfo()
+
+    def expirationsArePending(self):
+        return bool(self.__timelineExpQueue)
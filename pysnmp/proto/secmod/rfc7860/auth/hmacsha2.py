@@ -21,6 +21,7 @@ from pyasn1.type import univ
 from pysnmp.proto.secmod.rfc3414.auth import base
 from pysnmp.proto.secmod.rfc3414 import localkey
 from pysnmp.proto import errind, error
+from pysnmp import cache
 
 
 # 7.2.4
@@ -48,16 +49,14 @@ class HmacSha2(base.AbstractAuthenticationService):
         sha384ServiceID: sha384,
         sha512ServiceID: sha512
     }
-    
-    __ipad = [0x36] * 64
-    __opad = [0x5C] * 64
-    
+
     def __init__(self, oid):
         if oid not in self.hashAlgorithms:
             raise error.ProtocolError('No SHA-2 authentication algorithm %s available' % (oid,))
         self.__hashAlgo = self.hashAlgorithms[oid]
         self.__digestLength = self.digestLengths[oid]
         self.__placeHolder = univ.OctetString((0,) * self.__digestLength).asOctets()
+        self.__keyedHmacs = cache.Cache(maxSize=1024)
 
     def hashPassphrase(self, authKey):
         return localkey.hashPassphrase(authKey, self.__hashAlgo)
@@ -69,21 +68,41 @@ class HmacSha2(base.AbstractAuthenticationService):
     def digestLength(self):
         return self.__digestLength
 
+    @property
+    def hashAlgorithm(self):
+        return self.__hashAlgo
+
+    def __getKeyedHmac(self, authKey):
+        authKey = authKey.asOctets()
+
+        try:
+            return self.__keyedHmacs[authKey]
+
+        except KeyError:
+            pass
+
+        try:
+            keyedHmac = hmac.new(authKey, digestmod=self.__hashAlgo)
+
+        except errind.ErrorIndication:
+            raise error.StatusInformation(errorIndication=sys.exc_info()[1])
+
+        self.__keyedHmacs[authKey] = keyedHmac
+
+        return keyedHmac
+
     # 7.3.1
     def authenticateOutgoingMsg(self, authKey, wholeMsg):
         # 7.3.1.1
-        location = wholeMsg.find(self.__placeHolder)
+        location = base.locateDigest(wholeMsg, self.__placeHolder)
         if location == -1:
             raise error.ProtocolError('Can\'t locate digest placeholder')
         wholeHead = wholeMsg[:location]
         wholeTail = wholeMsg[location + self.__digestLength:]
 
         # 7.3.1.2, 7.3.1.3
-        try:
-            mac = hmac.new(authKey.asOctets(), wholeMsg, self.__hashAlgo)
-
-        except errind.ErrorIndication:
-            raise error.StatusInformation(errorIndication=sys.exc_info()[1])
+        mac = self.__getKeyedHmac(authKey).copy()
+        mac.update(wholeMsg)
 
         # 7.3.1.4
         mac = mac.digest()[:self.__digestLength]
@@ -100,7 +119,7 @@ class HmacSha2(base.AbstractAuthenticationService):
             )
 
         # 7.3.2.3
-        location = wholeMsg.find(authParameters.asOctets())
+        location = base.locateDigest(wholeMsg, authParameters.asOctets())
         if location == -1:
             raise error.ProtocolError('Can\'t locate digest in wholeMsg')
         wholeHead = wholeMsg[:location]
@@ -108,11 +127,8 @@ class HmacSha2(base.AbstractAuthenticationService):
         authenticatedWholeMsg = wholeHead + self.__placeHolder + wholeTail
 
         # 7.3.2.4
-        try:
-            mac = hmac.new(authKey.asOctets(), authenticatedWholeMsg, self.__hashAlgo)
-
-        except errind.ErrorIndication:
-            raise error.StatusInformation(errorIndication=sys.exc_info()[1])
+        mac = self.__getKeyedHmac(authKey).copy()
+        mac.update(authenticatedWholeMsg)
 
         # 7.3.2.5
         mac = mac.digest()[:self.__digestLength]
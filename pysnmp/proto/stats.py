@@ -0,0 +1,180 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+from pyasn1.type.base import noValue
+from pysnmp.proto import rfc1902
+from pysnmp import debug
+
+__all__ = ['Statistics']
+
+
+class _Counter32(rfc1902.Counter32):
+    # Value of a MIB counter instance tracking a Statistics attribute.
+    # Cloning takes a snapshot, so var-binds do not change after reading.
+    def __init__(self, statistics, counterName):
+        self.__statistics = statistics
+        self.__counterName = counterName
+        rfc1902.Counter32.__init__(self, 0)
+
+    @property
+    def _value(self):
+        return getattr(self.__statistics, self.__counterName) & 0xffffffff
+
+    @_value.setter
+    def _value(self, value):
+        pass
+
+    def clone(self, value=noValue, **kwargs):
+        if value is noValue:
+            value = self._value
+        return rfc1902.Counter32(value, **kwargs)
+
+
+class Statistics(object):
+    """SNMP engine statistics counters.
+
+    Counters are plain integer attributes named after the MIB objects
+    they back (e.g. `snmpInPkts`, `usmStatsWrongDigests`), so that
+    bumping a counter on the message processing path is a mere
+    attribute increment.
+
+    Once bound to a MIB with :py:meth:`bindMib`, counter values are read
+    by the corresponding MIB instances whenever they are queried over
+    SNMP.
+
+    Examples
+    --------
+    >>> snmpEngine.statistics.snmpInPkts
+    12
+    >>> print(snmpEngine.statistics.exportText())
+    # HELP pysnmp_snmpInPkts_total SNMPv2-MIB::snmpInPkts
+    # TYPE pysnmp_snmpInPkts_total counter
+    pysnmp_snmpInPkts_total 12
+    ...
+    """
+    counterNames = (
+        ('__SNMPv2-MIB', ('snmpInPkts',
+                          'snmpOutPkts',
+                          'snmpInBadVersions',
+                          'snmpInBadCommunityNames',
+                          'snmpInASNParseErrs',
+                          'snmpInGenErrs',
+                          'snmpSilentDrops')),
+        ('__SNMP-MPD-MIB', ('snmpUnknownSecurityModels',
+                            'snmpInvalidMsgs',
+                            'snmpUnknownPDUHandlers')),
+        ('__SNMP-TARGET-MIB', ('snmpUnavailableContexts',
+                               'snmpUnknownContexts')),
+        ('__SNMP-USER-BASED-SM-MIB', ('usmStatsUnsupportedSecLevels',
+                                      'usmStatsNotInTimeWindows',
+                                      'usmStatsUnknownUserNames',
+                                      'usmStatsUnknownEngineIDs',
+                                      'usmStatsWrongDigests',
+                                      'usmStatsDecryptionErrors'))
+    )
+
+    def __init__(self):
+        for modName, counterNames in self.counterNames:
+            for counterName in counterNames:
+                setattr(self, counterName, 0)
+
+        self.__histograms = []
+
+    def bindMib(self, mibBuilder):
+        """Make MIB counter instances read values from this object.
+
+        Current values of the MIB counters are carried over.
+
+        Parameters
+        ----------
+        mibBuilder : :py:class:`~pysnmp.smi.builder.MibBuilder`
+            MIB builder holding SNMP engine MIB instances.
+        """
+        for modName, counterNames in self.counterNames:
+            mibInstances = mibBuilder.importSymbols(modName, *counterNames)
+
+            for counterName, mibInstance in zip(counterNames, mibInstances):
+                setattr(self, counterName, int(mibInstance.syntax))
+                mibInstance.syntax = _Counter32(self, counterName)
+
+        debug.logger & debug.flagApp and debug.logger(
+            'bindMib: statistics bound to %s' % mibBuilder)
+
+    def addHistogram(self, name, histogram, description=''):
+        """Add histogram to statistics export.
+
+        Parameters
+        ----------
+        name : :py:class:`str`
+            Metric name, without prefix.
+        histogram : :py:class:`~pysnmp.entity.rfc3413.scheduler.Histogram`
+            Histogram to export.
+        description : :py:class:`str`
+            Optional metric description.
+        """
+        self.__histograms.append((name, histogram, description))
+
+    def getCounters(self):
+        """Return current counter values.
+
+        Returns
+        -------
+        :py:class:`dict`
+            Counter values keyed by MIB object name.
+        """
+        counters = {}
+        for modName, counterNames in self.counterNames:
+            for counterName in counterNames:
+                counters[counterName] = getattr(self, counterName)
+        return counters
+
+    def exportText(self, prefix='pysnmp_', labels=None):
+        """Render statistics in Prometheus text exposition format.
+
+        Parameters
+        ----------
+        prefix : :py:class:`str`
+            String prepended to metric names.
+        labels : :py:class:`dict`
+            Labels to attach to every sample (e.g. to tell SNMP
+            engines apart).
+
+        Returns
+        -------
+        :py:class:`str`
+            Metrics, one sample per line.
+        """
+        if labels:
+            labels = ','.join(
+                ['%s="%s"' % (k, str(labels[k]).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                 for k in sorted(labels)]
+            )
+        else:
+            labels = ''
+
+        lines = []
+
+        for modName, counterNames in self.counterNames:
+            for counterName in counterNames:
+                metric = '%s%s_total' % (prefix, counterName)
+                lines.append('# HELP %s %s::%s' % (metric, modName[2:], counterName))
+                lines.append('# TYPE %s counter' % metric)
+                lines.append('%s%s %d' % (metric, labels and '{%s}' % labels, getattr(self, counterName)))
+
+        for name, histogram, description in self.__histograms:
+            metric = prefix + name
+            if description:
+                lines.append('# HELP %s %s' % (metric, description))
+            lines.append('# TYPE %s histogram' % metric)
+            for bound, total in histogram.getBuckets():
+                lines.append(
+                    '%s_bucket{%sle="%s"} %d' % (metric, labels and labels + ',',
+                                                 bound is None and '+Inf' or repr(float(bound)), total)
+                )
+            lines.append('%s_sum%s %r' % (metric, labels and '{%s}' % labels, float(histogram.sum)))
+            lines.append('%s_count%s %d' % (metric, labels and '{%s}' % labels, histogram.count))
+
+        return '\n'.join(lines) + '\n'
@@ -10,6 +10,7 @@ import imp
 import struct
 import marshal
 import time
+import types
 import traceback
 
 try:
@@ -21,8 +22,6 @@ from pysnmp.smi import error
 from pysnmp import debug
 
 if sys.version_info[0] <= 2:
-    import types
-
     classTypes = (types.ClassType, type)
 else:
     classTypes = (type,)
@@ -72,6 +71,9 @@ class __AbstractMibSource(object):
     def listdir(self):
         return self._listdir()
 
+    def getTimestamp(self, f):
+        return self._getTimestamp(f)
+
     def read(self, f):
         pycTime = pyTime = -1
 
@@ -245,6 +247,9 @@ class MibBuilder(object):
 
     loadTexts = False
 
+    # Number of recent symbols exports/unexports to remember
+    changeLogSize = 16384
+
     # MIB modules can use this to select the features they can use
     version = pysnmp_version
 
@@ -261,11 +266,22 @@ class MibBuilder(object):
         for m in self.defaultCoreMibs.split(os.pathsep):
             sources.insert(0, ZipMibSource(m))
         self.mibSymbols = {}
+        # MIB module name -> lastBuildId of its most recent change
+        self.modBuildIds = {}
+        # (buildId, modName, symName, symObj, exported) tuples
+        self.__changeLog = []
+        self.__changeLogStart = 1
         self.__mibSources = []
         self.__modSeen = {}
         self.__modPathsSeen = {}
         self.__mibCompiler = None
+        self.__mibImage = None
+        self.__mibImagePath = None
+        self.__mibImageDirty = False
+        self.__loadDepth = 0
         self.setMibSources(*sources)
+        if 'PYSNMP_MIB_IMAGE' in os.environ:
+            self.setMibImage(os.environ['PYSNMP_MIB_IMAGE'])
 
     # MIB compiler management
 
@@ -277,6 +293,149 @@ class MibBuilder(object):
         self.__mibCompiler = mibCompiler
         return self
 
+    # MIB image management
+
+    def setMibImage(self, mibImagePath):
+        """Keep compiled MIB modules code in a file.
+
+        Once MIB module source is compiled, its code is stored in the
+        image file along with source timestamp and size. Subsequent
+        loads of the same MIB module, possibly by other processes,
+        take the code from the image as long as MIB module source
+        remains the same.
+
+        Image file gets updated whenever a MIB module not in the image
+        is loaded. It can also be given by the `PYSNMP_MIB_IMAGE`
+        environment variable.
+
+        Code taken from MIB image is executed as is, so the image file
+        must be trusted just like MIB modules and pysnmp itself are:
+        it should only be writable by those who may change the software
+        being run. Python and pysnmp versions recorded in the image
+        header are checked to sort out stale images, not to tell
+        tampered ones.
+
+        Parameters
+        ----------
+        mibImagePath : str
+            Path to MIB image file. The file is created if it does
+            not exist. Unreadable, malformed or stale image file is
+            ignored and MIB modules are loaded from their sources.
+        """
+        self.__mibImagePath = mibImagePath
+        self.__mibImage = {}
+        self.__mibImageDirty = False
+
+        try:
+            fp = open(mibImagePath, 'rb')
+            try:
+                mibImage = fp.read()
+            finally:
+                fp.close()
+
+        except (IOError, OSError):
+            debug.logger & debug.flagBld and debug.logger(
+                'setMibImage: MIB image %s read failed: %s' % (mibImagePath, sys.exc_info()[1]))
+            return self
+
+        header = self.__getMibImageHeader()
+
+        if mibImage[:len(header)] != header:
+            debug.logger & debug.flagBld and debug.logger(
+                'setMibImage: MIB image %s is for other Python or pysnmp version' % mibImagePath)
+            return self
+
+        try:
+            # loads() is way faster than load() on a file
+            mibImage = marshal.loads(mibImage[len(header):])
+
+        except (EOFError, ValueError, TypeError):
+            mibImage = None
+
+        if not isinstance(mibImage, dict):
+            debug.logger & debug.flagBld and debug.logger(
+                'setMibImage: MIB image %s is malformed' % mibImagePath)
+            return self
+
+        self.__mibImage = mibImage
+
+        debug.logger & debug.flagBld and debug.logger(
+            'setMibImage: %d MIB modules in MIB image %s' % (len(mibImage), mibImagePath))
+
+        return self
+
+    def getMibImage(self):
+        return self.__mibImagePath
+
+    def __getMibImageHeader(self):
+        return imp.get_magic() + (
+            'pysnmp %s\n' % '.'.join([str(x) for x in self.version])
+        ).encode('ascii')
+
+    def saveMibImage(self):
+        """Write MIB image file if there is anything new to store"""
+        if not self.__mibImageDirty:
+            return self
+
+        tmpPath = '%s.%d' % (self.__mibImagePath, os.getpid())
+
+        try:
+            fp = open(tmpPath, 'wb')
+            try:
+                fp.write(self.__getMibImageHeader())
+                marshal.dump(self.__mibImage, fp)
+            finally:
+                fp.close()
+
+            try:
+                os.rename(tmpPath, self.__mibImagePath)
+
+            except OSError:
+                # Windows would not overwrite file on rename
+                os.remove(self.__mibImagePath)
+                os.rename(tmpPath, self.__mibImagePath)
+
+        except (IOError, OSError):
+            debug.logger & debug.flagBld and debug.logger(
+                'saveMibImage: MIB image %s write failed: %s' % (self.__mibImagePath, sys.exc_info()[1]))
+            return self
+
+        self.__mibImageDirty = False
+
+        debug.logger & debug.flagBld and debug.logger(
+            'saveMibImage: %d MIB modules stored in MIB image %s' % (len(self.__mibImage), self.__mibImagePath))
+
+        return self
+
+    def __compileModule(self, mibSource, modName, modData, sfx, modPath):
+        try:
+            modTime = mibSource.getTimestamp(modName + sfx)
+
+        except IOError:
+            return modData
+
+        modSize = len(modData)
+
+        if modPath in self.__mibImage:
+            try:
+                imageTime, imageSize, modCode = self.__mibImage[modPath]
+
+            except (TypeError, ValueError):
+                imageTime = imageSize = modCode = None
+
+            if (imageTime == modTime and imageSize == modSize and
+                    isinstance(modCode, types.CodeType)):
+                debug.logger & debug.flagBld and debug.logger(
+                    'loadModule: %s code taken from MIB image' % modPath)
+                return modCode
+
+        modCode = compile(modData, modPath, 'exec')
+
+        self.__mibImage[modPath] = modTime, modSize, modCode
+        self.__mibImageDirty = True
+
+        return modCode
+
     # MIB modules management
 
     def addMibSources(self, *mibSources):
@@ -328,6 +487,12 @@ class MibBuilder(object):
             g = {'mibBuilder': self, 'userCtx': userCtx}
 
             try:
+                if (self.__mibImagePath is not None and
+                        not isinstance(modData, types.CodeType)):
+                    modData = self.__compileModule(
+                        mibSource, modName, modData, sfx, modPath
+                    )
+
                 exec (modData, g)
 
             except Exception:
@@ -363,19 +528,29 @@ class MibBuilder(object):
                 'No MIB module to load at %s' % (self,)
             )
 
-        for modName in modNames:
-            try:
-                self.loadModule(modName, **userCtx)
-            except error.MibNotFoundError:
-                if self.__mibCompiler:
-                    debug.logger & debug.flagBld and debug.logger('loadModules: calling MIB compiler for %s' % modName)
-                    status = self.__mibCompiler.compile(modName, genTexts=self.loadTexts)
-                    errs = '; '.join([hasattr(x, 'error') and str(x.error) or x for x in status.values() if
-                                      x in ('failed', 'missing')])
-                    if errs:
-                        raise error.MibNotFoundError('%s compilation error(s): %s' % (modName, errs))
-                    # compilation suceeded, MIB might load now
+        self.__loadDepth += 1
+
+        try:
+            for modName in modNames:
+                try:
                     self.loadModule(modName, **userCtx)
+                except error.MibNotFoundError:
+                    if self.__mibCompiler:
+                        debug.logger & debug.flagBld and debug.logger('loadModules: calling MIB compiler for %s' % modName)
+                        status = self.__mibCompiler.compile(modName, genTexts=self.loadTexts)
+                        errs = '; '.join([hasattr(x, 'error') and str(x.error) or x for x in status.values() if
+                                          x in ('failed', 'missing')])
+                        if errs:
+                            raise error.MibNotFoundError('%s compilation error(s): %s' % (modName, errs))
+                        # compilation suceeded, MIB might load now
+                        self.loadModule(modName, **userCtx)
+
+        finally:
+            self.__loadDepth -= 1
+
+        # modules load one another, store them all at once
+        if not self.__loadDepth and self.__mibImageDirty:
+            self.saveMibImage()
 
         return self
 
@@ -420,10 +595,14 @@ class MibBuilder(object):
             self.mibSymbols[modName] = {}
         mibSymbols = self.mibSymbols[modName]
 
+        buildId = self.lastBuildId + 1
+
         for symObj in anonymousSyms:
             debug.logger & debug.flagBld and debug.logger(
                 'exportSymbols: anonymous symbol %s::__pysnmp_%ld' % (modName, self._autoName))
-            mibSymbols['__pysnmp_%ld' % self._autoName] = symObj
+            symName = '__pysnmp_%ld' % self._autoName
+            mibSymbols[symName] = symObj
+            self.__changeLog.append((buildId, modName, symName, symObj, True))
             self._autoName += 1
         for symName, symObj in namedSyms.items():
             if symName in mibSymbols:
@@ -439,11 +618,19 @@ class MibBuilder(object):
                 else:
                     symObj.setLabel(symName)
 
+            if symName in mibSymbols:  # replaced under its label
+                self.__changeLog.append((buildId, modName, symName, mibSymbols[symName], False))
+
             mibSymbols[symName] = symObj
 
+            self.__changeLog.append((buildId, modName, symName, symObj, True))
+
             debug.logger & debug.flagBld and debug.logger('exportSymbols: symbol %s::%s' % (modName, symName))
 
         self.lastBuildId += 1
+        self.modBuildIds[modName] = self.lastBuildId
+
+        self.__trimChangeLog()
 
     def unexportSymbols(self, modName, *symNames):
         if modName not in self.mibSymbols:
@@ -456,6 +643,8 @@ class MibBuilder(object):
                 raise error.SmiError(
                     'No symbol %s::%s at %s' % (modName, symName, self)
                 )
+            self.__changeLog.append((self.lastBuildId + 1, modName, symName, mibSymbols[symName], False))
+
             del mibSymbols[symName]
 
             debug.logger & debug.flagBld and debug.logger('unexportSymbols: symbol %s::%s' % (modName, symName))
@@ -464,3 +653,52 @@ class MibBuilder(object):
             del self.mibSymbols[modName]
 
         self.lastBuildId += 1
+        self.modBuildIds[modName] = self.lastBuildId
+
+        self.__trimChangeLog()
+
+    def getChanges(self, lastBuildId):
+        """Return symbols exported or unexported since given build.
+
+        Parameters
+        ----------
+        lastBuildId : int
+            The `lastBuildId` value observed by the caller.
+
+        Returns
+        -------
+        : :py:class:`list`
+            Sequence of `(buildId, modName, symName, symObj, exported)`
+            tuples in order of change, `exported` is `False` for
+            unexported symbols. `None` is returned if some of the
+            changes are no longer remembered, so the caller should
+            re-read all of `mibSymbols`.
+        """
+        if lastBuildId + 1 < self.__changeLogStart:
+            return None
+
+        changeLog = self.__changeLog
+
+        idx = len(changeLog)
+        while idx and changeLog[idx - 1][0] > lastBuildId:
+            idx -= 1
+
+        return changeLog[idx:]
+
+    def __trimChangeLog(self):
+        changeLog = self.__changeLog
+
+        if len(changeLog) <= self.changeLogSize:
+            return
+
+        # forget older half, never splitting changes of a build
+        idx = len(changeLog) - self.changeLogSize // 2
+        while idx < len(changeLog) and changeLog[idx][0] == changeLog[idx - 1][0]:
+            idx += 1
+
+        del changeLog[:idx]
+
+        if changeLog:
+            self.__changeLogStart = changeLog[0][0]
+        else:
+            self.__changeLogStart = self.lastBuildId + 1
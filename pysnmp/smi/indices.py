@@ -4,117 +4,136 @@
 # Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
 # License: http://snmplabs.com/pysnmp/license.html
 #
-from bisect import bisect
+from bisect import bisect, bisect_left
 
 
 class OrderedDict(dict):
-    """Ordered dictionary used for indices"""
+    """Ordered dictionary used for indices
+
+    Keys are kept sorted on insertion so that ordered iteration and
+    successor lookup never require re-sorting the whole index.
+    """
 
     def __init__(self, **kwargs):
         self.__keys = []
-        self.__dirty = True
+        self.__sortingKeys = []
+        self.__keysLensCount = {}
+        self.__keysLens = None
         super(OrderedDict, self).__init__()
         if kwargs:
             self.update(kwargs)
 
     def __setitem__(self, key, value):
         if key not in self:
-            self.__keys.append(key)
-        super(OrderedDict, self).__setitem__(key, value)
-        self.__dirty = True
-
-    def __repr__(self):
-        if self.__dirty:
-            self.__order()
-        return super(OrderedDict, self).__repr__()
+            sortingKey = self.getSortingKey(key)
+            idx = bisect(self.__sortingKeys, sortingKey)
+            self.__sortingKeys.insert(idx, sortingKey)
+            self.__keys.insert(idx, key)
+
+            keyLen = len(key)
+            if keyLen in self.__keysLensCount:
+                self.__keysLensCount[keyLen] += 1
+            else:
+                self.__keysLensCount[keyLen] = 1
+                self.__keysLens = None
 
-    def __str__(self):
-        if self.__dirty:
-            self.__order()
-        return super(OrderedDict, self).__str__()
+        super(OrderedDict, self).__setitem__(key, value)
 
     def __delitem__(self, key):
         if super(OrderedDict, self).__contains__(key):
-            self.__keys.remove(key)
+            sortingKey = self.getSortingKey(key)
+            idx = bisect_left(self.__sortingKeys, sortingKey)
+            while self.__keys[idx] != key:
+                idx += 1  # same sorting key shared by other keys
+            del self.__sortingKeys[idx]
+            del self.__keys[idx]
+
+            keyLen = len(key)
+            self.__keysLensCount[keyLen] -= 1
+            if not self.__keysLensCount[keyLen]:
+                del self.__keysLensCount[keyLen]
+                self.__keysLens = None
+
         super(OrderedDict, self).__delitem__(key)
-        self.__dirty = True
 
     __delattr__ = __delitem__
 
     def clear(self):
         super(OrderedDict, self).clear()
         self.__keys = []
-        self.__dirty = True
+        self.__sortingKeys = []
+        self.__keysLensCount = {}
+        self.__keysLens = None
 
     def keys(self):
-        if self.__dirty:
-            self.__order()
         return list(self.__keys)
 
     def values(self):
-        if self.__dirty:
-            self.__order()
         return [self[k] for k in self.__keys]
 
     def items(self):
-        if self.__dirty:
-            self.__order()
         return [(k, self[k]) for k in self.__keys]
 
     def update(self, d):
-        [self.__setitem__(k, v) for k, v in d.items()]
+        if len(d) < 32:
+            for k, v in d.items():
+                self.__setitem__(k, v)
+            return
+
+        newKeys = [k for k in d if k not in self]
+
+        super(OrderedDict, self).update(d)
+
+        if not newKeys:
+            return
+
+        # sorting all keys at once beats inserting them one by one
+        getSortingKey = self.getSortingKey
+        keys = self.__keys + newKeys
+        sortingKeys = self.__sortingKeys + [getSortingKey(k) for k in newKeys]
+        order = sorted(range(len(keys)), key=sortingKeys.__getitem__)
+        self.__keys = [keys[idx] for idx in order]
+        self.__sortingKeys = [sortingKeys[idx] for idx in order]
+
+        for k in newKeys:
+            keyLen = len(k)
+            if keyLen in self.__keysLensCount:
+                self.__keysLensCount[keyLen] += 1
+            else:
+                self.__keysLensCount[keyLen] = 1
+                self.__keysLens = None
 
-    def sortingFun(self, keys):
-        keys.sort()
+    def getSortingKey(self, key):
+        return key
 
-    def __order(self):
-        self.sortingFun(self.__keys)
-        d = {}
-        for k in self.__keys:
-            d[len(k)] = 1
-        l = list(d.keys())
-        l.sort(reverse=True)
-        self.__keysLens = tuple(l)
-        self.__dirty = False
+    def firstKey(self):
+        if self.__keys:
+            return self.__keys[0]
+        else:
+            raise KeyError()
 
     def nextKey(self, key):
-        keys = list(self.keys())
-        if key in self:
-            nextIdx = keys.index(key) + 1
-        else:
-            nextIdx = bisect(keys, key)
-        if nextIdx < len(keys):
-            return keys[nextIdx]
+        nextIdx = bisect(self.__sortingKeys, self.getSortingKey(key))
+        if nextIdx < len(self.__keys):
+            return self.__keys[nextIdx]
         else:
             raise KeyError(key)
 
     def getKeysLens(self):
-        if self.__dirty:
-            self.__order()
+        if self.__keysLens is None:
+            self.__keysLens = tuple(
+                sorted(self.__keysLensCount, reverse=True)
+            )
         return self.__keysLens
 
 
 class OidOrderedDict(OrderedDict):
     """OID-ordered dictionary used for indices"""
 
-    def __init__(self, **kwargs):
-        self.__keysCache = {}
-        OrderedDict.__init__(self, **kwargs)
-
-    def __setitem__(self, key, value):
-        if key not in self.__keysCache:
-            if isinstance(key, tuple):
-                self.__keysCache[key] = key
-            else:
-                self.__keysCache[key] = [int(x) for x in key.split('.') if x]
-        OrderedDict.__setitem__(self, key, value)
-
-    def __delitem__(self, key):
-        if key in self.__keysCache:
-            del self.__keysCache[key]
-        OrderedDict.__delitem__(self, key)
-
-    __delattr__ = __delitem__
-
-    def sortingFun(self, keys):
-        keys.sort(key=lambda k, d=self.__keysCache: d[k])
+    def getSortingKey(self, key):
+        if isinstance(key, tuple):
+            return key
+        elif hasattr(key, 'split'):
+            return tuple([int(x) for x in key.split('.') if x])
+        else:
+            return tuple(key)
@@ -6,7 +6,7 @@
 #
 import sys
 import traceback
-from pysnmp.smi import error
+from pysnmp.smi import error, exval
 from pysnmp import debug
 
 __all__ = ['AbstractMibInstrumController', 'MibInstrumController']
@@ -19,6 +19,13 @@ class AbstractMibInstrumController(object):
     def readNextVars(self, varBinds, acInfo=(None, None)):
         raise error.EndOfMibViewError(idx=0)
 
+    def iterNextVars(self, varBinds, acInfo=(None, None)):
+        """Yield `readNextVars()` results, each time for the var-binds
+           yielded previously"""
+        while True:
+            varBinds = self.readNextVars(varBinds, acInfo)
+            yield varBinds
+
     def writeVars(self, varBinds, acInfo=(None, None)):
         raise error.NoSuchObjectError(idx=0)
 
@@ -61,6 +68,13 @@ class MibInstrumController(AbstractMibInstrumController):
         self.mibBuilder = mibBuilder
         self.lastBuildId = -1
         self.lastBuildSyms = {}
+        # MIB object name -> {(modName, symName): (typeIdx, -exportCount)}
+        self.__mibObjects = {}
+        # MIB object name -> MIB object attached under that name
+        self.__attachedObjects = {}
+        # MIB object name -> names of MIB objects attached to it
+        self.__attachedChildren = {}
+        self.__exportCount = 0
 
     def getMibBuilder(self):
         return self.mibBuilder
@@ -100,86 +114,267 @@ class MibInstrumController(AbstractMibInstrumController):
         # Mind you, only Managed Objects get indexed here, various MIB defs and
         # constants can't be SNMP managed so we drop them.
         #
-        scalars = {}
-        instances = {}
-        tables = {}
-        rows = {}
-        cols = {}
-
-        # Sort by module name to give user a chance to slip-in
-        # custom MIB modules (that would be sorted out first)
-        mibSymbols = list(self.mibBuilder.mibSymbols.items())
-        mibSymbols.sort(key=lambda x: x[0], reverse=True)
-
-        for modName, mibMod in mibSymbols:
-            for symObj in mibMod.values():
-                if isinstance(symObj, MibTable):
-                    tables[symObj.name] = symObj
-                elif isinstance(symObj, MibTableRow):
-                    rows[symObj.name] = symObj
-                elif isinstance(symObj, MibTableColumn):
-                    cols[symObj.name] = symObj
-                elif isinstance(symObj, MibScalarInstance):
-                    instances[symObj.name] = symObj
-                elif isinstance(symObj, MibScalar):
-                    scalars[symObj.name] = symObj
+        managedTypes = (MibTable, MibTableRow, MibTableColumn,
+                        MibScalarInstance, MibScalar)
 
-        # Detach items from each other
-        for symName, parentName in self.lastBuildSyms.items():
-            if parentName in scalars:
-                scalars[parentName].unregisterSubtrees(symName)
-            elif parentName in cols:
-                cols[parentName].unregisterSubtrees(symName)
-            elif parentName in rows:
-                rows[parentName].unregisterSubtrees(symName)
-            else:
-                mibTree.unregisterSubtrees(symName)
+        if self.lastBuildId < 0:
+            self.__buildTree(managedTypes, mibTree)
+            self.lastBuildId = self.mibBuilder.lastBuildId
+            return
+
+        mibObjects = self.__mibObjects
+
+        changes = self.mibBuilder.getChanges(self.lastBuildId)
 
-        lastBuildSyms = {}
+        if changes is None:
+            # Changes are not remembered that far back, take it all over
+            changedNames = set(mibObjects)
+            mibObjects.clear()
+
+            changes = []
+            for modName, mibMod in self.mibBuilder.mibSymbols.items():
+                for symName, symObj in mibMod.items():
+                    changes.append((None, modName, symName, symObj, True))
+
+            debug.logger & debug.flagIns and debug.logger(
+                '__indexMib: indexing %d symbols' % len(changes))
+
+        else:
+            changedNames = set()
+
+            debug.logger & debug.flagIns and debug.logger(
+                '__indexMib: indexing %d symbol changes' % len(changes))
 
-        # Attach Managed Objects Instances to Managed Objects
-        for inst in instances.values():
-            if inst.typeName in scalars:
-                scalars[inst.typeName].registerSubtrees(inst)
-            elif inst.typeName in cols:
-                cols[inst.typeName].registerSubtrees(inst)
+        # MIB object class -> its managedTypes index or None
+        typeIdxs = {}
+
+        for buildId, modName, symName, symObj, exported in changes:
+            # Same MIB object may be exported many times. Prefer the one of
+            # the earliest module name to give user a chance to slip-in
+            # custom MIB modules (that would be sorted out first), then the
+            # most recently exported one
+            symType = symObj.__class__
+            if symType in typeIdxs:
+                typeIdx = typeIdxs[symType]
             else:
-                raise error.SmiError(
-                    'Orphan MIB scalar instance %r at %r' % (inst, self)
+                for typeIdx, managedType in enumerate(managedTypes):
+                    if isinstance(symObj, managedType):
+                        break
+                else:
+                    typeIdx = None
+                typeIdxs[symType] = typeIdx
+
+            if typeIdx is None:
+                continue
+
+            name = symObj.name
+
+            if exported:
+                self.__exportCount += 1
+                mibObjects.setdefault(name, {})[(modName, symName)] = (
+                    typeIdx, -self.__exportCount
                 )
-            lastBuildSyms[inst.name] = inst.typeName
 
-        # Attach Table Columns to Table Rows
-        for col in cols.values():
-            rowName = col.name[:-1]  # XXX
-            if rowName in rows:
-                rows[rowName].registerSubtrees(col)
+            elif name in mibObjects:
+                mibObjs = mibObjects[name]
+                if (modName, symName) in mibObjs:
+                    del mibObjs[(modName, symName)]
+                    if not mibObjs:
+                        del mibObjects[name]
+
+            changedNames.add(name)
+
+        attachedObjects = self.__attachedObjects
+        attachedChildren = self.__attachedChildren
+        lastBuildSyms = self.lastBuildSyms
+        getMibObject = self.__getMibObject
+
+        # Attached children follow their parents
+        for name in [x for x in attachedChildren if x in changedNames]:
+            changedNames.update(attachedChildren[name])
+
+        # Figure out where the changed MIB objects belong
+        newObjects = {}
+
+        # MIB object name -> parent object it is currently attached to
+        attachedParents = {}
+
+        parentObjs = {}
+
+        for name in changedNames:
+            symObj = getMibObject(name)
+
+            if isinstance(symObj, MibScalarInstance):
+                if symObj.typeName not in parentObjs:
+                    parentObjs[symObj.typeName] = getMibObject(symObj.typeName)
+                parentObj = parentObjs[symObj.typeName]
+                if not isinstance(parentObj, MibScalar):
+                    raise error.SmiError(
+                        'Orphan MIB scalar instance %r at %r' % (symObj, self)
+                    )
+
+            elif isinstance(symObj, MibTableColumn):
+                parentObj = getMibObject(symObj.name[:-1])  # XXX
+                if not isinstance(parentObj, MibTableRow):
+                    raise error.SmiError(
+                        'Orphan MIB table column %r at %r' % (symObj, self)
+                    )
+
+            elif symObj is not None:
+                parentObj = mibTree
+
             else:
-                raise error.SmiError(
-                    'Orphan MIB table column %r at %r' % (col, self)
-                )
-            lastBuildSyms[col.name] = rowName
+                parentObj = None
+
+            if name in attachedObjects:
+                attachedParentName = lastBuildSyms[name]
+                if attachedParentName in attachedObjects:
+                    attachedParents[name] = attachedObjects[attachedParentName]
+                else:
+                    attachedParents[name] = mibTree
+
+                if attachedObjects[name] is symObj and attachedParents[name] is parentObj:
+                    continue
 
-        # Attach Table Rows to MIB tree
-        for row in rows.values():
-            mibTree.registerSubtrees(row)
-            lastBuildSyms[row.name] = mibTree.name
+            elif symObj is None:
+                continue
 
-        # Attach Tables to MIB tree
-        for table in tables.values():
-            mibTree.registerSubtrees(table)
-            lastBuildSyms[table.name] = mibTree.name
+            newObjects[name] = symObj, parentObj
 
-        # Attach Scalars to MIB tree
-        for scalar in scalars.values():
-            mibTree.registerSubtrees(scalar)
-            lastBuildSyms[scalar.name] = mibTree.name
+        # Detach items from each other
+        for name in newObjects:
+            if name in attachedParents:
+                parentObj = attachedParents[name]
+                parentObj.unregisterSubtrees(name)
+                del attachedObjects[name]
+                attachedChildren[parentObj.name].remove(name)
+                if not attachedChildren[parentObj.name]:
+                    del attachedChildren[parentObj.name]
+                del lastBuildSyms[name]
+
+        # Attach Managed Objects to their new parents, all children
+        # of a parent at once
+        parentChildren = {}
+
+        for name, (symObj, parentObj) in newObjects.items():
+            if parentObj is not None:
+                parentChildren.setdefault(parentObj.name, (parentObj, []))[1].append(symObj)
+                attachedObjects[name] = symObj
+                attachedChildren.setdefault(parentObj.name, set()).add(name)
+                lastBuildSyms[name] = parentObj.name
 
-        self.lastBuildSyms = lastBuildSyms
+        for parentObj, symObjs in parentChildren.values():
+            parentObj.registerSubtrees(*symObjs)
 
         self.lastBuildId = self.mibBuilder.lastBuildId
 
-        debug.logger & debug.flagIns and debug.logger('__indexMib: rebuilt')
+        debug.logger & debug.flagIns and debug.logger(
+            '__indexMib: %d MIB objects re-attached' % len(newObjects))
+
+    def __buildTree(self, managedTypes, mibTree):
+        """Attach all Managed Objects at once, the first time"""
+        (MibTable, MibTableRow, MibTableColumn,
+         MibScalarInstance, MibScalar) = managedTypes
+
+        mibObjects = self.__mibObjects
+        mibObjects.clear()
+
+        # MIB object class -> its managedTypes index or None
+        typeIdxs = {}
+
+        exportCount = self.__exportCount
+
+        # MIB object name -> the most preferred MIB object of that name
+        symObjs = {}
+
+        # names of MIB objects exported more than once
+        sharedNames = []
+
+        # Same precedence as on incremental updates
+        for modName, mibMod in self.mibBuilder.mibSymbols.items():
+            for symName, symObj in mibMod.items():
+                symType = symObj.__class__
+                if symType in typeIdxs:
+                    typeIdx = typeIdxs[symType]
+                else:
+                    for typeIdx, managedType in enumerate(managedTypes):
+                        if isinstance(symObj, managedType):
+                            break
+                    else:
+                        typeIdx = None
+                    typeIdxs[symType] = typeIdx
+
+                if typeIdx is None:
+                    continue
+
+                exportCount += 1
+
+                name = symObj.name
+                mibObjs = mibObjects.get(name)
+                if mibObjs is None:
+                    mibObjects[name] = {(modName, symName): (typeIdx, -exportCount)}
+                    symObjs[name] = symObj
+                else:
+                    mibObjs[(modName, symName)] = typeIdx, -exportCount
+                    sharedNames.append(name)
+
+        self.__exportCount = exportCount
+
+        for name in sharedNames:
+            symObjs[name] = self.__getMibObject(name)
+
+        lastBuildSyms = self.lastBuildSyms
+
+        # id(parent object) -> (parent object, its children)
+        parentChildren = {}
+
+        for name, symObj in symObjs.items():
+            if isinstance(symObj, MibScalarInstance):
+                parentObj = symObjs.get(symObj.typeName)
+                if not isinstance(parentObj, MibScalar):
+                    raise error.SmiError(
+                        'Orphan MIB scalar instance %r at %r' % (symObj, self)
+                    )
+
+            elif isinstance(symObj, MibTableColumn):
+                parentObj = symObjs.get(symObj.name[:-1])  # XXX
+                if not isinstance(parentObj, MibTableRow):
+                    raise error.SmiError(
+                        'Orphan MIB table column %r at %r' % (symObj, self)
+                    )
+
+            else:
+                parentObj = mibTree
+
+            if id(parentObj) in parentChildren:
+                parentChildren[id(parentObj)][1].append(symObj)
+            else:
+                parentChildren[id(parentObj)] = parentObj, [symObj]
+
+            lastBuildSyms[name] = parentObj.name
+
+        self.__attachedObjects.update(symObjs)
+
+        attachedChildren = self.__attachedChildren
+
+        for parentObj, children in parentChildren.values():
+            parentObj.registerSubtrees(*children)
+            attachedChildren[parentObj.name] = set([x.name for x in children])
+
+        debug.logger & debug.flagIns and debug.logger(
+            '__buildTree: %d MIB objects attached' % len(symObjs))
+
+    def __getMibObject(self, name):
+        mibObjs = self.__mibObjects.get(name)
+        if not mibObjs:
+            return
+        if len(mibObjs) == 1:
+            for modName, symName in mibObjs:
+                return self.mibBuilder.mibSymbols[modName][symName]
+        modName, symName = min(
+            mibObjs, key=lambda x: (mibObjs[x][0], x[0], mibObjs[x][1])
+        )
+        return self.mibBuilder.mibSymbols[modName][symName]
 
     # MIB instrumentation
 
@@ -252,5 +447,81 @@ class MibInstrumController(AbstractMibInstrumController):
     def readNextVars(self, varBinds, acInfo=(None, None)):
         return self.flipFlopFsm(self.fsmReadNextVar, varBinds, acInfo)
 
+    def iterNextVars(self, varBinds, acInfo=(None, None)):
+        """Yield `readNextVars()` results, each time for the var-binds
+           yielded previously.
+
+           MIB tree node holding the last yielded instance is remembered
+           for each var-bind so that the next instance is read right
+           from that node rather than by full FSM run and MIB tree
+           descent. Once that node runs out of instances or MIB objects
+           get (un)exported, the var-bind is read through `readNextVars()`
+           from the top of the MIB.
+        """
+        varBinds = self.readNextVars(varBinds, acInfo)
+
+        mibTree, = self.mibBuilder.importSymbols('SNMPv2-SMI', 'iso')
+
+        parentNodes = [self.__getParentNode(mibTree, name, val)
+                       for name, val in varBinds]
+
+        while True:
+            yield varBinds
+
+            # MIB tree is about to be re-indexed, remembered nodes may be gone
+            if self.lastBuildId != self.mibBuilder.lastBuildId:
+                parentNodes = [None] * len(varBinds)
+
+            nextVarBinds = []
+
+            for idx, (name, val) in enumerate(varBinds):
+                if val is exval.endOfMib:
+                    nextVarBinds.append((name, val))
+                    continue
+
+                parentNode = parentNodes[idx]
+                if parentNode is not None:
+                    try:
+                        rval = parentNode.readGetNext(
+                            tuple(name), val, idx, acInfo, tuple(name)
+                        )
+                    except (error.NoAccessError, error.NoSuchInstanceError,
+                            error.NoSuchObjectError):
+                        pass
+                    else:
+                        nextVarBinds.append((rval[0], rval[1]))
+                        continue
+
+                try:
+                    rval, = self.readNextVars([(name, val)], acInfo)
+                except error.MibOperationError:
+                    sys.exc_info()[1].update({'idx': idx})
+                    raise
+
+                nextVarBinds.append(rval)
+
+                parentNodes[idx] = self.__getParentNode(mibTree, rval[0], rval[1])
+
+            varBinds = nextVarBinds
+
+    @staticmethod
+    def __getParentNode(mibTree, name, val):
+        # MIB tree node the `name` instance is registered at
+        if val is exval.endOfMib:
+            return
+
+        name = tuple(name)
+        parentNode = mibTree
+
+        try:
+            node = mibTree.getBranch(name, 0)
+            while node.name != name:
+                parentNode, node = node, node.getBranch(name, 0)
+
+        except error.SmiError:
+            return
+
+        return parentNode
+
     def writeVars(self, varBinds, acInfo=(None, None)):
         return self.flipFlopFsm(self.fsmWriteVar, varBinds, acInfo)
@@ -356,12 +356,21 @@ class MibTree(ObjectType):
 
     def registerSubtrees(self, *subTrees):
         self.branchVersionId += 1
-        for subTree in subTrees:
-            if subTree.name in self._vars:
+        newVars = dict([(subTree.name, subTree) for subTree in subTrees])
+        if len(newVars) < len(subTrees):
+            newVars = {}
+            for subTree in subTrees:
+                if subTree.name in newVars:
+                    raise error.SmiError(
+                        'MIB subtree %s already registered at %s' % (subTree.name, self)
+                    )
+                newVars[subTree.name] = subTree
+        for name in newVars:
+            if name in self._vars:
                 raise error.SmiError(
-                    'MIB subtree %s already registered at %s' % (subTree.name, self)
+                    'MIB subtree %s already registered at %s' % (name, self)
                 )
-            self._vars[subTree.name] = subTree
+        self._vars.update(newVars)
 
     def unregisterSubtrees(self, *names):
         self.branchVersionId += 1
@@ -392,18 +401,11 @@ class MibTree(ObjectType):
         raise error.NoSuchObjectError(name=name, idx=idx)
 
     def getNextBranch(self, name, idx=None):
-        # Start from the beginning
-        if self._vars:
-            first = list(self._vars.keys())[0]
-        else:
-            first = ()
-        if self._vars and name < first:
-            return self._vars[first]
-        else:
-            try:
-                return self._vars[self._vars.nextKey(name)]
-            except KeyError:
-                raise error.NoSuchObjectError(idx=idx, name=name)
+        # Names preceding the first branch fall onto it
+        try:
+            return self._vars[self._vars.nextKey(name)]
+        except KeyError:
+            raise error.NoSuchObjectError(idx=idx, name=name)
 
     def getNode(self, name, idx=None):
         """Return tree node found by name"""
@@ -1010,10 +1012,15 @@ class MibTableRow(MibTree):
        Implements row creation/destruction.
     """
 
+    changeLogSize = 4096
+
     def __init__(self, name):
         MibTree.__init__(self, name)
         self.__idToIdxCache = cache.Cache()
         self.__idxToIdCache = cache.Cache()
+        self.__indexVals = {}
+        self.__changeLog = []
+        self.__changeLogStart = 1
         self.indexNames = ()
         self.augmentingRows = {}
 
@@ -1150,16 +1157,23 @@ class MibTableRow(MibTree):
 
     def __manageColumns(self, action, excludeName, nameSuffix,
                         val, idx, acInfo):
-        # Build a map of index names and values for automatic initialization
-        indexVals = {}
-        instId = nameSuffix
-        indices = []
-        for impliedFlag, modName, symName in self.indexNames:
-            mibObj, = mibBuilder.importSymbols(modName, symName)
-            syntax, instId = self.setFromName(mibObj.syntax, instId,
-                                              impliedFlag, indices)
-            indexVals[mibObj.name] = syntax
-            indices.append(syntax)
+        # Build a map of index names and values for automatic initialization,
+        # it is kept for as long as the row exists
+        indexVals = self.__indexVals.get(nameSuffix)
+        if indexVals is None:
+            indexVals = {}
+            instId = nameSuffix
+            indices = []
+            for impliedFlag, modName, symName in self.indexNames:
+                mibObj, = mibBuilder.importSymbols(modName, symName)
+                syntax, instId = self.setFromName(mibObj.syntax, instId,
+                                                  impliedFlag, indices)
+                indexVals[mibObj.name] = syntax
+                indices.append(syntax)
+
+        # Failed row creation is cleaned up as well, remember only the rows
+        # that have come into existence
+        rowExists = None
 
         for name, var in self._vars.items():
             if name == excludeName:
@@ -1171,9 +1185,18 @@ class MibTableRow(MibTree):
             else:
                 getattr(var, action)(name + nameSuffix, val, idx, acInfo)
 
+            if rowExists is None:
+                rowExists = name + nameSuffix in var._vars
+
             debug.logger & debug.flagIns and debug.logger('__manageColumns: action %s name %s suffix %s %svalue %r' % (
                 action, name, nameSuffix, name in indexVals and "index " or "", indexVals.get(name, val)))
 
+        if action == 'createCleanup' and rowExists:
+            self.__indexVals[nameSuffix] = indexVals
+
+        elif action in ('destroyCleanup', 'createUndo'):
+            self.__indexVals.pop(nameSuffix, None)
+
     def __delegate(self, subAction, name, val, idx, acInfo):
         # Relay operation request to column, expect row operation request.
         rowIsActive = False
@@ -1220,11 +1243,62 @@ class MibTableRow(MibTree):
 
     def writeCleanup(self, name, val, idx, acInfo):
         self.branchVersionId += 1
+        self.__logChange(name[len(self.name) + 1:])
         self.__delegate('Cleanup', name, val, idx, acInfo)
 
     def writeUndo(self, name, val, idx, acInfo):
         self.__delegate('Undo', name, val, idx, acInfo)
 
+    # Table row changes tracking
+
+    def __logChange(self, instId):
+        changeLog = self.__changeLog
+
+        # tree structure changed behind our back, can't tell what rows
+        if changeLog and changeLog[-1][0] + 1 != self.branchVersionId:
+            del changeLog[:]
+
+        if not changeLog:
+            self.__changeLogStart = self.branchVersionId
+
+        changeLog.append((self.branchVersionId, instId))
+
+        if len(changeLog) > self.changeLogSize:
+            # forget older half
+            del changeLog[:len(changeLog) - self.changeLogSize // 2]
+            self.__changeLogStart = changeLog[0][0]
+
+    def getChanges(self, lastVersionId):
+        """Return instance IDs of table rows written since given version.
+
+        Parameters
+        ----------
+        lastVersionId : int
+            The `branchVersionId` value observed by the caller.
+
+        Returns
+        -------
+        : :py:class:`list`
+            Sequence of row instance IDs (without column sub-OID) in
+            order of change, possibly repeating. `None` is returned if
+            some of the changes are not remembered, so the caller should
+            re-read the whole table.
+        """
+        changeLog = self.__changeLog
+
+        if lastVersionId == self.branchVersionId:
+            return []
+
+        if (not changeLog or lastVersionId + 1 < self.__changeLogStart or
+                changeLog[-1][0] != self.branchVersionId):
+            return None
+
+        idx = len(changeLog)
+        while idx and changeLog[idx - 1][0] > lastVersionId:
+            idx -= 1
+
+        return [instId for versionId, instId in changeLog[idx:]]
+
     # Table row management
 
     # Table row access by instance name
@@ -1239,6 +1313,8 @@ class MibTableRow(MibTree):
         if instId in self.__idToIdxCache:
             return self.__idToIdxCache[instId]
 
+        cacheKey = instId
+
         indices = []
         for impliedFlag, modName, symName in self.indexNames:
             mibObj, = mibBuilder.importSymbols(modName, symName)
@@ -1259,7 +1335,7 @@ class MibTableRow(MibTree):
             )
 
         indices = tuple(indices)
-        self.__idToIdxCache[instId] = indices
+        self.__idToIdxCache[cacheKey] = indices
 
         return indices
 
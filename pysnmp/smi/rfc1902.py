@@ -90,6 +90,7 @@ class ObjectIdentity(object):
         self.__indices = self.__oid = self.__label = ()
         self.__modName = self.__symName = ''
         self.__mibNode = None
+        self.__mibViewController = None  # pending lazy resolution
 
     def getMibSymbol(self):
         """Returns MIB variable symbolic identification.
@@ -117,6 +118,8 @@ class ObjectIdentity(object):
         >>>
 
         """
+        if self.__mibViewController is not None:
+            self.__resolveLazily()
         if self.__state & self.stClean:
             return self.__modName, self.__symName, self.__indices
         else:
@@ -180,12 +183,16 @@ class ObjectIdentity(object):
         >>>
 
         """
+        if self.__mibViewController is not None:
+            self.__resolveLazily()
         if self.__state & self.stClean:
             return self.__label
         else:
             raise SmiError('%s object not fully initialized' % self.__class__.__name__)
 
     def getMibNode(self):
+        if self.__mibViewController is not None:
+            self.__resolveLazily()
         if self.__state & self.stClean:
             return self.__mibNode
         else:
@@ -303,13 +310,17 @@ class ObjectIdentity(object):
 
     # this would eventually be called by an entity which posses a
     # reference to MibViewController
-    def resolveWithMib(self, mibViewController):
+    def resolveWithMib(self, mibViewController, lazy=False):
         """Perform MIB variable ID conversion.
 
         Parameters
         ----------
         mibViewController : :py:class:`~pysnmp.smi.view.MibViewController`
             class instance representing MIB browsing functionality.
+        lazy : bool
+            If `True` and MIB variable is identified by OID, MIB look up
+            is postponed till MIB module, symbol, label or indices are
+            first requested. OID is available right away.
 
         Returns
         -------
@@ -345,6 +356,20 @@ class ObjectIdentity(object):
         >>>
 
         """
+        if lazy and len(self.__args) == 1 and not self.__state & self.stClean:
+            oid = self.__args[0]
+            if not isinstance(oid, rfc1902.ObjectName):
+                try:
+                    oid = rfc1902.ObjectName(oid)
+                except PyAsn1Error:
+                    oid = None
+
+            if oid is not None:
+                self.__oid = oid
+                self.__mibViewController = mibViewController
+                self.__state |= self.stClean
+                return self
+
         if self.__mibSourcesToAdd is not None:
             debug.logger & debug.flagMIB and debug.logger('adding MIB sources %s' % ', '.join(self.__mibSourcesToAdd))
             mibViewController.mibBuilder.addMibSources(
@@ -417,9 +442,24 @@ class ObjectIdentity(object):
                         raise SmiError('Unknown object name component %r' % (suffix,))
                 self.__oid = rfc1902.ObjectName(prefix + suffix)
             else:
-                prefix, label, suffix = mibViewController.getNodeNameByOid(
-                    self.__oid
-                )
+                (self.__modName, self.__symName, self.__label,
+                 suffix, self.__mibNode,
+                 indexDecoder) = mibViewController.getNodeByOid(self.__oid)
+
+                debug.logger & debug.flagMIB and debug.logger(
+                    'resolved %r into MIB node %r and suffix %r' % (self.__args, self.__mibNode, suffix))
+
+                if suffix:
+                    if indexDecoder is None:
+                        self.__indices = (rfc1902.ObjectName(suffix),)
+                    else:
+                        self.__indices = indexDecoder(suffix)
+
+                self.__state |= self.stClean
+
+                debug.logger & debug.flagMIB and debug.logger('resolved indices are %r' % (self.__indices,))
+
+                return self
 
             debug.logger & debug.flagMIB and debug.logger(
                 'resolved %r into prefix %r and suffix %r' % (self.__args, prefix, suffix))
@@ -523,7 +563,19 @@ class ObjectIdentity(object):
         else:
             raise SmiError('Non-OID, label or MIB symbol')
 
+    def __resolveLazily(self):
+        mibViewController = self.__mibViewController
+        self.__state = self.stDirty
+        try:
+            self.resolveWithMib(mibViewController)
+        except SmiError:
+            self.__state = self.stClean
+            raise
+        self.__mibViewController = None
+
     def prettyPrint(self):
+        if self.__mibViewController is not None:
+            self.__resolveLazily()
         if self.__state & self.stClean:
             s = rfc1902.OctetString()
             return '%s::%s%s%s' % (
@@ -700,6 +752,7 @@ class ObjectType(object):
             raise SmiError('initializer should be ObjectIdentity instance, not %r' % (objectIdentity,))
         self.__args = [objectIdentity, objectSyntax]
         self.__state = self.stDirty
+        self.__mibViewController = None  # pending lazy resolution
 
     def __getitem__(self, i):
         if self.__state & self.stClean:
@@ -805,13 +858,19 @@ class ObjectType(object):
         self.__args[0].loadMibs(*modNames)
         return self
 
-    def resolveWithMib(self, mibViewController):
+    def resolveWithMib(self, mibViewController, lazy=False):
         """Perform MIB variable ID and associated value conversion.
 
         Parameters
         ----------
         mibViewController : :py:class:`~pysnmp.smi.view.MibViewController`
             class instance representing MIB browsing functionality.
+        lazy : bool
+            If `True`, MIB look up is postponed till this object gets
+            pretty printed or its MIB details requested from
+            :py:class:`~pysnmp.smi.rfc1902.ObjectIdentity`. Until then
+            the value is kept as it is rather than cast into MIB
+            variable type.
 
         Returns
         -------
@@ -842,6 +901,12 @@ class ObjectType(object):
         if self.__state & self.stClean:
             return self
 
+        if lazy:
+            self.__args[0].resolveWithMib(mibViewController, lazy=True)
+            self.__mibViewController = mibViewController
+            self.__state |= self.stClean
+            return self
+
         self.__args[0].resolveWithMib(mibViewController)
 
         MibScalar, MibTableColumn = mibViewController.mibBuilder.importSymbols('SNMPv2-SMI', 'MibScalar',
@@ -877,7 +942,19 @@ class ObjectType(object):
 
         return self
 
+    def __resolveLazily(self):
+        mibViewController = self.__mibViewController
+        self.__state = self.stDirty
+        try:
+            self.resolveWithMib(mibViewController)
+        except SmiError:
+            self.__state = self.stClean
+            raise
+        self.__mibViewController = None
+
     def prettyPrint(self):
+        if self.__mibViewController is not None:
+            self.__resolveLazily()
         if self.__state & self.stClean:
             return '%s = %s' % (self.__args[0].prettyPrint(),
                                 self.__args[1].prettyPrint())
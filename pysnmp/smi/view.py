@@ -7,7 +7,8 @@
 import sys
 from pysnmp.smi.indices import OrderedDict, OidOrderedDict
 from pysnmp.smi import error
-from pysnmp import debug
+from pysnmp.proto import rfc1902
+from pysnmp import cache, debug
 
 __all__ = ['MibViewController']
 
@@ -22,10 +23,17 @@ else:
 
 
 class MibViewController(object):
-    def __init__(self, mibBuilder):
+    def __init__(self, mibBuilder, nodeCacheSize=1024):
         self.mibBuilder = mibBuilder
         self.lastBuildId = -1
         self.__mibSymbolsIdx = OrderedDict()
+        # Type name, MIB variable name, OID -> MIB modules defining it
+        self.__typeMods = {}
+        self.__varMods = {}
+        self.__oidMods = {}
+        # MIB node OID -> resolved MIB node
+        self.__nodeCache = cache.Cache(maxSize=nodeCacheSize)
+        self.__nodeCacheKeyLens = ()
 
     # Indexing part
 
@@ -33,39 +41,29 @@ class MibViewController(object):
         if self.lastBuildId == self.mibBuilder.lastBuildId:
             return
 
-        debug.logger & debug.flagMIB and debug.logger('indexMib: re-indexing MIB view')
-
         MibScalarInstance, = self.mibBuilder.importSymbols(
             'SNMPv2-SMI', 'MibScalarInstance'
         )
 
-        #
-        # Create indices
-        #
+        mibSymbols = self.mibBuilder.mibSymbols
 
-        # Module name -> module-scope indices
-        self.__mibSymbolsIdx.clear()
+        # Only MIB modules changed since last indexing are (re-)indexed
+        modNames = [x for x in self.mibBuilder.modBuildIds
+                    if self.mibBuilder.modBuildIds[x] > self.lastBuildId]
 
-        # Oid <-> label indices
+        debug.logger & debug.flagMIB and debug.logger('indexMib: re-indexing MIB modules %s' % ', '.join(modNames))
 
-        # This is potentially ambiguous mapping. Sort modules in
-        # ascending age for resolution
-        def __sortFun(x, b=self.mibBuilder):
-            if b.moduleID in b.mibSymbols[x]:
-                m = b.mibSymbols[x][b.moduleID]
-                r = m.getRevisions()
-                if r:
-                    return r[0]
+        #
+        # Create module-scope indices
+        #
 
-            return "1970-01-01 00:00"
+        newMibMods = {}
 
-        modNames = list(self.mibBuilder.mibSymbols.keys())
-        modNames.sort(key=__sortFun)
+        for modName in modNames:
+            if modName not in mibSymbols:
+                continue  # unloaded
 
-        # Index modules names
-        for modName in [''] + modNames:
-            # Modules index
-            self.__mibSymbolsIdx[modName] = mibMod = {
+            newMibMods[modName] = mibMod = {
                 'oidToLabelIdx': OidOrderedDict(),
                 'labelToOidIdx': {},
                 'varToNameIdx': {},
@@ -73,12 +71,8 @@ class MibViewController(object):
                 'oidToModIdx': {}
             }
 
-            if not modName:
-                globMibMod = mibMod
-                continue
-
             # Types & MIB vars indices
-            for n, v in self.mibBuilder.mibSymbols[modName].items():
+            for n, v in mibSymbols[modName].items():
                 if n == self.mibBuilder.moduleID:  # do not index this
                     continue  # special symbol
                 if isinstance(v, classTypes):
@@ -86,7 +80,6 @@ class MibViewController(object):
                         raise error.SmiError(
                             'Duplicate SMI type %s::%s, has %s' % (modName, n, mibMod['typeToModIdx'][n])
                         )
-                    globMibMod['typeToModIdx'][n] = modName
                     mibMod['typeToModIdx'][n] = modName
                 elif isinstance(v, instanceTypes):
                     if isinstance(v, MibScalarInstance):
@@ -95,59 +88,275 @@ class MibViewController(object):
                         raise error.SmiError(
                             'Duplicate MIB variable %s::%s has %s' % (modName, n, mibMod['varToNameIdx'][n])
                         )
-                    globMibMod['varToNameIdx'][n] = v.name
                     mibMod['varToNameIdx'][n] = v.name
-                    # Potentionally ambiguous mapping ahead
-                    globMibMod['oidToModIdx'][v.name] = modName
                     mibMod['oidToModIdx'][v.name] = modName
-                    globMibMod['oidToLabelIdx'][v.name] = (n,)
+                    # short label till long one is known
                     mibMod['oidToLabelIdx'][v.name] = (n,)
                 else:
                     raise error.SmiError(
                         'Unexpected object %s::%s' % (modName, n)
                     )
 
-        # Build oid->long-label index
-        oidToLabelIdx = self.__mibSymbolsIdx['']['oidToLabelIdx']
-        labelToOidIdx = self.__mibSymbolsIdx['']['labelToOidIdx']
-        prevOid = ()
-        baseLabel = ()
-        for key in oidToLabelIdx.keys():
-            keydiff = len(key) - len(prevOid)
-            if keydiff > 0:
-                if prevOid:
-                    if keydiff == 1:
-                        baseLabel = oidToLabelIdx[prevOid]
-                    else:
-                        baseLabel += key[-keydiff:-1]
-                else:
-                    baseLabel = ()
-            elif keydiff < 0:
-                baseLabel = ()
-                keyLen = len(key)
-                i = keyLen - 1
-                while i:
-                    k = key[:i]
-                    if k in oidToLabelIdx:
-                        baseLabel = oidToLabelIdx[k]
-                        if i != keyLen - 1:
-                            baseLabel += key[i:-1]
-                        break
-                    i -= 1
-            # Build oid->long-label index
-            oidToLabelIdx[key] = baseLabel + oidToLabelIdx[key]
-            # Build label->oid index
-            labelToOidIdx[oidToLabelIdx[key]] = key
-            prevOid = key
-
-        # Build module-scope oid->long-label index
-        for mibMod in self.__mibSymbolsIdx.values():
-            for oid in mibMod['oidToLabelIdx'].keys():
-                mibMod['oidToLabelIdx'][oid] = oidToLabelIdx[oid]
-                mibMod['labelToOidIdx'][oidToLabelIdx[oid]] = oid
+        # This is potentially ambiguous mapping. Symbols of most
+        # recently revised modules take precedence
+        def __sortFun(x, b=self.mibBuilder):
+            if b.moduleID in b.mibSymbols[x]:
+                m = b.mibSymbols[x][b.moduleID]
+                r = m.getRevisions()
+                if r:
+                    return r[0]
+
+            return "1970-01-01 00:00"
+
+        modRanks = {}
+        for idx, modName in enumerate(mibSymbols):
+            modRanks[modName] = __sortFun(modName), idx
+
+        if not self.__mibSymbolsIdx:
+            self.__buildIndices(newMibMods, modRanks)
+            self.lastBuildId = self.mibBuilder.lastBuildId
+            return
+
+        globMibMod = self.__mibSymbolsIdx['']
+
+        typeMods = self.__typeMods
+        varMods = self.__varMods
+        oidMods = self.__oidMods
+
+        touchedTypes = set()
+        touchedVars = set()
+        touchedOids = set()
+
+        # Withdraw symbols of changed modules
+        for modName in modNames:
+            if modName not in self.__mibSymbolsIdx:
+                continue
+
+            mibMod = self.__mibSymbolsIdx[modName]
+
+            del self.__mibSymbolsIdx[modName]
+
+            for n in mibMod['typeToModIdx']:
+                typeMods[n].remove(modName)
+                touchedTypes.add(n)
+
+            for n in mibMod['varToNameIdx']:
+                varMods[n].remove(modName)
+                touchedVars.add(n)
+
+            for oid in mibMod['oidToModIdx']:
+                del oidMods[oid][modName]
+                touchedOids.add(oid)
+
+        # Contribute symbols of new or changed modules
+        for modName in newMibMods:
+            mibMod = self.__mibSymbolsIdx[modName] = newMibMods[modName]
+
+            for n in mibMod['typeToModIdx']:
+                typeMods.setdefault(n, []).append(modName)
+                touchedTypes.add(n)
+
+            for n in mibMod['varToNameIdx']:
+                varMods.setdefault(n, []).append(modName)
+                touchedVars.add(n)
+
+            for oid, label in mibMod['oidToLabelIdx'].items():
+                oidMods.setdefault(oid, {})[modName] = label[0]
+                touchedOids.add(oid)
+
+        #
+        # Re-evaluate global indices at the touched symbols
+        #
+
+        for n in touchedTypes:
+            if typeMods[n]:
+                globMibMod['typeToModIdx'][n] = max(typeMods[n], key=modRanks.get)
+            else:
+                del typeMods[n]
+                del globMibMod['typeToModIdx'][n]
+
+        for n in touchedVars:
+            if varMods[n]:
+                modName = max(varMods[n], key=modRanks.get)
+                globMibMod['varToNameIdx'][n] = self.__mibSymbolsIdx[modName]['varToNameIdx'][n]
+            else:
+                del varMods[n]
+                del globMibMod['varToNameIdx'][n]
+
+        oidToLabelIdx = globMibMod['oidToLabelIdx']
+        labelToOidIdx = globMibMod['labelToOidIdx']
+        oidToModIdx = globMibMod['oidToModIdx']
+
+        for oid in touchedOids:
+            if oidMods[oid]:
+                oidToModIdx[oid] = max(oidMods[oid], key=modRanks.get)
+                if oid not in oidToLabelIdx:
+                    oidToLabelIdx[oid] = (oidMods[oid][oidToModIdx[oid]],)
+            else:
+                del oidMods[oid]
+                del oidToModIdx[oid]
+                label = oidToLabelIdx[oid]
+                if labelToOidIdx.get(label) == oid:
+                    del labelToOidIdx[label]
+                del oidToLabelIdx[oid]
+
+        #
+        # Build oid->long-label indices
+        #
+
+        # Resolved MIB nodes at, above and below touched OIDs may have gone
+        nodeCache = self.__nodeCache
+        if len(touchedOids) > len(nodeCache):
+            nodeCache.clear()
+
+        # Long labels of OIDs below the touched ones may change as well
+        walkedOid = None
+
+        for oid in sorted(touchedOids, key=tuple):
+            key = tuple(oid)
+
+            if len(nodeCache):
+                for idx in range(len(key), 0, -1):
+                    try:
+                        del nodeCache[key[:idx]]
+
+                    except KeyError:
+                        pass
+
+            if walkedOid and key[:len(walkedOid)] == walkedOid:
+                continue
+
+            walkedOid = key
+
+            if oid in oidToLabelIdx:
+                self.__indexLabel(oid)
+
+            try:
+                nextOid = oidToLabelIdx.nextKey(key)
+                while tuple(nextOid)[:len(key)] == key:
+                    self.__indexLabel(nextOid)
+                    if len(nodeCache):
+                        try:
+                            del nodeCache[tuple(nextOid)]
+
+                        except KeyError:
+                            pass
+
+                    nextOid = oidToLabelIdx.nextKey(nextOid)
+
+            except KeyError:
+                pass
 
         self.lastBuildId = self.mibBuilder.lastBuildId
 
+    def __buildIndices(self, mibMods, modRanks):
+        """Index MIB modules from scratch, all at once"""
+        typeMods = self.__typeMods
+        varMods = self.__varMods
+        oidMods = self.__oidMods
+
+        typeToModIdx = {}
+        varToNameIdx = {}
+        oidToModIdx = {}
+        oidToLabelIdx = {}
+
+        # Later ranked modules override earlier ones
+        for modName in sorted(mibMods, key=modRanks.get):
+            mibMod = mibMods[modName]
+
+            for n in mibMod['typeToModIdx']:
+                typeMods.setdefault(n, []).append(modName)
+                typeToModIdx[n] = modName
+
+            for n, oid in mibMod['varToNameIdx'].items():
+                varMods.setdefault(n, []).append(modName)
+                varToNameIdx[n] = oid
+
+            for oid, label in mibMod['oidToLabelIdx'].items():
+                oidMods.setdefault(oid, {})[modName] = label[0]
+                oidToModIdx[oid] = modName
+                oidToLabelIdx[oid] = label
+
+        globMibMod = {
+            'oidToLabelIdx': OidOrderedDict(),
+            'labelToOidIdx': {},
+            'varToNameIdx': varToNameIdx,
+            'typeToModIdx': OrderedDict(),
+            'oidToModIdx': oidToModIdx
+        }
+
+        globMibMod['typeToModIdx'].update(typeToModIdx)
+        globMibMod['oidToLabelIdx'].update(oidToLabelIdx)
+
+        mibSymbolsIdx = self.__mibSymbolsIdx
+        mibSymbolsIdx.update(mibMods)
+        mibSymbolsIdx[''] = globMibMod
+
+        self.__nodeCache.clear()
+        self.__nodeCacheKeyLens = ()
+
+        # Build oid->long-label indices, parents go first and the
+        # greatest OID takes an ambiguous label
+        oidToLabelIdx = globMibMod['oidToLabelIdx']
+        labelToOidIdx = globMibMod['labelToOidIdx']
+
+        for oid in oidToLabelIdx.keys():
+            key = tuple(oid)
+
+            # Long label is based on the closest indexed parent
+            baseLabel = ()
+            idx = len(key) - 1
+            while idx:
+                if key[:idx] in oidToLabelIdx:
+                    baseLabel = oidToLabelIdx[key[:idx]] + key[idx:-1]
+                    break
+                idx -= 1
+
+            label = baseLabel + oidToLabelIdx[oid]
+
+            oidToLabelIdx[oid] = label
+            labelToOidIdx[label] = oid
+
+            for modName in oidMods[oid]:
+                mibMod = mibSymbolsIdx[modName]
+                mibMod['oidToLabelIdx'][oid] = label
+                mibMod['labelToOidIdx'][label] = oid
+
+    def __indexLabel(self, oid):
+        globMibMod = self.__mibSymbolsIdx['']
+
+        oidToLabelIdx = globMibMod['oidToLabelIdx']
+
+        key = tuple(oid)
+
+        # Long label is based on the closest indexed parent
+        baseLabel = ()
+        idx = len(key) - 1
+        while idx:
+            if key[:idx] in oidToLabelIdx:
+                baseLabel = oidToLabelIdx[key[:idx]] + key[idx:-1]
+                break
+            idx -= 1
+
+        mods = self.__oidMods[oid]
+
+        label = baseLabel + (mods[globMibMod['oidToModIdx'][oid]],)
+
+        for mibMod in [globMibMod] + [self.__mibSymbolsIdx[x] for x in mods]:
+            prevLabel = mibMod['oidToLabelIdx'][oid]
+            if prevLabel == label and label in mibMod['labelToOidIdx']:
+                continue
+
+            if mibMod['labelToOidIdx'].get(prevLabel) == oid:
+                del mibMod['labelToOidIdx'][prevLabel]
+
+            mibMod['oidToLabelIdx'][oid] = label
+
+            # Ambiguous labels resolve to the greatest OID
+            otherOid = mibMod['labelToOidIdx'].get(label)
+            if otherOid is None or tuple(otherOid) <= key:
+                mibMod['labelToOidIdx'][label] = oid
+
     # Module management
 
     def getOrderedModuleName(self, index):
@@ -290,6 +499,89 @@ class MibViewController(object):
         oid, label, suffix = self.getNodeName(nodeName, modName)
         return self.__mibSymbolsIdx['']['oidToModIdx'][oid], label[-1], suffix
 
+    def getNodeByOid(self, oid):
+        """Resolve object instance OID into MIB node and index values decoder.
+
+        Resolved MIB nodes are cached by their OIDs so that repeated
+        lookups of other instances of the same MIB object (e.g. rows
+        of the same table column) do not go through the whole MIB
+        index. The cache is dropped whenever the MIB gets re-indexed.
+
+        Parameters
+        ----------
+        oid : :py:class:`tuple`
+            MIB object instance OID.
+
+        Returns
+        -------
+        : :py:class:`tuple`
+            MIB module name, MIB symbol name, MIB node label, instance
+            OID suffix (as :py:class:`~pysnmp.proto.rfc1902.ObjectName`),
+            MIB node object and index decoder. The latter is
+            a callable turning instance OID suffix into a tuple of table
+            index values for table columns or `None` for other MIB nodes.
+
+        Raises
+        ------
+        : :py:class:`~pysnmp.smi.error.NoSuchObjectError`
+            If no MIB node covers the `oid`.
+        """
+        self.indexMib()
+
+        if hasattr(oid, 'asTuple'):
+            oid = oid.asTuple()
+        else:
+            oid = tuple(oid)
+
+        oidLen = len(oid)
+
+        for keyLen in self.__nodeCacheKeyLens:
+            if keyLen <= oidLen:
+                node = self.__nodeCache.get(oid[:keyLen])
+                if node is not None:
+                    return node[:3] + (rfc1902.ObjectName(oid[keyLen:]),) + node[3:]
+
+        prefix, label, suffix = self.getNodeNameByOid(oid)
+
+        modName, symName, _ = self.getNodeLocation(prefix)
+
+        mibNode, = self.mibBuilder.importSymbols(modName, symName)
+
+        MibTableColumn, = self.mibBuilder.importSymbols(
+            'SNMPv2-SMI', 'MibTableColumn'
+        )
+
+        if isinstance(mibNode, MibTableColumn):
+            rowModName, rowSymName, _ = self.getNodeLocation(
+                mibNode.name[:-1]
+            )
+            rowNode, = self.mibBuilder.importSymbols(rowModName, rowSymName)
+            indexDecoder = rowNode.getIndicesFromInstId
+        else:
+            indexDecoder = None
+
+        prefix = tuple(prefix)
+
+        # Only cache leaf nodes so that the longest match is always taken
+        try:
+            nextOid = self.__mibSymbolsIdx['']['oidToLabelIdx'].nextKey(prefix)
+
+        except KeyError:
+            nextOid = ()
+
+        if nextOid[:len(prefix)] != prefix:
+            self.__nodeCache[prefix] = modName, symName, label, mibNode, indexDecoder
+
+            if len(prefix) not in self.__nodeCacheKeyLens:
+                self.__nodeCacheKeyLens = tuple(
+                    sorted(self.__nodeCacheKeyLens + (len(prefix),), reverse=True)
+                )
+
+        debug.logger & debug.flagMIB and debug.logger(
+            'getNodeByOid: resolved %s -> %s::%s.%s' % (oid, modName, symName, suffix))
+
+        return modName, symName, label, rfc1902.ObjectName(suffix), mibNode, indexDecoder
+
     # MIB type management
 
     def getTypeName(self, typeName, modName=''):
@@ -2,6 +2,8 @@
 
 set -e
 
+python -m unittest discover -s tests -t .
+
 for x in examples/hlapi/asyncore/sync/manager/cmdgen/*.py \
          examples/hlapi/asyncore/sync/agent/ntforg/*.py \
          examples/hlapi/asyncore/manager/cmdgen/*.py \
@@ -14,7 +16,7 @@ for x in examples/hlapi/asyncore/sync/manager/cmdgen/*.py \
          examples/smi/agent/*.py
 do
     case "${x}" in
-    *spoof*|*ipv6*)
+    *spoof*|*ipv6*|*benchmark*)
         echo "skipping ${x}"
         continue
         ;;
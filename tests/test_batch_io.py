@@ -0,0 +1,85 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import sys
+import socket
+import unittest
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.carrier import sockmmsg, error
+
+
+class BatchIoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.receiver.bind(('127.0.0.1', 0))
+        self.receiver.settimeout(0.5)
+        self.port = self.receiver.getsockname()[1]
+        self.transport = udp.UdpTransport().openClientMode().enableBatchIo(8)
+
+    def tearDown(self):
+        self.receiver.close()
+        self.transport.closeTransport()
+
+    def flush(self):
+        errors = []
+        while self.transport.writable():
+            try:
+                self.transport.handle_write()
+            except error.CarrierError:
+                errors.append(sys.exc_info()[1])
+        received = []
+        try:
+            while True:
+                received.append(self.receiver.recv(65535))
+        except socket.timeout:
+            pass
+        return received, errors
+
+    def testHostName(self):
+        for idx in range(3):
+            self.transport.sendMessage(b'msg%d' % idx, ('localhost', self.port))
+        received, errors = self.flush()
+        self.assertEqual(received, [b'msg0', b'msg1', b'msg2'])
+        self.assertFalse(errors)
+
+    def testUnresolvableHostName(self):
+        self.transport.sendMessage(b'msg0', ('127.0.0.1', self.port))
+        self.transport.sendMessage(b'msg1', ('no-such-host.invalid', self.port))
+        self.transport.sendMessage(b'msg2', ('127.0.0.1', self.port))
+        received, errors = self.flush()
+        self.assertEqual(received, [b'msg0', b'msg2'])
+        self.assertEqual(len(errors), 1)
+
+    def testReceive(self):
+        receiver = udp.UdpTransport().openServerMode(('127.0.0.1', 0)).enableBatchIo(8)
+        received = []
+        receiver.registerCbFun(lambda t, a, m: received.append((m, a)))
+        try:
+            address = receiver.socket.getsockname()
+            for idx in range(3):
+                self.receiver.sendto(b'msg%d' % idx, address)
+            while len(received) < 3:
+                receiver.handle_read()
+        finally:
+            receiver.closeTransport()
+        self.assertEqual([x[0] for x in received], [b'msg0', b'msg1', b'msg2'])
+        self.assertEqual(received[0][1], self.receiver.getsockname())
+
+
+@unittest.skipIf(sockmmsg.sendmmsg is None, 'sendmmsg() is not available')
+class PackAddressTestCase(unittest.TestCase):
+    def testRoundTrip(self):
+        for family, address in ((socket.AF_INET, ('10.0.0.1', 161)),
+                                (socket.AF_INET6, ('fe80::1', 162, 0, 0))):
+            self.assertEqual(sockmmsg._unpackAddress(sockmmsg._packAddress(family, address)), address)
+
+    def testHostName(self):
+        self.assertEqual(sockmmsg._packAddress(socket.AF_INET, ('localhost', 161)),
+                         sockmmsg._packAddress(socket.AF_INET, ('127.0.0.1', 161)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,278 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import random
+import unittest
+from pyasn1.type import univ
+from pyasn1.codec.ber import encoder, decoder
+from pyasn1.compat.octets import ints2octs
+from pysnmp.entity import engine
+from pysnmp.proto import ber, rfc1902
+from pysnmp.proto.api import v1, v2c
+from pysnmp.proto.mpmod.rfc3412 import ScopedPDU, SNMPv3Message
+from pysnmp.proto.secmod.rfc3414.service import UsmSecurityParameters
+
+
+class MessageFactory(object):
+    """Build random yet valid SNMP messages"""
+    def __init__(self, seed):
+        self.rnd = random.Random(seed)
+
+    def octets(self, maxLength=40):
+        return ints2octs([self.rnd.randrange(256) for _ in range(self.rnd.randrange(maxLength))])
+
+    def integer(self, bits=32):
+        return self.rnd.randrange(-(1 << bits - 1), 1 << bits - 1)
+
+    def unsigned(self, bits=32):
+        return self.rnd.randrange(1 << bits)
+
+    def oid(self):
+        first = self.rnd.randrange(3)
+        if first < 2:
+            second = self.rnd.randrange(40)
+        else:
+            second = self.rnd.randrange(1000)
+        return (first, second) + tuple(
+            [self.rnd.choice((self.rnd.randrange(128), self.unsigned())) for _ in range(self.rnd.randrange(20))]
+        )
+
+    def v1Value(self):
+        return self.rnd.choice((
+            lambda: v1.Integer(self.integer()),
+            lambda: v1.OctetString(self.octets()),
+            lambda: v1.ObjectIdentifier(self.oid()),
+            lambda: v1.IpAddress(self.octets(4).ljust(4, ints2octs((0,)))),
+            lambda: v1.Counter(self.unsigned()),
+            lambda: v1.Gauge(self.unsigned()),
+            lambda: v1.TimeTicks(self.unsigned()),
+            lambda: v1.Opaque(self.octets()),
+            lambda: univ.Null(''),
+        ))()
+
+    def v2cValue(self):
+        return self.rnd.choice((
+            lambda: rfc1902.Integer32(self.integer()),
+            lambda: rfc1902.OctetString(self.octets()),
+            lambda: rfc1902.ObjectName(self.oid()),
+            lambda: rfc1902.IpAddress(self.octets(4).ljust(4, ints2octs((0,)))),
+            lambda: rfc1902.Counter32(self.unsigned()),
+            lambda: rfc1902.Gauge32(self.unsigned()),
+            lambda: rfc1902.TimeTicks(self.unsigned()),
+            lambda: rfc1902.Opaque(self.octets()),
+            lambda: rfc1902.Counter64(self.unsigned(64)),
+            lambda: rfc1902.Bits(self.octets(4)),
+            lambda: univ.Null(''),
+            lambda: v2c.NoSuchObject(''),
+            lambda: v2c.NoSuchInstance(''),
+            lambda: v2c.EndOfMibView(''),
+        ))()
+
+    def pdu(self, pMod, value):
+        pdu = self.rnd.choice((pMod.GetRequestPDU, pMod.GetNextRequestPDU,
+                               pMod.SetRequestPDU, pMod.GetResponsePDU))()
+        pMod.apiPDU.setDefaults(pdu)
+        pMod.apiPDU.setRequestID(pdu, self.integer())
+        pMod.apiPDU.setErrorStatus(pdu, self.rnd.randrange(6))
+        pMod.apiPDU.setErrorIndex(pdu, self.rnd.randrange(10))
+        pMod.apiPDU.setVarBinds(
+            pdu, [(self.oid(), value()) for _ in range(self.rnd.randrange(12))]
+        )
+        return pdu
+
+    def v1Message(self):
+        msg = v1.Message()
+        v1.apiMessage.setDefaults(msg)
+        v1.apiMessage.setCommunity(msg, self.octets())
+        v1.apiMessage.setPDU(msg, self.pdu(v1, self.v1Value))
+        return msg
+
+    def v2cMessage(self):
+        msg = v2c.Message()
+        v2c.apiMessage.setDefaults(msg)
+        v2c.apiMessage.setCommunity(msg, self.octets())
+        v2c.apiMessage.setPDU(msg, self.pdu(v2c, self.v2cValue))
+        return msg
+
+    def scopedPdu(self):
+        scopedPDU = ScopedPDU()
+        scopedPDU.setComponentByPosition(0, self.octets(32))
+        scopedPDU.setComponentByPosition(1, self.octets())
+        pdu = self.pdu(v2c, self.v2cValue)
+        scopedPDU.setComponentByPosition(2)
+        scopedPDU.getComponentByPosition(2).setComponentByType(
+            pdu.tagSet, pdu, verifyConstraints=False,
+            matchTags=False, matchConstraints=False
+        )
+        return scopedPDU
+
+    def usmSecurityParameters(self):
+        securityParameters = UsmSecurityParameters()
+        securityParameters['msgAuthoritativeEngineId'] = self.octets(32)
+        securityParameters['msgAuthoritativeEngineBoots'] = self.unsigned(31)
+        securityParameters['msgAuthoritativeEngineTime'] = self.unsigned(31)
+        securityParameters['msgUserName'] = self.octets(32)
+        securityParameters['msgAuthenticationParameters'] = self.octets(48)
+        securityParameters['msgPrivacyParameters'] = self.octets(16)
+        return securityParameters
+
+    def v3Message(self):
+        msg = SNMPv3Message()
+        msg['msgVersion'] = 3
+        msg['msgGlobalData']['msgID'] = self.unsigned(31)
+        msg['msgGlobalData']['msgMaxSize'] = self.rnd.randrange(484, 1 << 31)
+        msg['msgGlobalData']['msgFlags'] = ints2octs((self.rnd.randrange(8),))
+        msg['msgGlobalData']['msgSecurityModel'] = self.rnd.randrange(1, 4)
+        msg['msgSecurityParameters'] = encoder.encode(self.usmSecurityParameters())
+        if self.rnd.randrange(2):
+            msg['msgData']['plaintext'] = self.scopedPdu()
+        else:
+            msg['msgData']['encryptedPDU'] = self.octets(400)
+        return msg
+
+    def mutate(self, substrate):
+        octets = bytearray(substrate)
+        for _ in range(self.rnd.randrange(1, 4)):
+            mutation = self.rnd.randrange(3)
+            if mutation == 0 and octets:
+                octets[self.rnd.randrange(len(octets))] = self.rnd.randrange(256)
+            elif mutation == 1 and octets:
+                del octets[self.rnd.randrange(len(octets)):]
+            else:
+                octets.insert(self.rnd.randrange(len(octets) + 1), self.rnd.randrange(256))
+        return bytes(octets)
+
+
+@unittest.skipUnless(ber.isSupported, 'pyasn1 0.4.1+ required')
+class DifferentialTestCase(unittest.TestCase):
+    """Compare SNMP-specific BER codec against pyasn1 codec"""
+    messages = 100
+    mutations = 5
+
+    def setUp(self):
+        self.factory = MessageFactory(1)
+
+    def assertSameObjects(self, x, y):
+        self.assertIs(type(x), type(y))
+        self.assertEqual(x.tagSet, y.tagSet)
+        if isinstance(x, univ.Choice):
+            self.assertEqual(x.getName(), y.getName())
+            self.assertSameObjects(x.getComponent(), y.getComponent())
+        elif isinstance(x, (univ.Sequence, univ.SequenceOf)):
+            self.assertEqual(len(x), len(y))
+            for idx in range(len(x)):
+                self.assertSameObjects(x.getComponentByPosition(idx),
+                                       y.getComponentByPosition(idx))
+        else:
+            self.assertEqual(x, y)
+
+    def decode(self, codec, substrate, asn1Spec):
+        try:
+            return codec.decode(substrate, asn1Spec=asn1Spec)
+        except Exception as exc:
+            return exc.__class__
+
+    def assertSameDecoding(self, substrate, asn1Spec):
+        expected = self.decode(decoder, substrate, asn1Spec)
+        decoded = self.decode(ber.decoder, substrate, asn1Spec)
+
+        if isinstance(expected, tuple):
+            self.assertIsInstance(decoded, tuple)
+            self.assertSameObjects(decoded[0], expected[0])
+            self.assertEqual(decoded[1], expected[1])
+        else:
+            self.assertIs(decoded, expected)
+
+    def assertSameCodec(self, build, asn1Spec):
+        for _ in range(self.messages):
+            value = build()
+            substrate = encoder.encode(value)
+
+            self.assertEqual(ber.encoder.encode(value), substrate)
+
+            self.assertSameDecoding(substrate, asn1Spec)
+
+            for _ in range(self.mutations):
+                self.assertSameDecoding(self.factory.mutate(substrate), asn1Spec)
+
+    def testV1Message(self):
+        self.assertSameCodec(self.factory.v1Message, v1.Message())
+
+    def testV2cMessage(self):
+        self.assertSameCodec(self.factory.v2cMessage, v2c.Message())
+
+    def testV3Message(self):
+        self.assertSameCodec(self.factory.v3Message, SNMPv3Message())
+
+    def testScopedPdu(self):
+        self.assertSameCodec(self.factory.scopedPdu, ScopedPDU())
+
+    def testUsmSecurityParameters(self):
+        self.assertSameCodec(self.factory.usmSecurityParameters, UsmSecurityParameters())
+
+
+@unittest.skipUnless(ber.isSupported, 'pyasn1 0.4.1+ required')
+class DecoderSchemaCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.decoder = ber.Decoder()
+        self.substrate = encoder.encode(MessageFactory(1).v2cMessage())
+
+    def testFreshSchema(self):
+        expected = decoder.decode(self.substrate, asn1Spec=v2c.Message())
+
+        self.decoder.decode(self.substrate, asn1Spec=v2c.Message())
+        specs = len(self.decoder._Decoder__specs)
+
+        # schema components are compiled once
+        for _ in range(10):
+            self.assertEqual(self.decoder.decode(self.substrate, asn1Spec=v2c.Message()),
+                             expected)
+        self.assertEqual(len(self.decoder._Decoder__specs), specs + 10)
+
+        # compiled schemas do not pile up
+        for _ in range(2000):
+            self.decoder.decode(self.substrate, asn1Spec=v2c.Message())
+        self.assertTrue(len(self.decoder._Decoder__specs) <= 1024)
+
+    def testUnsupportedSchema(self):
+        asn1Spec = univ.Sequence()
+
+        for _ in range(2):
+            self.assertEqual(self.decoder.decode(encoder.encode(univ.Sequence()), asn1Spec=asn1Spec),
+                             decoder.decode(encoder.encode(univ.Sequence()), asn1Spec=asn1Spec))
+
+
+class EnableFastCodecTestCase(unittest.TestCase):
+    def setUp(self):
+        self.isSupported = ber.isSupported
+
+    def tearDown(self):
+        ber.isSupported = self.isSupported
+
+    def testEnabled(self):
+        ber.isSupported = True
+        snmpEngine = engine.SnmpEngine(fastCodec=True)
+        self.assertIs(snmpEngine.berEncoder, ber.encoder)
+        self.assertIs(snmpEngine.berDecoder, ber.decoder)
+
+        snmpEngine.enableFastCodec(False)
+        self.assertIs(snmpEngine.berEncoder, encoder)
+        self.assertIs(snmpEngine.berDecoder, decoder)
+
+    def testUnsupportedPyAsn1(self):
+        ber.isSupported = False
+        snmpEngine = engine.SnmpEngine(fastCodec=True)
+        self.assertIs(snmpEngine.berEncoder, encoder)
+        self.assertIs(snmpEngine.berDecoder, decoder)
+
+    def testParseVersion(self):
+        self.assertEqual(ber._parseVersion('0.4.2'), (0, 4, 2))
+        self.assertEqual(ber._parseVersion('0.4.1rc1'), (0, 4, 1))
+        self.assertEqual(ber._parseVersion('0.3'), (0, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdrsp, context
+from pysnmp.proto.rfc1902 import ObjectName
+
+try:
+    import asyncio
+    from pysnmp.carrier.asyncio.dgram import udp
+    from pysnmp.hlapi.asyncio import *
+
+except (ImportError, SyntaxError):
+    asyncio = None
+
+try:
+    StopAsyncIteration
+
+except NameError:  # Python < 3.5
+    StopAsyncIteration = None
+
+
+@unittest.skipIf(asyncio is None or StopAsyncIteration is None,
+                 'asyncio carrier is not available')
+class BulkWalkCmdTestCase(unittest.TestCase):
+    users = 60
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+        self.agentEngine = engine.SnmpEngine()
+
+        self.agentTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(self.agentEngine, udp.domainName, self.agentTransport)
+
+        while self.agentTransport.transport is None:
+            self.loop.run_until_complete(asyncio.sleep(0))
+
+        self.agentAddress = self.agentTransport.transport.get_extra_info('sockname')
+
+        config.addV1System(self.agentEngine, 'my-area', 'public')
+        config.addVacmUser(self.agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+
+        # usmUserTable rows to walk
+        for idx in range(self.users):
+            config.addV3User(self.agentEngine, 'user%.2d' % idx)
+
+        snmpContext = context.SnmpContext(self.agentEngine)
+        cmdrsp.GetCommandResponder(self.agentEngine, snmpContext)
+        cmdrsp.NextCommandResponder(self.agentEngine, snmpContext)
+        cmdrsp.BulkCommandResponder(self.agentEngine, snmpContext)
+
+        self.snmpEngine = SnmpEngine()
+
+    def tearDown(self):
+        self.snmpEngine.transportDispatcher.closeDispatcher()
+        self.agentEngine.transportDispatcher.closeDispatcher()
+        # let cancelled timers go
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def walk(self, *varBinds, **options):
+        walker = bulkWalkCmd(self.snmpEngine,
+                             CommunityData('public'),
+                             UdpTransportTarget(self.agentAddress, timeout=0.5, retries=0),
+                             ContextData(), *varBinds, **options)
+
+        results = []
+
+        # requests in progress to SNMP agent, at most
+        self.inFlight = 0
+
+        while True:
+            try:
+                results.append(self.loop.run_until_complete(walker.__anext__()))
+
+            except StopAsyncIteration:
+                break
+
+            for agent in self.snmpEngine.getUserContext('bulkWalkCmd').values():
+                self.inFlight = max(self.inFlight, agent[0])
+
+        return results
+
+    @staticmethod
+    def column(name):
+        return ObjectType(ObjectIdentity('SNMP-USER-BASED-SM-MIB', name))
+
+    def assertSubtree(self, results, rootOid):
+        oids = [varBind[0].getOid() for result in results
+                for varBind in result[3] if rootOid.isPrefixOf(varBind[0].getOid())]
+
+        self.assertEqual(len(oids), self.users)
+        self.assertEqual(oids, sorted(oids))
+
+        return oids
+
+    def testWalk(self):
+        results = self.walk(self.column('usmUserSecurityName'),
+                            self.column('usmUserStatus'))
+
+        for errorIndication, errorStatus, errorIndex, varBinds in results:
+            self.assertFalse(errorIndication)
+            self.assertFalse(errorStatus)
+
+        securityNames = [varBind[1].prettyPrint() for result in results
+                         for varBind in result[3]
+                         if varBind[0].getMibSymbol()[1] == 'usmUserSecurityName']
+        self.assertEqual(securityNames, ['user%.2d' % idx for idx in range(self.users)])
+
+        self.assertSubtree(results, ObjectName('1.3.6.1.6.3.15.1.2.2.1.13'))
+
+        self.assertEqual(self.inFlight, 2)
+
+        # no requests left in progress
+        self.assertEqual([agent[0] for agent in self.snmpEngine.getUserContext('bulkWalkCmd').values()], [0])
+
+    def testMaxRepetitions(self):
+        results = self.walk(self.column('usmUserSecurityName'),
+                            maxRepetitions=2, maxRepetitionsLimit=8)
+
+        # doubled till the limit
+        self.assertEqual([len(result[3]) for result in results], [2, 4, 8, 8, 8, 8, 8, 8, 6])
+
+    def testTrimmedResponses(self):
+        snmpEngineMaxMessageSize, = self.agentEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
+            '__SNMP-FRAMEWORK-MIB', 'snmpEngineMaxMessageSize'
+        )
+        snmpEngineMaxMessageSize.syntax = snmpEngineMaxMessageSize.syntax.clone(1500)
+
+        results = self.walk(self.column('usmUserSecurityName'),
+                            maxRepetitions=200, maxRepetitionsLimit=200)
+
+        # capped by the number of rows fitting into response
+        self.assertTrue(len(results) > 1)
+        self.assertEqual(len(set([len(result[3]) for result in results[:-1]])), 1)
+
+        self.assertSubtree(results, ObjectName('1.3.6.1.6.3.15.1.2.2.1.3'))
+
+    def testMaxConcurrency(self):
+        results = self.walk(self.column('usmUserSecurityName'),
+                            self.column('usmUserStatus'),
+                            self.column('usmUserStorageType'),
+                            maxConcurrency=1, lookupMib=False)
+
+        self.assertEqual(self.inFlight, 1)
+
+        for oid in ('1.3.6.1.6.3.15.1.2.2.1.3', '1.3.6.1.6.3.15.1.2.2.1.12', '1.3.6.1.6.3.15.1.2.2.1.13'):
+            rootOid = ObjectName(oid)
+            oids = [varBind[0] for result in results for varBind in result[3] if rootOid.isPrefixOf(varBind[0])]
+            self.assertEqual(len(oids), self.users)
+
+    def testEndOfMib(self):
+        self.assertEqual(self.walk(ObjectType(ObjectIdentity('1.3.6.1.6.3.99999'))), [])
+
+    def testClose(self):
+        walker = bulkWalkCmd(self.snmpEngine,
+                             CommunityData('public'),
+                             UdpTransportTarget(self.agentAddress),
+                             ContextData(),
+                             self.column('usmUserSecurityName'),
+                             maxRepetitions=2)
+
+        errorIndication, errorStatus, errorIndex, varBinds = self.loop.run_until_complete(walker.__anext__())
+        self.assertEqual(len(varBinds), 2)
+
+        walker.close()
+
+        self.assertRaises(StopAsyncIteration, self.loop.run_until_complete, walker.__anext__())
+
+    def testTimeout(self):
+        # nothing listens there
+        self.agentEngine.transportDispatcher.closeDispatcher()
+
+        results = self.walk(self.column('usmUserSecurityName'))
+
+        self.assertEqual(len(results), 1)
+
+        errorIndication, errorStatus, errorIndex, varBinds = results[0]
+
+        self.assertEqual(errorIndication, 'requestTimedOut')
+        self.assertEqual(varBinds[0][0].getOid(), ObjectName('1.3.6.1.6.3.15.1.2.2.1.3'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp import cache
+
+
+class LruCacheTestCase(unittest.TestCase):
+    cacheClass = cache.LruCache
+
+    def setUp(self):
+        self.cache = self.cacheClass(maxSize=3)
+
+    def testMiss(self):
+        self.assertFalse(1 in self.cache)
+        self.assertRaises(KeyError, lambda: self.cache[1])
+        self.assertEqual(self.cache.get(1, 'x'), 'x')
+        self.assertEqual(self.cache.misses, 3)
+
+    def testHit(self):
+        self.cache[1] = 'a'
+        self.assertTrue(1 in self.cache)
+        self.assertEqual(self.cache[1], 'a')
+        self.assertEqual(self.cache.hits, 1)
+        self.cache[1] = 'b'
+        self.assertEqual(self.cache[1], 'b')
+        self.assertEqual(len(self.cache), 1)
+
+    def testSizeBound(self):
+        for k in range(100):
+            self.cache[k] = k
+            self.assertTrue(len(self.cache) <= 3)
+        self.assertEqual(self.cache.evictions, 97)
+        self.assertEqual(self.cache.getStats()['size'], 3)
+
+    def testDelete(self):
+        self.cache[1] = 'a'
+        self.cache[2] = 'b'
+        del self.cache[1]
+        self.assertFalse(1 in self.cache)
+        self.assertEqual(len(self.cache), 1)
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def testEvictsLeastRecentlyUsed(self):
+        for k in 1, 2, 3:
+            self.cache[k] = k
+        self.cache[1]
+        self.cache[4] = 4
+        self.assertFalse(2 in self.cache)
+        for k in 1, 3, 4:
+            self.assertTrue(k in self.cache)
+
+
+class LinkedDictLruCacheTestCase(LruCacheTestCase):
+    def cacheClass(self, maxSize):
+        orderedDict = cache.OrderedDict
+        cache.OrderedDict = cache._LinkedDict
+        try:
+            return cache.LruCache(maxSize)
+        finally:
+            cache.OrderedDict = orderedDict
+
+    def testLinkedDict(self):
+        d = cache._LinkedDict()
+        for k in 3, 0, 2, 1:
+            d[k] = str(k)
+        d.move_to_end(0)
+        self.assertEqual(d.popitem(last=False), (3, '3'))
+        self.assertEqual(d.popitem(), (0, '0'))
+        del d[2]
+        self.assertEqual(d.popitem(last=False), (1, '1'))
+        self.assertRaises(KeyError, d.popitem)
+
+
+class LfuCacheTestCase(LruCacheTestCase):
+    cacheClass = cache.LfuCache
+
+    def testEvictsLeastRecentlyUsed(self):
+        pass
+
+    def testKeepsFrequentlyUsed(self):
+        self.cache = cache.LfuCache(maxSize=100)
+        for k in range(100):
+            self.cache[k] = k
+        for _ in range(10):
+            self.cache[0]
+        for k in range(100, 150):
+            self.cache[k] = k
+        self.assertTrue(0 in self.cache)
+        self.assertEqual(len(self.cache), 100)
+
+
+class DefaultCacheTestCase(unittest.TestCase):
+    def testDefaultPolicy(self):
+        self.assertTrue(cache.Cache is cache.LruCache)
+
+
+if __name__ == '__main__':
+    unittest.main()
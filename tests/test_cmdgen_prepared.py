@@ -0,0 +1,151 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pyasn1.codec.ber import decoder
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto import api, ber, rfc1902
+from pysnmp import error
+
+
+class PreparedVarBindsTestCase(unittest.TestCase):
+    varBinds = [((1, 3, 6, 1, 2, 1, 1, 1, 0), rfc1902.OctetString('sysDescr')),
+                ((1, 3, 6, 1, 2, 1, 1, 3, 0), rfc1902.TimeTicks(12345)),
+                ((1, 3, 6, 1, 2, 1, 1, 7, 0), rfc1902.Integer32(-1))]
+
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+        config.addTransport(self.snmpEngine, udp.domainName,
+                            udp.UdpTransport().openClientMode())
+        config.addV1System(self.snmpEngine, 'my-area', 'public')
+        config.addTargetAddr(self.snmpEngine, 'my-agent', udp.domainName,
+                             ('127.0.0.1', 1), 'my-creds')
+
+        self.messages = []
+
+        # capture outgoing messages rather than sending them
+        self.snmpEngine.transportDispatcher.sendMessage = \
+            lambda outgoingMessage, transportDomain, transportAddress: \
+            self.messages.append(outgoingMessage)
+
+    def tearDown(self):
+        self.snmpEngine.transportDispatcher.closeDispatcher()
+
+    def decode(self, wholeMsg):
+        pMod = api.protoModules[api.decodeMessageVersion(wholeMsg)]
+        msg, _ = decoder.decode(wholeMsg, asn1Spec=pMod.Message())
+        pdu = pMod.apiMessage.getPDU(msg)
+        return (pdu.__class__, pMod.apiPDU.getRequestID(pdu),
+                [(x[0].asTuple(), x[1].prettyPrint())
+                 for x in pMod.apiPDU.getVarBinds(pdu)])
+
+    def assertSameAsPlain(self, cmdGen, mpModel):
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area',
+                               'noAuthNoPriv', mpModel)
+
+        preparedVarBinds = cmdGen.prepareVarBinds(self.varBinds)
+
+        cmdGen.sendVarBinds(self.snmpEngine, 'my-agent', None, '',
+                            self.varBinds, None)
+        for _ in range(2):
+            cmdGen.sendVarBinds(self.snmpEngine, 'my-agent', None, '',
+                                preparedVarBinds, None)
+
+        plainPdu, preparedPdu, nextPreparedPdu = [self.decode(x) for x in self.messages]
+
+        self.assertEqual(preparedPdu[0], plainPdu[0])
+        self.assertEqual(preparedPdu[2], plainPdu[2])
+        self.assertEqual(nextPreparedPdu[2], plainPdu[2])
+
+        # request-id is unique for every message
+        self.assertEqual(len(set([x[1] for x in (plainPdu, preparedPdu, nextPreparedPdu)])), 3)
+
+    def testGetV1(self):
+        self.assertSameAsPlain(cmdgen.GetCommandGenerator(), 0)
+
+    def testGetV2c(self):
+        self.assertSameAsPlain(cmdgen.GetCommandGenerator(), 1)
+
+    def testSetV1(self):
+        self.assertSameAsPlain(cmdgen.SetCommandGenerator(), 0)
+
+    def testSetV2c(self):
+        self.assertSameAsPlain(cmdgen.SetCommandGenerator(), 1)
+
+    def testTypeMismatch(self):
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area',
+                               'noAuthNoPriv', 1)
+
+        self.assertRaises(
+            error.PySnmpError, cmdgen.GetCommandGenerator().sendVarBinds,
+            self.snmpEngine, 'my-agent', None, '',
+            cmdgen.SetCommandGenerator.prepareVarBinds(self.varBinds), None
+        )
+
+
+@unittest.skipUnless(ber.isSupported, 'pyasn1 0.4.1+ required')
+class FastCodecPreparedVarBindsTestCase(PreparedVarBindsTestCase):
+    def setUp(self):
+        PreparedVarBindsTestCase.setUp(self)
+        self.snmpEngine.enableFastCodec()
+
+
+class PreparedRequestTestCase(unittest.TestCase):
+    def testResponse(self):
+        transportDispatcher = AsyncoreDispatcher()
+        transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+        agentEngine = engine.SnmpEngine()
+        agentEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (2,))
+        agentTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(agentEngine, udp.domainName + (2,), agentTransport)
+        config.addV1System(agentEngine, 'my-area', 'public')
+        config.addVacmUser(agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+        cmdrsp.GetCommandResponder(agentEngine, context.SnmpContext(agentEngine))
+
+        snmpEngine = engine.SnmpEngine()
+        snmpEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (1,))
+        config.addTransport(snmpEngine, udp.domainName + (1,), udp.UdpTransport().openClientMode())
+        config.addV1System(snmpEngine, 'my-area', 'public')
+        config.addTargetParams(snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+        config.addTargetAddr(snmpEngine, 'my-agent', udp.domainName + (1,),
+                             agentTransport.socket.getsockname(), 'my-creds')
+
+        varBinds = [((1, 3, 6, 1, 2, 1, 1, 1, 0), None),
+                    ((1, 3, 6, 1, 2, 1, 1, 99, 0), None)]
+
+        getCmdGen = cmdgen.GetCommandGenerator()
+
+        results = []
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBinds, cbCtx):
+            results.append((errorIndication, int(errorStatus),
+                            [(x[0].asTuple(), x[1].prettyPrint()) for x in varBinds]))
+
+        getCmdGen.sendVarBinds(snmpEngine, 'my-agent', None, '', varBinds, cbFun)
+        preparedVarBinds = getCmdGen.prepareVarBinds(varBinds)
+        for _ in range(2):
+            getCmdGen.sendVarBinds(snmpEngine, 'my-agent', None, '', preparedVarBinds, cbFun)
+
+        try:
+            transportDispatcher.runDispatcher()
+
+        finally:
+            transportDispatcher.closeDispatcher()
+
+        self.assertEqual(len(results), 3)
+        self.assertFalse(results[0][0])
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
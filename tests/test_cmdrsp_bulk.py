@@ -0,0 +1,82 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto.rfc1902 import ObjectName, OctetString
+
+
+class BulkResponseSizeTestCase(unittest.TestCase):
+    """GETBULK responses fit into the requester's maximum message size"""
+    contextName = 'c' * 32
+
+    def bulkWalk(self, maxMessageSize):
+        transportDispatcher = AsyncoreDispatcher()
+        transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+        # longest engine ID and context name make the largest scopedPDU header
+        agentEngine = engine.SnmpEngine(snmpEngineID=OctetString(b'\x80\x00\x4f\xb8\x05' + b'a' * 27))
+        agentEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (2,))
+        agentTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(agentEngine, udp.domainName + (2,), agentTransport)
+        config.addV3User(agentEngine, 'usr-md5-des', config.usmHMACMD5AuthProtocol,
+                         'authkey1', config.usmDESPrivProtocol, 'privkey1')
+        config.addVacmUser(agentEngine, 3, 'usr-md5-des', 'authPriv', (1, 3, 6),
+                           contextName=self.contextName)
+        snmpContext = context.SnmpContext(agentEngine)
+        snmpContext.registerContextName(self.contextName, agentEngine.msgAndPduDsp.mibInstrumController)
+        cmdrsp.BulkCommandResponder(agentEngine, snmpContext)
+
+        snmpEngine = engine.SnmpEngine()
+        snmpEngineMaxMessageSize, = snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
+            '__SNMP-FRAMEWORK-MIB', 'snmpEngineMaxMessageSize')
+        snmpEngineMaxMessageSize.syntax = snmpEngineMaxMessageSize.syntax.clone(maxMessageSize)
+        snmpEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (1,))
+        config.addTransport(snmpEngine, udp.domainName + (1,), udp.UdpTransport().openClientMode())
+        config.addV3User(snmpEngine, 'usr-md5-des', config.usmHMACMD5AuthProtocol,
+                         'authkey1', config.usmDESPrivProtocol, 'privkey1')
+        config.addTargetParams(snmpEngine, 'my-creds', 'usr-md5-des', 'authPriv')
+        config.addTargetAddr(snmpEngine, 'my-agent', udp.domainName + (1,),
+                             agentTransport.socket.getsockname(), 'my-creds',
+                             timeout=300, retryCount=0)
+
+        result = {}
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBindTable, cbCtx):
+            result['errorIndication'] = errorIndication
+            result['errorStatus'] = errorStatus
+            result['varBinds'] = [x for row in varBindTable or () for x in row]
+            transportDispatcher.jobFinished(1)
+
+        cmdgen.BulkCommandGenerator().sendVarBinds(
+            snmpEngine, 'my-agent', None, self.contextName, 0, 64,
+            [(ObjectName('1.3.6.1.6.3'), None)], cbFun
+        )
+        transportDispatcher.jobStarted(1)
+
+        try:
+            transportDispatcher.runDispatcher()
+        finally:
+            transportDispatcher.closeDispatcher()
+
+        return result
+
+    def testFitsIntoMaxSize(self):
+        # msgMaxSize of SNMPv3 request limits response size
+        for maxMessageSize in range(484, 1500, 53):
+            result = self.bulkWalk(maxMessageSize)
+            self.assertFalse(result['errorIndication'], '%s at %s' % (result['errorIndication'], maxMessageSize))
+            self.assertFalse(result['errorStatus'])
+            self.assertTrue(result['varBinds'])
+            self.assertTrue(len(result['varBinds']) < 64)
+
+
+if __name__ == '__main__':
+    unittest.main()
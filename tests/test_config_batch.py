@@ -0,0 +1,215 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import sys
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.proto import rfc1905
+from pysnmp import error
+
+
+class BaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.mibInstrumController = self.snmpEngine.msgAndPduDsp.mibInstrumController
+        mibBuilder = self.mibInstrumController.mibBuilder
+        self.snmpTargetAddrEntry, self.snmpTargetParamsEntry = mibBuilder.importSymbols(
+            'SNMP-TARGET-MIB', 'snmpTargetAddrEntry', 'snmpTargetParamsEntry'
+        )
+
+    def getColumn(self, entry, column, index):
+        (name, value), = self.mibInstrumController.readVars(
+            [(entry.name + (column,) + entry.getInstIdFromIndices(index), None)]
+        )
+        if (value.isSameTypeWith(rfc1905.noSuchInstance) or
+                value.isSameTypeWith(rfc1905.noSuchObject)):
+            return
+        return value.prettyPrint()
+
+    def getTargetAddrParams(self, addrName):
+        return self.getColumn(self.snmpTargetAddrEntry, 7, addrName)
+
+    def getTargetParamsSecurityName(self, name):
+        return self.getColumn(self.snmpTargetParamsEntry, 4, name)
+
+    def getIndexCache(self, entry):
+        return entry._MibTableRow__indexVals
+
+
+class BatchTestCase(BaseTestCase):
+    def testAddBatch(self):
+        config.addBatch(
+            self.snmpEngine,
+            targetParams=[('creds-1', 'area-1', 'noAuthNoPriv', 1),
+                          {'name': 'creds-2', 'securityName': 'area-2',
+                           'securityLevel': 'noAuthNoPriv'}],
+            targetAddrs=[('router-%d' % x, config.snmpUDPDomain,
+                          ('127.0.0.1', 1000 + x), 'creds-1')
+                         for x in range(10)]
+        )
+
+        self.assertEqual(self.getTargetParamsSecurityName('creds-1'), 'area-1')
+        self.assertEqual(self.getTargetParamsSecurityName('creds-2'), 'area-2')
+        for x in range(10):
+            self.assertEqual(self.getTargetAddrParams('router-%d' % x), 'creds-1')
+
+        # later entries win
+        config.addBatch(
+            self.snmpEngine,
+            targetAddrs=[('router-1', config.snmpUDPDomain, ('127.0.0.1', 1), 'creds-1'),
+                         ('router-1', config.snmpUDPDomain, ('127.0.0.1', 1), 'creds-2')]
+        )
+
+        self.assertEqual(self.getTargetAddrParams('router-1'), 'creds-2')
+
+    def testCreationFailureRollback(self):
+        config.addTargetParams(self.snmpEngine, 'creds-1', 'area-1', 'noAuthNoPriv')
+
+        self.assertRaises(
+            error.PySnmpError, config.addBatch, self.snmpEngine,
+            targetParams=[('creds-1', 'area-2', 'noAuthNoPriv'),
+                          ('creds-2', 'area-2', 'noAuthNoPriv'),
+                          ('creds-3', 'area-3', 'no-such-level')]
+        )
+
+        self.assertEqual(self.getTargetParamsSecurityName('creds-1'), 'area-1')
+        self.assertEqual(self.getTargetParamsSecurityName('creds-2'), None)
+        self.assertEqual(self.getTargetParamsSecurityName('creds-3'), None)
+
+    def testColumnsFailureRollback(self):
+        config.addTargetParams(self.snmpEngine, 'creds-1', 'area-1', 'noAuthNoPriv')
+
+        # context names are plain columns written after all rows are created
+        vacmContextEntry, = self.mibInstrumController.mibBuilder.importSymbols(
+            'SNMP-VIEW-BASED-ACM-MIB', 'vacmContextEntry'
+        )
+
+        writeVars = self.mibInstrumController.writeVars
+
+        def failingWriteVars(varBinds, *args):
+            for name, value in varBinds:
+                if name[:len(vacmContextEntry.name)] == vacmContextEntry.name:
+                    raise error.PySnmpError('columns pass failed')
+            return writeVars(varBinds, *args)
+
+        self.mibInstrumController.writeVars = failingWriteVars
+
+        try:
+            self.assertRaises(
+                error.PySnmpError, config.addBatch, self.snmpEngine,
+                targetParams=[('creds-1', 'area-2', 'noAuthNoPriv'),
+                              ('creds-2', 'area-2', 'noAuthNoPriv')],
+                contexts=[('ctx',)]
+            )
+
+        finally:
+            del self.mibInstrumController.writeVars
+
+        self.assertEqual(self.getTargetParamsSecurityName('creds-1'), 'area-1')
+        self.assertEqual(self.getTargetParamsSecurityName('creds-2'), None)
+
+    def testIndexCache(self):
+        config.addTargetParams(self.snmpEngine, 'creds-1', 'area-1', 'noAuthNoPriv')
+        config.addTargetAddr(self.snmpEngine, 'router-1', config.snmpUDPDomain,
+                             ('127.0.0.1', 161), 'creds-1')
+        self.assertEqual(len(self.getIndexCache(self.snmpTargetAddrEntry)), 1)
+
+        config.delTargetAddr(self.snmpEngine, 'router-1')
+        self.assertFalse(self.getIndexCache(self.snmpTargetAddrEntry))
+
+        # failed row creation is not cached beyond the instances it leaves
+        self.assertRaises(
+            error.PySnmpError, config.addTargetParams, self.snmpEngine,
+            'creds-2', 'area-2', 'no-such-level'
+        )
+        column = self.snmpTargetParamsEntry.getBranch(self.snmpTargetParamsEntry.name + (1,), 0)
+        for instId in self.getIndexCache(self.snmpTargetParamsEntry):
+            self.assertTrue(column.name + instId in column._vars)
+
+        # row creation failed by another var-bind leaves neither instances nor cache
+        self.assertRaises(
+            error.PySnmpError, self.mibInstrumController.writeVars,
+            [(self.snmpTargetParamsEntry.name + (7,) +
+              self.snmpTargetParamsEntry.getInstIdFromIndices('creds-3'), 'createAndWait'),
+             ((1, 3, 6, 1, 6, 3, 999, 1, 0), 'no-such-object')]
+        )
+        self.assertFalse(self.snmpTargetParamsEntry.getInstIdFromIndices('creds-3') in
+                         self.getIndexCache(self.snmpTargetParamsEntry))
+
+        config.delTargetParams(self.snmpEngine, 'creds-2')
+        self.assertEqual(list(self.getIndexCache(self.snmpTargetParamsEntry)),
+                         [self.snmpTargetParamsEntry.getInstIdFromIndices('creds-1')])
+
+
+class LoadBatchTestCase(BaseTestCase):
+    def testLoad(self):
+        config.loadBatch(self.snmpEngine, [
+            '{"type": "targetParams", "name": "creds-1", "securityName": "area-1", '
+            '"securityLevel": "noAuthNoPriv", "mpModel": 1}',
+            '',
+            '{"type": "targetAddr", "addrName": "router-1", "transportDomain": "snmpUDPDomain", '
+            '"transportAddress": ["127.0.0.1", 161], "params": "creds-1"}',
+            '{"type": "v3User", "userName": "user-1", "authProtocol": "usmHMACSHAAuthProtocol", '
+            '"authKey": "authkey1", "privProtocol": "usmAesCfb128Protocol", "privKey": "privkey1"}'
+        ])
+
+        self.assertEqual(self.getTargetAddrParams('router-1'), 'creds-1')
+
+        snmpEngineID = self.snmpEngine.snmpEngineID
+        mibBuilder = self.snmpEngine.msgAndPduDsp.mibInstrumController.mibBuilder
+        usmUserEntry, = mibBuilder.importSymbols('SNMP-USER-BASED-SM-MIB', 'usmUserEntry')
+        tblIdx = usmUserEntry.getInstIdFromIndices(snmpEngineID, 'user-1')
+        self.assertEqual(usmUserEntry.getNode(usmUserEntry.name + (5,) + tblIdx).syntax,
+                         config.usmHMACSHAAuthProtocol)
+        self.assertEqual(usmUserEntry.getNode(usmUserEntry.name + (8,) + tblIdx).syntax,
+                         config.usmAesCfb128Protocol)
+
+    def assertLineError(self, lines, lineNo):
+        try:
+            config.loadBatch(self.snmpEngine, lines)
+
+        except error.PySnmpError:
+            self.assertTrue('line %d' % lineNo in str(sys.exc_info()[1]),
+                            sys.exc_info()[1])
+
+        else:
+            self.fail('PySnmpError not raised')
+
+    def testUnknownName(self):
+        self.assertLineError([
+            '{"type": "context", "contextName": "ctx"}',
+            '{"type": "targetAddr", "addrName": "router-1", "transportDomain": "snmpUDPDomainX", '
+            '"transportAddress": ["127.0.0.1", 161], "params": "creds-1"}'
+        ], 2)
+
+    def testNoModuleGlobals(self):
+        # only protocols and transport domains are taken by name
+        self.assertLineError([
+            '{"type": "v3User", "userName": "user-1", "authProtocol": "usmDESPrivProtocol"}'
+        ], 1)
+        self.assertLineError([
+            '{"type": "v3User", "userName": "user-1", "authProtocol": "authServices"}'
+        ], 1)
+
+    def testUnknownArgument(self):
+        self.assertLineError([
+            '{"type": "context", "contextName": "ctx"}',
+            '',
+            '{"type": "context", "contextNam": "ctx"}'
+        ], 3)
+
+    def testMissingArgument(self):
+        self.assertLineError([
+            '{"type": "targetParams", "name": "creds-1", "securityName": "area-1"}'
+        ], 1)
+
+    def testBadEntry(self):
+        self.assertLineError(['{"type": "context", "contextName": "ctx"}', '[1, 2]'], 2)
+        self.assertLineError(['{"type": "no-such-type"}'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
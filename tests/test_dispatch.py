@@ -0,0 +1,224 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import time
+import socket
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, ntforg
+from pysnmp.carrier.asyncore import dispatch
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto import errind
+from pysnmp.proto.api import v2c
+
+
+class CallLaterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.transportDispatcher = AsyncoreDispatcher()
+        self.calls = []
+
+    def tearDown(self):
+        self.transportDispatcher.closeDispatcher()
+
+    def cbFun(self, *args):
+        self.calls.append(args)
+
+    def testOrder(self):
+        for delay in 0.03, 0.01, 0.02:
+            self.transportDispatcher.callLater(delay, self.cbFun, delay)
+
+        self.transportDispatcher.callLater(0.04, self.transportDispatcher.jobFinished, 1)
+        self.transportDispatcher.jobStarted(1)
+        self.transportDispatcher.runDispatcher()
+
+        self.assertEqual(self.calls, [(0.01,), (0.02,), (0.03,)])
+
+    def testCancel(self):
+        timerHandle = self.transportDispatcher.callLater(0, self.cbFun, 1)
+        self.transportDispatcher.callLater(0, self.cbFun, 2)
+        timerHandle.cancel()
+
+        self.transportDispatcher.runDelayedCalls()
+
+        self.assertEqual(self.calls, [(2,)])
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), None)
+
+    def testNextCallTime(self):
+        timeNow = time.time()
+
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), None)
+
+        timerHandle = self.transportDispatcher.callLater(1, self.cbFun)
+        self.transportDispatcher.callLater(2, self.cbFun)
+
+        self.assertTrue(timeNow + 1 <= self.transportDispatcher.getNextCallTime() < timeNow + 2)
+        timerHandle.cancel()
+        self.assertTrue(timeNow + 2 <= self.transportDispatcher.getNextCallTime() < timeNow + 3)
+
+        # not due yet
+        self.transportDispatcher.runDelayedCalls()
+        self.assertEqual(self.calls, [])
+
+    def testPollTimeout(self):
+        # delayed call is not held up by dispatcher poll timeout
+        self.transportDispatcher.callLater(0.05, self.transportDispatcher.jobFinished, 1)
+        self.transportDispatcher.jobStarted(1)
+
+        timeNow = time.time()
+        self.transportDispatcher.runDispatcher()
+
+        self.assertTrue(time.time() - timeNow < 0.5)
+
+    def testIdleSleep(self):
+        # idle dispatcher sleeps till the next delayed call in one go
+        self.transportDispatcher.registerTransport(
+            udp.domainName, udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        )
+        self.transportDispatcher.callLater(0.6, self.transportDispatcher.jobFinished, 1)
+        self.transportDispatcher.jobStarted(1)
+
+        polls = []
+
+        def loop(*args, **kwargs):
+            polls.append(args[0])
+            return pollLoop(*args, **kwargs)
+
+        pollLoop = dispatch.loop
+        dispatch.loop = loop
+        try:
+            self.transportDispatcher.runDispatcher()
+
+        finally:
+            dispatch.loop = pollLoop
+
+        self.assertTrue(len(polls) <= 3, polls)
+        self.assertTrue(polls[0] > 0.5, polls)
+
+    def testTimerCallbackTicks(self):
+        self.transportDispatcher.setTimerResolution(0.02)
+        self.transportDispatcher.registerTimerCbFun(self.cbFun)
+        self.transportDispatcher.callLater(0.11, self.transportDispatcher.jobFinished, 1)
+        self.transportDispatcher.jobStarted(1)
+        self.transportDispatcher.runDispatcher()
+
+        self.assertTrue(3 <= len(self.calls) <= 6, self.calls)
+
+
+class HousekeepingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.transportDispatcher = AsyncoreDispatcher()
+        self.transportDispatcher.setTimerResolution(0.01)
+        self.snmpEngine.registerTransportDispatcher(self.transportDispatcher)
+        self.transport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(self.snmpEngine, udp.domainName, self.transport)
+
+    def tearDown(self):
+        self.transportDispatcher.closeDispatcher()
+
+    def tick(self):
+        time.sleep(0.02)
+        self.transportDispatcher.runDelayedCalls()
+
+    def testIdleEngineSleeps(self):
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), None)
+
+    def testArmedByIncomingMessage(self):
+        self.transportDispatcher._cbFun(self.transport, ('127.0.0.1', 161), b'junk')
+        self.assertNotEqual(self.transportDispatcher.getNextCallTime(), None)
+
+        # nothing left to expire
+        self.tick()
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), None)
+
+    def testTicksWhileExpirationsPending(self):
+        mpHandler = self.snmpEngine.messageProcessingSubsystems[1]
+        stateReference = mpHandler._cache.newStateReference()
+        mpHandler._cache.pushByStateRef(stateReference, msgID=1)
+        self.assertTrue(mpHandler.expirationsArePending())
+
+        self.transportDispatcher._cbFun(self.transport, ('127.0.0.1', 161), b'junk')
+        self.tick()
+        self.assertNotEqual(self.transportDispatcher.getNextCallTime(), None)
+
+        mpHandler._cache.popByStateRef(stateReference)
+        self.assertFalse(mpHandler.expirationsArePending())
+
+        self.tick()
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), None)
+
+
+class RequestTimeoutTestCase(unittest.TestCase):
+    def setUp(self):
+        # peer never responding
+        self.peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.peer.bind(('127.0.0.1', 0))
+
+        self.snmpEngine = engine.SnmpEngine()
+        self.snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+        # retries do not depend on timer resolution
+        self.snmpEngine.transportDispatcher.setTimerResolution(10)
+        config.addTransport(self.snmpEngine, udp.domainName,
+                            udp.UdpTransport().openClientMode())
+        config.addV1System(self.snmpEngine, 'my-area', 'public')
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+        # timeout of 0.05 seconds, well below timer resolution
+        config.addTargetAddr(self.snmpEngine, 'my-agent', udp.domainName,
+                             self.peer.getsockname(), 'my-creds',
+                             timeout=5, retryCount=1, tagList='my-tag')
+
+        self.errors = []
+
+    def tearDown(self):
+        self.snmpEngine.transportDispatcher.closeDispatcher()
+        self.peer.close()
+
+    def assertTimedOut(self, timeNow):
+        elapsed = time.time() - timeNow
+
+        self.assertEqual(self.errors, [errind.requestTimedOut])
+        self.assertTrue(0.1 <= elapsed < 0.3, elapsed)
+
+    def testCommandGenerator(self):
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBinds, cbCtx):
+            self.errors.append(errorIndication)
+
+        timeNow = time.time()
+
+        cmdgen.GetCommandGenerator().sendVarBinds(
+            self.snmpEngine, 'my-agent', None, '',
+            [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)], cbFun
+        )
+
+        self.snmpEngine.transportDispatcher.runDispatcher()
+
+        self.assertTimedOut(timeNow)
+
+    def testNotificationOriginator(self):
+        config.addNotificationTarget(self.snmpEngine, 'my-notification', 'my-creds', 'my-tag', 'inform')
+        config.addContext(self.snmpEngine, '')
+        config.addVacmUser(self.snmpEngine, 2, 'my-area', 'noAuthNoPriv', (), (), (1, 3, 6))
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBinds, cbCtx):
+            self.errors.append(errorIndication)
+
+        timeNow = time.time()
+
+        ntforg.NotificationOriginator().sendVarBinds(
+            self.snmpEngine, 'my-notification', None, '',
+            [((1, 3, 6, 1, 6, 3, 1, 1, 4, 1, 0), v2c.ObjectIdentifier((1, 3, 6, 1, 6, 3, 1, 1, 5, 1)))], cbFun
+        )
+
+        self.snmpEngine.transportDispatcher.runDispatcher()
+
+        self.assertTimedOut(timeNow)
+
+
+if __name__ == '__main__':
+    unittest.main()
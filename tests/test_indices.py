@@ -0,0 +1,96 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import random
+import unittest
+from pysnmp.smi.indices import OrderedDict, OidOrderedDict
+
+
+class OrderedDictTestCase(unittest.TestCase):
+    def testSortedOnInsertion(self):
+        d = OrderedDict()
+        for k in 'c', 'a', 'b':
+            d[k] = k.upper()
+        self.assertEqual(d.keys(), ['a', 'b', 'c'])
+        self.assertEqual(d.values(), ['A', 'B', 'C'])
+        self.assertEqual(d.items(), [('a', 'A'), ('b', 'B'), ('c', 'C')])
+
+    def testNextKey(self):
+        d = OrderedDict(a=1, c=3)
+        self.assertEqual(d.firstKey(), 'a')
+        self.assertEqual(d.nextKey('a'), 'c')
+        self.assertEqual(d.nextKey('b'), 'c')  # absent key
+        self.assertRaises(KeyError, d.nextKey, 'c')
+        self.assertRaises(KeyError, OrderedDict().firstKey)
+
+    def testGetSortingKeyOverride(self):
+        class ReversedDict(OrderedDict):
+            def getSortingKey(self, key):
+                return -int(key)
+
+        d = ReversedDict()
+        for k in '1', '3', '2':
+            d[k] = None
+        self.assertEqual(d.keys(), ['3', '2', '1'])
+        self.assertEqual(d.nextKey('3'), '2')
+
+
+class OidOrderedDictTestCase(unittest.TestCase):
+    def testRandomized(self):
+        rnd = random.Random(1)
+        d = OidOrderedDict()
+        reference = {}
+        for _ in range(2000):
+            key = tuple([rnd.randint(0, 5) for _ in range(rnd.randint(1, 5))])
+            if key in reference and rnd.random() < 0.5:
+                del d[key]
+                del reference[key]
+            else:
+                d[key] = reference[key] = rnd.random()
+
+            keys = sorted(reference)
+            self.assertEqual(d.keys(), keys)
+            self.assertEqual(d.getKeysLens(), tuple(sorted(set([len(k) for k in keys]), reverse=True)))
+
+            probe = tuple([rnd.randint(0, 5) for _ in range(rnd.randint(1, 5))])
+            following = [k for k in keys if k > probe]
+            if following:
+                self.assertEqual(d.nextKey(probe), following[0])
+            else:
+                self.assertRaises(KeyError, d.nextKey, probe)
+
+    def testBulkUpdate(self):
+        rnd = random.Random(1)
+        d = OidOrderedDict()
+        reference = {}
+        for _ in range(20):
+            update = {}
+            for _ in range(rnd.randint(0, 100)):
+                key = tuple([rnd.randint(0, 5) for _ in range(rnd.randint(1, 5))])
+                update[key] = rnd.random()
+            d.update(update)
+            reference.update(update)
+
+            keys = sorted(reference)
+            self.assertEqual(d.keys(), keys)
+            self.assertEqual(d.values(), [reference[k] for k in keys])
+            self.assertEqual(d.getKeysLens(), tuple(sorted(set([len(k) for k in keys]), reverse=True)))
+            if len(keys) > 1:
+                self.assertEqual(d.nextKey(keys[0]), keys[1])
+
+            for key in keys[:5]:
+                del d[key]
+                del reference[key]
+
+    def testDottedKeys(self):
+        d = OidOrderedDict()
+        d['1.3.6.10'] = 1
+        d['1.3.6.9'] = 2
+        self.assertEqual(d.keys(), ['1.3.6.9', '1.3.6.10'])
+
+
+if __name__ == '__main__':
+    unittest.main()
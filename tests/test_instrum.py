@@ -0,0 +1,245 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.smi import builder, instrum, error
+from pysnmp.proto import rfc1905
+
+modName = '__TEST-MIB'
+tableOid = (1, 3, 6, 1, 4, 1, 20408, 999, 1)
+
+
+class BaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.mibBuilder = builder.MibBuilder()
+        self.mibBuilder.loadModules('SNMPv2-MIB')
+
+        (MibTable, MibTableRow, MibTableColumn,
+         self.MibScalarInstance, self.Integer32) = self.mibBuilder.importSymbols(
+            'SNMPv2-SMI', 'MibTable', 'MibTableRow', 'MibTableColumn',
+            'MibScalarInstance', 'Integer32'
+        )
+
+        self.mibBuilder.exportSymbols(
+            modName,
+            testTable=MibTable(tableOid),
+            testEntry=MibTableRow(tableOid + (1,)).setIndexNames(
+                (0, modName, 'testColumn1')
+            ),
+            testColumn1=MibTableColumn(tableOid + (1, 1), self.Integer32()),
+            testColumn2=MibTableColumn(tableOid + (1, 2), self.Integer32())
+        )
+
+    def exportRows(self, rows, offset=0, modName=modName):
+        instances = {}
+        for row in rows:
+            for column in 1, 2:
+                instances['testInstance%d.%d' % (column, row)] = self.MibScalarInstance(
+                    tableOid + (1, column), (row,), self.Integer32(row + offset)
+                )
+        self.mibBuilder.exportSymbols(modName, **instances)
+
+    def unexportRows(self, rows, modName=modName):
+        self.mibBuilder.unexportSymbols(
+            modName, *['testInstance%d.%d' % (column, row)
+                       for row in rows for column in (1, 2)]
+        )
+
+
+class IndexMibTestCase(BaseTestCase):
+    @staticmethod
+    def dumpTree(mibNode):
+        tree = {}
+        for name, subNode in mibNode._vars.items():
+            if hasattr(subNode, '_vars'):
+                tree[name] = subNode, subNode._vars.keys(), IndexMibTestCase.dumpTree(subNode)
+            else:
+                tree[name] = subNode
+        return tree
+
+    @staticmethod
+    def clearTree(mibNode):
+        for subNode in mibNode._vars.values():
+            if hasattr(subNode, '_vars'):
+                IndexMibTestCase.clearTree(subNode)
+        mibNode.unregisterSubtrees(*mibNode._vars.keys())
+
+    def assertSameAsFirstBuild(self, mibInstrumController):
+        mibInstrumController.readVars([((1, 3, 6, 1, 2, 1, 1, 1, 0), None)])
+
+        iso, = self.mibBuilder.importSymbols('SNMPv2-SMI', 'iso')
+        tree = self.dumpTree(iso)
+        lastBuildSyms = mibInstrumController.lastBuildSyms
+
+        self.clearTree(iso)
+
+        mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+        mibInstrumController.readVars([((1, 3, 6, 1, 2, 1, 1, 1, 0), None)])
+
+        self.assertEqual(tree, self.dumpTree(iso))
+        self.assertEqual(lastBuildSyms, mibInstrumController.lastBuildSyms)
+
+    def readColumn(self, mibInstrumController, column):
+        oid = tableOid + (1, column)
+        values = []
+        while True:
+            (oid, value), = mibInstrumController.readNextVars([(oid, None)])
+            if (value.isSameTypeWith(rfc1905.endOfMibView) or
+                    oid[:len(tableOid) + 2] != tableOid + (1, column)):
+                return values
+            values.append((oid[-1], int(value)))
+
+    def testChurn(self):
+        mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+
+        self.exportRows(range(1, 11))
+        self.assertEqual(self.readColumn(mibInstrumController, 2),
+                         [(x, x) for x in range(1, 11)])
+
+        for cycle in range(3):
+            self.unexportRows(range(cycle * 5 + 1, cycle * 5 + 6))
+            self.exportRows(range(cycle * 5 + 11, cycle * 5 + 16))
+            self.assertEqual(self.readColumn(mibInstrumController, 1),
+                             [(x, x) for x in range(cycle * 5 + 6, cycle * 5 + 16)])
+
+        self.assertSameAsFirstBuild(mibInstrumController)
+
+    def testOverride(self):
+        self.exportRows(range(1, 4))
+
+        mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+        self.assertEqual(self.readColumn(mibInstrumController, 1),
+                         [(1, 1), (2, 2), (3, 3)])
+
+        # instances of a module of lesser name take precedence
+        self.exportRows([2], offset=100, modName='__A-TEST-MIB')
+        self.assertEqual(self.readColumn(mibInstrumController, 1),
+                         [(1, 1), (2, 102), (3, 3)])
+        self.assertSameAsFirstBuild(mibInstrumController)
+
+        self.unexportRows([2], modName='__A-TEST-MIB')
+        self.assertEqual(self.readColumn(mibInstrumController, 1),
+                         [(1, 1), (2, 2), (3, 3)])
+        self.assertSameAsFirstBuild(mibInstrumController)
+
+    def testReplaceColumn(self):
+        self.exportRows(range(1, 4))
+
+        mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+        self.assertEqual(self.readColumn(mibInstrumController, 2),
+                         [(1, 1), (2, 2), (3, 3)])
+
+        # instances follow their column to its replacement
+        MibTableColumn, = self.mibBuilder.importSymbols('SNMPv2-SMI', 'MibTableColumn')
+        self.mibBuilder.exportSymbols(
+            '__A-TEST-MIB', testColumn2=MibTableColumn(tableOid + (1, 2), self.Integer32())
+        )
+        self.assertEqual(self.readColumn(mibInstrumController, 2),
+                         [(1, 1), (2, 2), (3, 3)])
+        self.assertSameAsFirstBuild(mibInstrumController)
+
+    def testFirstBuildWithOverrides(self):
+        self.exportRows(range(1, 4))
+        self.exportRows([2], offset=100, modName='__A-TEST-MIB')
+
+        mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+        self.assertEqual(self.readColumn(mibInstrumController, 1),
+                         [(1, 1), (2, 102), (3, 3)])
+
+        self.unexportRows([2], modName='__A-TEST-MIB')
+        self.assertEqual(self.readColumn(mibInstrumController, 1),
+                         [(1, 1), (2, 2), (3, 3)])
+
+    def testOrphanInstance(self):
+        self.mibBuilder.exportSymbols(
+            modName, testOrphan=self.MibScalarInstance(
+                tableOid + (1, 3), (1,), self.Integer32(1)
+            )
+        )
+
+        mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+        self.assertRaises(error.SmiError, mibInstrumController.readVars,
+                          [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)])
+
+
+class IterNextVarsTestCase(BaseTestCase):
+    def setUp(self):
+        BaseTestCase.setUp(self)
+        self.exportRows(range(1, 6))
+        self.mibInstrumController = instrum.MibInstrumController(self.mibBuilder)
+
+    def readNextVars(self, varBinds, count):
+        results = []
+        for _ in range(count):
+            varBinds = self.mibInstrumController.readNextVars(varBinds)
+            results.append(varBinds)
+        return results
+
+    def iterNextVars(self, varBinds, count):
+        results = []
+        for varBinds in self.mibInstrumController.iterNextVars(varBinds):
+            results.append(varBinds)
+            if len(results) == count:
+                return results
+
+    def testSameAsReadNextVars(self):
+        # columns run into each other and out of the table
+        for varBinds in ([(tableOid + (1, 1), None), (tableOid + (1, 2, 3), None)],
+                         [((1, 3, 6, 1, 2, 1, 1), None)]):
+            self.assertEqual(self.iterNextVars(varBinds, 15),
+                             self.readNextVars(varBinds, 15))
+
+    def testEndOfMib(self):
+        varBinds = self.iterNextVars(
+            [(tableOid + (1, 2, 4), None), ((1, 3, 6, 1, 2, 1, 1), None)], 3
+        )
+
+        self.assertEqual([x[0][0] for x in varBinds], [tableOid + (1, 2, 5)] * 3)
+        self.assertTrue(varBinds[1][0][1].isSameTypeWith(rfc1905.endOfMibView))
+        self.assertTrue(varBinds[2][0][1].isSameTypeWith(rfc1905.endOfMibView))
+
+    def testTableChange(self):
+        nextVars = self.mibInstrumController.iterNextVars([(tableOid + (1, 1), None)])
+
+        self.assertEqual(int(next(nextVars)[0][1]), 1)
+
+        # instances removed between repetitions are not returned
+        self.unexportRows([2, 3])
+        self.assertEqual(int(next(nextVars)[0][1]), 4)
+
+
+class RegisterSubtreesTestCase(unittest.TestCase):
+    def setUp(self):
+        mibBuilder = builder.MibBuilder()
+        self.MibTree, self.MibScalar = mibBuilder.importSymbols(
+            'SNMPv2-SMI', 'MibTree', 'MibScalar'
+        )
+        self.mibTree = self.MibTree((1, 3, 6, 1, 4, 1, 20408, 999))
+
+    def testRegister(self):
+        scalars = [self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, x)) for x in (3, 1, 2)]
+        self.mibTree.registerSubtrees(*scalars)
+        self.assertEqual(self.mibTree._vars.keys(),
+                         [(1, 3, 6, 1, 4, 1, 20408, 999, x) for x in (1, 2, 3)])
+
+    def testAlreadyRegistered(self):
+        scalar = self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 1))
+        self.mibTree.registerSubtrees(scalar)
+        self.assertRaises(error.SmiError, self.mibTree.registerSubtrees,
+                          self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 2)),
+                          self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 1)))
+        self.assertEqual(self.mibTree._vars.keys(), [scalar.name])
+
+    def testDuplicates(self):
+        for scalars in ((self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 1)),
+                         self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 1))),
+                        (self.MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 1)),) * 2):
+            self.assertRaises(error.SmiError, self.mibTree.registerSubtrees, *scalars)
+            self.assertFalse(self.mibTree._vars)
+
+
+if __name__ == '__main__':
+    unittest.main()
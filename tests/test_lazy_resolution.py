@@ -0,0 +1,133 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.entity import engine
+from pysnmp.hlapi.varbinds import CommandGeneratorVarBinds
+from pysnmp.smi import builder, view, error
+from pysnmp.smi.rfc1902 import ObjectIdentity, ObjectType
+from pysnmp.proto import rfc1902
+
+
+class BaseTestCase(unittest.TestCase):
+    varBinds = [('1.3.6.1.2.1.1.1.0', rfc1902.OctetString('Linux host')),
+                ('1.3.6.1.2.1.1.3.0', rfc1902.TimeTicks(12345)),
+                ('1.3.6.1.2.1.1.9.1.2.7', rfc1902.ObjectIdentifier('1.3.6.1.6.3.1')),
+                ('1.3.6.1.6.3.15.1.2.2.1.3.5.128.0.79.184.5.1.65', rfc1902.OctetString('A')),
+                ('1.3.6.1.6.3.15.1.2.2.1.3.65.66.67', rfc1902.OctetString('B'))]
+
+    def setUp(self):
+        self.mibBuilder = builder.MibBuilder()
+        self.mibBuilder.loadModules('SNMPv2-MIB', 'SNMP-USER-BASED-SM-MIB')
+        self.mibViewController = view.MibViewController(self.mibBuilder)
+
+    def assertNotIndexed(self):
+        self.assertEqual(self.mibViewController.lastBuildId, -1)
+
+
+class LazyObjectIdentityTestCase(BaseTestCase):
+    def testOidOperations(self):
+        objectIdentity = ObjectIdentity(rfc1902.ObjectName('1.3.6.1.2.1.1.1.0'))
+        objectIdentity.resolveWithMib(self.mibViewController, lazy=True)
+
+        self.assertEqual(str(objectIdentity), '1.3.6.1.2.1.1.1.0')
+        self.assertEqual(objectIdentity.asTuple(), (1, 3, 6, 1, 2, 1, 1, 1, 0))
+        self.assertEqual(objectIdentity, rfc1902.ObjectName('1.3.6.1.2.1.1.1.0'))
+        self.assertTrue(objectIdentity < rfc1902.ObjectName('1.3.6.1.2.1.1.2.0'))
+        self.assertTrue(ObjectIdentity('1.3.6.1.2.1.1').resolveWithMib(
+            self.mibViewController, lazy=True).isPrefixOf(objectIdentity))
+
+        self.assertNotIndexed()
+
+    def testSameAsEager(self):
+        for oid, _ in self.varBinds:
+            objectIdentity = ObjectIdentity(oid).resolveWithMib(self.mibViewController)
+
+            lazyObjectIdentity = ObjectIdentity(oid).resolveWithMib(self.mibViewController, lazy=True)
+            self.assertEqual(lazyObjectIdentity.prettyPrint(), objectIdentity.prettyPrint())
+            self.assertEqual(lazyObjectIdentity.getOid(), objectIdentity.getOid())
+
+            lazyObjectIdentity = ObjectIdentity(oid).resolveWithMib(self.mibViewController, lazy=True)
+            self.assertEqual(lazyObjectIdentity.getMibSymbol(), objectIdentity.getMibSymbol())
+
+            lazyObjectIdentity = ObjectIdentity(oid).resolveWithMib(self.mibViewController, lazy=True)
+            self.assertEqual(lazyObjectIdentity.getLabel(), objectIdentity.getLabel())
+
+            lazyObjectIdentity = ObjectIdentity(oid).resolveWithMib(self.mibViewController, lazy=True)
+            self.assertIs(lazyObjectIdentity.getMibNode(), objectIdentity.getMibNode())
+
+    def testMibSymbol(self):
+        # MIB symbols can not be resolved lazily
+        objectIdentity = ObjectIdentity('SNMPv2-MIB', 'sysDescr', 0)
+        objectIdentity.resolveWithMib(self.mibViewController, lazy=True)
+
+        self.assertEqual(objectIdentity.getOid(), (1, 3, 6, 1, 2, 1, 1, 1, 0))
+
+    def testFailedResolution(self):
+        objectIdentity = ObjectIdentity('3.1.2')
+        objectIdentity.resolveWithMib(self.mibViewController, lazy=True)
+
+        self.assertRaises(error.SmiError, objectIdentity.prettyPrint)
+
+        # remains lazy
+        self.assertEqual(str(objectIdentity), '3.1.2')
+        self.assertRaises(error.SmiError, objectIdentity.getMibSymbol)
+
+        MibIdentifier, = self.mibBuilder.importSymbols('SNMPv2-SMI', 'MibIdentifier')
+        self.mibBuilder.exportSymbols('TEST-MIB', testRoot=MibIdentifier((3, 1)))
+
+        self.assertEqual(objectIdentity.prettyPrint(), 'TEST-MIB::testRoot.2')
+
+
+class LazyObjectTypeTestCase(BaseTestCase):
+    def testRawValue(self):
+        objectType = ObjectType(ObjectIdentity(rfc1902.ObjectName('1.3.6.1.2.1.1.1.0')),
+                                rfc1902.OctetString('Linux host'))
+        objectType.resolveWithMib(self.mibViewController, lazy=True)
+
+        self.assertEqual(objectType[0], rfc1902.ObjectName('1.3.6.1.2.1.1.1.0'))
+        self.assertIs(objectType[1].__class__, rfc1902.OctetString)
+
+        self.assertNotIndexed()
+
+    def testSameAsEager(self):
+        for oid, value in self.varBinds:
+            objectType = ObjectType(ObjectIdentity(oid), value).resolveWithMib(self.mibViewController)
+
+            lazyObjectType = ObjectType(ObjectIdentity(oid), value).resolveWithMib(self.mibViewController, lazy=True)
+            self.assertEqual(lazyObjectType.prettyPrint(), objectType.prettyPrint())
+
+            # value cast into MIB type
+            self.assertIs(lazyObjectType[1].__class__, objectType[1].__class__)
+
+    def testFailedResolution(self):
+        # sysUpTime value is not TimeTicks
+        objectType = ObjectType(ObjectIdentity('1.3.6.1.2.1.1.3.0'), rfc1902.OctetString('Linux host'))
+        objectType.resolveWithMib(self.mibViewController, lazy=True)
+
+        for _ in range(2):
+            self.assertRaises(error.SmiError, objectType.prettyPrint)
+
+            # remains lazy
+            self.assertEqual(objectType[0], rfc1902.ObjectName('1.3.6.1.2.1.1.3.0'))
+            self.assertEqual(objectType[1], rfc1902.OctetString('Linux host'))
+
+
+class UnmakeVarBindsTestCase(unittest.TestCase):
+    def testLazy(self):
+        snmpEngine = engine.SnmpEngine()
+        varBinds = [(rfc1902.ObjectName(oid), value) for oid, value in BaseTestCase.varBinds]
+
+        vbProcessor = CommandGeneratorVarBinds()
+
+        self.assertEqual(
+            [x.prettyPrint() for x in vbProcessor.unmakeVarBinds(snmpEngine, varBinds, 'lazy')],
+            [x.prettyPrint() for x in vbProcessor.unmakeVarBinds(snmpEngine, varBinds)]
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413.config import getTargetAddr, getTargetParams, \
+    getTargetInfo, getNotificationInfo, getTargetNames
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.smi.error import SmiError
+
+
+class BaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+        config.addTransport(self.snmpEngine, udp.domainName,
+                            udp.UdpTransport().openClientMode())
+        config.addV1System(self.snmpEngine, 'my-area', 'public')
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+
+        self.mibInstrumController = self.snmpEngine.msgAndPduDsp.mibInstrumController
+
+        self.snmpTargetAddrEntry, = self.mibInstrumController.mibBuilder.importSymbols(
+            'SNMP-TARGET-MIB', 'snmpTargetAddrEntry'
+        )
+
+    def tearDown(self):
+        self.snmpEngine.transportDispatcher.closeDispatcher()
+
+    def addTarget(self, name, port, tagList=''):
+        config.addTargetAddr(self.snmpEngine, name, udp.domainName,
+                             ('127.0.0.1', port), 'my-creds', tagList=tagList)
+
+    def setTagList(self, name, tagList):
+        # snmpTargetAddrTagList
+        self.mibInstrumController.writeVars(
+            ((self.snmpTargetAddrEntry.name + (6,) + self.snmpTargetAddrEntry.getInstIdFromIndices(name),
+              tagList),)
+        )
+
+
+class TargetAddrTestCase(BaseTestCase):
+    def testAddDel(self):
+        self.addTarget('target-a', 161)
+
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-a')[1], ('127.0.0.1', 161))
+
+        config.delTargetAddr(self.snmpEngine, 'target-a')
+
+        self.assertRaises(SmiError, getTargetAddr, self.snmpEngine, 'target-a')
+
+        self.addTarget('target-a', 1161)
+
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-a')[1], ('127.0.0.1', 1161))
+
+    def testUnchangedRowsKept(self):
+        self.addTarget('target-a', 161)
+        self.addTarget('target-b', 162)
+
+        targetA = getTargetAddr(self.snmpEngine, 'target-a')
+        targetB = getTargetAddr(self.snmpEngine, 'target-b')
+
+        self.addTarget('target-b', 1162)
+
+        self.assertIs(getTargetAddr(self.snmpEngine, 'target-a'), targetA)
+        self.assertIsNot(getTargetAddr(self.snmpEngine, 'target-b'), targetB)
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-b')[1], ('127.0.0.1', 1162))
+
+    def testSourceAddress(self):
+        SnmpUDPAddress, = self.mibInstrumController.mibBuilder.importSymbols('SNMPv2-TM', 'SnmpUDPAddress')
+
+        self.addTarget('target-a', 161)
+
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-a')[1].getLocalAddress(),
+                         SnmpUDPAddress(('0.0.0.0', 0)))
+
+        config.addTargetAddr(self.snmpEngine, 'target-a', udp.domainName,
+                             ('127.0.0.1', 161), 'my-creds',
+                             sourceAddress=('127.0.0.1', 1024))
+
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-a')[1].getLocalAddress(),
+                         SnmpUDPAddress(('127.0.0.1', 1024)))
+
+    def testForgottenChanges(self):
+        self.addTarget('target-a', 161)
+        self.addTarget('target-b', 162)
+
+        getTargetAddr(self.snmpEngine, 'target-a')
+
+        # the log can't cover all the changes since last lookup
+        self.snmpTargetAddrEntry.changeLogSize = 2
+
+        self.addTarget('target-a', 1161)
+        self.addTarget('target-b', 1162)
+
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-a')[1], ('127.0.0.1', 1161))
+        self.assertEqual(getTargetAddr(self.snmpEngine, 'target-b')[1], ('127.0.0.1', 1162))
+
+
+class TargetParamsTestCase(BaseTestCase):
+    def testTargetInfo(self):
+        self.addTarget('target-a', 161)
+
+        self.assertEqual(getTargetInfo(self.snmpEngine, 'target-a')[4:], (1, 2, b'my-area', 1))
+
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 2)
+
+        self.assertEqual(getTargetParams(self.snmpEngine, 'my-creds')[0], 2)
+        self.assertEqual(getTargetInfo(self.snmpEngine, 'target-a')[4], 2)
+
+        config.delTargetParams(self.snmpEngine, 'my-creds')
+
+        self.assertRaises(SmiError, getTargetInfo, self.snmpEngine, 'target-a')
+
+
+class NotificationInfoTestCase(BaseTestCase):
+    def testAddDel(self):
+        config.addNotificationTarget(self.snmpEngine, 'my-notification', 'my-creds', 'my-tag', 'trap')
+
+        self.assertEqual(getNotificationInfo(self.snmpEngine, 'my-notification'), (b'my-tag', 1))
+
+        config.addNotificationTarget(self.snmpEngine, 'my-notification', 'my-creds', 'my-tag', 'inform')
+
+        self.assertEqual(getNotificationInfo(self.snmpEngine, 'my-notification'), (b'my-tag', 2))
+
+        config.delNotificationTarget(self.snmpEngine, 'my-notification', 'my-creds')
+
+        self.assertRaises(SmiError, getNotificationInfo, self.snmpEngine, 'my-notification')
+
+
+class TargetNamesTestCase(BaseTestCase):
+    def setUp(self):
+        BaseTestCase.setUp(self)
+
+        self.addTarget('target-c', 163, 'all odd')
+        self.addTarget('target-a', 161, 'all odd')
+        self.addTarget('target-b', 162, 'all even all')
+
+    def testTableOrder(self):
+        self.assertEqual(getTargetNames(self.snmpEngine, b'all'), [b'target-a', b'target-b', b'target-c'])
+        self.assertEqual(getTargetNames(self.snmpEngine, b'odd'), [b'target-a', b'target-c'])
+        self.assertEqual(getTargetNames(self.snmpEngine, b'even'), [b'target-b'])
+
+        self.assertRaises(SmiError, getTargetNames, self.snmpEngine, b'none')
+
+    def testAddDel(self):
+        getTargetNames(self.snmpEngine, b'all')
+
+        config.delTargetAddr(self.snmpEngine, 'target-b')
+
+        self.assertEqual(getTargetNames(self.snmpEngine, b'all'), [b'target-a', b'target-c'])
+        self.assertRaises(SmiError, getTargetNames, self.snmpEngine, b'even')
+
+        self.addTarget('target-d', 164, 'all even')
+        self.addTarget('target-b', 162, 'even')
+
+        self.assertEqual(getTargetNames(self.snmpEngine, b'all'), [b'target-a', b'target-c', b'target-d'])
+        self.assertEqual(getTargetNames(self.snmpEngine, b'even'), [b'target-b', b'target-d'])
+
+    def testSnmpSet(self):
+        getTargetNames(self.snmpEngine, b'all')
+
+        self.setTagList('target-c', 'even')
+
+        self.assertEqual(getTargetNames(self.snmpEngine, b'all'), [b'target-a', b'target-b'])
+        self.assertEqual(getTargetNames(self.snmpEngine, b'odd'), [b'target-a'])
+        self.assertEqual(getTargetNames(self.snmpEngine, b'even'), [b'target-b', b'target-c'])
+
+    def testForgottenChanges(self):
+        getTargetNames(self.snmpEngine, b'all')
+
+        # the log can't cover all the changes since last lookup
+        self.snmpTargetAddrEntry.changeLogSize = 2
+
+        self.setTagList('target-a', 'even')
+        self.setTagList('target-b', 'odd')
+        self.setTagList('target-c', 'odd')
+
+        self.assertRaises(SmiError, getTargetNames, self.snmpEngine, b'all')
+        self.assertEqual(getTargetNames(self.snmpEngine, b'odd'), [b'target-b', b'target-c'])
+        self.assertEqual(getTargetNames(self.snmpEngine, b'even'), [b'target-a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
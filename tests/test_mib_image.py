@@ -0,0 +1,99 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import os
+import imp
+import marshal
+import shutil
+import tempfile
+import unittest
+from pysnmp.smi import builder
+
+
+class MibImageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.mkdtemp()
+        self.mibImagePath = os.path.join(self.tmpDir, 'mib.image')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpDir)
+
+    def loadModules(self):
+        mibBuilder = builder.MibBuilder().setMibImage(self.mibImagePath)
+        mibBuilder.loadModules('SNMPv2-MIB')
+        sysDescr, = mibBuilder.importSymbols('SNMPv2-MIB', 'sysDescr')
+        self.assertEqual(sysDescr.name, (1, 3, 6, 1, 2, 1, 1, 1))
+        return mibBuilder
+
+    def readImage(self):
+        fp = open(self.mibImagePath, 'rb')
+        try:
+            return fp.read()
+        finally:
+            fp.close()
+
+    def writeImage(self, data):
+        fp = open(self.mibImagePath, 'wb')
+        try:
+            fp.write(data)
+        finally:
+            fp.close()
+
+    def testImageReused(self):
+        self.loadModules()
+        image = self.readImage()
+        self.assertTrue(image.startswith(imp.get_magic()))
+
+        mtime = os.stat(self.mibImagePath).st_mtime
+        os.utime(self.mibImagePath, (mtime - 10, mtime - 10))
+
+        self.loadModules()
+        self.assertEqual(os.stat(self.mibImagePath).st_mtime, mtime - 10)
+        self.assertEqual(self.readImage(), image)
+
+    @staticmethod
+    def getHeader(image):
+        # Python magic is followed by pysnmp version line
+        return image[:image.index(b'\n', len(imp.get_magic())) + 1]
+
+    def assertImageReplaced(self, data):
+        self.writeImage(data)
+        self.loadModules()
+        image = self.readImage()
+        self.assertNotEqual(image, data)
+        self.assertTrue(image.startswith(imp.get_magic()))
+
+    def testOtherVersion(self):
+        self.loadModules()
+        image = self.readImage()
+        self.assertImageReplaced(image.replace(b'pysnmp ', b'pysnmp 0'))
+
+    def testOtherPython(self):
+        self.loadModules()
+        image = self.readImage()
+        self.assertImageReplaced(b'\x00\x00\x00\x00' + image[4:])
+
+    def testGarbage(self):
+        self.assertImageReplaced(b'garbage')
+
+    def testNotDict(self):
+        self.loadModules()
+        image = self.readImage()
+        header = self.getHeader(image)
+        self.assertImageReplaced(header + marshal.dumps(['not', 'a', 'dict']))
+
+    def testMalformedEntries(self):
+        self.loadModules()
+        image = self.readImage()
+        header = self.getHeader(image)
+        mibImage = marshal.loads(image[len(header):])
+        for modPath in mibImage:
+            mibImage[modPath] = 'garbage'
+        self.assertImageReplaced(header + marshal.dumps(mibImage))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.smi import builder, view, rfc1902, error
+from pysnmp.smi.indices import OrderedDict
+from pysnmp.proto.rfc1902 import ObjectName
+
+
+class GetNodeByOidTestCase(unittest.TestCase):
+    def setUp(self):
+        self.mibBuilder = builder.MibBuilder()
+        self.mibBuilder.loadModules('SNMPv2-MIB', 'SNMP-USER-BASED-SM-MIB')
+        self.mibViewController = view.MibViewController(self.mibBuilder)
+
+    def testSuffixType(self):
+        oid = ObjectName('1.3.6.1.6.3.15.1.2.2.1.3.5.128.0.79.184.5.1.65')
+        for _ in range(2):  # resolved, then cached
+            modName, symName, label, suffix, mibNode, indexDecoder = self.mibViewController.getNodeByOid(oid)
+            self.assertEqual((modName, symName), ('SNMP-USER-BASED-SM-MIB', 'usmUserSecurityName'))
+            self.assertIsInstance(suffix, ObjectName)
+            self.assertEqual(suffix, ObjectName('5.128.0.79.184.5.1.65'))
+            self.assertEqual(indexDecoder(suffix)[1].prettyPrint(), 'A')
+
+    def testMalformedIndex(self):
+        for _ in range(2):  # resolved, then cached
+            objectIdentity = rfc1902.ObjectIdentity('1.3.6.1.6.3.15.1.2.2.1.3.65.66.67')
+            objectIdentity.resolveWithMib(self.mibViewController)
+            self.assertEqual(objectIdentity.prettyPrint(),
+                             'SNMP-USER-BASED-SM-MIB::usmUserSecurityName.65.66.67')
+
+    def assertSameAsUncached(self, oid):
+        prefix, label, suffix = self.mibViewController.getNodeNameByOid(oid)
+        modName, symName, _ = self.mibViewController.getNodeLocation(prefix)
+
+        for _ in range(2):  # resolved, then cached
+            node = self.mibViewController.getNodeByOid(oid)
+            self.assertEqual(node[:4], (modName, symName, label, suffix))
+            self.assertIs(node[4], self.mibBuilder.importSymbols(modName, symName)[0])
+
+    def testSameAsUncached(self):
+        for oid in ((1, 3, 6, 1, 2, 1, 1, 1, 0),  # scalar
+                    (1, 3, 6, 1, 2, 1, 1, 1, 0, 1, 2),  # past scalar instance
+                    (1, 3, 6, 1, 2, 1, 1, 9, 1, 2, 7),  # table column
+                    (1, 3, 6, 1, 2, 1, 1, 9, 1, 7),  # past table columns
+                    (1, 3, 6, 1, 2, 1, 1, 9, 1),  # table row
+                    (1, 3, 6, 1, 2, 1, 1),  # subtree
+                    (1, 3, 6, 1, 2, 1, 1, 99, 0),  # unknown object in subtree
+                    (1, 3, 6, 1, 6, 3, 15, 1, 2, 2, 1, 3, 5, 128, 0, 79, 184, 5, 1, 65)):
+            self.assertSameAsUncached(oid)
+
+    def testTableColumn(self):
+        node = self.mibViewController.getNodeByOid((1, 3, 6, 1, 2, 1, 1, 9, 1, 2, 7))
+        self.assertEqual(node[3], ObjectName((7,)))
+        self.assertEqual(node[5](node[3]), (7,))
+
+        node = self.mibViewController.getNodeByOid((1, 3, 6, 1, 2, 1, 1, 1, 0))
+        self.assertIs(node[5], None)
+
+    def testMibChange(self):
+        self.assertEqual(self.mibViewController.getNodeByOid((1, 3, 6, 1, 2, 1, 1, 1, 0, 1))[:2],
+                         ('SNMPv2-MIB', 'sysDescr'))
+
+        # new MIB node deeper than a cached one
+        MibScalar, Integer32 = self.mibBuilder.importSymbols('SNMPv2-SMI', 'MibScalar', 'Integer32')
+        self.mibBuilder.exportSymbols('DEEPER-MIB', deeper=MibScalar((1, 3, 6, 1, 2, 1, 1, 1, 0), Integer32()))
+
+        self.assertSameAsUncached((1, 3, 6, 1, 2, 1, 1, 1, 0, 1))
+        self.assertEqual(self.mibViewController.getNodeByOid((1, 3, 6, 1, 2, 1, 1, 1, 0, 1))[:2],
+                         ('DEEPER-MIB', 'deeper'))
+
+        # cached MIB node gone
+        self.mibBuilder.unexportSymbols('DEEPER-MIB', 'deeper')
+
+        self.assertSameAsUncached((1, 3, 6, 1, 2, 1, 1, 1, 0, 1))
+        self.assertEqual(self.mibViewController.getNodeByOid((1, 3, 6, 1, 2, 1, 1, 1, 0, 1))[:2],
+                         ('SNMPv2-MIB', 'sysDescr'))
+
+    def testNoSuchObject(self):
+        for _ in range(2):
+            self.assertRaises(error.NoSuchObjectError,
+                              self.mibViewController.getNodeByOid, (5, 1))
+
+    def testCacheSize(self):
+        mibViewController = view.MibViewController(self.mibBuilder, nodeCacheSize=4)
+
+        for column in range(1, 12):
+            oid = (1, 3, 6, 1, 6, 3, 15, 1, 2, 2, 1, column, 1, 65, 1, 66)
+            self.assertEqual(mibViewController.getNodeByOid(oid)[3], ObjectName((1, 65, 1, 66)))
+
+        self.assertTrue(len(mibViewController._MibViewController__nodeCache) <= 4)
+
+
+class IndexMibTestCase(unittest.TestCase):
+    modNames = ('SNMPv2-MIB', 'RFC1158-MIB', 'RFC1213-MIB',
+                'SNMP-FRAMEWORK-MIB', 'SNMP-USER-BASED-SM-MIB')
+
+    @staticmethod
+    def dumpIndices(mibViewController):
+        mibViewController.indexMib()
+        indices = {}
+        for modName, mibMod in mibViewController._MibViewController__mibSymbolsIdx.items():
+            indices[modName] = {}
+            for name, idx in mibMod.items():
+                # ordered indices must iterate the same way
+                if isinstance(idx, OrderedDict):
+                    indices[modName][name] = idx.keys(), dict(idx.items())
+                else:
+                    indices[modName][name] = dict(idx.items())
+        return indices
+
+    def assertSameAsFullIndex(self, mibBuilder, mibViewController):
+        self.assertEqual(self.dumpIndices(mibViewController),
+                         self.dumpIndices(view.MibViewController(mibBuilder)))
+
+    def testLoadOneByOne(self):
+        mibBuilder = builder.MibBuilder()
+        mibViewController = view.MibViewController(mibBuilder)
+
+        for modName in self.modNames:
+            mibBuilder.loadModules(modName)
+            self.assertSameAsFullIndex(mibBuilder, mibViewController)
+
+    def testUnloadAndOverride(self):
+        mibBuilder = builder.MibBuilder()
+        mibBuilder.loadModules(*self.modNames)
+        mibViewController = view.MibViewController(mibBuilder)
+        mibViewController.indexMib()
+
+        mibBuilder.unloadModules('RFC1213-MIB')
+        self.assertSameAsFullIndex(mibBuilder, mibViewController)
+
+        # MIB variable of an unloaded module gets overridden
+        MibScalar, Integer32 = mibBuilder.importSymbols('SNMPv2-SMI', 'MibScalar', 'Integer32')
+        mibBuilder.exportSymbols('OVERRIDE-MIB', sysDescr=MibScalar((1, 3, 6, 1, 4, 1, 20408, 999, 1), Integer32()))
+        self.assertSameAsFullIndex(mibBuilder, mibViewController)
+
+        mibBuilder.unexportSymbols('SNMPv2-MIB', 'sysDescr')
+        self.assertSameAsFullIndex(mibBuilder, mibViewController)
+
+        mibBuilder.loadModules('RFC1213-MIB')
+        self.assertSameAsFullIndex(mibBuilder, mibViewController)
+
+    def testLongLabels(self):
+        mibBuilder = builder.MibBuilder()
+        mibBuilder.loadModules('SNMPv2-MIB')
+        mibViewController = view.MibViewController(mibBuilder)
+
+        oid, label, suffix = mibViewController.getNodeName((1, 3, 6, 1, 2, 1, 1, 1, 0))
+        self.assertEqual(oid, (1, 3, 6, 1, 2, 1, 1, 1))
+        self.assertEqual(label[-3:], ('mib-2', 'system', 'sysDescr'))
+        self.assertEqual(suffix, (0,))
+
+        self.assertEqual(mibViewController.getNodeName(('sysDescr',), 'SNMPv2-MIB')[0],
+                         (1, 3, 6, 1, 2, 1, 1, 1))
+        self.assertEqual(mibViewController.getNextNodeName((1, 3, 6, 1, 2, 1, 1, 1))[1][-1],
+                         'sysObjectID')
+
+
+if __name__ == '__main__':
+    unittest.main()
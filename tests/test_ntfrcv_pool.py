@@ -0,0 +1,92 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import sys
+import socket
+import unittest
+from pyasn1.codec.ber import encoder
+from pysnmp.entity import config
+from pysnmp.entity.rfc3413 import ntfrcv
+from pysnmp.proto import api
+from pysnmp.carrier.error import CarrierError
+from pysnmp.error import PySnmpError
+
+
+def configure(snmpEngine):
+    config.addV1System(snmpEngine, 'my-area', 'public')
+
+
+def failToConfigure(snmpEngine):
+    raise Exception('no configuration')
+
+
+def buildTrap():
+    pMod = api.protoModules[api.protoVersion2c]
+    trapPDU = pMod.TrapPDU()
+    pMod.apiTrapPDU.setDefaults(trapPDU)
+    trapMsg = pMod.Message()
+    pMod.apiMessage.setDefaults(trapMsg)
+    pMod.apiMessage.setCommunity(trapMsg, 'public')
+    pMod.apiMessage.setPDU(trapMsg, trapPDU)
+    return encoder.encode(trapMsg)
+
+
+@unittest.skipIf(not hasattr(socket, 'SO_REUSEPORT'), 'SO_REUSEPORT is not available')
+class NotificationReceiverPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.iface = self.sock.getsockname()
+
+    def tearDown(self):
+        self.sock.close()
+
+    def testBindFailure(self):
+        # port is held by a socket without SO_REUSEPORT
+        pool = ntfrcv.NotificationReceiverPool(configure, self.iface, workers=2)
+        self.assertRaises(PySnmpError, pool.start)
+
+    def testConfigFailure(self):
+        self.sock.close()
+        pool = ntfrcv.NotificationReceiverPool(failToConfigure, self.iface, workers=2)
+        try:
+            pool.start()
+        except PySnmpError:
+            self.assertTrue('no configuration' in str(sys.exc_info()[1]))
+        else:
+            pool.stop()
+            self.fail('pool started')
+
+    def testReceive(self):
+        self.sock.close()
+        pool = ntfrcv.NotificationReceiverPool(configure, self.iface, workers=2).start()
+        try:
+            sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sender.sendto(buildTrap(), self.iface)
+            transportDomain, transportAddress, contextEngineId, contextName, varBinds = pool.getNotification(timeout=10)
+            self.assertEqual(transportAddress[1], sender.getsockname()[1])
+            self.assertEqual(len(varBinds), 2)
+            sender.close()
+        finally:
+            pool.stop()
+
+
+class NoReusePortTestCase(unittest.TestCase):
+    def setUp(self):
+        self.reusePort = getattr(socket, 'SO_REUSEPORT', None)
+        if self.reusePort is not None:
+            del socket.SO_REUSEPORT
+
+    def tearDown(self):
+        if self.reusePort is not None:
+            socket.SO_REUSEPORT = self.reusePort
+
+    def testPoolRefused(self):
+        self.assertRaises(CarrierError, ntfrcv.NotificationReceiverPool, configure, ('127.0.0.1', 0), workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import socket
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto import cache, errind, error
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cache = cache.Cache()
+        self.offered = []
+
+    def expire(self, timeNow=None, expired=True):
+        del self.offered[:]
+
+        def cbFun(index, cachedParams, cbCtx):
+            self.offered.append(index)
+            return expired
+
+        self.cache.expire(cbFun, None, timeNow)
+
+        return self.offered
+
+    def testExpireDue(self):
+        for index in range(10):
+            self.cache.add(index, timeout=10 - index)
+
+        self.assertEqual(self.expire(0), [])
+        self.assertEqual(self.expire(3), [9, 8, 7])
+        self.assertEqual(len(self.cache), 7)
+        self.assertEqual(self.cache.getNextExpiration(), 4)
+        self.assertEqual(self.expire(100), [6, 5, 4, 3, 2, 1, 0])
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.getNextExpiration(), None)
+
+    def testExpireAll(self):
+        self.cache.add(1, timeout=10)
+        self.cache.add(2)
+
+        # no time given, everything is offered
+        self.assertEqual(sorted(self.expire()), [1, 2])
+        self.assertEqual(len(self.cache), 0)
+
+    def testNotExpired(self):
+        self.cache.add(1, timeout=1)
+        self.cache.add(2, timeout=2)
+
+        # entries declined by callback stay in place
+        self.assertEqual(self.expire(5, expired=False), [1, 2])
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.expire(5), [1, 2])
+        self.assertEqual(len(self.cache), 0)
+
+    def testPopped(self):
+        self.cache.add(1, timeout=1)
+        self.cache.add(2, timeout=2)
+        self.assertEqual(self.cache.pop(1), {'timeout': 1})
+        self.assertEqual(self.cache.pop(1), None)
+
+        self.assertEqual(self.cache.getNextExpiration(), 2)
+        self.assertEqual(self.expire(5), [2])
+
+    def testReschedule(self):
+        self.cache.add(1, timeout=1)
+        self.cache.update(1, timeout=5)
+
+        self.assertEqual(self.cache.getNextExpiration(), 5)
+        self.assertEqual(self.expire(3), [])
+        self.assertEqual(self.expire(5), [1])
+
+    def testUpdateMiss(self):
+        self.assertRaises(error.ProtocolError, self.cache.update, 1, timeout=1)
+
+    def testStaleEntriesCompaction(self):
+        self.cache.add(0, timeout=1000)
+        for index in range(1, 1000):
+            self.cache.add(index, timeout=index)
+            self.cache.pop(index)
+
+        self.assertTrue(len(self.cache._Cache__expirationHeap) < 100)
+        self.assertEqual(self.cache.getNextExpiration(), 1000)
+        self.assertEqual(self.expire(1000), [0])
+
+
+class PendingRequestsTestCase(unittest.TestCase):
+    def setUp(self):
+        # peer never responding
+        self.peer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.peer.bind(('127.0.0.1', 0))
+
+        self.transportDispatcher = AsyncoreDispatcher()
+        self.snmpEngine = engine.SnmpEngine()
+        self.snmpEngine.registerTransportDispatcher(self.transportDispatcher)
+        config.addTransport(self.snmpEngine, udp.domainName,
+                            udp.UdpTransport().openClientMode())
+        config.addV1System(self.snmpEngine, 'my-area', 'public')
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+
+    def tearDown(self):
+        self.transportDispatcher.closeDispatcher()
+        self.peer.close()
+
+    def sendRequest(self, timeout, cbFun=None):
+        config.addTargetAddr(self.snmpEngine, 'my-agent', udp.domainName,
+                             self.peer.getsockname(), 'my-creds',
+                             timeout=timeout, retryCount=0)
+        cmdgen.GetCommandGenerator().sendVarBinds(
+            self.snmpEngine, 'my-agent', None, '',
+            [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)], cbFun
+        )
+
+    def testStats(self):
+        msgAndPduDsp = self.snmpEngine.msgAndPduDsp
+
+        self.assertEqual(msgAndPduDsp.getPendingRequestsStats(self.snmpEngine),
+                         {'pendingRequests': 0, 'timeToExpire': None})
+
+        self.sendRequest(1000)
+        self.sendRequest(500)
+
+        stats = msgAndPduDsp.getPendingRequestsStats(self.snmpEngine)
+        self.assertEqual(stats['pendingRequests'], 2)
+        self.assertTrue(4 < stats['timeToExpire'] <= 5, stats)
+
+    def testTimeout(self):
+        errors = []
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBinds, cbCtx):
+            errors.append(errorIndication)
+            self.transportDispatcher.jobFinished(1)
+
+        self.sendRequest(5, cbFun)
+        self.transportDispatcher.jobStarted(1)
+        self.transportDispatcher.runDispatcher()
+
+        self.assertEqual(errors, [errind.requestTimedOut])
+        self.assertEqual(
+            self.snmpEngine.msgAndPduDsp.getPendingRequestsStats(self.snmpEngine),
+            {'pendingRequests': 0, 'timeToExpire': None}
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,463 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import time
+import unittest
+from pysnmp.entity import engine
+from pysnmp.carrier.base import TimerHandle
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.entity.rfc3413 import scheduler
+from pysnmp.entity.rfc3413.scheduler import PollScheduler, TokenBucket, Histogram
+from pysnmp.smi.error import SmiError
+from pysnmp.error import PySnmpError
+
+
+class Clock(object):
+    def __init__(self, timeNow=1000.0):
+        self.timeNow = timeNow
+
+    def __call__(self):
+        return self.timeNow
+
+
+class Random(object):
+    """Stands for random module, returns queued values then 0"""
+    def __init__(self):
+        self.values = []
+
+    def random(self):
+        if self.values:
+            return self.values.pop(0)
+        return 0.0
+
+
+class Dispatcher(object):
+    """Runs delayed calls on a fake clock"""
+    def __init__(self, clock):
+        self.clock = clock
+        self.delayedCalls = []
+        self.jobs = 0
+
+    def callLater(self, delay, cbFun, *args):
+        timerHandle = TimerHandle(self.clock() + delay, cbFun, args)
+        self.delayedCalls.append(timerHandle)
+        return timerHandle
+
+    def jobStarted(self, jobId):
+        self.jobs += 1
+
+    def jobFinished(self, jobId):
+        self.jobs -= 1
+
+    def getNextCallTime(self):
+        callTimes = [x.callTime for x in self.delayedCalls if not x.cancelled]
+        return callTimes and min(callTimes) or None
+
+    def advance(self, timeNow):
+        while True:
+            dueCalls = [x for x in self.delayedCalls
+                        if not x.cancelled and x.callTime <= timeNow]
+            if not dueCalls:
+                break
+            timerHandle = min(dueCalls)
+            self.delayedCalls.remove(timerHandle)
+            self.clock.timeNow = max(self.clock.timeNow, timerHandle.callTime)
+            cbFun, args = timerHandle.cbFun, timerHandle.args
+            timerHandle.cancel()
+            cbFun(*args)
+
+        self.clock.timeNow = timeNow
+
+
+class SnmpEngine(object):
+    def __init__(self, transportDispatcher):
+        self.transportDispatcher = transportDispatcher
+
+
+class CommandGenerator(object):
+    """Records requests, responds on demand"""
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = []  # (sendTime, targetName)
+        self.pending = []
+
+    @staticmethod
+    def prepareVarBinds(varBinds):
+        return varBinds
+
+    def sendVarBinds(self, snmpEngine, targetName, contextEngineId,
+                     contextName, varBinds, cbFun, cbCtx=None):
+        self.sent.append((self.clock(), targetName))
+        self.pending.append((snmpEngine, cbFun, cbCtx))
+
+    def respond(self, errorIndication=None):
+        pending, self.pending = self.pending, []
+        for snmpEngine, cbFun, cbCtx in pending:
+            cbFun(snmpEngine, None, errorIndication, 0, 0, (), cbCtx)
+
+
+class BaseTestCase(unittest.TestCase):
+    varBinds = [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)]
+
+    def setUp(self):
+        self.clock = Clock()
+        self.random = Random()
+        self.time, scheduler.time = scheduler.time, self.clock
+        self.randomModule, scheduler.random = scheduler.random, self.random
+        self.transportDispatcher = Dispatcher(self.clock)
+        self.snmpEngine = SnmpEngine(self.transportDispatcher)
+        self.commandGenerator = CommandGenerator(self.clock)
+        self.responses = []
+
+    def tearDown(self):
+        scheduler.time = self.time
+        scheduler.random = self.randomModule
+
+    def getScheduler(self, **kwargs):
+        kwargs.setdefault('jitter', 0)
+        pollScheduler = PollScheduler(self.snmpEngine, **kwargs)
+        pollScheduler._PollScheduler__commandGenerator = self.commandGenerator
+        return pollScheduler
+
+    def cbFun(self, snmpEngine, pollId, errorIndication, errorStatus,
+              errorIndex, varBinds, cbCtx):
+        self.responses.append((pollId, errorIndication, cbCtx))
+
+    def advance(self, delay):
+        self.transportDispatcher.advance(self.clock() + delay)
+
+    def getSendTimes(self, targetName=None):
+        return [round(sendTime - 1000, 6) for sendTime, name in self.commandGenerator.sent
+                if targetName is None or name == targetName]
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    def testBurst(self):
+        tokenBucket = TokenBucket(10, burst=3)
+        self.assertEqual([tokenBucket.consume(0) for _ in range(4)],
+                         [True, True, True, False])
+
+    def testDelay(self):
+        tokenBucket = TokenBucket(4, burst=1)
+        self.assertEqual(tokenBucket.getDelay(0), 0)
+        self.assertTrue(tokenBucket.consume(0))
+        self.assertEqual(tokenBucket.getDelay(0), 0.25)
+        self.assertEqual(tokenBucket.getDelay(0.125), 0.125)
+        self.assertFalse(tokenBucket.consume(0.125))
+        self.assertTrue(tokenBucket.consume(0.25))
+
+    def testRefillCapped(self):
+        tokenBucket = TokenBucket(10, burst=2)
+        tokenBucket.consume(0)
+        tokenBucket.consume(0)
+        # an hour of idling does not build up more than burst
+        self.assertEqual([tokenBucket.consume(3600) for _ in range(3)],
+                         [True, True, False])
+
+    def testDefaultBurst(self):
+        self.assertEqual(TokenBucket(5).burst, 5)
+        self.assertEqual(TokenBucket(0.5).burst, 1)
+
+    def testBadRate(self):
+        self.assertRaises(PySnmpError, TokenBucket, 0)
+
+
+class HistogramTestCase(unittest.TestCase):
+    def testBuckets(self):
+        histogram = Histogram((1, 2, 4))
+        for value in 0.5, 1, 1.5, 3, 3, 10:
+            histogram.observe(value)
+
+        # bounds are inclusive, counts are cumulative
+        self.assertEqual(histogram.getBuckets(),
+                         [(1, 2), (2, 3), (4, 5), (None, 6)])
+        self.assertEqual(histogram.count, 6)
+        self.assertEqual(histogram.sum, 19)
+
+    def testPercentile(self):
+        histogram = Histogram((1, 2, 4))
+        for value in range(10):
+            histogram.observe(value * 0.1)
+        histogram.observe(1.5)
+        histogram.observe(10)
+
+        self.assertEqual(histogram.getPercentile(50), 1)
+        self.assertEqual(histogram.getPercentile(80), 1)
+        self.assertEqual(histogram.getPercentile(90), 2)
+        self.assertEqual(histogram.getPercentile(100), None)
+
+    def testEmpty(self):
+        histogram = Histogram()
+        self.assertEqual(histogram.getPercentile(50), None)
+        self.assertEqual(histogram.getBuckets()[-1], (None, 0))
+
+
+class ScheduleTestCase(BaseTestCase):
+    def testPhaseSpreading(self):
+        pollScheduler = self.getScheduler()
+
+        self.random.values = [0.25, 0, 0.75]
+        pollScheduler.addPoll('target-1', self.varBinds, 10, self.cbFun)
+        pollScheduler.addPoll('target-2', self.varBinds, 10, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(20)
+        self.commandGenerator.respond()
+
+        self.assertEqual(self.getSendTimes('target-1'), [2.5])
+        self.assertEqual(self.getSendTimes('target-2'), [7.5])
+
+    def testIntervals(self):
+        pollScheduler = self.getScheduler()
+        pollScheduler.addPoll('target-1', self.varBinds, 2, self.cbFun, 'ctx')
+        pollScheduler.start()
+
+        for _ in range(4):
+            self.advance(1)
+            self.commandGenerator.respond()
+
+        self.assertEqual(self.getSendTimes(), [0, 2, 4])
+        self.assertEqual([x[1:] for x in self.responses], [(None, 'ctx')] * 3)
+
+        stats = pollScheduler.getStats()
+        self.assertEqual(stats['sent'], 3)
+        self.assertEqual(stats['completed'], 3)
+        self.assertEqual(stats['skipped'], 0)
+
+    def testJitter(self):
+        pollScheduler = self.getScheduler(jitter=0.1)
+
+        # phase 0, then jitter of 50% and 20% of 0.1 * interval
+        self.random.values = [0, 0.5, 0.2]
+        pollScheduler.addPoll('target-1', self.varBinds, 10, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(5)
+        self.commandGenerator.respond()
+        self.advance(10)
+        self.commandGenerator.respond()
+
+        self.assertEqual(self.getSendTimes(), [0.5, 10.2])
+
+        # lateness is measured against jittered schedule
+        self.assertEqual(pollScheduler.lateness.getBuckets()[0], (0.001, 2))
+
+    def testSkipWhilePending(self):
+        pollScheduler = self.getScheduler()
+        pollScheduler.addPoll('target-1', self.varBinds, 1, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(0.5)
+        self.advance(1)
+        self.advance(1)
+
+        self.assertEqual(self.getSendTimes(), [0])
+        stats = pollScheduler.getStats()
+        self.assertEqual(stats['skipped'], 2)
+        self.assertEqual(stats['pending'], 1)
+
+        self.commandGenerator.respond()
+        self.advance(1)
+
+        self.assertEqual(self.getSendTimes(), [0, 3])
+        self.assertEqual(pollScheduler.completion.count, 1)
+        self.assertEqual(pollScheduler.completion.sum, 2.5)
+
+    def testSkipWhenBehind(self):
+        pollScheduler = self.getScheduler()
+        pollScheduler.addPoll('target-1', self.varBinds, 1, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(0)
+        self.commandGenerator.respond()
+
+        # dispatcher stalled for 3.5 intervals
+        self.clock.timeNow += 3.5
+        self.transportDispatcher.advance(self.clock())
+
+        # one late request instead of a burst of three
+        self.assertEqual(self.getSendTimes(), [0, 3.5])
+        self.assertEqual(pollScheduler.getStats()['skipped'], 2)
+
+        self.commandGenerator.respond()
+        self.advance(0.5)
+
+        self.assertEqual(self.getSendTimes(), [0, 3.5, 4])
+
+    def testRemovePoll(self):
+        pollScheduler = self.getScheduler()
+        pollId = pollScheduler.addPoll('target-1', self.varBinds, 1, self.cbFun)
+        otherPollId = pollScheduler.addPoll('target-2', self.varBinds, 1, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(0)
+        self.assertEqual(len(self.commandGenerator.sent), 2)
+
+        # response to pending request of removed poll is ignored
+        pollScheduler.removePoll(pollId)
+        self.commandGenerator.respond()
+
+        self.assertEqual([x[0] for x in self.responses], [otherPollId])
+        self.assertEqual(pollScheduler.getStats()['completed'], 1)
+
+        self.advance(1)
+        self.assertEqual(self.commandGenerator.sent[-1], (1001, 'target-2'))
+        self.assertEqual(len(self.commandGenerator.sent), 3)
+
+        # nothing is left to run
+        pollScheduler.removePoll(otherPollId)
+        self.advance(5)
+        self.assertEqual(len(self.commandGenerator.sent), 3)
+        self.assertEqual(pollScheduler.getStats()['polls'], 0)
+
+    def testStop(self):
+        pollScheduler = self.getScheduler()
+        pollScheduler.addPoll('target-1', self.varBinds, 1, self.cbFun)
+        pollScheduler.start()
+        self.assertEqual(self.transportDispatcher.jobs, 1)
+
+        pollScheduler.stop()
+        self.assertEqual(self.transportDispatcher.jobs, 0)
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), None)
+
+        self.advance(5)
+        self.assertEqual(self.commandGenerator.sent, [])
+
+
+class RateLimitTestCase(BaseTestCase):
+    def testGlobalRate(self):
+        pollScheduler = self.getScheduler(rate=2, burst=2)
+        for idx in range(5):
+            pollScheduler.addPoll('target-%d' % idx, self.varBinds, 10, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(0)
+        self.assertEqual(self.getSendTimes(), [0, 0])
+
+        # waits for the next token rather than polling
+        self.assertEqual(self.transportDispatcher.getNextCallTime(), 1000.5)
+
+        self.advance(1)
+        self.assertEqual(self.getSendTimes(), [0, 0, 0.5, 1])
+
+        self.advance(1)
+        self.assertEqual(self.getSendTimes(), [0, 0, 0.5, 1, 1.5])
+        self.assertEqual(pollScheduler.getStats()['postponed'], 0)
+
+    def testTargetRate(self):
+        pollScheduler = self.getScheduler(targetRate=1, targetBurst=1)
+        for _ in range(3):
+            pollScheduler.addPoll('target-1', self.varBinds, 10, self.cbFun)
+        pollScheduler.addPoll('target-2', self.varBinds, 10, self.cbFun)
+        pollScheduler.start()
+
+        self.advance(0)
+
+        # other targets are not held up
+        self.assertEqual(self.getSendTimes('target-1'), [0])
+        self.assertEqual(self.getSendTimes('target-2'), [0])
+        self.assertEqual(pollScheduler.getStats()['postponed'], 2)
+
+        self.advance(2)
+        self.assertEqual(self.getSendTimes('target-1'), [0, 1, 2])
+
+        stats = pollScheduler.getStats()
+        self.assertEqual(stats['postponed'], 3)
+        self.assertEqual(stats['skipped'], 0)
+
+        # lateness of postponed requests
+        self.assertEqual(pollScheduler.lateness.getPercentile(100), 2.5)
+
+
+class DispatcherRateLimitTestCase(unittest.TestCase):
+    varBinds = [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)]
+
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+        self.commandGenerator = CommandGenerator(time.time)
+
+    def tearDown(self):
+        self.snmpEngine.transportDispatcher.closeDispatcher()
+
+    def respond(self):
+        self.commandGenerator.respond()
+        self.snmpEngine.transportDispatcher.callLater(0.001, self.respond)
+
+    def runScheduler(self, pollScheduler, duration):
+        pollScheduler._PollScheduler__commandGenerator = self.commandGenerator
+
+        for idx in range(20):
+            pollScheduler.addPoll('target-%d' % (idx % 2), self.varBinds, 0.05, lambda *args: None)
+
+        self.respond()
+        self.snmpEngine.transportDispatcher.callLater(duration, pollScheduler.stop)
+
+        pollScheduler.start()
+        self.snmpEngine.transportDispatcher.runDispatcher()
+
+    def assertRateLimited(self, sendTimes, rate, burst):
+        # no window lets more than burst plus rate requests through
+        for idx, startTime in enumerate(sendTimes):
+            for count, endTime in enumerate(sendTimes[idx:]):
+                self.assertTrue(count + 1 <= burst + rate * (endTime - startTime) + 0.01,
+                                (count + 1, endTime - startTime))
+
+    def testRate(self):
+        pollScheduler = PollScheduler(self.snmpEngine, rate=100, burst=5)
+        self.runScheduler(pollScheduler, 0.3)
+
+        sendTimes = [x[0] for x in self.commandGenerator.sent]
+
+        # 20 polls every 0.05 s would make 400 requests per second
+        self.assertTrue(len(sendTimes) >= 20, len(sendTimes))
+        self.assertRateLimited(sendTimes, 100, 5)
+
+    def testTargetRate(self):
+        pollScheduler = PollScheduler(self.snmpEngine, targetRate=50, targetBurst=2)
+        self.runScheduler(pollScheduler, 0.3)
+
+        for targetName in 'target-0', 'target-1':
+            sendTimes = [x[0] for x in self.commandGenerator.sent if x[1] == targetName]
+            self.assertTrue(len(sendTimes) >= 10, len(sendTimes))
+            self.assertRateLimited(sendTimes, 50, 2)
+
+
+class SendFailureTestCase(unittest.TestCase):
+    def testUnknownTarget(self):
+        snmpEngine = engine.SnmpEngine()
+        snmpEngine.registerTransportDispatcher(AsyncoreDispatcher())
+
+        scheduler = PollScheduler(snmpEngine, jitter=0)
+
+        errors = []
+
+        def cbFun(snmpEngine, pollId, errorIndication, errorStatus,
+                  errorIndex, varBinds, cbCtx):
+            errors.append(errorIndication)
+            if len(errors) == 2:
+                scheduler.stop()
+
+        scheduler.addPoll('unknown-target', [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)], 0.01, cbFun)
+        scheduler.start()
+
+        snmpEngine.transportDispatcher.runDispatcher()
+
+        # failed request is not left pending and gets re-sent next round
+        self.assertEqual(len(errors), 2)
+        self.assertIsInstance(errors[0], SmiError)
+
+        stats = scheduler.getStats()
+        self.assertEqual(stats['sent'], 2)
+        self.assertEqual(stats['failed'], 2)
+        self.assertEqual(stats['skipped'], 0)
+        self.assertEqual(stats['pending'], 0)
+
+        snmpEngine.transportDispatcher.closeDispatcher()
+
+
+if __name__ == '__main__':
+    unittest.main()
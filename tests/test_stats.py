@@ -0,0 +1,175 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pyasn1.codec.ber import encoder
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.entity.rfc3413.scheduler import Histogram
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto import api, rfc1902, stats
+
+
+class StatisticsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.statistics = self.snmpEngine.statistics
+        self.mibInstrumController = self.snmpEngine.msgAndPduDsp.mibInstrumController
+
+    def readCounter(self, oid):
+        return self.mibInstrumController.readVars(((oid, None),))[0][1]
+
+    def testInitialValues(self):
+        counters = stats.Statistics().getCounters()
+        self.assertEqual(len(counters), 18)
+        self.assertEqual(set(counters.values()), set([0]))
+
+    def testMibCounters(self):
+        self.statistics.snmpInPkts = 5
+        self.statistics.usmStatsWrongDigests = 7
+
+        snmpInPkts = self.readCounter((1, 3, 6, 1, 2, 1, 11, 1, 0))
+        self.assertIsInstance(snmpInPkts, rfc1902.Counter32)
+        self.assertEqual(snmpInPkts, 5)
+        self.assertEqual(self.readCounter((1, 3, 6, 1, 6, 3, 15, 1, 1, 5, 0)), 7)
+
+        # values read are snapshots
+        self.statistics.snmpInPkts += 1
+        self.assertEqual(snmpInPkts, 5)
+        self.assertEqual(self.readCounter((1, 3, 6, 1, 2, 1, 11, 1, 0)), 6)
+
+    def testWrapAround(self):
+        self.statistics.snmpInPkts = 0xffffffff + 3
+        self.assertEqual(self.readCounter((1, 3, 6, 1, 2, 1, 11, 1, 0)), 2)
+
+    def testBindMib(self):
+        self.statistics.snmpSilentDrops = 3
+
+        # MIB counter values are carried over
+        statistics = stats.Statistics()
+        statistics.bindMib(self.mibInstrumController.mibBuilder)
+        self.assertEqual(statistics.snmpSilentDrops, 3)
+
+        statistics.snmpSilentDrops += 1
+        self.assertEqual(self.readCounter((1, 3, 6, 1, 2, 1, 11, 31, 0)), 4)
+
+    def testExportText(self):
+        self.statistics.snmpInPkts = 12
+
+        text = self.statistics.exportText()
+        self.assertTrue(text.endswith('\n'))
+        self.assertTrue('# HELP pysnmp_snmpInPkts_total SNMPv2-MIB::snmpInPkts\n'
+                        '# TYPE pysnmp_snmpInPkts_total counter\n'
+                        'pysnmp_snmpInPkts_total 12\n' in text)
+        self.assertTrue('pysnmp_usmStatsWrongDigests_total 0\n' in text)
+
+        text = self.statistics.exportText(prefix='snmp_', labels={'engine': 'a"b\\c', 'agent': 'x'})
+        self.assertTrue('snmp_snmpInPkts_total{agent="x",engine="a\\"b\\\\c"} 12\n' in text)
+
+    def testExportHistogram(self):
+        histogram = Histogram((0.1, 1))
+        for value in 0.05, 0.5, 0.7, 3:
+            histogram.observe(value)
+
+        self.statistics.addHistogram('poll_seconds', histogram, 'Poll duration')
+
+        text = self.statistics.exportText(labels={'agent': 'x'})
+        self.assertTrue('# HELP pysnmp_poll_seconds Poll duration\n'
+                        '# TYPE pysnmp_poll_seconds histogram\n'
+                        'pysnmp_poll_seconds_bucket{agent="x",le="0.1"} 1\n'
+                        'pysnmp_poll_seconds_bucket{agent="x",le="1.0"} 3\n'
+                        'pysnmp_poll_seconds_bucket{agent="x",le="+Inf"} 4\n'
+                        'pysnmp_poll_seconds_sum{agent="x"} 4.25\n'
+                        'pysnmp_poll_seconds_count{agent="x"} 4\n' in text)
+
+
+class MessageProcessingStatisticsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        config.addV1System(self.snmpEngine, 'my-area', 'public')
+        self.statistics = self.snmpEngine.statistics
+
+    def receive(self, wholeMsg):
+        self.snmpEngine.msgAndPduDsp.receiveMessage(
+            self.snmpEngine, udp.domainName, ('127.0.0.1', 1024), wholeMsg
+        )
+
+    def testAsnParseError(self):
+        self.receive(b'\x30\x03\x02\x01')
+        self.assertEqual(self.statistics.snmpInPkts, 1)
+        self.assertEqual(self.statistics.snmpInASNParseErrs, 1)
+
+    def testBadVersion(self):
+        # SEQUENCE {version 7, community "public"}
+        self.receive(b'\x30\x0b\x02\x01\x07\x04\x06public')
+        self.assertEqual(self.statistics.snmpInPkts, 1)
+        self.assertEqual(self.statistics.snmpInBadVersions, 1)
+
+    def testBadCommunityName(self):
+        msg = api.v2c.Message()
+        api.v2c.apiMessage.setDefaults(msg)
+        api.v2c.apiMessage.setCommunity(msg, 'private')
+        pdu = api.v2c.GetRequestPDU()
+        api.v2c.apiPDU.setDefaults(pdu)
+        api.v2c.apiMessage.setPDU(msg, pdu)
+
+        self.receive(encoder.encode(msg))
+        self.assertEqual(self.statistics.snmpInPkts, 1)
+        self.assertEqual(self.statistics.snmpInBadCommunityNames, 1)
+
+
+class EngineStatisticsTestCase(unittest.TestCase):
+    def testDiscovery(self):
+        transportDispatcher = AsyncoreDispatcher()
+        transportDispatcher.registerRoutingCbFun(lambda td, t, d: td)
+
+        agentEngine = engine.SnmpEngine()
+        agentEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (2,))
+        agentTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(agentEngine, udp.domainName + (2,), agentTransport)
+        config.addV3User(agentEngine, 'usr-none-none')
+        config.addVacmUser(agentEngine, 3, 'usr-none-none', 'noAuthNoPriv', (1, 3, 6))
+        cmdrsp.GetCommandResponder(agentEngine, context.SnmpContext(agentEngine))
+
+        snmpEngine = engine.SnmpEngine()
+        snmpEngine.registerTransportDispatcher(transportDispatcher, udp.domainName + (1,))
+        config.addTransport(snmpEngine, udp.domainName + (1,), udp.UdpTransport().openClientMode())
+        config.addV3User(snmpEngine, 'usr-none-none')
+        config.addTargetParams(snmpEngine, 'my-creds', 'usr-none-none', 'noAuthNoPriv')
+        config.addTargetAddr(snmpEngine, 'my-agent', udp.domainName + (1,),
+                             agentTransport.socket.getsockname(), 'my-creds')
+
+        results = []
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBinds, cbCtx):
+            results.append((errorIndication, varBinds))
+
+        # sysDescr
+        cmdgen.GetCommandGenerator().sendVarBinds(
+            snmpEngine, 'my-agent', None, '', [((1, 3, 6, 1, 2, 1, 1, 1, 0), None)], cbFun
+        )
+
+        try:
+            transportDispatcher.runDispatcher()
+
+        finally:
+            transportDispatcher.closeDispatcher()
+
+        self.assertEqual(len(results), 1)
+        self.assertFalse(results[0][0])
+
+        # discovery request gets a report, then the request gets a response
+        for statistics in agentEngine.statistics, snmpEngine.statistics:
+            self.assertEqual(statistics.snmpInPkts, 2)
+            self.assertEqual(statistics.snmpOutPkts, 2)
+
+        self.assertEqual(agentEngine.statistics.usmStatsUnknownEngineIDs, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
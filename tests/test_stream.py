@@ -0,0 +1,446 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import socket
+import unittest
+from pysnmp.carrier.framing import BerStreamFramer
+from pysnmp.carrier.asyncore.dispatch import AsyncoreDispatcher
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.carrier.asyncore.stream import tcp
+from pysnmp.carrier.asyncore.stream.base import StreamConnection
+from pysnmp.carrier import error
+from pysnmp.entity import engine, config
+from pysnmp.entity.rfc3413 import cmdgen, cmdrsp, context
+from pysnmp.proto import rfc1905
+
+try:
+    import asyncio
+    from pysnmp.carrier.asyncio.stream import tcp as asyncio_tcp
+
+except (ImportError, SyntaxError):
+    asyncio = None
+
+
+def makeMessage(length):
+    if length < 0x80:
+        header = bytearray([0x30, length])
+    elif length < 0x100:
+        header = bytearray([0x30, 0x81, length])
+    else:
+        header = bytearray([0x30, 0x82, length >> 8, length & 0xff])
+    return bytes(header + bytearray([x & 0xff for x in range(length)]))
+
+
+class BerStreamFramerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.framer = BerStreamFramer(1024)
+
+    def testWhole(self):
+        message = makeMessage(10)
+        self.assertEqual(self.framer.feed(message), [message])
+        self.assertEqual(self.framer.feed(b''), [])
+
+    def testOctetByOctet(self):
+        for length in 10, 200, 300:
+            message = makeMessage(length)
+            messages = []
+            for idx in range(len(message)):
+                messages.extend(self.framer.feed(message[idx:idx + 1]))
+            self.assertEqual(messages, [message])
+
+    def testSplitHeader(self):
+        message = makeMessage(300)
+        for offset in 1, 2, 3:
+            self.assertEqual(self.framer.feed(message[:offset]), [])
+            self.assertEqual(self.framer.feed(message[offset:]), [message])
+
+    def testLongFormLength(self):
+        for length in 0x7f, 0x80, 0xff, 0x100, 1020:
+            message = makeMessage(length)
+            self.assertEqual(self.framer.feed(message), [message])
+
+        # long form of a short length is legal BER
+        message = b'\x30\x82\x00\x03\x02\x01\x00'
+        self.assertEqual(self.framer.feed(message), [message])
+
+    def testPipelined(self):
+        messages = [makeMessage(length) for length in (10, 200, 0, 300, 5)]
+        stream = b''.join(messages)
+        self.assertEqual(self.framer.feed(stream), messages)
+
+        # messages spanning over chunks
+        received = []
+        for offset in range(0, len(stream), 7):
+            received.extend(self.framer.feed(stream[offset:offset + 7]))
+        self.assertEqual(received, messages)
+
+        # partial message left over is completed by the next chunk
+        self.assertEqual(self.framer.feed(stream[:-3]), messages[:-1])
+        self.assertEqual(self.framer.feed(stream[-3:]), messages[-1:])
+
+    def testOversized(self):
+        self.assertRaises(error.CarrierError, self.framer.feed, makeMessage(1024)[:5])
+
+        # the limit is inclusive of the header
+        message = makeMessage(1020)
+        self.assertEqual(BerStreamFramer(1024).feed(message), [message])
+        self.assertRaises(error.CarrierError, BerStreamFramer(1023).feed, message)
+
+    def testHugeLength(self):
+        self.assertRaises(error.CarrierError, self.framer.feed, b'\x30\x84\xff\xff\xff\xff')
+        self.assertRaises(error.CarrierError, self.framer.feed, b'\x30\x85\x00\x00\x00\x00\x01')
+
+    def testIndefiniteLength(self):
+        self.assertRaises(error.CarrierError, self.framer.feed, b'\x30\x80\x02\x01\x00\x00\x00')
+
+    def testNotSequence(self):
+        self.assertRaises(error.CarrierError, self.framer.feed, b'\x04\x01\x00')
+
+    def testClear(self):
+        message = makeMessage(10)
+        self.assertEqual(self.framer.feed(message[:5]), [])
+        self.framer.clear()
+        self.assertEqual(self.framer.feed(message), [message])
+
+
+class StreamSocketTransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.peer = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.peer.bind(('127.0.0.1', 0))
+        self.peer.listen(1)
+        self.peerAddress = self.peer.getsockname()
+        self.transports = []
+
+    def tearDown(self):
+        for transport in self.transports:
+            transport.closeTransport()
+        self.peer.close()
+
+    def testClientModeConnects(self):
+        transport = tcp.TcpSocketTransport().openClientMode()
+        self.transports.append(transport)
+
+        transport.sendMessage(makeMessage(10), self.peerAddress)
+        self.assertEqual([x.transportAddress for x in transport.getConnections()],
+                         [self.peerAddress])
+
+    def testServerModeDrops(self):
+        transport = tcp.TcpSocketTransport().openServerMode(('127.0.0.1', 0))
+        self.transports.append(transport)
+
+        transport.sendMessage(makeMessage(10), self.peerAddress)
+        self.assertEqual(transport.getConnections(), [])
+
+    def testMaxConnections(self):
+        transport = tcp.TcpSocketTransport().openClientMode()
+        transport.maxConnections = 1
+        self.transports.append(transport)
+
+        other = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        other.bind(('127.0.0.1', 0))
+        other.listen(1)
+
+        try:
+            transport.sendMessage(makeMessage(10), self.peerAddress)
+            transport.sendMessage(makeMessage(10), other.getsockname())
+
+            # least recently used connection closed
+            self.assertEqual([x.transportAddress for x in transport.getConnections()],
+                             [other.getsockname()])
+
+        finally:
+            other.close()
+
+    def testIdleTimeout(self):
+        transportDispatcher = AsyncoreDispatcher()
+
+        transport = tcp.TcpSocketTransport().openClientMode()
+        transport.idleTimeout = 0.1
+        transportDispatcher.registerTransport(tcp.domainName, transport)
+
+        try:
+            transport.sendMessage(makeMessage(10), self.peerAddress)
+            peer, _ = self.peer.accept()
+
+            transportDispatcher.callLater(0.05, transportDispatcher.jobFinished, 1)
+            transportDispatcher.jobStarted(1)
+            transportDispatcher.runDispatcher()
+
+            self.assertEqual(len(transport.getConnections()), 1)
+
+            transportDispatcher.callLater(0.1, transportDispatcher.jobFinished, 1)
+            transportDispatcher.jobStarted(1)
+            transportDispatcher.runDispatcher()
+
+            self.assertEqual(transport.getConnections(), [])
+
+            # peer sees connection closed after message
+            peer.settimeout(1)
+            received = b''
+            while True:
+                data = peer.recv(1024)
+                if not data:
+                    break
+                received += data
+            peer.close()
+
+            self.assertEqual(received, makeMessage(10))
+
+        finally:
+            transportDispatcher.closeDispatcher()
+
+
+class StreamConnectionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.transport = tcp.TcpSocketTransport().openClientMode()
+        sock, self.peer = socket.socketpair()
+        self.connection = StreamConnection(
+            self.transport, sock, self.transport.addressType(('127.0.0.1', 161))
+        )
+        self.connection.sendSize = 16
+
+    def tearDown(self):
+        self.connection.close()
+        self.peer.close()
+        self.transport.closeTransport()
+
+    def write(self):
+        sent = []
+        while self.connection.writable():
+            self.connection.handle_write()
+            sent.append(self.peer.recv(1024))
+        return sent
+
+    def testChunked(self):
+        messages = [makeMessage(length) for length in (3, 40, 1, 1, 20)]
+        for message in messages:
+            self.connection.sendMessage(message)
+
+        self.assertEqual(self.connection.getUnsentSize(), len(b''.join(messages)))
+
+        sent = self.write()
+
+        self.assertEqual(b''.join(sent), b''.join(messages))
+        self.assertEqual([len(x) for x in sent], [16, 16, 16, 16, 11])
+        self.assertEqual(self.connection.getUnsentSize(), 0)
+
+    def testInterleaved(self):
+        messages = [makeMessage(length) for length in (20, 5, 30)]
+
+        self.connection.sendMessage(messages[0])
+        self.connection.handle_write()
+        sent = [self.peer.recv(1024)]
+
+        for message in messages[1:]:
+            self.connection.sendMessage(message)
+        sent.extend(self.write())
+
+        self.assertEqual(b''.join(sent), b''.join(messages))
+
+
+@unittest.skipIf(asyncio is None, 'asyncio carrier is not available')
+class StreamAsyncioTransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.peers = []
+        for _ in range(2):
+            peer = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            peer.bind(('127.0.0.1', 0))
+            peer.listen(1)
+            self.peers.append(peer)
+        self.transport = asyncio_tcp.TcpAsyncioTransport(loop=self.loop).openClientMode()
+
+    def tearDown(self):
+        self.transport.closeTransport()
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        for peer in self.peers:
+            peer.close()
+
+    def received(self, peer):
+        sock, _ = peer.accept()
+        sock.settimeout(1)
+        received = b''
+        while True:
+            data = sock.recv(1024)
+            if not data:
+                break
+            received += data
+        sock.close()
+        return received
+
+    def testMaxConnections(self):
+        self.transport.maxConnections = 1
+
+        self.transport.sendMessage(makeMessage(10), self.peers[0].getsockname())
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+        self.transport.sendMessage(makeMessage(10), self.peers[1].getsockname())
+
+        self.assertEqual([x.transportAddress for x in self.transport.getConnections()],
+                         [self.peers[1].getsockname()])
+
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        self.assertEqual(self.received(self.peers[0]), makeMessage(10))
+
+    def testIdleTimeout(self):
+        self.transport.idleTimeout = 0.1
+
+        self.transport.sendMessage(makeMessage(10), self.peers[0].getsockname())
+        self.loop.run_until_complete(asyncio.sleep(0.05))
+
+        self.assertEqual(len(self.transport.getConnections()), 1)
+
+        self.loop.run_until_complete(asyncio.sleep(0.15))
+
+        self.assertEqual(self.transport.getConnections(), [])
+        self.assertEqual(self.received(self.peers[0]), makeMessage(10))
+
+
+class CommandResponderTestCase(unittest.TestCase):
+    """Manager and agent SNMP engines talking through loopback
+    interface over TCP and UDP, run by the same transport dispatcher."""
+
+    agentId = 1
+    managerId = 2
+
+    def setUp(self):
+        self.transportDispatcher = AsyncoreDispatcher()
+        self.transportDispatcher.registerRoutingCbFun(lambda td, t, d: td[-1])
+
+        self.agentEngine = engine.SnmpEngine()
+        self.agentEngine.registerTransportDispatcher(self.transportDispatcher, self.agentId)
+
+        self.agentTransport = tcp.TcpSocketTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(self.agentEngine, tcp.domainName + (self.agentId,), self.agentTransport)
+
+        agentUdpTransport = udp.UdpTransport().openServerMode(('127.0.0.1', 0))
+        config.addTransport(self.agentEngine, udp.domainName + (self.agentId,), agentUdpTransport)
+
+        config.addV1System(self.agentEngine, 'my-area', 'public')
+        config.addVacmUser(self.agentEngine, 2, 'my-area', 'noAuthNoPriv', (1, 3, 6))
+
+        snmpContext = context.SnmpContext(self.agentEngine)
+        cmdrsp.GetCommandResponder(self.agentEngine, snmpContext)
+        cmdrsp.BulkCommandResponder(self.agentEngine, snmpContext)
+
+        self.snmpEngine = engine.SnmpEngine()
+        self.snmpEngine.registerTransportDispatcher(self.transportDispatcher, self.managerId)
+
+        self.transport = tcp.TcpSocketTransport().openClientMode()
+        config.addTransport(self.snmpEngine, tcp.domainName + (self.managerId,), self.transport)
+        config.addTransport(self.snmpEngine, udp.domainName + (self.managerId,),
+                            udp.UdpTransport().openClientMode())
+
+        config.addV1System(self.snmpEngine, 'my-area', 'public')
+        config.addTargetParams(self.snmpEngine, 'my-creds', 'my-area', 'noAuthNoPriv', 1)
+        config.addTargetAddr(self.snmpEngine, 'tcp-agent', tcp.domainName + (self.managerId,),
+                             self.agentTransport.socket.getsockname(), 'my-creds',
+                             timeout=100, retryCount=0)
+        config.addTargetAddr(self.snmpEngine, 'udp-agent', udp.domainName + (self.managerId,),
+                             agentUdpTransport.socket.getsockname(), 'my-creds',
+                             timeout=100, retryCount=0)
+
+    def tearDown(self):
+        self.transportDispatcher.closeDispatcher()
+
+    def walk(self, targetName):
+        rows = []
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBindTable, cbCtx):
+            if errorIndication or errorStatus:
+                rows.append(errorIndication or errorStatus)
+                self.transportDispatcher.jobFinished(1)
+                return False
+
+            for varBindRow in varBindTable:
+                oid, val = varBindRow[0]
+                if rfc1905.endOfMibView.isSameTypeWith(val):
+                    self.transportDispatcher.jobFinished(1)
+                    return False
+                rows.append(oid)
+
+            return True
+
+        cmdgen.BulkCommandGenerator().sendVarBinds(
+            self.snmpEngine, targetName, None, '', 0, 10,
+            [((1, 3, 6), None)], cbFun
+        )
+
+        self.transportDispatcher.jobStarted(1)
+        self.transportDispatcher.runDispatcher()
+
+        return rows
+
+    def get(self, count=1):
+        responses = []
+
+        def cbFun(snmpEngine, sendRequestHandle, errorIndication,
+                  errorStatus, errorIndex, varBinds, cbCtx):
+            responses.append((errorIndication, errorStatus, varBinds))
+            self.transportDispatcher.jobFinished(1)
+
+        for _ in range(count):
+            cmdgen.GetCommandGenerator().sendVarBinds(
+                self.snmpEngine, 'tcp-agent', None, '',
+                [((1, 3, 6, 1, 6, 3, 10, 2, 1, 3, 0), None)], cbFun
+            )
+            self.transportDispatcher.jobStarted(1)
+
+        self.transportDispatcher.runDispatcher()
+
+        return responses
+
+    def assertResponses(self, responses, count):
+        self.assertEqual(len(responses), count)
+        for errorIndication, errorStatus, varBinds in responses:
+            self.assertFalse(errorIndication)
+            self.assertFalse(errorStatus)
+            self.assertEqual(len(varBinds), 1)
+
+    def testBulkWalk(self):
+        udpRows = self.walk('udp-agent')
+        tcpRows = self.walk('tcp-agent')
+
+        self.assertTrue(len(tcpRows) > 10)
+        self.assertEqual(tcpRows, udpRows)
+
+        # all requests went through a single connection
+        self.assertEqual(len(self.transport.getConnections()), 1)
+        self.assertEqual(len(self.agentTransport.getConnections()), 1)
+
+    def testPipelining(self):
+        self.assertResponses(self.get(20), 20)
+
+        self.assertEqual(len(self.transport.getConnections()), 1)
+        self.assertEqual(len(self.agentTransport.getConnections()), 1)
+
+    def testReconnect(self):
+        self.assertResponses(self.get(), 1)
+
+        connection, = self.transport.getConnections()
+
+        for agentConnection in self.agentTransport.getConnections():
+            agentConnection.handle_close()
+
+        # let manager see the connection closed
+        self.transportDispatcher.callLater(0.05, self.transportDispatcher.jobFinished, 1)
+        self.transportDispatcher.jobStarted(1)
+        self.transportDispatcher.runDispatcher()
+
+        self.assertEqual(self.transport.getConnections(), [])
+
+        self.assertResponses(self.get(3), 3)
+
+        self.assertNotEqual(self.transport.getConnections(), [connection])
+        self.assertEqual(len(self.transport.getConnections()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
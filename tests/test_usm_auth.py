@@ -0,0 +1,96 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import hmac
+import unittest
+from hashlib import md5, sha1, sha224, sha256, sha384, sha512
+from pyasn1.type import univ
+from pyasn1.codec.ber import encoder
+from pysnmp.proto.mpmod.rfc3412 import SNMPv3Message
+from pysnmp.proto.secmod.rfc3414.service import UsmSecurityParameters
+from pysnmp.proto.secmod.rfc3414.auth import base, hmacmd5, hmacsha
+from pysnmp.proto.secmod.rfc7860.auth import hmacsha2
+from pysnmp.proto import error
+
+
+def buildMessage(engineId, userName, digestLength):
+    securityParameters = UsmSecurityParameters()
+    securityParameters['msgAuthoritativeEngineId'] = engineId
+    securityParameters['msgAuthoritativeEngineBoots'] = 0
+    securityParameters['msgAuthoritativeEngineTime'] = 0
+    securityParameters['msgUserName'] = userName
+    securityParameters['msgAuthenticationParameters'] = b'\x00' * digestLength
+    securityParameters['msgPrivacyParameters'] = b''
+
+    message = SNMPv3Message()
+    message['msgVersion'] = 3
+    message['msgGlobalData']['msgID'] = 1
+    message['msgGlobalData']['msgMaxSize'] = 65507
+    message['msgGlobalData']['msgFlags'] = b'\x05'
+    message['msgGlobalData']['msgSecurityModel'] = 3
+    message['msgSecurityParameters'] = encoder.encode(securityParameters)
+    message['msgData']['encryptedPDU'] = b'\x00' * 64
+
+    return encoder.encode(message)
+
+
+class UsmAuthTestCase(unittest.TestCase):
+    services = (
+        (md5, hmacmd5.HmacMd5()),
+        (sha1, hmacsha.HmacSha()),
+        (sha224, hmacsha2.HmacSha2(hmacsha2.HmacSha2.sha224ServiceID)),
+        (sha256, hmacsha2.HmacSha2(hmacsha2.HmacSha2.sha256ServiceID)),
+        (sha384, hmacsha2.HmacSha2(hmacsha2.HmacSha2.sha384ServiceID)),
+        (sha512, hmacsha2.HmacSha2(hmacsha2.HmacSha2.sha512ServiceID)),
+    )
+
+    # zero runs in engine ID and user name precede the digest
+    engineIds = (
+        univ.OctetString(hexValue='80004fb80501020304'),
+        univ.OctetString(hexValue='8000000000000000000000000000000000000000'),
+    )
+    userNames = (b'usr-auth', b'\x00' * 32)
+
+    def testRoundTrip(self):
+        for hashAlgo, service in self.services:
+            digestLength = service.digestLength
+            for engineId in self.engineIds:
+                authKey = univ.OctetString(service.localizeKey(service.hashPassphrase('authkey1'), engineId))
+                for userName in self.userNames:
+                    wholeMsg = buildMessage(engineId, userName, digestLength)
+                    location = base.locateDigest(wholeMsg, b'\x00' * digestLength)
+
+                    mac = hmac.new(authKey.asOctets(), wholeMsg, hashAlgo).digest()[:digestLength]
+                    signedMsg = service.authenticateOutgoingMsg(authKey, wholeMsg)
+                    self.assertEqual(signedMsg, wholeMsg[:location] + mac + wholeMsg[location + digestLength:])
+
+                    authParameters = univ.OctetString(mac)
+                    self.assertEqual(service.authenticateIncomingMsg(authKey, authParameters, signedMsg), wholeMsg)
+
+                    # repeated use of the cached keyed hashers
+                    self.assertEqual(service.authenticateOutgoingMsg(authKey, wholeMsg), signedMsg)
+
+    def testWrongDigest(self):
+        for hashAlgo, service in self.services:
+            digestLength = service.digestLength
+            engineId = self.engineIds[0]
+            authKey = univ.OctetString(service.localizeKey(service.hashPassphrase('authkey1'), engineId))
+            wholeMsg = buildMessage(engineId, b'usr-auth', digestLength)
+            signedMsg = service.authenticateOutgoingMsg(authKey, wholeMsg)
+            location = base.locateDigest(wholeMsg, b'\x00' * digestLength)
+            authParameters = univ.OctetString(signedMsg[location:location + digestLength])
+
+            otherKey = univ.OctetString(service.localizeKey(service.hashPassphrase('authkey2'), engineId))
+            self.assertRaises(error.StatusInformation, service.authenticateIncomingMsg,
+                              otherKey, authParameters, signedMsg)
+
+            # digest not in message
+            self.assertRaises(error.ProtocolError, service.authenticateIncomingMsg,
+                              authKey, univ.OctetString(b'\x01' * digestLength), signedMsg)
+
+
+if __name__ == '__main__':
+    unittest.main()
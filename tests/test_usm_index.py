@@ -0,0 +1,170 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.smi.error import NoSuchInstanceError
+
+
+class BaseTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.usm = self.snmpEngine.securityModels[3]
+        self.mibInstrumController = self.snmpEngine.msgAndPduDsp.mibInstrumController
+
+        mibBuilder = self.mibInstrumController.mibBuilder
+
+        snmpEngineID, = mibBuilder.importSymbols('__SNMP-FRAMEWORK-MIB', 'snmpEngineID')
+        self.snmpEngineID = snmpEngineID.syntax
+
+        self.usmUserEntry, = mibBuilder.importSymbols('SNMP-USER-BASED-SM-MIB', 'usmUserEntry')
+
+    def getUserInfo(self, userName, securityEngineID=None):
+        if securityEngineID is None:
+            securityEngineID = self.snmpEngineID
+
+        return self.usm._SnmpUSMSecurityModel__getUserInfo(
+            self.mibInstrumController, securityEngineID, userName
+        )
+
+    def sec2usr(self, securityName, securityEngineID=None):
+        return self.usm._SnmpUSMSecurityModel__sec2usr(
+            self.snmpEngine, securityName, securityEngineID
+        )
+
+    def instId(self, userName):
+        return self.usmUserEntry.getInstIdFromIndices(self.snmpEngineID, userName)
+
+
+class UserIndexTestCase(BaseTestCase):
+    def testAddDelUser(self):
+        self.assertRaises(NoSuchInstanceError, self.getUserInfo, 'usr-md5-des')
+
+        config.addV3User(self.snmpEngine, 'usr-md5-des',
+                         config.usmHMACMD5AuthProtocol, 'authkey1',
+                         config.usmDESPrivProtocol, 'privkey1')
+
+        (usmUserName, usmUserSecurityName, usmUserAuthProtocol,
+         usmUserAuthKeyLocalized, usmUserPrivProtocol,
+         usmUserPrivKeyLocalized) = self.getUserInfo('usr-md5-des')
+
+        self.assertEqual(usmUserName, b'usr-md5-des')
+        self.assertEqual(usmUserSecurityName, b'usr-md5-des')
+        self.assertEqual(usmUserAuthProtocol, config.usmHMACMD5AuthProtocol)
+        self.assertEqual(usmUserPrivProtocol, config.usmDESPrivProtocol)
+        self.assertEqual(len(usmUserAuthKeyLocalized), 16)
+        self.assertEqual(len(usmUserPrivKeyLocalized), 16)
+
+        self.assertEqual(self.sec2usr('usr-md5-des'), b'usr-md5-des')
+
+        config.delV3User(self.snmpEngine, 'usr-md5-des')
+
+        self.assertRaises(NoSuchInstanceError, self.getUserInfo, 'usr-md5-des')
+        self.assertRaises(NoSuchInstanceError, self.sec2usr, 'usr-md5-des')
+
+    def testEngineID(self):
+        config.addV3User(self.snmpEngine, 'usr-none-none', securityEngineId=b'\x80\x00\x00\x00\x01')
+
+        self.assertRaises(NoSuchInstanceError, self.getUserInfo, 'usr-none-none')
+        self.assertEqual(self.getUserInfo('usr-none-none', b'\x80\x00\x00\x00\x01')[0], b'usr-none-none')
+        self.assertEqual(self.sec2usr('usr-none-none', b'\x80\x00\x00\x00\x01'), b'usr-none-none')
+
+    def testSecurityName(self):
+        config.addV3User(self.snmpEngine, 'usr-b', securityName='my-user')
+
+        self.assertEqual(self.getUserInfo('usr-b')[1], b'my-user')
+        self.assertEqual(self.sec2usr('my-user'), b'usr-b')
+        self.assertRaises(NoSuchInstanceError, self.sec2usr, 'usr-b')
+
+        # first (lesser) user entry wins
+        config.addV3User(self.snmpEngine, 'usr-a', securityName='my-user')
+        self.assertEqual(self.sec2usr('my-user'), b'usr-a')
+
+        config.delV3User(self.snmpEngine, 'usr-a')
+        self.assertEqual(self.sec2usr('my-user'), b'usr-b')
+
+    def testSnmpSet(self):
+        config.addV3User(self.snmpEngine, 'usr-none-none')
+
+        self.assertEqual(self.getUserInfo('usr-none-none')[2], config.usmNoAuthProtocol)
+
+        # usmUserAuthProtocol
+        self.mibInstrumController.writeVars(
+            ((self.usmUserEntry.name + (5,) + self.instId('usr-none-none'),
+              config.usmHMACMD5AuthProtocol),)
+        )
+        self.assertEqual(self.getUserInfo('usr-none-none')[2], config.usmHMACMD5AuthProtocol)
+
+        # usmUserStatus
+        self.mibInstrumController.writeVars(
+            ((self.usmUserEntry.name + (13,) + self.instId('usr-none-none'), 'destroy'),)
+        )
+        self.assertRaises(NoSuchInstanceError, self.getUserInfo, 'usr-none-none')
+
+    def testFullReindex(self):
+        config.addV3User(self.snmpEngine, 'usr-0')
+        self.getUserInfo('usr-0')
+
+        # the log can't cover all the changes since last lookup
+        self.usmUserEntry.changeLogSize = 2
+
+        for idx in range(1, 6):
+            config.addV3User(self.snmpEngine, 'usr-%d' % idx)
+        config.delV3User(self.snmpEngine, 'usr-0')
+
+        self.assertRaises(NoSuchInstanceError, self.getUserInfo, 'usr-0')
+
+        for idx in range(1, 6):
+            self.assertEqual(self.getUserInfo('usr-%d' % idx)[0], b'usr-%d' % idx)
+
+
+class TableRowChangesTestCase(BaseTestCase):
+    def setUp(self):
+        BaseTestCase.setUp(self)
+        # MIB tree gets indexed, which changes it
+        config.addV3User(self.snmpEngine, 'usr-0')
+
+    def testChanges(self):
+        versionId = self.usmUserEntry.branchVersionId
+
+        self.assertEqual(self.usmUserEntry.getChanges(versionId), [])
+
+        config.addV3User(self.snmpEngine, 'usr-a')
+        config.addV3User(self.snmpEngine, 'usr-b')
+
+        self.assertEqual(set(self.usmUserEntry.getChanges(versionId)),
+                         set([self.instId('usr-a'), self.instId('usr-b')]))
+
+        versionId = self.usmUserEntry.branchVersionId
+
+        config.delV3User(self.snmpEngine, 'usr-a')
+
+        self.assertEqual(set(self.usmUserEntry.getChanges(versionId)),
+                         set([self.instId('usr-a')]))
+
+    def testForgottenChanges(self):
+        self.usmUserEntry.changeLogSize = 4
+
+        versionId = self.usmUserEntry.branchVersionId
+
+        config.addV3User(self.snmpEngine, 'usr-a')
+
+        self.assertEqual(self.usmUserEntry.getChanges(versionId), None)
+
+        # recent changes are still there
+        versionId = self.usmUserEntry.branchVersionId
+
+        # usmUserAuthProtocol
+        self.mibInstrumController.writeVars(
+            ((self.usmUserEntry.name + (5,) + self.instId('usr-a'),
+              config.usmHMACMD5AuthProtocol),)
+        )
+
+        self.assertEqual(self.usmUserEntry.getChanges(versionId), [self.instId('usr-a')])
+
+
+if __name__ == '__main__':
+    unittest.main()
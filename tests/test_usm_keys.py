@@ -0,0 +1,217 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+from hashlib import md5, sha1
+from pyasn1.type import univ
+from pysnmp.entity import engine, config
+from pysnmp.proto.secmod.rfc3414 import localkey
+from pysnmp import error
+
+
+class HashPassphraseTestCase(unittest.TestCase):
+    # RFC3414 A.3.1 & A.3.2
+    def testMd5(self):
+        self.assertEqual(
+            localkey.passwordToKey('maplesyrup', univ.OctetString(hexValue='000000000000000000000002'), md5),
+            univ.OctetString(hexValue='526f5eed9fcce26f8964c2930787d82b').asOctets()
+        )
+
+    def testSha(self):
+        self.assertEqual(
+            localkey.passwordToKey('maplesyrup', univ.OctetString(hexValue='000000000000000000000002'), sha1),
+            univ.OctetString(hexValue='6695febc9288e36282235fc7151f128497b38f3f').asOctets()
+        )
+
+    def testHashPassphrases(self):
+        passphrases = [('maplesyrup', md5), ('maplesyrup', sha1), ('maplesyrup', md5)]
+        self.assertEqual(
+            localkey.hashPassphrases(passphrases, processes=1),
+            [localkey.hashPassphrase(*x) for x in passphrases]
+        )
+
+
+class BaseTestCase(unittest.TestCase):
+    def readKeys(self, snmpEngine):
+        mibInstrumController = snmpEngine.msgAndPduDsp.mibInstrumController
+        pysnmpUsmKeyEntry, = mibInstrumController.mibBuilder.importSymbols(
+            'PYSNMP-USM-MIB', 'pysnmpUsmKeyEntry')
+        keys = []
+        varBinds = [(pysnmpUsmKeyEntry.name, None)]
+        while True:
+            varBinds = mibInstrumController.readNextVars(varBinds)
+            if varBinds[0][0][:len(pysnmpUsmKeyEntry.name)] != pysnmpUsmKeyEntry.name:
+                return keys
+            keys.append((varBinds[0][0], varBinds[0][1].prettyPrint()))
+
+
+class LocalizedKeysCacheTestCase(BaseTestCase):
+    users = (
+        ('usr-sha-aes', config.usmHMACSHAAuthProtocol, 'authkey1',
+         config.usmAesCfb128Protocol, 'privkey1'),
+        ('usr-md5-des', config.usmHMACMD5AuthProtocol, 'authkey1',
+         config.usmDESPrivProtocol, 'privkey1'),
+        ('usr-sha256-none', config.usmHMAC192SHA256AuthProtocol, 'authkey1'),
+        ('usr-none-none',),
+    )
+
+    def setUp(self):
+        localkey._localizedKeys.clear()
+
+    def testBulkAndSingleUsersMatch(self):
+        snmpEngine = engine.SnmpEngine()
+        for user in self.users:
+            config.addV3User(snmpEngine, *user)
+
+        localkey._localizedKeys.clear()
+
+        otherSnmpEngine = engine.SnmpEngine(snmpEngineID=snmpEngine.snmpEngineID)
+        config.addV3Users(otherSnmpEngine, self.users, processes=1)
+
+        keys = self.readKeys(snmpEngine)
+        self.assertEqual(len(keys), len(self.users) * 4)
+        self.assertEqual(keys, self.readKeys(otherSnmpEngine))
+
+    def testCacheHitAndEviction(self):
+        snmpEngine = engine.SnmpEngine()
+        config.addV3User(snmpEngine, *self.users[0])
+        self.assertEqual(len(localkey._localizedKeys), 2)
+
+        hits = localkey._localizedKeys.hits
+        config.addV3User(snmpEngine, 'usr-other', *self.users[0][1:])
+        self.assertEqual(localkey._localizedKeys.hits, hits + 2)
+        self.assertEqual(len(localkey._localizedKeys), 2)
+
+        config.addV3User(snmpEngine, *self.users[3])
+        self.assertEqual(len(localkey._localizedKeys), 2)
+
+        config.delV3User(snmpEngine, 'usr-other')
+        self.assertEqual(len(localkey._localizedKeys), 0)
+
+
+class LocalizedKeysCacheFileTestCase(BaseTestCase):
+    user = LocalizedKeysCacheTestCase.users[0]
+
+    def setUp(self):
+        localkey._localizedKeys.clear()
+        self.tempDir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tempDir, 'usm-keys')
+        localkey.openCacheFile(self.filename)
+
+    def tearDown(self):
+        localkey.closeCacheFile()
+        localkey._localizedKeys.clear()
+        shutil.rmtree(self.tempDir)
+
+    def restart(self):
+        localkey.closeCacheFile()
+        localkey._localizedKeys.clear()
+        localkey.openCacheFile(self.filename)
+
+    @unittest.skipUnless(os.name == 'posix', 'POSIX file permissions required')
+    def testOwnerOnly(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.filename).st_mode), 384)  # 0600
+
+    @unittest.skipUnless(os.name == 'posix', 'POSIX file permissions required')
+    def testAccessibleByOthersRefused(self):
+        localkey.closeCacheFile()
+        os.chmod(self.filename, 420)  # 0644
+        self.assertRaises(error.PySnmpError, localkey.openCacheFile, self.filename)
+
+    def testKeysSurviveRestart(self):
+        snmpEngine = engine.SnmpEngine()
+        config.addV3User(snmpEngine, *self.user)
+
+        self.restart()
+
+        hashPassphrase = localkey.hashPassphrase
+        localkey.hashPassphrase = None  # keys must not be derived again
+        try:
+            otherSnmpEngine = engine.SnmpEngine(snmpEngineID=snmpEngine.snmpEngineID)
+            config.addV3User(otherSnmpEngine, *self.user)
+
+        finally:
+            localkey.hashPassphrase = hashPassphrase
+
+        self.assertEqual(self.readKeys(snmpEngine), self.readKeys(otherSnmpEngine))
+
+    def testBulkUsersNotHashedAfterRestart(self):
+        snmpEngine = engine.SnmpEngine()
+        config.addV3Users(snmpEngine, [self.user], processes=1)
+
+        self.restart()
+
+        hashPassphrases = localkey.hashPassphrases
+        passphrases = []
+        localkey.hashPassphrases = lambda x, processes=None: passphrases.extend(x) or hashPassphrases(x, processes)
+        try:
+            otherSnmpEngine = engine.SnmpEngine(snmpEngineID=snmpEngine.snmpEngineID)
+            config.addV3Users(otherSnmpEngine, [self.user, ('usr-new',) + self.user[1:]], processes=1)
+
+        finally:
+            localkey.hashPassphrases = hashPassphrases
+
+        self.assertEqual(passphrases, [])
+        self.assertEqual(sorted([x[1] for x in self.readKeys(snmpEngine)] * 2),
+                         sorted([x[1] for x in self.readKeys(otherSnmpEngine)]))
+
+    def testNoDigestsStored(self):
+        snmpEngine = engine.SnmpEngine()
+        config.addV3User(snmpEngine, *self.user)
+        localkey.closeCacheFile()
+
+        with open(self.filename, 'rb') as f:
+            data = f.read()
+
+        for passphrase in self.user[2], self.user[4]:
+            for hashFunc in md5, sha1:
+                self.assertFalse(hashFunc(univ.OctetString(passphrase).asOctets()).digest() in data)
+
+    def testSaltPerFile(self):
+        snmpEngine = engine.SnmpEngine()
+        config.addV3User(snmpEngine, *self.user)
+        localkey.closeCacheFile()
+
+        otherFilename = self.filename + '-other'
+        localkey.openCacheFile(otherFilename)
+        localkey._localizedKeys.clear()
+        config.addV3User(snmpEngine, *self.user)
+        localkey.closeCacheFile()
+
+        with open(self.filename, 'rb') as f:
+            data = f.read()
+
+        with open(otherFilename, 'rb') as f:
+            otherData = f.read()
+
+        self.assertEqual(len(data), len(otherData))
+        self.assertNotEqual(data, otherData)
+
+    def testDelV3UserForgetsKeys(self):
+        snmpEngine = engine.SnmpEngine()
+        config.addV3User(snmpEngine, *self.user)
+        config.delV3User(snmpEngine, self.user[0])
+
+        self.restart()
+
+        self.assertEqual(len(localkey._cacheFile), 0)
+
+    def testOtherEngineIdMisses(self):
+        config.addV3User(engine.SnmpEngine(), *self.user)
+
+        self.restart()
+
+        size = os.stat(self.filename).st_size
+        config.addV3User(engine.SnmpEngine(), *self.user)
+        self.assertTrue(os.stat(self.filename).st_size > size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import sys
+import unittest
+from pysnmp.entity import engine, config
+from pysnmp.proto.acmod import rfc3415
+from pysnmp.proto import errind, error
+
+
+class ViewTreeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.viewTree = rfc3415.ViewTree()
+
+    def testEmpty(self):
+        self.assertFalse(self.viewTree.isInView((1, 3, 6)))
+
+    def testIncluded(self):
+        self.viewTree.addFamily((1, 3, 6, 1, 2), (), True)
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2)))
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 1, 0)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 4)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1)))
+
+    def testExcluded(self):
+        self.viewTree.addFamily((1, 3, 6, 1), (), True)
+        self.viewTree.addFamily((1, 3, 6, 1, 6, 3), (), False)
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 1, 0)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 6, 3, 15, 1)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 6, 3)))
+
+    def testMostSpecificFamily(self):
+        # family order does not matter, the longest matching one decides
+        self.viewTree.addFamily((1, 3, 6, 1, 6, 3, 15), (), True)
+        self.viewTree.addFamily((1, 3, 6, 1, 6, 3), (), False)
+        self.viewTree.addFamily((1, 3, 6, 1), (), True)
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 6, 3, 15, 1)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 6, 3, 16, 1)))
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2)))
+
+    def testMask(self):
+        # ifEntry columns of interface 5: 1.3.6.1.2.1.2.2.1.*.5
+        self.viewTree.addFamily((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 5), (0xff, 0xa0), True)
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 5)))
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 7, 5)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 7, 6)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 2, 7, 5)))
+
+    def testShortMask(self):
+        # mask shorter than subtree is extended with ones
+        self.viewTree.addFamily((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 5), (0xff,), True)
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 5, 0)))
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 6)))
+
+    def testMaskedExclusion(self):
+        self.viewTree.addFamily((1, 3, 6, 1, 2, 1, 2, 2, 1), (), True)
+        self.viewTree.addFamily((1, 3, 6, 1, 2, 1, 2, 2, 1, 1, 5), (0xff, 0xa0), False)
+        self.assertFalse(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 7, 5)))
+        self.assertTrue(self.viewTree.isInView((1, 3, 6, 1, 2, 1, 2, 2, 1, 7, 6)))
+
+
+class VacmTestCase(unittest.TestCase):
+    def setUp(self):
+        self.snmpEngine = engine.SnmpEngine()
+        self.vacm = self.snmpEngine.accessControlModel[rfc3415.Vacm.accessModelID]
+        config.addVacmUser(self.snmpEngine, 2, 'public', 'noAuthNoPriv',
+                           readSubTree=(1, 3, 6, 1))
+
+    def isAccessAllowed(self, variableName, securityName='public',
+                        viewType='read', contextName=b''):
+        try:
+            self.vacm.isAccessAllowed(
+                self.snmpEngine, 2, securityName, 1, viewType,
+                contextName, variableName
+            )
+
+        except error.StatusInformation:
+            return sys.exc_info()[1]['errorIndication']
+
+        return errind.accessAllowed
+
+    def testAccess(self):
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1, 2, 1, 1, 1, 0)),
+                         errind.accessAllowed)
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 2)), errind.notInView)
+        # write view is named but has no families
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1), viewType='write'),
+                         errind.notInView)
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1), securityName='private'),
+                         errind.noGroupName)
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1), contextName=b'ctx'),
+                         errind.noSuchContext)
+
+    def testUnknownViewType(self):
+        self.assertRaises(error.ProtocolError, self.vacm.isAccessAllowed,
+                          self.snmpEngine, 2, 'public', 1, 'readwrite', b'',
+                          (1, 3, 6, 1))
+
+    def testCache(self):
+        for _ in range(3):
+            self.isAccessAllowed((1, 3, 6, 1, 2, 1, 1, 1, 0))
+            self.isAccessAllowed((1, 3, 6, 1), securityName='private')
+
+        stats = self.vacm.getCacheStats()
+        self.assertEqual((stats['misses'], stats['hits']), (2, 4))
+
+    def testTablesChange(self):
+        readView = 'r' + 'v-%s-%d' % (hash('public'), 2)
+
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1, 6, 3, 15, 1)),
+                         errind.accessAllowed)
+
+        config.addVacmView(self.snmpEngine, readView, 'excluded',
+                           (1, 3, 6, 1, 6, 3), '')
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1, 6, 3, 15, 1)),
+                         errind.notInView)
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1, 2, 1, 1, 1, 0)),
+                         errind.accessAllowed)
+
+        config.delVacmView(self.snmpEngine, readView, (1, 3, 6, 1, 6, 3))
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1, 6, 3, 15, 1)),
+                         errind.accessAllowed)
+
+        config.delVacmUser(self.snmpEngine, 2, 'public', 'noAuthNoPriv',
+                           readSubTree=(1, 3, 6, 1))
+        self.assertEqual(self.isAccessAllowed((1, 3, 6, 1, 6, 3, 15, 1)),
+                         errind.noGroupName)
+
+
+if __name__ == '__main__':
+    unittest.main()
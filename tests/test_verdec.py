@@ -0,0 +1,137 @@
+#
+# This file is part of pysnmp software.
+#
+# Copyright (c) 2005-2017, Ilya Etingof <etingof@gmail.com>
+# License: http://snmplabs.com/pysnmp/license.html
+#
+import sys
+import random
+import unittest
+from pyasn1.type import univ
+from pyasn1.codec.ber import encoder
+from pysnmp.entity import engine
+from pysnmp.carrier.asyncore.dgram import udp
+from pysnmp.proto import api, error, rfc1902
+from pysnmp.proto.api import verdec, v2c
+
+
+def getRequest():
+    msg = v2c.Message()
+    v2c.apiMessage.setDefaults(msg)
+    v2c.apiMessage.setCommunity(msg, 'public')
+    pdu = v2c.GetRequestPDU()
+    v2c.apiPDU.setDefaults(pdu)
+    v2c.apiPDU.setVarBinds(pdu, [('1.3.6.1.2.1.1.1.0', v2c.null)])
+    v2c.apiMessage.setPDU(msg, pdu)
+    return encoder.encode(msg)
+
+
+class DecodeMessageVersionTestCase(unittest.TestCase):
+    def testVersion(self):
+        self.assertEqual(verdec.decodeMessageVersion(getRequest()), api.protoVersion2c)
+
+    def testTruncated(self):
+        self.assertRaises(error.ProtocolError, verdec.decodeMessageVersion, getRequest()[:-1])
+
+    def testWrongTag(self):
+        self.assertRaises(error.ProtocolError, verdec.decodeMessageVersion, b'\x04' + getRequest()[1:])
+
+    def testLongFormTag(self):
+        # legal BER, accepted by pyasn1 decoder
+        self.assertEqual(verdec.decodeMessageVersion(b'\x30\x04\x1f\x02\x01\x01'), 1)
+        self.assertRaises(error.ProtocolError, verdec.decodeMessageVersion, b'\xbf\x30\x03\x02\x01\x00')
+
+    def testMaxMessageSize(self):
+        wholeMsg = getRequest()
+        self.assertEqual(verdec.decodeMessageVersion(wholeMsg, len(wholeMsg)), api.protoVersion2c)
+        self.assertRaises(error.ProtocolError, verdec.decodeMessageVersion, wholeMsg, len(wholeMsg) - 1)
+
+
+class DifferentialTestCase(unittest.TestCase):
+    """Compare version sniffing against pyasn1 decoder"""
+    messages = 1500
+    mutations = 20
+
+    def setUp(self):
+        self.rnd = random.Random(1)
+
+    def message(self, version):
+        # body contents do not matter, its length shapes outer header
+        body = univ.OctetString(b'x' * self.rnd.choice((0, 10, 200, 70000)))
+
+        msg = univ.Sequence()
+        msg.setComponentByPosition(0, univ.Integer(version))
+        msg.setComponentByPosition(1, body)
+
+        return encoder.encode(msg)
+
+    def mutate(self, wholeMsg):
+        octets = bytearray(wholeMsg)
+        for _ in range(self.rnd.randrange(1, 4)):
+            if not octets:
+                break
+            # mostly headers
+            pos = self.rnd.randrange(min(len(octets), self.rnd.choice((8, len(octets)))))
+            mutation = self.rnd.randrange(3)
+            if mutation == 0:
+                octets[pos] = self.rnd.randrange(256)
+            elif mutation == 1:
+                del octets[pos:]
+            else:
+                octets.insert(pos, self.rnd.randrange(256))
+        return bytes(octets)
+
+    @staticmethod
+    def decode(fun, wholeMsg):
+        try:
+            return int(fun(wholeMsg))
+
+        except Exception:
+            return sys.exc_info()[1]
+
+    def assertSameVersion(self, wholeMsg):
+        version = self.decode(verdec.decodeMessageVersion, wholeMsg)
+        expected = self.decode(verdec._decodeMessageVersion, wholeMsg)
+
+        if isinstance(expected, Exception):
+            self.assertIsInstance(version, error.ProtocolError, repr(wholeMsg[:16]))
+        else:
+            self.assertEqual(version, expected, repr(wholeMsg[:16]))
+
+    def testMessages(self):
+        for _ in range(self.messages):
+            version = self.rnd.choice((0, 1, 3, self.rnd.randrange(-1 << 40, 1 << 40)))
+            wholeMsg = self.message(version)
+            self.assertEqual(self.decode(verdec.decodeMessageVersion, wholeMsg), version)
+            self.assertSameVersion(wholeMsg)
+            for _ in range(self.mutations):
+                self.assertSameVersion(self.mutate(wholeMsg))
+
+    def testNotSequence(self):
+        # pyasn1 decoder used to leak TypeError on that
+        self.assertRaises(error.ProtocolError, verdec.decodeMessageVersion, b'\x02\x01\x00')
+
+
+class ReceiveMessageSizeTestCase(unittest.TestCase):
+    def receive(self, maxMessageSize):
+        snmpEngine = engine.SnmpEngine()
+        msgAndPduDsp = snmpEngine.msgAndPduDsp
+        snmpEngineMaxMessageSize, = msgAndPduDsp.mibInstrumController.mibBuilder.importSymbols(
+            '__SNMP-FRAMEWORK-MIB', 'snmpEngineMaxMessageSize')
+        # bypass value constraints to model unlimited (zero) size
+        snmpEngineMaxMessageSize.syntax = rfc1902.Integer32(maxMessageSize)
+        msgAndPduDsp.receiveMessage(snmpEngine, udp.domainName, ('127.0.0.1', 161), getRequest())
+        return msgAndPduDsp.statistics.snmpInASNParseErrs
+
+    def testWithinLimit(self):
+        self.assertEqual(self.receive(len(getRequest())), 0)
+
+    def testOverLimit(self):
+        self.assertEqual(self.receive(len(getRequest()) - 1), 1)
+
+    def testNoLimit(self):
+        self.assertEqual(self.receive(0), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()